@@ -0,0 +1,41 @@
+"""
+Moduuli suorituskykytestien mittausprosessien ajamiseen.
+
+Mittaukset ajetaan omissa Python-prosesseissaan, jotta tuonnit, välimuistit
+ja muistinkäyttö eivät periydy kierrokselta toiselle. Mittausprosessi
+tulostaa tuloksensa viimeisenä JSON-rivinä.
+"""
+
+import json
+import subprocess
+import sys
+from typing import Any, Dict, Optional, Sequence
+
+
+def run_child(
+    module: str, args: Sequence[str] = (), env: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """
+    Ajaa mittausmoduulin `--child`-tilassa erillisessä Python-prosessissa.
+
+    Args:
+        module: Ajettavan moduulin nimi, esim. "src.benchmarks.split_benchmark".
+        args: Lisäargumentit mittausprosessille.
+        env: Valinnaiset ympäristömuuttujat. Oletuksena nykyinen ympäristö.
+
+    Returns:
+        Mittausprosessin viimeiseltä riviltä jäsennetty tulos.
+
+    Raises:
+        RuntimeError: Jos mittausprosessi epäonnistuu.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-m", module, "--child", *args],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Mittausprosessi epäonnistui: {completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
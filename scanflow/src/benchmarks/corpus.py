@@ -0,0 +1,283 @@
+"""
+Deterministiset synteettiset PDF-aineistot suorituskykytesteihin.
+
+Jokainen aineisto luodaan kiinteällä siemenluvulla, joten sama mittakaava
+tuottaa aina tavulleen saman tiedoston. Aineistot kattavat jakamisen
+kannalta olennaiset ääripäät:
+
+- `text`: kevyitä tekstisivuja.
+- `scanned`: jokaisella sivulla oma harmaasävykuva, kuten skannauksissa.
+- `shared_font`: kaikki sivut käyttävät samaa suurta upotettua fonttia.
+- `many_pages`: yli 10 000 lähes tyhjää sivua.
+- `deep_tree`: sivupuu, jossa jokaisella solmulla on vain kaksi lasta.
+
+Luodut tiedostot säilytetään hakemistossa ja käytetään uudelleen, kunnes
+aineiston versio tai mittakaava muuttuu.
+"""
+
+import os
+import random
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import fitz
+
+CORPUS_VERSION = 1
+_SEED = 20240601
+_PAGE_WIDTH = 595
+_PAGE_HEIGHT = 842
+_WORDS = (
+    "skannaus sivu asiakirja arkisto lasku sopimus liite kuitti pöytäkirja "
+    "raportti hakemus päätös todistus lausunto muistio selvitys"
+).split()
+
+
+def _scaled(pages: int, scale: float) -> int:
+    return max(2, int(pages * scale))
+
+
+def _new_document() -> fitz.Document:
+    doc = fitz.open()
+    doc.set_metadata({})
+    return doc
+
+
+def _save(doc: fitz.Document, path: str) -> None:
+    temp_path = f"{path}.tmp"
+    doc.save(temp_path, garbage=4, deflate=True, no_new_id=True)
+    doc.close()
+    os.replace(temp_path, path)
+
+
+def _write_text(path: str, scale: float) -> None:
+    rng = random.Random(_SEED)
+    doc = _new_document()
+    for page_number in range(_scaled(500, scale)):
+        page = doc.new_page(width=_PAGE_WIDTH, height=_PAGE_HEIGHT)
+        lines = [
+            " ".join(rng.choice(_WORDS) for _ in range(10)) for _ in range(40)
+        ]
+        page.insert_text((50, 60), f"Sivu {page_number + 1}", fontsize=14)
+        page.insert_text((50, 90), "\n".join(lines), fontsize=9)
+    _save(doc, path)
+
+
+def _write_scanned(path: str, scale: float) -> None:
+    rng = random.Random(_SEED)
+    width, height = 400, 560
+    doc = _new_document()
+    for _ in range(_scaled(150, scale)):
+        page = doc.new_page(width=_PAGE_WIDTH, height=_PAGE_HEIGHT)
+        samples = bytearray(width * height)
+        # Vaakaraidat, joiden sävy vaihtelee satunnaisesti, jäljittelevät
+        # tekstirivejä niin, että kuva pakkautuu skannauksen tapaan osittain.
+        for row in range(height):
+            shade = 255 if row % 14 > 9 else rng.randrange(80, 256)
+            noise = bytes(rng.getrandbits(8) | 0xC0 for _ in range(width // 8))
+            start = row * width
+            samples[start:start + width] = bytes([shade]) * (width - len(noise)) + noise
+        pixmap = fitz.Pixmap(fitz.csGRAY, width, height, bytes(samples), False)
+        page.insert_image(page.rect, pixmap=pixmap)
+    _save(doc, path)
+
+
+def _write_shared_font(path: str, scale: float) -> None:
+    rng = random.Random(_SEED)
+    font_buffer = fitz.Font("cjk").buffer
+    doc = _new_document()
+    for page_number in range(_scaled(300, scale)):
+        page = doc.new_page(width=_PAGE_WIDTH, height=_PAGE_HEIGHT)
+        page.insert_font(fontname="F0", fontbuffer=font_buffer)
+        text = " ".join(rng.choice(_WORDS) for _ in range(30))
+        page.insert_text((50, 60), f"Sivu {page_number + 1} 文書 {text}", fontname="F0")
+    _save(doc, path)
+
+
+def _write_many_pages(path: str, scale: float) -> None:
+    _write_minimal_pdf(path, _scaled(10000, scale))
+
+
+def _write_deep_tree(path: str, scale: float) -> None:
+    _write_minimal_pdf(path, _scaled(1000, scale), fanout=2)
+
+
+def _write_minimal_pdf(path: str, page_count: int, fanout: int = 0) -> None:
+    """
+    Kirjoittaa kevyen PDF:n suoraan ilman PyMuPDF:ää.
+
+    PyMuPDF:n sivujen lisäys hidastuu sivumäärän kasvaessa, joten
+    kymmenientuhansien sivujen aineisto kirjoitetaan suoraan. Kaikki sivut
+    jakavat saman fonttiresurssin.
+
+    Args:
+        path: Kohdetiedoston polku.
+        page_count: Sivujen määrä.
+        fanout: Sivupuun solmujen lapsimäärä. Arvolla 0 puu on litteä.
+    """
+    # Objektit 1 = katalogi, 2 = juurisolmu, 3 = fontti, sitten sivut ja sisällöt.
+    objects: Dict[int, bytes] = {
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    pages = _add_pages(objects, page_count, first_id=4)
+    _add_page_tree(objects, pages, fanout)
+    objects[1] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    _write_objects(path, objects)
+
+
+def _add_pages(
+    objects: Dict[int, bytes], page_count: int, first_id: int
+) -> List[Tuple[int, int]]:
+    """
+    Lisää sivut ja niiden sisällöt objekteihin.
+
+    Sivujen `/Parent`-viittaus jätetään paikkamerkiksi, kunnes sivupuu on
+    koottu.
+
+    Args:
+        objects: PDF-objektit numeron mukaan. Päivitetään.
+        page_count: Sivujen määrä.
+        first_id: Ensimmäisen lisättävän objektin numero.
+
+    Returns:
+        Lista (sivun objektinumero, sivumäärä 1) -pareja sivujärjestyksessä.
+    """
+    pages = []
+    for page_number in range(page_count):
+        page_id = first_id + 2 * page_number
+        content_id = page_id + 1
+        content = f"BT /F1 12 Tf 50 782 Td (Sivu {page_number + 1}) Tj ET".encode("ascii")
+        objects[content_id] = (
+            b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream"
+        )
+        objects[page_id] = (
+            f"<< /Type /Page /Parent {{parent}} 0 R /MediaBox [0 0 {_PAGE_WIDTH} "
+            f"{_PAGE_HEIGHT}] /Resources << /Font << /F1 3 0 R >> >> "
+            f"/Contents {content_id} 0 R >>"
+        ).encode("ascii")
+        pages.append((page_id, 1))
+    return pages
+
+
+def _add_page_tree(
+    objects: Dict[int, bytes], level: List[Tuple[int, int]], fanout: int
+) -> None:
+    """
+    Kokoaa sivupuun solmut ja täyttää sivujen `/Parent`-viittaukset.
+
+    Args:
+        objects: PDF-objektit numeron mukaan. Päivitetään.
+        level: Sivut (objektinumero, sivumäärä) -pareina.
+        fanout: Solmujen lapsimäärä. Arvolla 0 kaikki sivut ovat juurisolmun lapsia.
+    """
+    next_id = max(objects) + 1
+    parents: Dict[int, int] = {}
+    while fanout and len(level) > fanout:
+        next_level = []
+        for start in range(0, len(level), fanout):
+            children = level[start:start + fanout]
+            for child_id, _ in children:
+                parents[child_id] = next_id
+            objects[next_id] = _pages_node(children, parent=True)
+            next_level.append((next_id, sum(count for _, count in children)))
+            next_id += 1
+        level = next_level
+    for child_id, _ in level:
+        parents[child_id] = 2
+    objects[2] = _pages_node(level, parent=False)
+
+    for object_id, parent_id in parents.items():
+        objects[object_id] = objects[object_id].replace(
+            b"{parent}", str(parent_id).encode("ascii")
+        )
+
+
+def _write_objects(path: str, objects: Dict[int, bytes]) -> None:
+    """
+    Kirjoittaa objektit, xref-taulun ja trailerin PDF-tiedostoksi.
+
+    Tiedosto kirjoitetaan ensin väliaikaiseen polkuun, jotta keskeytynyt
+    kirjoitus ei jätä puolikasta aineistoa.
+
+    Args:
+        path: Kohdetiedoston polku.
+        objects: PDF-objektit numeron mukaan. Numeroinnin on oltava yhtenäinen.
+    """
+    size = max(objects) + 1
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(b"%PDF-1.7\n")
+        offsets = {}
+        for object_id in sorted(objects):
+            offsets[object_id] = file.tell()
+            file.write(b"%d 0 obj\n" % object_id + objects[object_id] + b"\nendobj\n")
+        xref_offset = file.tell()
+        file.write(b"xref\n0 %d\n0000000000 65535 f \n" % (size,))
+        for object_id in range(1, size):
+            file.write(b"%010d 00000 n \n" % offsets[object_id])
+        file.write(
+            b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (size, xref_offset)
+        )
+    os.replace(temp_path, path)
+
+
+def _pages_node(children: List, parent: bool) -> bytes:
+    kids = " ".join(f"{child_id} 0 R" for child_id, _ in children)
+    count = sum(child_count for _, child_count in children)
+    parent_ref = " /Parent {parent} 0 R" if parent else ""
+    return f"<< /Type /Pages{parent_ref} /Kids [{kids}] /Count {count} >>".encode("ascii")
+
+
+CORPORA: Dict[str, Callable[[str, float], None]] = {
+    "text": _write_text,
+    "scanned": _write_scanned,
+    "shared_font": _write_shared_font,
+    "many_pages": _write_many_pages,
+    "deep_tree": _write_deep_tree,
+}
+
+
+def corpus_path(directory: str, name: str, scale: float) -> str:
+    """
+    Palauttaa aineiston tiedostopolun.
+
+    Args:
+        directory: Aineistohakemisto.
+        name: Aineiston nimi (`CORPORA`-sanakirjan avain).
+        scale: Sivumäärien kerroin.
+
+    Returns:
+        Tiedostopolku, jossa on mukana aineiston versio ja mittakaava.
+    """
+    return os.path.join(directory, f"{name}-x{scale:g}-v{CORPUS_VERSION}.pdf")
+
+
+def ensure_corpus(
+    directory: str, names: Sequence[str] = tuple(CORPORA), scale: float = 1.0
+) -> Dict[str, str]:
+    """
+    Luo puuttuvat aineistot ja palauttaa niiden polut.
+
+    Args:
+        directory: Hakemisto, johon aineistot tallennetaan.
+        names: Luotavien aineistojen nimet.
+        scale: Sivumäärien kerroin. Esimerkiksi 0.1 tuottaa nopean pienen ajon.
+
+    Returns:
+        Sanakirja aineiston nimestä tiedostopolkuun.
+
+    Raises:
+        ValueError: Jos aineiston nimi on tuntematon tai scale ei ole positiivinen.
+    """
+    if scale <= 0:
+        raise ValueError("Mittakaavan tulee olla positiivinen.")
+    unknown: List[str] = [name for name in names if name not in CORPORA]
+    if unknown:
+        raise ValueError(f"Tuntematon aineisto: {', '.join(unknown)}")
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for name in names:
+        path = corpus_path(directory, name, scale)
+        if not os.path.exists(path):
+            CORPORA[name](path, scale)
+        paths[name] = path
+    return paths
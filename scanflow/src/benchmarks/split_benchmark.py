@@ -0,0 +1,455 @@
+"""
+PDF-jaon suorituskykytesti synteettisillä aineistoilla.
+
+Luo deterministiset aineistot (`src.benchmarks.corpus`) ja mittaa
+`split_by_fixed_range`- ja `split_by_custom_ranges`-metodien nopeuden eri
+osakoilla. Jokainen mittaus ajetaan omassa prosessissaan, jotta
+huippumuistinkäyttö (RSS) kuvaa vain kyseistä tapausta. Tuloksia verrataan
+tallennettuun perustasoon, ja merkittävä heikkeneminen palauttaa
+paluukoodin 1:
+
+    python -m src.benchmarks.split_benchmark --scale 0.1
+    python -m src.benchmarks.split_benchmark --update-baseline
+
+Perustaso on konekohtainen, joten se tallennetaan oletuksena
+`~/.scanflow/benchmarks`-hakemistoon. Ensimmäinen ajo `--update-baseline`-
+valitsimella luo sen.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+from src.benchmarks.child_process import run_child
+from src.benchmarks.corpus import CORPORA, CORPUS_VERSION, ensure_corpus
+from src.services.split_options import SplitOptions
+from src.utils.app_paths import get_app_dir
+from src.utils.memory_profiler import MemoryProfiler, ProfilingRepository
+
+MODES = ("fixed", "custom")
+DEFAULT_PART_SIZES = (1, 10, 100)
+DEFAULT_TOLERANCE = 0.25
+BASELINE_FILENAME = "split_baseline.json"
+
+
+def case_name(corpus: str, mode: str, part_size: int) -> str:
+    """
+    Palauttaa mittaustapauksen tunnisteen, esim. "text/fixed/10".
+
+    Args:
+        corpus: Aineiston nimi.
+        mode: Jakotapa ("fixed" tai "custom").
+        part_size: Sivuja per osa.
+
+    Returns:
+        Tapauksen tunniste.
+    """
+    return f"{corpus}/{mode}/{part_size}"
+
+
+def custom_ranges(page_count: int, part_size: int) -> List[Tuple[int, int]]:
+    """
+    Muodostaa mukautetun jaon sivualueet, joiden välissä jää joka toinen alue.
+
+    Args:
+        page_count: Lähdetiedoston sivumäärä.
+        part_size: Sivuja per alue.
+
+    Returns:
+        Lista (aloitussivu, lopetussivu) -tupleja (1-pohjaisia).
+    """
+    return [
+        (start, min(start + part_size - 1, page_count))
+        for start in range(1, page_count + 1, 2 * part_size)
+    ]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Palauttaa nykyisen prosessin huippumuistinkäytön megatavuina.
+
+    Returns:
+        Huippu-RSS megatavuina, tai None, jos alusta ei tue mittausta.
+    """
+    # Linuxissa ru_maxrss periytyy fork- ja exec-kutsujen yli, joten
+    # mittausprosessi näkisi myös käynnistäjänsä huipun. VmHWM on muistialue-
+    # kohtainen ja nollautuu exec-kutsussa.
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS ilmoittaa arvon tavuina, Linux kilotavuina.
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def _split_once(
+    service: Any, corpus_path: str, mode: str, *, part_size: int,
+    ranges: List[Tuple[int, int]], output_dir: str, workers: int,
+) -> List[str]:
+    if mode == "fixed":
+        return service.split_by_fixed_range(
+            corpus_path, part_size, output_dir, options=SplitOptions(workers=workers),
+        )
+    return service.split_by_custom_ranges(
+        corpus_path, ranges, output_dir, options=SplitOptions(workers=workers),
+    )
+
+
+def _time_splits(
+    service: Any, corpus_path: str, mode: str, *, part_size: int,
+    ranges: List[Tuple[int, int]], repeat: int, workers: int,
+) -> Tuple[float, int, int]:
+    """
+    Toistaa jaon ja palauttaa nopeimman kierroksen.
+
+    Returns:
+        (sekunnit, osien määrä, kirjoitetut tavut) -tuple.
+    """
+    timings = []
+    for _ in range(max(1, repeat)):
+        with tempfile.TemporaryDirectory() as output_dir:
+            started = time.perf_counter()
+            output_files = _split_once(
+                service, corpus_path, mode,
+                part_size=part_size, ranges=ranges, output_dir=output_dir, workers=workers,
+            )
+            timings.append(time.perf_counter() - started)
+            bytes_written = sum(os.path.getsize(path) for path in output_files)
+    return min(timings), len(output_files), bytes_written
+
+
+def _measure_child(
+    corpus_path: str,
+    mode: str,
+    part_size: int,
+    *,
+    repeat: int,
+    workers: int,
+    memprofile: bool = False,
+) -> Dict[str, Any]:
+    from src.services.pdf_splitter_service import PDFSplitterService # pylint: disable=import-outside-toplevel
+
+    service = PDFSplitterService()
+    page_count = service.get_pdf_info(corpus_path)["page_count"]
+    ranges = custom_ranges(page_count, part_size)
+    seconds, parts, bytes_written = _time_splits(
+        service, corpus_path, mode,
+        part_size=part_size, ranges=ranges, repeat=repeat, workers=workers,
+    )
+
+    pages = page_count if mode == "fixed" else sum(end - start + 1 for start, end in ranges)
+    result = {
+        "seconds": seconds,
+        "pages": pages,
+        "parts": parts,
+        "bytes_written": bytes_written,
+        "pages_per_second": pages / seconds if seconds > 0 else 0.0,
+        "mb_per_second": bytes_written / (1024 * 1024) / seconds if seconds > 0 else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if memprofile:
+        result["memory"] = _profile_memory(
+            PDFSplitterService, corpus_path, mode, part_size, ranges
+        )
+    return result
+
+
+def _profile_memory(
+    service_class: Any, corpus_path: str, mode: str, part_size: int,
+    ranges: List[Tuple[int, int]],
+) -> Dict[str, Any]:
+    """Ajaa ajastuskierrosten jälkeen yhden profiloidun jaon sarjassa."""
+    from src.repositories.pdf_repository import PDFRepository # pylint: disable=import-outside-toplevel
+
+    profiler = MemoryProfiler()
+    service = service_class(ProfilingRepository(PDFRepository(), profiler))
+    with tempfile.TemporaryDirectory() as output_dir:
+        with profiler:
+            _split_once(
+                service, corpus_path, mode,
+                part_size=part_size, ranges=ranges, output_dir=output_dir, workers=1,
+            )
+    report = profiler.report()
+    del report["parts"]
+    return report
+
+
+def run_case(
+    corpus_path: str,
+    mode: str,
+    part_size: int,
+    *,
+    repeat: int = 5,
+    workers: int = 1,
+    memprofile: bool = False,
+) -> Dict[str, Any]:
+    """
+    Suorittaa yhden mittaustapauksen erillisessä Python-prosessissa.
+
+    Args:
+        corpus_path: Jaettavan aineiston polku.
+        mode: Jakotapa ("fixed" tai "custom").
+        part_size: Sivuja per osa.
+        repeat: Toistokertojen määrä. Tulokseksi valitaan nopein.
+        workers: Jaon työprosessien määrä.
+        memprofile: Ajetaanko lopuksi yksi muistiprofiloitu jako. Raportti
+                    palautetaan avaimella 'memory'.
+
+    Returns:
+        Sanakirja avaimilla 'seconds', 'pages', 'parts', 'bytes_written',
+        'pages_per_second', 'mb_per_second' ja 'peak_rss_mb'.
+
+    Raises:
+        RuntimeError: Jos mittausprosessi epäonnistuu.
+    """
+    return run_child(
+        "src.benchmarks.split_benchmark",
+        [
+            "--corpus-file", corpus_path, "--mode", mode,
+            "--part-size", str(part_size), "--repeat", str(repeat),
+            "--workers", str(workers),
+            *(["--memprofile"] if memprofile else []),
+        ],
+    )
+
+
+def run_suite(
+    corpus_paths: Dict[str, str],
+    part_sizes: Sequence[int] = DEFAULT_PART_SIZES,
+    repeat: int = 5,
+    workers: int = 1,
+    memprofile: bool = False,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Suorittaa kaikki aineiston, jakotavan ja osakoon yhdistelmät.
+
+    Args:
+        corpus_paths: Sanakirja aineiston nimestä tiedostopolkuun.
+        part_sizes: Mitattavat osakoot.
+        repeat: Toistokertojen määrä per tapaus.
+        workers: Jaon työprosessien määrä.
+        memprofile: Lisätäänkö jokaiseen tapaukseen muistiprofiili.
+
+    Returns:
+        Mittaustulokset tapauksen tunnisteen mukaan.
+    """
+    return {
+        case_name(corpus, mode, part_size): run_case(
+            path, mode, part_size, repeat=repeat, workers=workers, memprofile=memprofile
+        )
+        for corpus, path in corpus_paths.items()
+        for mode in MODES
+        for part_size in part_sizes
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[str]:
+    """
+    Vertaa tuloksia perustasoon.
+
+    Sivunopeuden lasku tai huippumuistin kasvu, joka ylittää sallitun
+    suhteellisen poikkeaman, tulkitaan heikkenemiseksi. Kirjoitusnopeutta
+    (Mt/s) ei verrata erikseen, koska se muuttuu samassa suhteessa. Tapaukset, joita
+    perustasossa ei ole, ohitetaan.
+
+    Args:
+        results: `run_suite`-funktion tulokset.
+        baseline: Perustason tulokset samassa muodossa.
+        tolerance: Sallittu suhteellinen poikkeama (0.25 = 25 %).
+
+    Returns:
+        Lista heikkenemisiä kuvaavia viestejä.
+    """
+    regressions = []
+    for case, result in results.items():
+        reference = baseline.get(case)
+        if reference is None:
+            continue
+        current_rate, reference_rate = result["pages_per_second"], reference["pages_per_second"]
+        if current_rate < reference_rate * (1 - tolerance):
+            regressions.append(
+                f"{case}: {current_rate:.0f} sivua/s, perustaso {reference_rate:.0f} sivua/s"
+            )
+        current_rss, reference_rss = result.get("peak_rss_mb"), reference.get("peak_rss_mb")
+        if current_rss and reference_rss and current_rss > reference_rss * (1 + tolerance):
+            regressions.append(
+                f"{case}: huippu-RSS {current_rss:.0f} Mt, perustaso {reference_rss:.0f} Mt"
+            )
+    return regressions
+
+
+def load_baseline(path: str, scale: float) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Lukee perustason tiedostosta.
+
+    Args:
+        path: Perustasotiedoston polku.
+        scale: Nykyisen ajon mittakaava.
+
+    Returns:
+        Perustason tulokset, tai None, jos tiedostoa ei ole tai se on
+        mitattu eri mittakaavalla tai aineistoversiolla.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if data.get("scale") != scale or data.get("corpus_version") != CORPUS_VERSION:
+        return None
+    return data.get("results")
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, Any]], scale: float) -> None:
+    """
+    Tallentaa tulokset uudeksi perustasoksi.
+
+    Args:
+        path: Perustasotiedoston polku.
+        results: `run_suite`-funktion tulokset.
+        scale: Ajon mittakaava.
+    """
+    data = {
+        "scale": scale,
+        "corpus_version": CORPUS_VERSION,
+        "results": {
+            case: {
+                key: result[key]
+                for key in ("pages_per_second", "mb_per_second", "peak_rss_mb")
+            }
+            for case, result in sorted(results.items())
+        },
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+        file.write("\n")
+
+
+def _parse_sizes(value: str) -> List[int]:
+    try:
+        sizes = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Virheellinen osakokolista: '{value}'") from None
+    if not sizes or min(sizes) < 1:
+        raise argparse.ArgumentTypeError("Osakokojen tulee olla vähintään 1.")
+    return sizes
+
+
+def _format_result(case: str, result: Dict[str, Any]) -> str:
+    rss = result.get("peak_rss_mb")
+    line = (
+        f"{case}: {result['pages_per_second']:.0f} sivua/s, "
+        f"{result['mb_per_second']:.1f} Mt/s, "
+        f"huippu-RSS {'-' if rss is None else f'{rss:.0f} Mt'}"
+    )
+    memory = result.get("memory")
+    if memory is not None:
+        growth = memory["rss_growth_per_part_kb"]
+        line += (
+            f", pysyvä {memory['steady_rss_mb'] or 0:.0f} Mt, "
+            f"kasvu {'-' if growth is None else f'{growth:.1f} kt'}/osa"
+        )
+    return line
+
+
+def _print_report(
+    results: Dict[str, Dict[str, Any]], regressions: List[str], has_baseline: bool
+) -> None:
+    for case, result in results.items():
+        print(_format_result(case, result))
+    if not has_baseline:
+        print("Vertailukelpoista perustasoa ei löytynyt.")
+    for regression in regressions:
+        print(f"HEIKKENEMINEN: {regression}")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Mittaa PDF-jaon suorituskyvyn.")
+    parser.add_argument("--scale", type=float, default=1.0, help="aineistojen sivumääräkerroin")
+    parser.add_argument("--corpora", default=",".join(CORPORA), help="mitattavat aineistot")
+    parser.add_argument(
+        "--part-sizes", type=_parse_sizes, default=list(DEFAULT_PART_SIZES),
+        help="osakoot pilkuin eroteltuina",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="toistot per tapaus")
+    parser.add_argument("--workers", type=int, default=1, help="jaon työprosessit")
+    parser.add_argument("--corpus-dir", help="aineistohakemisto")
+    parser.add_argument("--baseline", help="perustasotiedosto")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="tallenna tulokset perustasoksi"
+    )
+    parser.add_argument(
+        "--memprofile", action="store_true", help="lisää tuloksiin vaiheittainen muistiprofiili"
+    )
+    parser.add_argument("--json", action="store_true", help="tulosta tulokset JSON-muodossa")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--corpus-file", help=argparse.SUPPRESS)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--part-size", type=int, help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Suorittaa jaon suorituskykytestin.
+
+    Args:
+        argv: Komentoriviargumentit. Oletuksena `sys.argv[1:]`.
+
+    Returns:
+        Paluukoodi: 0, jos heikkenemistä ei havaittu, muuten 1.
+    """
+    args = _build_parser().parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_measure_child(
+            args.corpus_file, args.mode, args.part_size,
+            repeat=args.repeat, workers=args.workers, memprofile=args.memprofile,
+        )))
+        return 0
+
+    corpus_paths = ensure_corpus(
+        args.corpus_dir or get_app_dir("bench_corpus"),
+        [name.strip() for name in args.corpora.split(",") if name.strip()],
+        args.scale,
+    )
+    results = run_suite(
+        corpus_paths, args.part_sizes, args.repeat, args.workers, args.memprofile
+    )
+    baseline_path = args.baseline or os.path.join(get_app_dir("benchmarks"), BASELINE_FILENAME)
+    baseline = load_baseline(baseline_path, args.scale)
+    regressions = compare(results, baseline, args.tolerance) if baseline else []
+
+    if args.json:
+        print(json.dumps({"results": results, "regressions": regressions}, indent=2))
+    else:
+        _print_report(results, regressions, has_baseline=baseline is not None)
+
+    if args.update_baseline:
+        save_baseline(baseline_path, results, args.scale)
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
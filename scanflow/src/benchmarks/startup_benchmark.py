@@ -0,0 +1,203 @@
+"""
+Graafisen käyttöliittymän käynnistysajan suorituskykytesti.
+
+Mittaa jokaisella kierroksella uudessa prosessissa, kuinka kauan
+`src.main`-moduulin tuonti kestää, milloin pääikkuna piirtyy ensimmäisen
+kerran ja milloin PDF-palvelu on valmis käytettäväksi. Tulokset verrataan
+annettuihin aikabudjetteihin, ja ylitys palauttaa paluukoodin 1:
+
+    python -m src.benchmarks.startup_benchmark --runs 5 --paint-budget 1.5
+
+Oletuksena käytetään Qt:n `offscreen`-alustaa, joten testi toimii myös
+ilman näyttöä.
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+from src.benchmarks.child_process import run_child
+
+DEFAULT_IMPORT_BUDGET = 0.5
+DEFAULT_PAINT_BUDGET = 1.0
+_TIMEOUT_MS = 30000
+_POLL_INTERVAL_MS = 5
+
+
+def _measure_child() -> Dict[str, object]:
+    start = time.perf_counter()
+    from src import main as app_main # pylint: disable=import-outside-toplevel
+    import_seconds = time.perf_counter() - start
+
+    from PyQt6.QtWidgets import QApplication # pylint: disable=import-outside-toplevel,no-name-in-module
+
+    result: Dict[str, object] = {"import_seconds": import_seconds}
+    app = QApplication(sys.argv[:1])
+    watcher = _install_paint_watcher(app, result, start)
+    window = app_main.start_ui(logging.getLogger(__name__))
+    _run_until_ready(app, window, result, start)
+    window.close()
+    app.removeEventFilter(watcher)
+    return result
+
+
+def _install_paint_watcher(app, result: Dict[str, object], start: float):
+    from PyQt6.QtCore import QEvent, QObject # pylint: disable=import-outside-toplevel,no-name-in-module
+
+    class PaintWatcher(QObject):
+        """Tallentaa ensimmäisen piirtotapahtuman ajankohdan."""
+
+        def eventFilter(self, _watched, event): # pylint: disable=invalid-name
+            if event.type() == QEvent.Type.Paint and "first_paint_seconds" not in result:
+                result["first_paint_seconds"] = time.perf_counter() - start
+                result["fitz_loaded_before_paint"] = "fitz" in sys.modules
+            return False
+
+    watcher = PaintWatcher()
+    app.installEventFilter(watcher)
+    return watcher
+
+
+def _run_until_ready(app, window, result: Dict[str, object], start: float) -> None:
+    from PyQt6.QtCore import QTimer # pylint: disable=import-outside-toplevel,no-name-in-module
+
+    def check_done():
+        if window.pdf_service is not None and "service_ready_seconds" not in result:
+            result["service_ready_seconds"] = time.perf_counter() - start
+        if "first_paint_seconds" in result and "service_ready_seconds" in result:
+            app.quit()
+
+    poller = QTimer()
+    poller.timeout.connect(check_done)
+    poller.start(_POLL_INTERVAL_MS)
+    QTimer.singleShot(_TIMEOUT_MS, app.quit)
+    app.exec()
+    poller.stop()
+
+
+def run_once(platform: str = "offscreen") -> Dict[str, object]:
+    """
+    Suorittaa yhden mittauksen erillisessä Python-prosessissa.
+
+    Args:
+        platform: Käytettävä Qt-alusta (QT_QPA_PLATFORM).
+
+    Returns:
+        Sanakirja avaimilla 'import_seconds', 'first_paint_seconds',
+        'service_ready_seconds' ja 'fitz_loaded_before_paint'.
+
+    Raises:
+        RuntimeError: Jos mittausprosessi epäonnistuu.
+    """
+    return run_child(
+        "src.benchmarks.startup_benchmark", env=dict(os.environ, QT_QPA_PLATFORM=platform)
+    )
+
+
+def summarize(samples: List[Dict[str, object]]) -> Dict[str, Optional[float]]:
+    """
+    Laskee mittauskierrosten mediaanit.
+
+    Args:
+        samples: `run_once`-funktion palauttamat tulokset.
+
+    Returns:
+        Mediaani jokaiselle aikamittarille, tai None, jos mittari puuttuu
+        kaikista kierroksista.
+    """
+    summary: Dict[str, Optional[float]] = {}
+    for key in ("import_seconds", "first_paint_seconds", "service_ready_seconds"):
+        values = [sample[key] for sample in samples if key in sample]
+        summary[key] = statistics.median(values) if values else None
+    return summary
+
+
+def check_budget(
+    summary: Dict[str, Optional[float]], import_budget: float, paint_budget: float
+) -> List[str]:
+    """
+    Vertaa mediaaneja aikabudjetteihin.
+
+    Args:
+        summary: `summarize`-funktion palauttamat mediaanit.
+        import_budget: Moduulin tuonnin enimmäisaika sekunteina.
+        paint_budget: Ensimmäisen piirron enimmäisaika sekunteina.
+
+    Returns:
+        Lista ylityksiä kuvaavia viestejä. Tyhjä lista, jos budjetit pitävät.
+    """
+    failures = []
+    for key, budget in (
+        ("import_seconds", import_budget),
+        ("first_paint_seconds", paint_budget),
+    ):
+        value = summary.get(key)
+        if value is None:
+            failures.append(f"{key}: mittaus puuttuu")
+        elif value > budget:
+            failures.append(f"{key}: {value:.3f} s ylittää budjetin {budget:.3f} s")
+    return failures
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Mittaa sovelluksen käynnistysajan.")
+    parser.add_argument("--runs", type=int, default=5, help="mittauskierrosten määrä")
+    parser.add_argument("--import-budget", type=float, default=DEFAULT_IMPORT_BUDGET)
+    parser.add_argument("--paint-budget", type=float, default=DEFAULT_PAINT_BUDGET)
+    parser.add_argument("--platform", default="offscreen", help="Qt-alusta")
+    parser.add_argument("--json", action="store_true", help="tulosta tulokset JSON-muodossa")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser
+
+
+def _print_report(
+    summary: Dict[str, Optional[float]],
+    samples: List[Dict[str, object]],
+    failures: List[str],
+) -> None:
+    for key, value in summary.items():
+        print(f"{key}: {'-' if value is None else f'{value:.3f} s'}")
+    if any(sample.get("fitz_loaded_before_paint") for sample in samples):
+        print("Huom: PyMuPDF ladattiin ennen ensimmäistä piirtoa.")
+    for failure in failures:
+        print(f"BUDJETTI YLITETTY: {failure}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Suorittaa käynnistysajan suorituskykytestin.
+
+    Args:
+        argv: Komentoriviargumentit. Oletuksena `sys.argv[1:]`.
+
+    Returns:
+        Paluukoodi: 0, jos budjetit pitävät, muuten 1.
+    """
+    args = _build_parser().parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_measure_child()))
+        return 0
+
+    samples = [run_once(args.platform) for _ in range(max(1, args.runs))]
+    summary = summarize(samples)
+    failures = check_budget(summary, args.import_budget, args.paint_budget)
+
+    if args.json:
+        print(json.dumps({
+            "summary": summary,
+            "samples": samples,
+            "failures": failures,
+        }, indent=2))
+    else:
+        _print_report(summary, samples, failures)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,657 @@
+"""
+Scanflow-sovelluksen komentorivikäyttöliittymä.
+
+Tarjoaa PDF-tiedostojen tietojen haun ja jakamisen ilman graafista
+käyttöliittymää. Moduuli ei tuo PyQt-kirjastoa, joten sitä voidaan käyttää
+palvelimilla ilman näyttöä:
+
+    scanflow info tiedosto.pdf
+    scanflow split fixed tiedosto.pdf --pages 2 --output osat/
+    scanflow split custom tiedosto.pdf --ranges 1-3,5,8-10 --output osat/
+    scanflow split size tiedosto.pdf --max-size 10M --output osat/
+    scanflow split separators skannaus.pdf --output osat/
+    scanflow split outline kirja.pdf --level 2 --output osat/
+    scanflow split pattern laskut.pdf --pattern "Lasku nro \\d+" --output osat/
+    scanflow split similarity skannaus.pdf --sensitivity 0.7 --output osat/
+    scanflow split fixed skannaus.pdf --pages 2 --drop-blank --output osat/
+    scanflow batch skannaukset/ --pages 1 --output osat/ --jobs 4
+
+Valitsin `--json` tulostaa tulokset koneluettavassa muodossa.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.repositories.page_stats_cache import PageStatsCache
+from src.repositories.part_cache import PartCache
+from src.repositories.pdf_info_cache import PDFInfoCache
+from src.repositories.pdf_repository import PDFRepository
+from src.services.page_similarity import DEFAULT_SENSITIVITY
+from src.services.page_text_extractor import TEXT_CACHE_MAX_ENTRIES, TEXT_CACHE_TABLE
+from src.services.pdf_splitter_service import PDFSplitterService
+from src.services.split_observers import (
+    CompositeObserver,
+    HistogramObserver,
+    JsonLinesObserver,
+    PrometheusTextfileObserver,
+    SplitObserver,
+)
+from src.services.split_options import DEFAULT_BLANK_THRESHOLD, SplitOptions
+from src.utils import tracing
+from src.utils.job_profiler import JobProfiler
+from src.utils.memory_profiler import MemoryProfiler, ProfilingRepository, format_report
+
+
+def parse_ranges(value: str) -> List[Tuple[int, int]]:
+    """
+    Muuntaa sivualuemerkkijonon (esim. "1-3,5,8-10") listaksi tupleja.
+
+    Args:
+        value: Pilkuin eroteltu lista sivuja tai sivualueita (1-pohjaisia).
+
+    Returns:
+        Lista (aloitussivu, lopetussivu) -tupleja.
+
+    Raises:
+        argparse.ArgumentTypeError: Jos merkkijono on virheellinen.
+    """
+    ranges = []
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        try:
+            ranges.append((int(start), int(end or start)))
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f"Virheellinen sivualue: '{part}'"
+            ) from None
+    if not ranges:
+        raise argparse.ArgumentTypeError("Vähintään yksi sivualue on määritettävä.")
+    return ranges
+
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+def parse_size(value: str) -> int:
+    """
+    Muuntaa kokomerkkijonon (esim. "10M", "500k" tai "2048") tavuiksi.
+
+    Args:
+        value: Kokonaisluku tai desimaaliluku, jota seuraa valinnainen
+               yksikkö K, M tai G (1024-kantainen, kirjainkoolla ei väliä).
+
+    Returns:
+        Koko tavuina.
+
+    Raises:
+        argparse.ArgumentTypeError: Jos merkkijono on virheellinen tai koko
+                                    on alle yhden tavun.
+    """
+    text = value.strip().upper().removesuffix("B")
+    unit = text[-1:] if text[-1:] in _SIZE_UNITS else ""
+    try:
+        size = int(float(text[:len(text) - len(unit)]) * _SIZE_UNITS[unit])
+    except (ValueError, OverflowError):
+        raise argparse.ArgumentTypeError(f"Virheellinen koko: '{value}'") from None
+    if size < 1:
+        raise argparse.ArgumentTypeError("Koon tulee olla vähintään 1 tavu.")
+    return size
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ei kokonaisluku: '{value}'") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError("Arvon tulee olla vähintään 1.")
+    return number
+
+
+def _non_negative_float(value: str) -> float:
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ei luku: '{value}'") from None
+    if math.isnan(number) or number < 0:
+        raise argparse.ArgumentTypeError("Arvon tulee olla vähintään 0.")
+    return number
+
+
+def _unit_interval_float(value: str) -> float:
+    number = _non_negative_float(value)
+    if number > 1:
+        raise argparse.ArgumentTypeError("Arvon tulee olla välillä 0-1.")
+    return number
+
+
+def _create_service(
+    use_cache: bool,
+    use_part_cache: bool = False,
+    profiler: Optional[MemoryProfiler] = None,
+    observer: Optional[SplitObserver] = None,
+) -> PDFSplitterService:
+    return PDFSplitterService(
+        ProfilingRepository(PDFRepository(), profiler) if profiler is not None else None,
+        info_cache=PDFInfoCache() if use_cache else None,
+        part_cache=PartCache() if use_part_cache else None,
+        observer=observer,
+        page_stats_cache=PageStatsCache() if use_part_cache else None,
+        page_text_cache=(
+            PageStatsCache(max_entries=TEXT_CACHE_MAX_ENTRIES, table=TEXT_CACHE_TABLE)
+            if use_part_cache else None
+        ),
+    )
+
+
+def _create_observers(
+    observe: Sequence[str],
+) -> Tuple[Optional[SplitObserver], Optional[HistogramObserver]]:
+    """
+    Luo `--observe`-valinnan mukaiset tarkkailijat yhdelle jaolle.
+
+    Prometheus-tiedosto kirjoitetaan vasta pääprosessissa kaikkien jakojen
+    jälkeen, joten jaon aikana mittaukset kootaan histogrammitarkkailijaan.
+
+    Args:
+        observe: Valitut tarkkailijat ("histogram", "jsonl", "prometheus").
+
+    Returns:
+        (palvelulle annettava tarkkailija, histogrammitarkkailija) -tuple.
+        Kumpikin voi olla None.
+    """
+    histogram = HistogramObserver() if {"histogram", "prometheus"} & set(observe) else None
+    observers: List[SplitObserver] = [histogram] if histogram is not None else []
+    if "jsonl" in observe:
+        observers.append(JsonLinesObserver())
+    if len(observers) > 1:
+        return CompositeObserver(observers), histogram
+    return (observers[0] if observers else None), histogram
+
+
+class _SplitCall:
+    """
+    Jakotavan palvelukutsu, joka voidaan välittää työprosessille.
+
+    Attributes:
+        method (str): `PDFSplitterService`-luokan jakometodin nimi.
+        args (Tuple[Any, ...]): Jakotavan omat argumentit tiedostopolun jälkeen.
+        kwargs (Dict[str, Any]): Jakotavan omat nimetyt argumentit.
+    """
+
+    __slots__ = ("method", "args", "kwargs")
+
+    def __init__(self, method: str, *args: Any, **kwargs: Any):
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+
+    def __call__(
+        self,
+        service: PDFSplitterService,
+        file_path: str,
+        output_dir: str,
+        options: SplitOptions,
+    ) -> List[str]:
+        split = getattr(service, self.method)
+        return split(file_path, *self.args, output_dir=output_dir, options=options, **self.kwargs)
+
+
+@dataclass(frozen=True)
+class _RunOptions:
+    """
+    Yhden tiedoston jaon asetukset, jotka ovat samat kaikille jakotavoille.
+
+    Attributes:
+        output_dir: Tallennuskansio.
+        split: Palvelulle annettavat jaon asetukset.
+        cache: Käytetäänkö pysyviä osa-, sivu- ja tekstivälimuisteja.
+        memprofile: Raportoidaanko muistinkäyttö.
+        observe: Valitut tarkkailijat.
+        trace: Aikajanan tallennuspolku tai None.
+        profile: Profiloidaanko jako cProfile-työkalulla.
+    """
+
+    output_dir: str
+    split: SplitOptions
+    cache: bool = False
+    memprofile: bool = False
+    observe: Tuple[str, ...] = ()
+    trace: Optional[str] = None
+    profile: bool = False
+
+
+def _run_options(args: argparse.Namespace, output_dir: str) -> _RunOptions:
+    return _RunOptions(
+        output_dir=output_dir,
+        split=SplitOptions(
+            workers=1 if args.memprofile or args.profile else args.workers,
+            resume=args.resume,
+            drop_blank_pages=args.drop_blank,
+            blank_threshold=args.blank_threshold,
+        ),
+        cache=args.cache,
+        memprofile=args.memprofile,
+        observe=tuple(args.observe),
+        trace=args.trace,
+        profile=args.profile,
+    )
+
+
+def _split_file(
+    file_path: str, split_call: _SplitCall, options: _RunOptions
+) -> Dict[str, Any]:
+    """
+    Jakaa yhden tiedoston. Moduulitason funktio, jotta erät voidaan jakaa rinnakkain.
+
+    Args:
+        file_path: Jaettava PDF-tiedosto.
+        split_call: Jakotavan palvelukutsu.
+        options: Jaon asetukset.
+
+    Returns:
+        Jaon tulos tulostettavassa muodossa.
+    """
+    dropped_pages: List[int] = []
+    split_options = replace(options.split, dropped_pages_callback=dropped_pages.extend)
+    profiler = MemoryProfiler() if options.memprofile else None
+    job_profiler = JobProfiler(os.path.basename(file_path)) if options.profile else None
+    observer, histogram = _create_observers(options.observe)
+    service = _create_service(False, options.cache, profiler, observer)
+
+    def operation() -> Dict[str, Any]:
+        with ExitStack() as stack:
+            for context in (profiler, job_profiler):
+                if context is not None:
+                    stack.enter_context(context)
+            output_files = split_call(service, file_path, options.output_dir, split_options)
+        result: Dict[str, Any] = {"output_files": output_files}
+        if split_options.drop_blank_pages:
+            result["dropped_pages"] = dropped_pages
+        if service.part_cache is not None:
+            result["part_cache"] = service.part_cache.get_stats()
+        return {**result, **_profile_results(profiler, job_profiler)}
+
+    result = _run_traced(operation, file_path, options.trace)
+    if histogram is not None:
+        result["split_metrics"] = histogram.summary()
+    return result
+
+
+def _profile_results(
+    profiler: Optional[MemoryProfiler], job_profiler: Optional[JobProfiler]
+) -> Dict[str, Any]:
+    result: Dict[str, Any] = {}
+    if job_profiler is not None:
+        result["profile"] = job_profiler.pstats_path
+    if profiler is not None:
+        result["memory_profile"] = profiler.report()
+    return result
+
+
+def _run_traced(
+    operation: Callable[[], Dict[str, Any]], file_path: str, trace_path: Optional[str]
+) -> Dict[str, Any]:
+    if trace_path is None:
+        return _run_safely(operation, file_path)
+    tracer = tracing.enable()
+    try:
+        result = _run_safely(operation, file_path)
+    finally:
+        tracing.disable()
+    result["trace_file"] = tracer.write(trace_path)
+    return result
+
+
+def _run_safely(operation: Callable[[], Dict[str, Any]], file_path: str) -> Dict[str, Any]:
+    try:
+        return {"file_path": file_path, "ok": True, **operation()}
+    except (FileNotFoundError, ValueError, IOError, RuntimeError) as error:
+        return {"file_path": file_path, "ok": False, "error": str(error)}
+
+
+def _info_file(file_path: str, use_cache: bool = False) -> Dict[str, Any]:
+    service = _create_service(use_cache)
+    return _run_safely(
+        lambda: {
+            **service.get_pdf_info(file_path),
+            "size_bytes": os.path.getsize(file_path),
+        },
+        file_path,
+    )
+
+
+def _map_files(
+    function: Callable[..., Dict[str, Any]],
+    file_paths: Sequence[str],
+    jobs: int,
+    *args: Any,
+) -> List[Dict[str, Any]]:
+    """
+    Suorittaa funktion jokaiselle tiedostolle, tarvittaessa rinnakkain.
+
+    Args:
+        function: Moduulitason funktio, jonka ensimmäinen argumentti on tiedostopolku.
+        file_paths: Käsiteltävät tiedostot.
+        jobs: Samanaikaisten prosessien määrä.
+        *args: Funktiolle välitettävät lisäargumentit.
+
+    Returns:
+        Tulokset tiedostojen järjestyksessä.
+    """
+    if jobs <= 1 or len(file_paths) <= 1:
+        return [function(file_path, *args) for file_path in file_paths]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(file_paths))) as executor:
+        futures = [executor.submit(function, file_path, *args) for file_path in file_paths]
+        return [future.result() for future in futures]
+
+
+def _find_pdfs(directory: str, recursive: bool) -> List[str]:
+    if not os.path.isdir(directory):
+        raise IOError(f"Hakemistoa ei löydy: {directory}")
+    if recursive:
+        found = [
+            os.path.join(root, name)
+            for root, _dirs, names in os.walk(directory)
+            for name in names
+        ]
+    else:
+        found = [os.path.join(directory, name) for name in os.listdir(directory)]
+    return sorted(path for path in found if path.lower().endswith(".pdf"))
+
+
+def _write_prometheus(results: List[Dict[str, Any]]) -> None:
+    """
+    Kokoaa kaikkien jakojen mittaukset Prometheus-tekstitiedostoon.
+
+    Jaot voivat ajautua eri prosesseissa, joten tiedosto kirjoitetaan
+    kerran pääprosessissa tulosten yhteenvedoista.
+
+    Args:
+        results: Jakojen tulokset.
+    """
+    observer = PrometheusTextfileObserver()
+    for result in results:
+        if "split_metrics" in result:
+            observer.merge(result["split_metrics"])
+    observer.write()
+
+
+def _print_results(results: List[Dict[str, Any]], as_json: bool) -> None:
+    if as_json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    for result in results:
+        if not result["ok"]:
+            print(f"{result['file_path']}: VIRHE: {result['error']}", file=sys.stderr)
+        elif "output_files" in result:
+            print(f"{result['file_path']}: {len(result['output_files'])} osaa")
+            for line in [*result["output_files"], *_split_details(result)]:
+                print(f"  {line}")
+        else:
+            print(
+                f"{result['file_path']}: {result['page_count']} sivua, "
+                f"{result['size_bytes']} tavua"
+            )
+
+
+def _split_details(result: Dict[str, Any]) -> List[str]:
+    lines = []
+    if "dropped_pages" in result:
+        dropped = ", ".join(str(page) for page in result["dropped_pages"]) or "ei"
+        lines.append(f"poistetut tyhjät sivut: {dropped}")
+    if "part_cache" in result:
+        stats = result["part_cache"]
+        lines.append(
+            f"välimuisti: {stats['hits']} osumaa, {stats['misses']} hutia "
+            f"({stats['hit_rate']:.0%})"
+        )
+    if "memory_profile" in result:
+        lines.extend(format_report(result["memory_profile"]).splitlines())
+    if "split_metrics" in result:
+        summary = HistogramObserver()
+        summary.merge(result["split_metrics"])
+        lines.extend(summary.format_summary().splitlines())
+    if "trace_file" in result:
+        lines.append(f"aikajana: {result['trace_file']}")
+    if "profile" in result:
+        lines.append(f"profiili: {result['profile']}")
+    return lines
+
+
+def _command_info(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    return _map_files(_info_file, args.files, args.jobs, args.cache)
+
+
+def _command_split(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    return [_split_file(args.file, args.split_call(args), _run_options(args, args.output))]
+
+
+def _command_batch(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    file_paths = _find_pdfs(args.directory, args.recursive)
+    output_dir = args.output or args.directory
+    os.makedirs(output_dir, exist_ok=True)
+    return _map_files(
+        _split_file,
+        file_paths,
+        args.jobs,
+        _SplitCall("split_by_fixed_range", args.pages),
+        _run_options(args, output_dir),
+    )
+
+
+_PAGES_ARGUMENT = (
+    "--pages", {"type": _positive_int, "required": True, "help": "sivuja per tiedosto"}
+)
+
+# Jakotavat: (nimi, ohje, jakotavan omat valitsimet, palvelukutsun muodostin).
+_SPLIT_MODES: Tuple[
+    Tuple[str, str, Tuple[Tuple[str, Dict[str, Any]], ...],
+          Callable[[argparse.Namespace], _SplitCall]],
+    ...
+] = (
+    (
+        "fixed", "jaa kiinteän sivumäärän osiin",
+        (_PAGES_ARGUMENT,),
+        lambda args: _SplitCall("split_by_fixed_range", args.pages),
+    ),
+    (
+        "custom", "jaa sivualueiden mukaan",
+        (("--ranges", {
+            "type": parse_ranges, "required": True, "help": "sivualueet, esim. 1-3,5,8-10",
+        }),),
+        lambda args: _SplitCall("split_by_custom_ranges", args.ranges),
+    ),
+    (
+        "size", "jaa osiin, joiden tiedostokoko on enintään annettu raja",
+        (("--max-size", {
+            "type": parse_size, "required": True,
+            "help": "osan enimmäiskoko, esim. 10M tai 500K",
+        }),),
+        lambda args: _SplitCall("split_by_max_size", args.max_size),
+    ),
+    (
+        "separators", "jaa skannauserä asiakirjoiksi erotinsivujen kohdalta",
+        (("--patch-only", {
+            "action": "store_true",
+            "help": "jaa vain patch code -erotinarkkien kohdalta, ei tyhjien sivujen",
+        }),),
+        lambda args: _SplitCall(
+            "split_by_separator_pages", blank_is_separator=not args.patch_only
+        ),
+    ),
+    (
+        "outline", "jaa kirjanmerkkien (sisällysluettelon) kohdalta",
+        (("--level", {
+            "type": _positive_int, "default": 1,
+            "help": "syvin kirjanmerkkien taso, joka aloittaa uuden osan (oletus 1)",
+        }),),
+        lambda args: _SplitCall("split_by_outline", level=args.level),
+    ),
+    (
+        "pattern", "jaa sivuilta, joiden teksti vastaa hakulauseketta",
+        (
+            ("--pattern", {
+                "required": True,
+                "help": 'säännöllinen lauseke, jonka sisältävä sivu aloittaa osan, '
+                        'esim. "Lasku nro"',
+            }),
+            ("--ignore-case", {"action": "store_true", "help": "älä huomioi kirjainkokoa"}),
+        ),
+        lambda args: _SplitCall(
+            "split_by_text_pattern", args.pattern, ignore_case=args.ignore_case
+        ),
+    ),
+    (
+        "similarity", "jaa asiakirjoiksi sivujen ulkoasun muutosten kohdalta",
+        (("--sensitivity", {
+            "type": _unit_interval_float, "default": DEFAULT_SENSITIVITY,
+            "help": f"herkkyys välillä 0-1, suurempi arvo tuottaa enemmän osia "
+                    f"(oletus {DEFAULT_SENSITIVITY})",
+        }),),
+        lambda args: _SplitCall("split_by_similarity", sensitivity=args.sensitivity),
+    ),
+)
+
+# Valitsimet, jotka ovat yhteiset kaikille jakotavoille ja eräjaolle.
+_SPLIT_OPTIONS: Tuple[Tuple[str, Dict[str, Any]], ...] = (
+    ("--resume", {
+        "action": "store_true",
+        "help": "jatka keskeytynyttä jakoa tulostuskansion jakolokin perusteella",
+    }),
+    ("--cache", {
+        "action": "store_true",
+        "help": "käytä pysyviä osa-, sivu- ja tekstivälimuisteja toistuvissa jaoissa",
+    }),
+    ("--memprofile", {
+        "action": "store_true",
+        "help": "raportoi muistinkäyttö vaiheittain ja osittain (jako ajetaan sarjassa)",
+    }),
+    ("--observe", {
+        "action": "append", "choices": ("histogram", "jsonl", "prometheus"), "default": [],
+        "help": "kerää vaiheiden kestot: histogram (yhteenveto), jsonl "
+                "(~/.scanflow/split_events.jsonl) tai prometheus "
+                "(~/.scanflow/metrics/scanflow.prom); voidaan antaa useasti",
+    }),
+    ("--profile", {
+        "action": "store_true",
+        "help": "profiloi jako cProfile-työkalulla ja tallenna profiili hakemistoon "
+                "~/.scanflow/profiles (jako ajetaan sarjassa)",
+    }),
+    ("--drop-blank", {
+        "action": "store_true",
+        "help": "jätä tyhjät sivut, kuten kaksipuolisen skannauksen kääntöpuolet, pois",
+    }),
+    ("--blank-threshold", {
+        "type": _non_negative_float, "default": DEFAULT_BLANK_THRESHOLD,
+        "help": f"musteen peiton yläraja tyhjälle sivulle (oletus {DEFAULT_BLANK_THRESHOLD})",
+    }),
+)
+
+# Valitsimet, jotka ovat vain yksittäisen tiedoston jakotavoilla.
+_SPLIT_MODE_OPTIONS: Tuple[Tuple[str, Dict[str, Any]], ...] = (
+    ("--output", {"required": True, "help": "tallennuskansio"}),
+    ("--workers", {"type": _positive_int, "default": 1, "help": "työprosessien määrä"}),
+    ("--trace", {
+        "metavar": "TIEDOSTO",
+        "help": "tallenna jaon aikajana Chrome/Perfetto-muodossa, esim. trace.json",
+    }),
+)
+
+
+def _add_arguments(
+    parser: argparse.ArgumentParser, arguments: Sequence[Tuple[str, Dict[str, Any]]]
+) -> None:
+    for name, settings in arguments:
+        parser.add_argument(name, **settings)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Rakentaa komentoriviparserin.
+
+    Returns:
+        Määritelty `argparse.ArgumentParser`.
+    """
+    parser = argparse.ArgumentParser(
+        prog="scanflow", description="PDF-tiedostojen jakaminen komentoriviltä."
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="tulosta tulokset JSON-muodossa"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    info_parser = commands.add_parser("info", help="näytä PDF-tiedostojen tiedot")
+    info_parser.add_argument("files", nargs="+", help="PDF-tiedostot")
+    info_parser.add_argument(
+        "--jobs", type=_positive_int, default=1, help="rinnakkaisten prosessien määrä"
+    )
+    info_parser.add_argument(
+        "--cache", action="store_true", help="käytä pysyvää tietovälimuistia"
+    )
+    info_parser.set_defaults(handler=_command_info)
+
+    split_parser = commands.add_parser("split", help="jaa PDF-tiedosto")
+    split_modes = split_parser.add_subparsers(dest="mode", required=True)
+    for name, help_text, arguments, split_call in _SPLIT_MODES:
+        mode_parser = split_modes.add_parser(name, help=help_text)
+        mode_parser.add_argument("file", help="jaettava PDF-tiedosto")
+        _add_arguments(mode_parser, (*arguments, *_SPLIT_MODE_OPTIONS, *_SPLIT_OPTIONS))
+        mode_parser.set_defaults(handler=_command_split, split_call=split_call)
+
+    _add_batch_parser(commands)
+    return parser
+
+
+def _add_batch_parser(commands: Any) -> None:
+    batch_parser = commands.add_parser(
+        "batch", help="jaa kaikki hakemiston PDF-tiedostot kiinteän sivumäärän osiin"
+    )
+    batch_parser.add_argument("directory", help="hakemisto, jonka PDF-tiedostot jaetaan")
+    _add_arguments(batch_parser, (_PAGES_ARGUMENT,))
+    batch_parser.add_argument(
+        "--output", help="tallennuskansio (oletuksena lähdehakemisto)"
+    )
+    batch_parser.add_argument(
+        "--jobs", type=_positive_int, default=1, help="rinnakkain jaettavien tiedostojen määrä"
+    )
+    batch_parser.add_argument(
+        "--recursive", action="store_true", help="käy läpi myös alihakemistot"
+    )
+    _add_arguments(batch_parser, _SPLIT_OPTIONS)
+    batch_parser.set_defaults(handler=_command_batch, workers=1, trace=None)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Komentorivisovelluksen pääfunktio.
+
+    Args:
+        argv: Komentoriviargumentit. Oletuksena `sys.argv[1:]`.
+
+    Returns:
+        Paluukoodi: 0 onnistuessa, 1 jos yksikin tiedosto epäonnistui.
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        results = args.handler(args)
+    except (IOError, ValueError) as error:
+        results = [{"file_path": None, "ok": False, "error": str(error)}]
+    if "prometheus" in getattr(args, "observe", ()):
+        _write_prometheus(results)
+    _print_results(results, args.json)
+    return 0 if all(result["ok"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Moduuli jaon yksittäisen osan tulokselle.
+
+Tämä moduuli sisältää `PartResult`-luokan, joka kuvaa yhden valmiin
+osatiedoston ja sen tuottamiseen kuluneen ajan.
+"""
+
+
+class PartResult:
+    """
+    Kevyt, slotteja käyttävä kuvaus yhdestä tallennetusta osatiedostosta.
+
+    Attributes:
+        output_path (str): Tallennetun osatiedoston polku.
+        start_page (int): Osan ensimmäinen sivu (1-pohjainen).
+        end_page (int): Osan viimeinen sivu (1-pohjainen, sisällytetty).
+        size_bytes (int): Tallennetun tiedoston koko tavuina.
+        extract_seconds (float): Sivujen poimintaan kulunut aika sekunteina.
+        save_seconds (float): Tallennukseen kulunut aika sekunteina.
+    """
+
+    __slots__ = (
+        "output_path",
+        "start_page",
+        "end_page",
+        "size_bytes",
+        "extract_seconds",
+        "save_seconds",
+    )
+
+    def __init__(
+        self,
+        output_path: str,
+        start_page: int,
+        end_page: int,
+        *,
+        size_bytes: int = 0,
+        extract_seconds: float = 0.0,
+        save_seconds: float = 0.0,
+    ):
+        """
+        Alustaa uuden PartResult-olion.
+
+        Args:
+            output_path: Tallennetun osatiedoston polku.
+            start_page: Osan ensimmäinen sivu (1-pohjainen).
+            end_page: Osan viimeinen sivu (1-pohjainen).
+            size_bytes: Tallennetun tiedoston koko tavuina.
+            extract_seconds: Sivujen poimintaan kulunut aika sekunteina.
+            save_seconds: Tallennukseen kulunut aika sekunteina.
+        """
+        self.output_path = output_path
+        self.start_page = start_page
+        self.end_page = end_page
+        self.size_bytes = size_bytes
+        self.extract_seconds = extract_seconds
+        self.save_seconds = save_seconds
+
+    @property
+    def page_count(self) -> int:
+        """Palauttaa osan sivumäärän."""
+        return self.end_page - self.start_page + 1
+
+    def __repr__(self):
+        """
+        Palauttaa merkkijonoesityksen PartResult-oliosta.
+
+        Returns:
+            str: Merkkijonoesitys, joka sisältää polun, sivut ja koon.
+        """
+        return (
+            f"PartResult(output_path='{self.output_path}', "
+            f"pages={self.start_page}-{self.end_page}, size_bytes={self.size_bytes})"
+        )
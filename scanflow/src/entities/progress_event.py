@@ -0,0 +1,121 @@
+"""
+Moduuli jaon edistymistapahtumalle.
+
+Tämä moduuli sisältää `ProgressEvent`-luokan, joka kuvaa jaon edistymisen
+yhdellä ajanhetkellä: valmiit osat ja sivut, kirjoitetut tavut, nopeuden ja
+arvioidun jäljellä olevan ajan.
+"""
+
+from typing import Optional
+
+from .part_result import PartResult
+
+
+class ProgressEvent:
+    """
+    Kevyt, slotteja käyttävä kuvaus jaon edistymisestä.
+
+    Attributes:
+        parts_done (int): Valmiiden osien määrä.
+        total_parts (int): Osien kokonaismäärä.
+        pages_done (int): Valmiiden osien yhteenlaskettu sivumäärä.
+        bytes_written (int): Valmiiden osien yhteenlaskettu koko tavuina.
+        elapsed_seconds (float): Jaon alusta kulunut aika sekunteina.
+        current_part (Optional[PartResult]): Viimeisin valmistunut osa.
+    """
+
+    __slots__ = (
+        "parts_done",
+        "total_parts",
+        "pages_done",
+        "bytes_written",
+        "elapsed_seconds",
+        "current_part",
+    )
+
+    def __init__(
+        self,
+        parts_done: int,
+        total_parts: int,
+        *,
+        pages_done: int = 0,
+        bytes_written: int = 0,
+        elapsed_seconds: float = 0.0,
+        current_part: Optional[PartResult] = None,
+    ):
+        """
+        Alustaa uuden ProgressEvent-olion.
+
+        Args:
+            parts_done: Valmiiden osien määrä.
+            total_parts: Osien kokonaismäärä.
+            pages_done: Valmiiden osien yhteenlaskettu sivumäärä.
+            bytes_written: Valmiiden osien yhteenlaskettu koko tavuina.
+            elapsed_seconds: Jaon alusta kulunut aika sekunteina.
+            current_part: Viimeisin valmistunut osa.
+        """
+        self.parts_done = parts_done
+        self.total_parts = total_parts
+        self.pages_done = pages_done
+        self.bytes_written = bytes_written
+        self.elapsed_seconds = elapsed_seconds
+        self.current_part = current_part
+
+    @property
+    def percent(self) -> int:
+        """Palauttaa valmistumisasteen prosentteina (0–100)."""
+        if self.total_parts <= 0:
+            return 100
+        return int((self.parts_done / self.total_parts) * 100)
+
+    @property
+    def is_final(self) -> bool:
+        """Palauttaa True, jos kaikki osat ovat valmiita."""
+        return self.parts_done >= self.total_parts
+
+    @property
+    def parts_per_second(self) -> float:
+        """Palauttaa keskimääräisen nopeuden osina sekunnissa."""
+        return self._rate(self.parts_done)
+
+    @property
+    def pages_per_second(self) -> float:
+        """Palauttaa keskimääräisen nopeuden sivuina sekunnissa."""
+        return self._rate(self.pages_done)
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Palauttaa keskimääräisen kirjoitusnopeuden tavuina sekunnissa."""
+        return self._rate(self.bytes_written)
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """
+        Palauttaa arvion jäljellä olevasta ajasta sekunteina.
+
+        Returns:
+            Arvio sekunteina, tai None, jos arviota ei vielä voi laskea.
+        """
+        if self.is_final:
+            return 0.0
+        if self.parts_done == 0:
+            return None
+        remaining_parts = self.total_parts - self.parts_done
+        return self.elapsed_seconds / self.parts_done * remaining_parts
+
+    def _rate(self, amount: float) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return amount / self.elapsed_seconds
+
+    def __repr__(self):
+        """
+        Palauttaa merkkijonoesityksen ProgressEvent-oliosta.
+
+        Returns:
+            str: Merkkijonoesitys, joka sisältää osat ja kirjoitetut tavut.
+        """
+        return (
+            f"ProgressEvent(parts={self.parts_done}/{self.total_parts}, "
+            f"pages_done={self.pages_done}, bytes_written={self.bytes_written})"
+        )
@@ -10,9 +10,8 @@ import logging
 import warnings
 import tempfile
 from PyQt6 import QtWidgets
-from src.ui.app import MainWindow
-from src.services.fallback_pdf_service import FallbackPDFService
-from src.services.pdf_splitter_service import PDFSplitterService
+from src.utils.app_paths import get_app_dir
+from src.utils.async_logging import create_rotating_file_handler, start_queue_logging
 
 warnings.filterwarnings(
     "ignore", category=DeprecationWarning, message=".*SwigPyPacked.*__module__.*"
@@ -24,36 +23,46 @@ warnings.filterwarnings(
     "ignore", category=DeprecationWarning, message=".*swigvarlink.*__module__.*"
 )
 
-def get_pdf_service(logger):
+def get_pdf_service(logger, use_cache=False):
+    """
+    Luo PDF-palvelun.
+
+    PyMuPDF tuodaan vasta tässä, jotta sen latausaika ei viivästytä ikkunan
+    ensimmäistä piirtoa. Jos kirjasto puuttuu, käytetään fallback-palvelua.
+    Osavälimuisti ja sivujen tunnuslukujen välimuisti otetaan käyttöön vain
+    pyydettäessä (`--cache`), koska osavälimuisti laskee jokaisesta
+    lähteestä tiivisteen ja kasvattaa `~/.scanflow`-hakemistoa.
+    """
     try:
-        PDFSplitterService()
-        logger.info("Käytetään varsinaista PDF-palvelua")
-        return PDFSplitterService()
+        from src.services.pdf_splitter_service import PDFSplitterService # pylint: disable=import-outside-toplevel
+        from src.repositories.pdf_repository import PDFRepository # pylint: disable=import-outside-toplevel
+        from src.repositories.document_cache import DocumentCache # pylint: disable=import-outside-toplevel
+        from src.repositories.pdf_info_cache import PDFInfoCache # pylint: disable=import-outside-toplevel
+        from src.repositories.part_cache import PartCache # pylint: disable=import-outside-toplevel
+        from src.repositories.page_stats_cache import PageStatsCache # pylint: disable=import-outside-toplevel
     except ImportError:
+        from src.services.fallback_pdf_service import FallbackPDFService # pylint: disable=import-outside-toplevel
         logger.info("Käytetään fallback-palvelua, koska varsinainen palvelu ei ole saatavilla")
         return FallbackPDFService()
+    logger.info("Käytetään varsinaista PDF-palvelua")
+    return PDFSplitterService(
+        PDFRepository(document_cache=DocumentCache()),
+        info_cache=PDFInfoCache(),
+        part_cache=PartCache() if use_cache else None,
+        page_stats_cache=PageStatsCache() if use_cache else None,
+    )
 
 def get_log_file_path():
     """Palauttaa lokitiedoston polun huomioiden ympäristön (kehitys vs. paketoitu)"""
     try:
-        user_home = os.path.expanduser("~")
-        app_dir = os.path.join(user_home, ".scanflow")
-        if not os.path.exists(app_dir):
-            os.makedirs(app_dir)
-        return os.path.join(app_dir, "scanflow.log")
+        return os.path.join(get_app_dir(), "scanflow.log")
     except (IOError, PermissionError):
         temp_dir = tempfile.gettempdir()
         return os.path.join(temp_dir, "scanflow.log")
 
 def create_file_handler(log_file):
-    """Luo tiedostoon kirjoittavan lokikäsittelijän"""
-    file_handler = logging.FileHandler(log_file, encoding="utf-8")
-    file_handler.setLevel(logging.DEBUG)
-    file_format = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-    file_handler.setFormatter(file_format)
-    return file_handler
+    """Luo kokorajoitettuun tiedostoon JSON-riveinä kirjoittavan lokikäsittelijän"""
+    return create_rotating_file_handler(log_file)
 
 def create_console_handler():
     """Luo konsoliin kirjoittavan lokikäsittelijän"""
@@ -64,16 +73,17 @@ def create_console_handler():
     return console_handler
 
 def setup_file_logger():
-    """Alustaa tiedostoon kirjoittavan lokittajan"""
+    """
+    Alustaa tiedostoon kirjoittavan lokittajan.
+
+    Lokikutsut lisäävät tietueet jonoon, ja taustasäie kirjoittaa ne
+    tiedostoon, joten hidas levy ei hidasta jakoa suorittavaa säiettä.
+    """
     log_file = get_log_file_path()
     try:
         handler = create_file_handler(log_file)
-        root_logger = logging.getLogger()
-        root_logger.setLevel(logging.DEBUG)
-        if root_logger.hasHandlers():
-            root_logger.handlers.clear()
-        root_logger.addHandler(handler)
-        return root_logger
+        start_queue_logging(handler)
+        return logging.getLogger()
     except (IOError, PermissionError) as e:
         print(f"Varoitus: Lokitiedoston luonti epäonnistui: {str(e)}")
         handler = create_console_handler()
@@ -129,8 +139,9 @@ def start_ui(logger):
     """Käynnistää käyttöliittymän ja asettaa virheenkäsittelijät"""
     sys.excepthook = except_hook_factory(logger)
     try:
-        pdf_service = get_pdf_service(logger)
-        window = MainWindow(pdf_service)
+        from src.ui.app import MainWindow # pylint: disable=import-outside-toplevel
+        use_cache = "--cache" in sys.argv[1:]
+        window = MainWindow(pdf_service_factory=lambda: get_pdf_service(logger, use_cache))
         window.show()
         return window
     except (RuntimeError, ImportError) as e:
@@ -0,0 +1,180 @@
+"""
+Moduuli avattujen PDF-dokumenttien välimuistille.
+
+Tarjoaa `DocumentCache`-luokan, joka pitää jo jäsennetyt PDF-dokumentit
+avoinna, jotta saman tiedoston peräkkäiset käsittelyt (tiedot, suunnittelu,
+jako) eivät jäsennä tiedostoa joka kerta uudelleen.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+class _CacheEntry:
+    """Yksi välimuistissa oleva dokumentti ja sen käyttötila."""
+
+    __slots__ = ("document", "signature", "size_bytes", "lock", "refcount", "evicted")
+
+    def __init__(self, document: Any, signature: Tuple[int, int], size_bytes: int):
+        self.document = document
+        self.signature = signature
+        self.size_bytes = size_bytes
+        self.lock = threading.RLock()
+        self.refcount = 0
+        self.evicted = False
+
+
+class DocumentCache:
+    """
+    LRU-välimuisti avatuille PDF-dokumenteille.
+
+    Avaimena on tiedoston absoluuttinen polku, ja merkintä on voimassa vain
+    niin kauan kuin tiedoston muokkausaika ja koko pysyvät samoina.
+    Muistibudjettina käytetään tiedostojen yhteenlaskettua kokoa, joka on
+    yläraja-arvio jäsennetyn dokumentin muistinkäytölle.
+
+    Sama dokumentti voidaan lainata useaan säikeeseen, mutta kerrallaan vain
+    yksi säie pitää lainaa, koska PyMuPDF-dokumentit eivät ole säieturvallisia.
+    Välimuistista poistettu dokumentti suljetaan vasta, kun viimeinen laina
+    on palautettu.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Alustaa dokumenttivälimuistin.
+
+        Args:
+            max_bytes: Välimuistissa pidettävien tiedostojen yhteenlaskettu
+                       enimmäiskoko tavuina.
+
+        Raises:
+            ValueError: Jos max_bytes on negatiivinen.
+        """
+        if max_bytes < 0:
+            raise ValueError("Välimuistin koko ei voi olla negatiivinen.")
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._leases: Dict[int, _CacheEntry] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        """Palauttaa välimuistissa olevien tiedostojen yhteenlasketun koon."""
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def acquire(self, file_path: str, opener: Callable[[str], Any]) -> Any:
+        """
+        Lainaa dokumentin välimuistista tai avaa sen annetulla funktiolla.
+
+        Kutsu odottaa, kunnes mikään muu säie ei pidä samaa dokumenttia
+        lainassa. Laina on palautettava `release`-metodilla.
+
+        Args:
+            file_path: Avattavan PDF-tiedoston polku.
+            opener: Funktio, joka avaa dokumentin, jos sitä ei löydy välimuistista.
+
+        Returns:
+            Avattu dokumentti.
+        """
+        key = os.path.abspath(file_path)
+        stat_result = os.stat(file_path)
+        signature = (stat_result.st_mtime_ns, stat_result.st_size)
+
+        entry = self._reserve(key, signature)
+        if entry is None:
+            document = opener(file_path)
+            entry = self._insert(key, _CacheEntry(document, signature, stat_result.st_size))
+
+        entry.lock.acquire()
+        return entry.document
+
+    def release(self, document: Any) -> bool:
+        """
+        Palauttaa lainatun dokumentin välimuistiin.
+
+        Args:
+            document: Aiemmin `acquire`-metodilla lainattu dokumentti.
+
+        Returns:
+            True, jos dokumentti kuului välimuistiin, muuten False.
+        """
+        with self._lock:
+            entry = self._leases.get(id(document))
+            if entry is None or entry.document is not document:
+                return False
+            entry.refcount -= 1
+            entry.lock.release()
+            if entry.refcount == 0 and entry.evicted:
+                del self._leases[id(document)]
+                self._close(entry)
+        return True
+
+    def invalidate(self, file_path: str) -> None:
+        """
+        Poistaa tiedoston dokumentin välimuistista.
+
+        Args:
+            file_path: Poistettavan tiedoston polku.
+        """
+        with self._lock:
+            entry = self._entries.get(os.path.abspath(file_path))
+            if entry is not None:
+                self._evict(os.path.abspath(file_path), entry)
+
+    def clear(self) -> None:
+        """Poistaa kaikki dokumentit välimuistista."""
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                self._evict(key, entry)
+
+    def _reserve(self, key: str, signature: Tuple[int, int]) -> Optional[_CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.signature != signature or entry.document.is_closed:
+                self._evict(key, entry)
+                return None
+            self._entries.move_to_end(key)
+            entry.refcount += 1
+            return entry
+
+    def _insert(self, key: str, entry: _CacheEntry) -> _CacheEntry:
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None and existing.signature == entry.signature:
+                self._close(entry)
+                existing.refcount += 1
+                self._entries.move_to_end(key)
+                return existing
+            if existing is not None:
+                self._evict(key, existing)
+
+            entry.refcount += 1
+            self._entries[key] = entry
+            self._leases[id(entry.document)] = entry
+            self._total_bytes += entry.size_bytes
+            while self._total_bytes > self.max_bytes and self._entries:
+                oldest_key, oldest_entry = next(iter(self._entries.items()))
+                self._evict(oldest_key, oldest_entry)
+            return entry
+
+    def _evict(self, key: str, entry: _CacheEntry) -> None:
+        del self._entries[key]
+        self._total_bytes -= entry.size_bytes
+        entry.evicted = True
+        if entry.refcount == 0:
+            self._leases.pop(id(entry.document), None)
+            self._close(entry)
+
+    def _close(self, entry: _CacheEntry) -> None:
+        if not entry.document.is_closed:
+            entry.document.close()
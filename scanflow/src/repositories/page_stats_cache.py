@@ -0,0 +1,157 @@
+"""
+Moduuli lähdetiedostojen sivukohtaisten tietojen pysyvälle välimuistille.
+
+Tarjoaa `PageStatsCache`-luokan, joka tallentaa lähdetiedoston sivujen
+tiedot (esim. musteen peitto tai sivujen tekstit) pakattuna JSON-arvona
+SQLite-tietokantaan `~/.scanflow`-hakemistoon. Avain muodostetaan
+lähdetiedoston sisällön tiivisteestä ja mittauksen asetuksista, joten saman
+skannauksen uudelleen jakaminen ei vaadi sivujen renderöintiä tai tekstin
+poimintaa. Välimuistiin tallennetaan tunnusluvut eikä luokittelua, joten
+esimerkiksi tyhjän sivun rajaa voi säätää ilman uutta renderöintiä. Eri
+tiedot voidaan pitää omissa tauluissaan ja tiedostoissaan.
+"""
+
+import hashlib
+import json
+import os
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+from ..utils.app_paths import get_app_dir
+from .sqlite_cache import SQLiteCache
+
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_TABLE = "page_stats"
+KEY_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    key TEXT PRIMARY KEY,
+    payload BLOB NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+
+
+class PageStatsCache(SQLiteCache):
+    """
+    SQLite-pohjainen välimuisti lähdetiedostojen sivukohtaisille tiedoille.
+
+    Välimuistin koko on rajattu merkintöjen määrällä, ja vanhimmat
+    käyttämättömät merkinnät poistetaan ensin.
+
+    Attributes:
+        hits (int): Välimuistiosumien määrä tämän instanssin elinaikana.
+        misses (int): Hutien määrä tämän instanssin elinaikana.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        table: str = DEFAULT_TABLE,
+    ):
+        """
+        Alustaa välimuistin ja luo tietokannan tarvittaessa.
+
+        Args:
+            db_path: Tietokantatiedoston polku. Oletuksena
+                     `~/.scanflow/<table>_cache.sqlite3`.
+            max_entries: Säilytettävien merkintöjen enimmäismäärä.
+            table: Tietokantataulun nimi. Eri tiedoille käytetään omaa taulua.
+
+        Raises:
+            ValueError: Jos max_entries on alle 1 tai taulun nimi ei ole
+                        kelvollinen tunniste.
+        """
+        if max_entries < 1:
+            raise ValueError("Välimuistin koon tulee olla vähintään 1.")
+        if not table.isidentifier():
+            raise ValueError(f"Virheellinen taulun nimi: '{table}'")
+        super().__init__(
+            db_path or os.path.join(get_app_dir(), f"{table}_cache.sqlite3"),
+            _SCHEMA.format(table=table),
+        )
+        self.max_entries = max_entries
+        self.table = table
+
+    @staticmethod
+    def make_key(source_hash: str, signature: Dict[str, Any]) -> str:
+        """
+        Muodostaa välimuistiavaimen.
+
+        Args:
+            source_hash: Lähdetiedoston sisällön SHA-256-tiiviste.
+            signature: Mittauksen asetukset, jotka vaikuttavat tallennettuihin
+                       tietoihin (esim. pienoiskuvan koko).
+
+        Returns:
+            Heksadesimaalimuotoinen avain.
+        """
+        payload = json.dumps([KEY_VERSION, source_hash, signature], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Hakee sivujen tiedot välimuistista.
+
+        Args:
+            key: `make_key`-metodilla muodostettu avain.
+
+        Returns:
+            Tallennettu JSON-arvo (tavallisesti lista sivujärjestyksessä),
+            tai None jos merkintää ei löydy.
+        """
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                f"SELECT payload FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._connection.execute(
+                    f"UPDATE {self.table} SET last_access = ? WHERE key = ?", (time.time(), key)
+                )
+                self.hits += 1
+            else:
+                self.misses += 1
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+
+    def put(self, key: str, payload: Any) -> None:
+        """
+        Tallentaa sivujen tiedot välimuistiin.
+
+        Args:
+            key: `make_key`-metodilla muodostettu avain.
+            payload: JSON-muotoon muunnettava arvo, tavallisesti lista
+                     sivujärjestyksessä.
+        """
+        blob = zlib.compress(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, payload, last_access) "
+                "VALUES (?, ?, ?)",
+                (key, blob, time.time()),
+            )
+            self._evict_least_recent(self.table, "key", self.max_entries)
+
+    def clear(self) -> None:
+        """Tyhjentää välimuistin ja nollaa osumalaskurit."""
+        with self._lock, self._connection:
+            self._connection.execute(f"DELETE FROM {self.table}")
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Palauttaa välimuistin tilastot.
+
+        Returns:
+            Sanakirja avaimilla 'hits', 'misses' ja 'entries'.
+        """
+        with self._lock:
+            entries = self._connection.execute(
+                f"SELECT COUNT(*) FROM {self.table}"
+            ).fetchone()[0]
+            return {"hits": self.hits, "misses": self.misses, "entries": entries}
@@ -0,0 +1,310 @@
+"""
+Moduuli jaettujen osatiedostojen sisältöosoitteiselle välimuistille.
+
+Tarjoaa `PartCache`-luokan, joka säilyttää valmiit osatiedostot
+`~/.scanflow/part_cache`-hakemistossa. Avain muodostetaan lähdetiedoston
+sisällön tiivisteestä, osan sivuväleistä ja tallennusasetuksista, joten
+saman skannauksen toistuvassa jaossa jo kerran tuotettu osa voidaan
+kopioida tai linkittää välimuistista poimimatta ja tallentamatta sitä
+uudelleen.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from ..utils.app_paths import get_app_dir
+from .sqlite_cache import SQLiteCache
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+KEY_VERSION = 1
+
+# Linuxin FICLONE-ioctl, joka luo copy-on-write-kopion (reflink).
+_FICLONE = 0x40049409
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parts (
+    key TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+
+_SOURCES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS source_sizes (
+    size INTEGER PRIMARY KEY
+)
+"""
+
+
+class PartCache(SQLiteCache):
+    """
+    Tavumäärällä rajattu LRU-välimuisti valmiille osatiedostoille.
+
+    Osatiedostot säilytetään hakemistossa avaimen mukaan nimettyinä, ja
+    SQLite-indeksi pitää kirjaa niiden koosta ja käyttöajasta. Tiedosto
+    siirretään välimuistin ja tulostushakemiston välillä ensisijaisesti
+    reflink-kopiona, sitten kovana linkkinä ja viimeisenä tavallisena
+    kopiona. Koska kova linkki jakaa tiedoston tulostushakemiston kanssa,
+    merkintä hylätään, jos tiedoston koko tai muokkausaika on muuttunut.
+
+    Indeksi pitää kirjaa myös niiden lähdetiedostojen koosta, joiden osia on
+    tallennettu, jotta jakaja voi ohittaa lähteen sisällön tiivisteen
+    laskemisen, kun välimuistista ei voi löytyä sen osia.
+
+    Attributes:
+        hits (int): Välimuistiosumien määrä tämän instanssin elinaikana.
+        misses (int): Hutien määrä tämän instanssin elinaikana.
+        bytes_served (int): Välimuistista tuotettujen osien koko tavuina.
+    """
+
+    def __init__(
+        self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """
+        Alustaa välimuistin ja luo hakemiston ja indeksin tarvittaessa.
+
+        Args:
+            cache_dir: Välimuistihakemisto. Oletuksena `~/.scanflow/part_cache`.
+            max_bytes: Säilytettävien osien yhteenlaskettu enimmäiskoko tavuina.
+
+        Raises:
+            ValueError: Jos max_bytes on alle 1.
+        """
+        if max_bytes < 1:
+            raise ValueError("Välimuistin koon tulee olla vähintään 1 tavu.")
+        self.cache_dir = cache_dir or get_app_dir("part_cache")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        super().__init__(os.path.join(self.cache_dir, "index.sqlite3"), _SCHEMA)
+        self.max_bytes = max_bytes
+        self.bytes_served = 0
+        with self._connection:
+            self._connection.execute(_SOURCES_SCHEMA)
+
+    @staticmethod
+    def make_key(
+        source_hash: str, start_idx: int, end_idx: int, save_options: Dict[str, Any]
+    ) -> str:
+        """
+        Muodostaa osan välimuistiavaimen.
+
+        Args:
+            source_hash: Lähdetiedoston sisällön SHA-256-tiiviste.
+            start_idx: Aloitussivun indeksi (0-pohjainen).
+            end_idx: Lopetussivun indeksi (0-pohjainen).
+            save_options: Tallennusasetukset, jotka vaikuttavat osan sisältöön.
+
+        Returns:
+            Heksadesimaalimuotoinen avain.
+        """
+        payload = json.dumps(
+            [KEY_VERSION, source_hash, start_idx, end_idx, save_options],
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def materialize(self, key: str, output_path: str) -> Optional[int]:
+        """
+        Tuottaa osan välimuistista annettuun polkuun.
+
+        Args:
+            key: Osan välimuistiavain.
+            output_path: Kohdetiedoston polku. Olemassa oleva tiedosto korvataan.
+
+        Returns:
+            Osan koko tavuina, tai None, jos voimassa olevaa merkintää ei löydy.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT size, mtime_ns FROM parts WHERE key = ?", (key,)
+            ).fetchone()
+        blob_path = self._blob_path(key)
+        if row is None or not self._blob_matches(blob_path, row[0], row[1]):
+            if row is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+        try:
+            _place_file(blob_path, output_path)
+        except OSError:
+            self.misses += 1
+            return None
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE parts SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+        self.hits += 1
+        self.bytes_served += row[0]
+        return row[0]
+
+    def may_contain_source(self, source_size: int) -> bool:
+        """
+        Kertoo, voiko välimuistissa olla annetun kokoisen lähdetiedoston osia.
+
+        Args:
+            source_size: Lähdetiedoston koko tavuina.
+
+        Returns:
+            False, jos tämän kokoisen lähteen osia ei ole tallennettu, muuten True.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM source_sizes WHERE size = ?", (source_size,)
+            ).fetchone()
+        return row is not None
+
+    def store(self, key: str, part_path: str, source_size: Optional[int] = None) -> None:
+        """
+        Tallentaa valmiin osatiedoston välimuistiin.
+
+        Osaa, joka on suurempi kuin koko välimuistin enimmäiskoko, ei
+        tallenneta. Tallennuksen jälkeen vanhimmat käyttämättömät osat
+        poistetaan, kunnes yhteenlaskettu koko mahtuu rajaan.
+
+        Args:
+            key: Osan välimuistiavain.
+            part_path: Tallennetun osatiedoston polku.
+            source_size: Valinnainen lähdetiedoston koko tavuina. Kirjataan
+                         `may_contain_source`-tarkistusta varten.
+        """
+        try:
+            size = os.path.getsize(part_path)
+            if size > self.max_bytes:
+                return
+            blob_path = self._blob_path(key)
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            _place_file(part_path, blob_path)
+            mtime_ns = os.stat(blob_path).st_mtime_ns
+        except OSError:
+            return
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO parts (key, size, mtime_ns, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, size, mtime_ns, time.time()),
+            )
+            if source_size is not None:
+                self._connection.execute(
+                    "INSERT OR IGNORE INTO source_sizes (size) VALUES (?)", (source_size,)
+                )
+        self._evict()
+
+    def clear(self) -> None:
+        """Tyhjentää välimuistin ja nollaa tilastot."""
+        with self._lock:
+            keys = [row[0] for row in self._connection.execute("SELECT key FROM parts")]
+        for key in keys:
+            self._remove(key)
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM source_sizes")
+        self.hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Palauttaa välimuistin tilastot.
+
+        Returns:
+            Sanakirja avaimilla 'hits', 'misses', 'hit_rate', 'entries',
+            'total_bytes' ja 'bytes_served'.
+        """
+        with self._lock:
+            entries, total_bytes = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parts"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "total_bytes": total_bytes,
+            "bytes_served": self.bytes_served,
+        }
+
+    def _blob_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pdf")
+
+    @staticmethod
+    def _blob_matches(blob_path: str, size: int, mtime_ns: int) -> bool:
+        try:
+            stat_result = os.stat(blob_path)
+        except OSError:
+            return False
+        return stat_result.st_size == size and stat_result.st_mtime_ns == mtime_ns
+
+    def _evict(self) -> None:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key, size FROM parts ORDER BY last_access DESC"
+            ).fetchall()
+        total_bytes = 0
+        for key, size in rows:
+            total_bytes += size
+            if total_bytes > self.max_bytes:
+                self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM parts WHERE key = ?", (key,))
+        try:
+            os.remove(self._blob_path(key))
+        except FileNotFoundError:
+            pass
+
+
+def _place_file(source_path: str, target_path: str) -> None:
+    """
+    Tuo tiedoston kohteeseen reflinkillä, kovalla linkillä tai kopiona.
+
+    Kohde kirjoitetaan ensin väliaikaiseen tiedostoon ja siirretään sitten
+    paikalleen, joten keskeytynyt siirto ei jätä puolikasta tiedostoa.
+
+    Args:
+        source_path: Lähdetiedoston polku.
+        target_path: Kohdetiedoston polku.
+
+    Raises:
+        OSError: Jos tiedostoa ei voida kopioida.
+    """
+    temp_path = f"{target_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        if not _reflink(source_path, temp_path):
+            try:
+                os.link(source_path, temp_path)
+            except OSError:
+                shutil.copyfile(source_path, temp_path)
+        os.replace(temp_path, target_path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _reflink(source_path: str, target_path: str) -> bool:
+    if fcntl is None:
+        return False
+    try:
+        with open(source_path, "rb") as source, open(target_path, "wb") as target:
+            fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+        return True
+    except OSError:
+        try:
+            os.remove(target_path)
+        except FileNotFoundError:
+            pass
+        return False
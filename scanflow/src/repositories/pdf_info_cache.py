@@ -0,0 +1,178 @@
+"""
+Moduuli PDF-tiedostojen perustietojen pysyvälle välimuistille.
+
+Tarjoaa `PDFInfoCache`-luokan, joka tallentaa tiedostojen sivumäärät,
+metatiedot ja sivukoot SQLite-tietokantaan `~/.scanflow`-hakemistoon.
+Uudelleen avattujen tiedostojen tiedot saadaan välimuistista ilman, että
+tiedostoa tarvitsee jäsentää PyMuPDF:llä.
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.app_paths import get_app_dir
+from ..utils.file_fingerprint import quick_fingerprint
+from .sqlite_cache import SQLiteCache
+
+DEFAULT_MAX_ENTRIES = 50000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pdf_info (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    page_count INTEGER NOT NULL,
+    metadata TEXT,
+    page_sizes TEXT,
+    last_access REAL NOT NULL
+)
+"""
+
+
+class PDFInfoCache(SQLiteCache):
+    """
+    SQLite-pohjainen välimuisti PDF-tiedostojen perustiedoille.
+
+    Merkintä on voimassa, kun tiedoston polku, koko, muokkausaika ja
+    sisältösormenjälki vastaavat tallennettuja. Välimuistin koko on rajattu
+    merkintöjen määrällä, ja vanhimmat käyttämättömät merkinnät poistetaan
+    ensin.
+
+    Attributes:
+        hits (int): Välimuistiosumien määrä tämän instanssin elinaikana.
+        misses (int): Hutien määrä tämän instanssin elinaikana.
+    """
+
+    def __init__(
+        self, db_path: Optional[str] = None, max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        """
+        Alustaa välimuistin ja luo tietokannan tarvittaessa.
+
+        Args:
+            db_path: Tietokantatiedoston polku. Oletuksena
+                     `~/.scanflow/pdf_info_cache.sqlite3`.
+            max_entries: Säilytettävien merkintöjen enimmäismäärä.
+
+        Raises:
+            ValueError: Jos max_entries on alle 1.
+        """
+        if max_entries < 1:
+            raise ValueError("Välimuistin koon tulee olla vähintään 1.")
+        super().__init__(
+            db_path or os.path.join(get_app_dir(), "pdf_info_cache.sqlite3"), _SCHEMA
+        )
+        self.max_entries = max_entries
+
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Hakee tiedoston tiedot välimuistista.
+
+        Args:
+            file_path: PDF-tiedoston polku.
+
+        Returns:
+            Sanakirja avaimilla 'page_count', 'metadata' ja 'page_sizes', tai
+            None, jos voimassa olevaa merkintää ei löydy. 'metadata' ja
+            'page_sizes' voivat olla None, jos niitä ei ole tallennettu.
+        """
+        key, size, mtime_ns = self._stat(file_path)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT size, mtime_ns, fingerprint, page_count, metadata, page_sizes "
+                "FROM pdf_info WHERE path = ?",
+                (key,),
+            ).fetchone()
+        if (
+            row is None or row[0] != size or row[1] != mtime_ns
+            or row[2] != quick_fingerprint(file_path)
+        ):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE pdf_info SET last_access = ? WHERE path = ?", (time.time(), key)
+            )
+            self.hits += 1
+        return {
+            "page_count": row[3],
+            "metadata": json.loads(row[4]) if row[4] is not None else None,
+            "page_sizes": (
+                [tuple(size) for size in json.loads(row[5])] if row[5] is not None else None
+            ),
+        }
+
+    def put(
+        self,
+        file_path: str,
+        page_count: int,
+        metadata: Optional[Dict[str, Any]] = None,
+        page_sizes: Optional[List[Tuple[float, float]]] = None,
+    ) -> None:
+        """
+        Tallentaa tiedoston tiedot välimuistiin.
+
+        Args:
+            file_path: PDF-tiedoston polku.
+            page_count: Tiedoston sivumäärä.
+            metadata: Valinnaiset metatiedot.
+            page_sizes: Valinnainen lista sivujen (leveys, korkeus) -pareja.
+        """
+        key, size, mtime_ns = self._stat(file_path)
+        fingerprint = quick_fingerprint(file_path)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO pdf_info "
+                "(path, size, mtime_ns, fingerprint, page_count, metadata, page_sizes, "
+                "last_access) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    size,
+                    mtime_ns,
+                    fingerprint,
+                    page_count,
+                    json.dumps(metadata) if metadata is not None else None,
+                    json.dumps(page_sizes) if page_sizes is not None else None,
+                    time.time(),
+                ),
+            )
+            self._evict_least_recent("pdf_info", "path", self.max_entries)
+
+    def invalidate(self, file_path: str) -> None:
+        """
+        Poistaa tiedoston merkinnän välimuistista.
+
+        Args:
+            file_path: PDF-tiedoston polku.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM pdf_info WHERE path = ?", (os.path.abspath(file_path),)
+            )
+
+    def clear(self) -> None:
+        """Tyhjentää välimuistin ja nollaa osumalaskurit."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM pdf_info")
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Palauttaa välimuistin tilastot.
+
+        Returns:
+            Sanakirja avaimilla 'hits', 'misses' ja 'entries'.
+        """
+        with self._lock:
+            entries = self._connection.execute("SELECT COUNT(*) FROM pdf_info").fetchone()[0]
+            return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def _stat(self, file_path: str) -> Tuple[str, int, int]:
+        stat_result = os.stat(file_path)
+        return os.path.abspath(file_path), stat_result.st_size, stat_result.st_mtime_ns
@@ -7,9 +7,90 @@ käyttäen PyMuPDF -kirjastoa.
 """
 
 import os
-from typing import Dict, Any
+import re
+from typing import Collection, Dict, Any, List, Optional, Sequence, Tuple
 import fitz
 
+from .document_cache import DocumentCache
+from .pdf_structure_reader import read_page_count
+
+
+_REFERENCE_PATTERN = re.compile(r"(\d+) 0 R")
+# Sivupuuhun ja annotaation omaan sivuun osoittavat viittaukset eivät tuo
+# osaan uusia objekteja.
+_BACK_REFERENCE_PATTERN = re.compile(r"/(?:Parent|P)\s+\d+ 0 R")
+# Objektin numero, "obj"/"endobj"-avainsanat ja xref-taulun rivi.
+_OBJECT_OVERHEAD_BYTES = 40
+
+
+def _page_runs(
+    start_page: int, end_page: int, skip_pages: Optional[Collection[int]]
+) -> List[Tuple[int, int]]:
+    if not skip_pages:
+        return [(start_page, end_page)]
+    runs = []
+    run_start = None
+    for page in range(start_page, end_page + 1):
+        if page in skip_pages:
+            if run_start is not None:
+                runs.append((run_start, page - 1))
+                run_start = None
+        elif run_start is None:
+            run_start = page
+    if run_start is not None:
+        runs.append((run_start, end_page))
+    return runs
+
+
+def _describe_object(pdf_document: fitz.Document, xref: int) -> Tuple[int, List[int]]:
+    source = pdf_document.xref_object(xref, compressed=True)
+    size = len(source) + _OBJECT_OVERHEAD_BYTES
+    if pdf_document.xref_is_stream(xref):
+        size += len(pdf_document.xref_stream_raw(xref) or b"")
+    references = [
+        int(number)
+        for number in _REFERENCE_PATTERN.findall(_BACK_REFERENCE_PATTERN.sub("", source))
+    ]
+    return size, references
+
+
+def _page_objects(
+    pdf_document: fitz.Document,
+    page_xref: int,
+    page_xrefs: Collection[int],
+    objects: Dict[int, Tuple[int, List[int]]],
+) -> Dict[int, int]:
+    """
+    Kerää sivulta viittauksia seuraten saavutettavat objektit kokoineen.
+
+    Args:
+        pdf_document: PyMuPDF-dokumentti.
+        page_xref: Sivun objektinumero.
+        page_xrefs: Kaikkien sivujen objektinumerot. Muihin sivuihin ei edetä.
+        objects: Jo luettujen objektien (koko, viittaukset) numeron mukaan.
+                 Täydennetään luetuilla objekteilla.
+
+    Returns:
+        Sanakirja objektinumerosta arvioituun kokoon tavuina.
+    """
+    xref_count = pdf_document.xref_length()
+    page_objects: Dict[int, int] = {}
+    pending = [page_xref]
+    while pending:
+        xref = pending.pop()
+        if (
+            xref in page_objects
+            or not 0 < xref < xref_count
+            or (xref in page_xrefs and xref != page_xref)
+        ):
+            continue
+        if xref not in objects:
+            objects[xref] = _describe_object(pdf_document, xref)
+        size, references = objects[xref]
+        page_objects[xref] = size
+        pending.extend(references)
+    return page_objects
+
 
 class PDFRepository:
     """
@@ -19,10 +100,26 @@ class PDFRepository:
     Hoitaa virheenkäsittelyn liittyen tiedosto-operaatioihin.
     """
 
+    SAVE_OPTIONS = {"garbage": 4, "deflate": True}
+
+    def __init__(self, document_cache: Optional[DocumentCache] = None):
+        """
+        Alustaa repositorion.
+
+        Args:
+            document_cache: Valinnainen välimuisti avatuille dokumenteille.
+                            Jos annettu, `load_pdf` lainaa dokumentin
+                            välimuistista ja `close_pdf` palauttaa sen sinne.
+        """
+        self.document_cache = document_cache
+
     def load_pdf(self, file_path: str) -> fitz.Document:
         """
         Lataa PDF-dokumentin annetusta tiedostopolusta.
 
+        Välimuistia käytettäessä palautettu dokumentti on lainassa, kunnes
+        se annetaan `close_pdf`-metodille.
+
         Args:
             file_path: Ladattavan PDF-tiedoston polku.
 
@@ -37,6 +134,11 @@ class PDFRepository:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Tiedostoa ei löydy: {file_path}")
 
+        if self.document_cache is not None:
+            return self.document_cache.acquire(file_path, self._open_pdf)
+        return self._open_pdf(file_path)
+
+    def _open_pdf(self, file_path: str) -> fitz.Document:
         pdf_document = None
         try:
             pdf_document = fitz.open(file_path)
@@ -68,6 +170,39 @@ class PDFRepository:
             raise ValueError("Dokumentti on suljettu.")
         return pdf_document.page_count
 
+    def count_pages(self, file_path: str) -> int:
+        """
+        Palauttaa tiedoston sivumäärän avaamatta sitä PyMuPDF:llä, jos mahdollista.
+
+        Sivumäärä luetaan ensin suoraan tiedoston trailerista ja sivupuun
+        juuresta. Jos rakenne on vaurioitunut tai salattu, tiedosto avataan
+        `load_pdf`-metodilla, joka osaa myös korjata vauriot.
+
+        Args:
+            file_path: PDF-tiedoston polku.
+
+        Returns:
+            Dokumentin sivumäärä.
+
+        Raises:
+            FileNotFoundError: Jos annettua tiedostoa ei löydy.
+            ValueError: Jos tiedoston avaaminen epäonnistuu.
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Tiedostoa ei löydy: {file_path}")
+        try:
+            page_count = read_page_count(file_path)
+        except OSError:
+            page_count = None
+        if page_count is not None:
+            return page_count
+
+        pdf_document = self.load_pdf(file_path)
+        try:
+            return self.get_page_count(pdf_document)
+        finally:
+            self.close_pdf(pdf_document)
+
     def get_metadata(self, pdf_document: fitz.Document) -> Dict[str, Any]:
         """
         Palauttaa PDF-dokumentin metatiedot sanakirjana.
@@ -87,8 +222,70 @@ class PDFRepository:
             raise ValueError("Dokumentti on suljettu.")
         return pdf_document.metadata or {}
 
+    def get_page_sizes(self, pdf_document: fitz.Document) -> List[Tuple[float, float]]:
+        """
+        Palauttaa dokumentin sivujen koot lataamatta sivuja kokonaan.
+
+        Args:
+            pdf_document: PyMuPDF-dokumenttiobjekti.
+
+        Returns:
+            Lista sivujen (leveys, korkeus) -pareja pisteinä.
+
+        Raises:
+            ValueError: Jos annettu dokumenttiobjekti on suljettu.
+        """
+        if pdf_document.is_closed:
+            raise ValueError("Dokumentti on suljettu.")
+        sizes = []
+        for page_index in range(pdf_document.page_count):
+            rect = pdf_document.page_cropbox(page_index)
+            sizes.append((rect.width, rect.height))
+        return sizes
+
+    def get_outline(self, pdf_document: fitz.Document) -> List[List[Any]]:
+        """
+        Palauttaa dokumentin sisällysluettelon (kirjanmerkit).
+
+        Args:
+            pdf_document: PyMuPDF-dokumenttiobjekti.
+
+        Returns:
+            Lista [taso, otsikko, sivu] -listoja luettelon järjestyksessä.
+            Sivu on 1-pohjainen, tai -1, jos kirjanmerkki ei osoita
+            dokumentin sivulle.
+
+        Raises:
+            ValueError: Jos annettu dokumenttiobjekti on suljettu.
+        """
+        if pdf_document.is_closed:
+            raise ValueError("Dokumentti on suljettu.")
+        return list(pdf_document.get_toc())
+
+    def set_outline(
+        self, pdf_document: fitz.Document, outline: Sequence[Tuple[int, str, int]]
+    ) -> None:
+        """
+        Korvaa dokumentin sisällysluettelon.
+
+        Args:
+            pdf_document: PyMuPDF-dokumenttiobjekti.
+            outline: Lista (taso, otsikko, sivu) -tupleja. Ensimmäisen tason
+                     tulee olla 1, eikä taso saa kasvaa kerralla yhtä enempää.
+
+        Raises:
+            ValueError: Jos dokumentti on suljettu tai tasot ovat virheelliset.
+        """
+        if pdf_document.is_closed:
+            raise ValueError("Dokumentti on suljettu.")
+        pdf_document.set_toc([list(entry) for entry in outline])
+
     def extract_pages(
-        self, pdf_document: fitz.Document, start_page: int, end_page: int
+        self,
+        pdf_document: fitz.Document,
+        start_page: int,
+        end_page: int,
+        skip_pages: Optional[Collection[int]] = None,
     ) -> fitz.Document:
         """
         Poimii määritellyt sivut annetusta PDF-dokumentista uuteen dokumenttiin.
@@ -97,6 +294,8 @@ class PDFRepository:
             pdf_document: Alkuperäinen PyMuPDF-dokumentti.
             start_page: Ensimmäisen poimittavan sivun indeksi (0-pohjainen).
             end_page: Viimeisen poimittavan sivun indeksi (0-pohjainen, sisällytetty).
+            skip_pages: Valinnaiset sivuindeksit, joita ei poimita. Välin
+                        muut sivut poimitaan yhtenäisinä jaksoina.
 
         Returns:
             Uusi PyMuPDF-dokumentti, joka sisältää vain poimitut sivut.
@@ -118,7 +317,8 @@ class PDFRepository:
 
         new_doc = fitz.open()
         try:
-            new_doc.insert_pdf(pdf_document, from_page=start_page, to_page=end_page)
+            for run_start, run_end in _page_runs(start_page, end_page, skip_pages):
+                new_doc.insert_pdf(pdf_document, from_page=run_start, to_page=run_end)
             return new_doc
         except Exception as e:
             new_doc.close()
@@ -126,6 +326,105 @@ class PDFRepository:
                 f"Sivujen {start_page + 1}-{end_page + 1} poiminta epäonnistui: {e}"
             ) from e
 
+    def estimate_page_costs(self, pdf_document: fitz.Document) -> List[Dict[int, int]]:
+        """
+        Arvioi jokaisen sivun tarvitsemat objektit ja niiden koon tallennettuna.
+
+        Sivulta seurataan kaikki viittaukset (sisältövirrat, resurssit,
+        kuvat, fontit ja annotaatiot) lukuun ottamatta viittauksia sivupuuhun
+        ja muihin sivuihin. Virtojen koko on niiden pakattu pituus, koska
+        tallennus ei pakkaa valmiiksi pakattuja virtoja uudelleen. Usean
+        sivun jakama objekti (esim. fontti) on kunkin sivun sanakirjassa
+        samalla numerolla, joten osan koko saadaan sivujen sanakirjojen
+        yhdisteestä.
+
+        Args:
+            pdf_document: PyMuPDF-dokumentti.
+
+        Returns:
+            Lista sivujärjestyksessä. Jokainen alkio on sanakirja
+            objektinumerosta arvioituun kokoon tavuina.
+
+        Raises:
+            ValueError: Jos dokumentti on suljettu.
+        """
+        if pdf_document.is_closed:
+            raise ValueError("Dokumentti on suljettu.")
+        page_xrefs = [pdf_document.page_xref(index) for index in range(pdf_document.page_count)]
+        page_xref_set = set(page_xrefs)
+        objects: Dict[int, Tuple[int, List[int]]] = {}
+        return [
+            _page_objects(pdf_document, page_xref, page_xref_set, objects)
+            for page_xref in page_xrefs
+        ]
+
+    def render_page_gray(
+        self, pdf_document: fitz.Document, page_index: int, width: int, height: int
+    ) -> bytes:
+        """
+        Renderöi sivun harmaasävyiseksi pienoiskuvaksi annettuun kokoon.
+
+        Sivu skaalataan koko kuva-alaan kuvasuhteesta riippumatta, joten
+        kaikkien sivujen kuvat ovat samankokoisia.
+
+        Args:
+            pdf_document: PyMuPDF-dokumentti.
+            page_index: Sivun indeksi (0-pohjainen).
+            width: Kuvan leveys pikseleinä.
+            height: Kuvan korkeus pikseleinä.
+
+        Returns:
+            width * height tavua rivijärjestyksessä, 0 = musta ja 255 = valkoinen.
+
+        Raises:
+            ValueError: Jos dokumentti on suljettu.
+        """
+        if pdf_document.is_closed:
+            raise ValueError("Dokumentti on suljettu.")
+        page = pdf_document.load_page(page_index)
+        rect = page.rect
+        pixmap = page.get_pixmap(
+            matrix=fitz.Matrix(width / rect.width, height / rect.height),
+            colorspace=fitz.csGRAY,
+            alpha=False,
+        )
+        if (pixmap.width, pixmap.height) != (width, height):
+            pixmap = fitz.Pixmap(pixmap, width, height)
+        return pixmap.samples
+
+    def get_page_text(self, pdf_document: fitz.Document, page_index: int) -> str:
+        """
+        Poimii sivun tekstikerroksen tekstin.
+
+        Skannatuista sivuista teksti löytyy vain, jos skannaus on tunnistettu
+        (OCR) ja tekstikerros on tallennettu PDF:ään.
+
+        Args:
+            pdf_document: PyMuPDF-dokumentti.
+            page_index: Sivun indeksi (0-pohjainen).
+
+        Returns:
+            Sivun teksti lukujärjestyksessä, tai tyhjä merkkijono.
+
+        Raises:
+            ValueError: Jos dokumentti on suljettu.
+        """
+        if pdf_document.is_closed:
+            raise ValueError("Dokumentti on suljettu.")
+        return pdf_document.load_page(page_index).get_text("text")
+
+    def get_save_signature(self) -> Dict[str, Any]:
+        """
+        Palauttaa tallennusasetukset ja PyMuPDF-version.
+
+        Tallennettujen osien sisältö riippuu näistä, joten niitä käytetään
+        osavälimuistin avaimena.
+
+        Returns:
+            Sanakirja tallennusasetuksista ja kirjastoversiosta.
+        """
+        return {**self.SAVE_OPTIONS, "pymupdf": fitz.VersionBind}
+
     def save_pdf(self, pdf_document: fitz.Document, output_path: str) -> str:
         """Tallentaa annetun PDF-dokumentin määritettyyn tiedostopolkuun.
 
@@ -154,7 +453,7 @@ class PDFRepository:
                         f"Kohdehakemiston '{output_dir}' luominen epäonnistui: {e}"
                     ) from e
 
-            pdf_document.save(output_path, garbage=4, deflate=True)
+            pdf_document.save(output_path, **self.SAVE_OPTIONS)
             return output_path
         except IOError as e:
             raise IOError(
@@ -169,8 +468,17 @@ class PDFRepository:
         """
         Sulkee annetun PDF-dokumentin ja vapauttaa sen resurssit.
 
+        Välimuistista lainattu dokumentti palautetaan välimuistiin
+        sulkematta sitä.
+
         Args:
             pdf_document: Suljettava PyMuPDF-dokumentti tai None.
         """
+        if (
+            pdf_document
+            and self.document_cache is not None
+            and self.document_cache.release(pdf_document)
+        ):
+            return
         if pdf_document and not pdf_document.is_closed:
             pdf_document.close()
@@ -0,0 +1,515 @@
+"""
+Moduuli PDF-tiedoston sivumäärän lukemiseen suoraan tiedostorakenteesta.
+
+Tarjoaa `read_page_count`-funktion, joka lukee muistiin kuvatusta
+tiedostosta trailerin, xref-taulukon tai xref-virran sekä dokumentin
+juuriobjektin `/Pages /Count`-arvon. Koko dokumenttia ei jäsennetä, joten
+sivumäärä saadaan murto-osassa ajasta, jonka `fitz.open` vaatii.
+
+Funktio palauttaa None, jos rakenne on vaurioitunut, salattu tai muuten
+tulkittavissa vain täydellä jäsennyksellä. Tällöin kutsujan tulee käyttää
+PyMuPDF:ää.
+"""
+
+import mmap
+import re
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+_WHITESPACE = b" \t\r\n\f\x00"
+_DELIMITERS = b"()<>[]{}/%"
+_TAIL_BYTES = 8192
+_MAX_XREF_SECTIONS = 512
+_INTEGER = re.compile(rb"[+-]?\d+$")
+_XREF_ROW_BYTES = 20
+_XREF_ROW = re.compile(rb"(\d{10}) (\d{5}) ([nf])[ \r\n]{2}")
+_ARRAY_BOUNDARY = re.compile(rb"[\[\]()]")
+_SKIPPED_ARRAYS = frozenset({"Kids"})
+_KEYWORDS = {b"true": True, b"false": False, b"null": None}
+
+
+class PDFStructureError(Exception):
+    """Nostetaan, kun tiedostorakennetta ei voida tulkita kevyesti."""
+
+
+class PDFReference:
+    """Epäsuora viittaus PDF-objektiin (`N G R`)."""
+
+    __slots__ = ("number", "generation")
+
+    def __init__(self, number: int, generation: int):
+        self.number = number
+        self.generation = generation
+
+    def __repr__(self):
+        return f"PDFReference({self.number}, {self.generation})"
+
+
+class PDFName(str):
+    """PDF-nimi ilman alkukauttaviivaa."""
+
+
+class _ObjectParser:
+    """Minimaalinen PDF-objektien jäsennin muistiin kuvatulle datalle."""
+
+    def __init__(self, data: Any, position: int = 0):
+        self.data = data
+        self.position = position
+
+    def skip_whitespace(self) -> None:
+        data = self.data
+        size = len(data)
+        while self.position < size:
+            char = data[self.position]
+            if char in _WHITESPACE:
+                self.position += 1
+            elif char == 0x25:
+                while self.position < size and data[self.position] not in b"\r\n":
+                    self.position += 1
+            else:
+                return
+
+    def startswith(self, token: bytes) -> bool:
+        return self.data[self.position:self.position + len(token)] == token
+
+    def read_token(self) -> bytes:
+        self.skip_whitespace()
+        start = self.position
+        data = self.data
+        size = len(data)
+        while (
+            self.position < size
+            and data[self.position] not in _WHITESPACE
+            and data[self.position] not in _DELIMITERS
+        ):
+            self.position += 1
+        if start == self.position:
+            raise PDFStructureError(f"Odotettiin tunnusta kohdassa {start}")
+        return bytes(data[start:self.position])
+
+    def read_integer(self) -> int:
+        token = self.read_token()
+        if not _INTEGER.match(token):
+            raise PDFStructureError(f"Odotettiin kokonaislukua: {token!r}")
+        return int(token)
+
+    def parse_object(self) -> Any:
+        self.skip_whitespace()
+        if self.startswith(b"<<"):
+            return self._parse_dictionary()
+        if self.startswith(b"<"):
+            return self._parse_hex_string()
+        if self.startswith(b"["):
+            return self._parse_array()
+        if self.startswith(b"("):
+            return self._parse_literal_string()
+        if self.startswith(b"/"):
+            return self._parse_name()
+        return self._parse_keyword_or_number()
+
+    def _parse_dictionary(self) -> Dict[str, Any]:
+        self.position += 2
+        result = {}
+        while True:
+            self.skip_whitespace()
+            if self.startswith(b">>"):
+                self.position += 2
+                return result
+            if not self.startswith(b"/"):
+                raise PDFStructureError(f"Virheellinen sanakirja kohdassa {self.position}")
+            key = self._parse_name()
+            self.skip_whitespace()
+            if key in _SKIPPED_ARRAYS and self.startswith(b"["):
+                self._skip_array()
+                result[key] = None
+            else:
+                result[key] = self.parse_object()
+
+    def _parse_array(self) -> List[Any]:
+        self.position += 1
+        result = []
+        while True:
+            self.skip_whitespace()
+            if self.startswith(b"]"):
+                self.position += 1
+                return result
+            if self.position >= len(self.data):
+                raise PDFStructureError("Taulukko päättyi kesken")
+            result.append(self.parse_object())
+
+    def _skip_array(self) -> None:
+        depth = 0
+        while True:
+            match = _ARRAY_BOUNDARY.search(self.data, self.position)
+            if match is None:
+                raise PDFStructureError("Taulukko päättyi kesken")
+            self.position = match.start()
+            boundary = match.group()
+            if boundary == b"(":
+                self._parse_literal_string()
+                continue
+            self.position += 1
+            depth += 1 if boundary == b"[" else -1
+            if depth == 0:
+                return
+
+    def _parse_name(self) -> PDFName:
+        self.position += 1
+        start = self.position
+        data = self.data
+        size = len(data)
+        while (
+            self.position < size
+            and data[self.position] not in _WHITESPACE
+            and data[self.position] not in _DELIMITERS
+        ):
+            self.position += 1
+        raw = bytes(data[start:self.position])
+        if b"#" in raw:
+            raw = re.sub(rb"#([0-9A-Fa-f]{2})", lambda m: bytes([int(m.group(1), 16)]), raw)
+        return PDFName(raw.decode("latin-1"))
+
+    def _parse_hex_string(self) -> bytes:
+        end = self.data.find(b">", self.position)
+        if end < 0:
+            raise PDFStructureError("Heksamerkkijono päättyi kesken")
+        self.position = end + 1
+        return b""
+
+    def _parse_literal_string(self) -> bytes:
+        depth = 0
+        data = self.data
+        size = len(data)
+        while self.position < size:
+            char = data[self.position]
+            if char == 0x5C:
+                self.position += 2
+                continue
+            if char == 0x28:
+                depth += 1
+            elif char == 0x29:
+                depth -= 1
+                if depth == 0:
+                    self.position += 1
+                    return b""
+            self.position += 1
+        raise PDFStructureError("Merkkijono päättyi kesken")
+
+    def _parse_keyword_or_number(self) -> Any:
+        token = self.read_token()
+        if token in _KEYWORDS:
+            return _KEYWORDS[token]
+        if _INTEGER.match(token):
+            return self._parse_integer_or_reference(int(token))
+        try:
+            return float(token)
+        except ValueError:
+            return token
+
+    def _parse_integer_or_reference(self, number: int) -> Any:
+        saved_position = self.position
+        try:
+            generation_token = self.read_token()
+            if _INTEGER.match(generation_token) and self.read_token() == b"R":
+                return PDFReference(number, int(generation_token))
+        except PDFStructureError:
+            pass
+        self.position = saved_position
+        return number
+
+
+def _apply_png_predictor(data: bytes, columns: int) -> bytes:
+    row_size = columns + 1
+    if len(data) % row_size:
+        raise PDFStructureError("Ennustimen rivikoko ei täsmää")
+    previous = bytearray(columns)
+    output = bytearray()
+    for row_start in range(0, len(data), row_size):
+        row = bytearray(data[row_start + 1:row_start + row_size])
+        _unfilter_png_row(data[row_start], row, previous)
+        output.extend(row)
+        previous = row
+    return bytes(output)
+
+
+def _unfilter_png_row(filter_type: int, row: bytearray, previous: bytearray) -> None:
+    for i, value in enumerate(row):
+        left = row[i - 1] if i else 0
+        up = previous[i]
+        if filter_type == 1:
+            row[i] = (value + left) & 0xFF
+        elif filter_type == 2:
+            row[i] = (value + up) & 0xFF
+        elif filter_type == 3:
+            row[i] = (value + ((left + up) >> 1)) & 0xFF
+        elif filter_type == 4:
+            upper_left = previous[i - 1] if i else 0
+            estimate = left + up - upper_left
+            distances = (abs(estimate - left), abs(estimate - up), abs(estimate - upper_left))
+            predictor = (left, up, upper_left)[distances.index(min(distances))]
+            row[i] = (value + predictor) & 0xFF
+        elif filter_type != 0:
+            raise PDFStructureError(f"Tuntematon PNG-suodatin {filter_type}")
+
+
+class _XRefTableSection:
+    """Klassisen xref-taulukon alijakso, jonka rivit luetaan tarvittaessa."""
+
+    __slots__ = ("data", "first", "count", "position")
+
+    def __init__(self, data: Any, first: int, count: int, position: int):
+        self.data = data
+        self.first = first
+        self.count = count
+        self.position = position
+
+    def lookup(self, number: int) -> Optional[Tuple[int, int]]:
+        if not self.first <= number < self.first + max(self.count, 0):
+            return None
+        row_start = self.position + (number - self.first) * _XREF_ROW_BYTES
+        match = _XREF_ROW.match(self.data[row_start:row_start + _XREF_ROW_BYTES])
+        if match is None:
+            raise PDFStructureError(f"Virheellinen xref-rivi objektille {number}")
+        if match.group(3) == b"f":
+            return None
+        return 1, int(match.group(1))
+
+
+class _XRefStreamSection:
+    """Xref-virran merkinnät, jotka tulkitaan vasta kysyttäessä."""
+
+    __slots__ = ("stream", "widths", "subsections")
+
+    def __init__(self, stream: bytes, widths: List[int], index: List[int]):
+        self.stream = stream
+        self.widths = widths
+        self.subsections = []
+        entry_size = sum(widths)
+        position = 0
+        for first, count in zip(index[0::2], index[1::2]):
+            self.subsections.append((first, count, position))
+            position += count * entry_size
+        if entry_size == 0 or position > len(stream):
+            raise PDFStructureError("xref-virta päättyi kesken")
+
+    def lookup(self, number: int) -> Optional[Tuple[int, int]]:
+        entry_size = sum(self.widths)
+        for first, count, position in self.subsections:
+            if first <= number < first + count:
+                position += (number - first) * entry_size
+                fields = []
+                for width in self.widths:
+                    fields.append(int.from_bytes(self.stream[position:position + width], "big"))
+                    position += width
+                kind = fields[0] if self.widths[0] else 1
+                if kind == 1:
+                    return 1, fields[1]
+                if kind == 2:
+                    return 2, fields[1] * 65536 + fields[2]
+                return None
+        return None
+
+
+class _StructureReader:
+    """Lukee xref-tiedot ja ratkaisee epäsuorat objektit tarpeen mukaan."""
+
+    def __init__(self, data: Any):
+        self.data = data
+        self.sections: List[Any] = []
+        self.trailer: Dict[str, Any] = {}
+        self._object_streams: Dict[int, Tuple[List[int], bytes, int]] = {}
+
+    def page_count(self) -> int:
+        if self.data.find(b"%PDF-", 0, 1024) < 0:
+            raise PDFStructureError("Tiedosto ei ala PDF-otsakkeella")
+        self._load_xref_chain(self._find_startxref())
+        if "Encrypt" in self.trailer:
+            raise PDFStructureError("Salattu dokumentti")
+        root = self.resolve(self.trailer.get("Root"))
+        if not isinstance(root, dict):
+            raise PDFStructureError("Juuriobjekti puuttuu")
+        pages = self.resolve(root.get("Pages"))
+        if not isinstance(pages, dict) or pages.get("Type") != "Pages":
+            raise PDFStructureError("Sivupuu puuttuu")
+        count = self.resolve(pages.get("Count"))
+        if not isinstance(count, int) or isinstance(count, bool) or count < 0:
+            raise PDFStructureError("Virheellinen sivumäärä")
+        return count
+
+    def lookup(self, number: int) -> Tuple[int, int]:
+        for section in self.sections:
+            entry = section.lookup(number)
+            if entry is not None:
+                return entry
+        raise PDFStructureError(f"Objektia {number} ei löydy")
+
+    def resolve(self, value: Any) -> Any:
+        if not isinstance(value, PDFReference):
+            return value
+        kind, location = self.lookup(value.number)
+        if kind == 1:
+            return self._read_indirect_object(location, value.number)[0]
+        return self._read_compressed_object(location, value.number)
+
+    def _find_startxref(self) -> int:
+        tail_start = max(0, len(self.data) - _TAIL_BYTES)
+        marker = self.data.rfind(b"startxref", tail_start)
+        if marker < 0:
+            raise PDFStructureError("startxref puuttuu")
+        parser = _ObjectParser(self.data, marker + len(b"startxref"))
+        return parser.read_integer()
+
+    def _load_xref_chain(self, offset: int) -> None:
+        visited = set()
+        pending = [offset]
+        while pending:
+            offset = pending.pop(0)
+            if offset in visited:
+                continue
+            if len(visited) >= _MAX_XREF_SECTIONS or not 0 <= offset < len(self.data):
+                raise PDFStructureError(f"Virheellinen xref-sijainti {offset}")
+            visited.add(offset)
+            trailer = self._read_xref_section(offset)
+            if isinstance(trailer.get("XRefStm"), int):
+                pending.insert(0, trailer["XRefStm"])
+            if not self.trailer:
+                self.trailer = trailer
+            if isinstance(trailer.get("Prev"), int):
+                pending.append(trailer["Prev"])
+
+    def _read_xref_section(self, offset: int) -> Dict[str, Any]:
+        parser = _ObjectParser(self.data, offset)
+        parser.skip_whitespace()
+        if not parser.startswith(b"xref"):
+            return self._read_xref_stream(offset)
+        parser.position += len(b"xref")
+        return self._read_xref_table(parser)
+
+    def _read_xref_table(self, parser: _ObjectParser) -> Dict[str, Any]:
+        while True:
+            parser.skip_whitespace()
+            if parser.startswith(b"trailer"):
+                parser.position += len(b"trailer")
+                trailer = parser.parse_object()
+                if not isinstance(trailer, dict):
+                    raise PDFStructureError("Virheellinen trailer")
+                return trailer
+            first = parser.read_integer()
+            count = parser.read_integer()
+            parser.skip_whitespace()
+            self.sections.append(_XRefTableSection(self.data, first, count, parser.position))
+            parser.position += max(count, 0) * _XREF_ROW_BYTES
+
+    def _read_xref_stream(self, offset: int) -> Dict[str, Any]:
+        dictionary, stream = self._read_indirect_object(offset)
+        if not isinstance(dictionary, dict) or dictionary.get("Type") != "XRef":
+            raise PDFStructureError(f"Kohdassa {offset} ei ole xref-virtaa")
+        widths = dictionary.get("W")
+        if not isinstance(widths, list) or len(widths) != 3:
+            raise PDFStructureError("Virheellinen /W")
+        index = dictionary.get("Index") or [0, dictionary.get("Size", 0)]
+        self.sections.append(_XRefStreamSection(stream or b"", widths, index))
+        return dictionary
+
+    def _read_indirect_object(
+        self, offset: int, expected_number: Optional[int] = None
+    ) -> Tuple[Any, Optional[bytes]]:
+        parser = _ObjectParser(self.data, offset)
+        number = parser.read_integer()
+        parser.read_integer()
+        if parser.read_token() != b"obj":
+            raise PDFStructureError(f"Kohdassa {offset} ei ole objektia")
+        if expected_number is not None and number != expected_number:
+            raise PDFStructureError(f"Kohdassa {offset} on väärä objekti {number}")
+        value = parser.parse_object()
+        parser.skip_whitespace()
+        if not (isinstance(value, dict) and parser.startswith(b"stream")):
+            return value, None
+        return value, self._read_stream(parser, value)
+
+    def _read_stream(self, parser: _ObjectParser, dictionary: Dict[str, Any]) -> bytes:
+        start = parser.position + len(b"stream")
+        if self.data[start:start + 2] == b"\r\n":
+            start += 2
+        elif self.data[start:start + 1] in (b"\n", b"\r"):
+            start += 1
+        length = dictionary.get("Length")
+        if isinstance(length, PDFReference):
+            length = self.resolve(length)
+        if not isinstance(length, int) or start + length > len(self.data):
+            end = self.data.find(b"endstream", start)
+            if end < 0:
+                raise PDFStructureError("endstream puuttuu")
+            length = end - start
+        return self._decode_stream(bytes(self.data[start:start + length]), dictionary)
+
+    def _decode_stream(self, raw: bytes, dictionary: Dict[str, Any]) -> bytes:
+        filters = dictionary.get("Filter")
+        if filters is None:
+            return raw
+        if not isinstance(filters, list):
+            filters = [filters]
+        if filters != ["FlateDecode"]:
+            raise PDFStructureError(f"Tukematon suodatin {filters}")
+        try:
+            decoded = zlib.decompress(raw)
+        except zlib.error as error:
+            raise PDFStructureError(f"Virran purku epäonnistui: {error}") from error
+        params = dictionary.get("DecodeParms")
+        if isinstance(params, list):
+            params = params[0] if params else None
+        if isinstance(params, dict) and params.get("Predictor", 1) >= 10:
+            return _apply_png_predictor(decoded, int(params.get("Columns", 1)))
+        if isinstance(params, dict) and params.get("Predictor", 1) != 1:
+            raise PDFStructureError("Tukematon ennustin")
+        return decoded
+
+    def _read_compressed_object(self, stream_number: int, object_number: int) -> Any:
+        stream_number, index = divmod(stream_number, 65536)
+        if stream_number not in self._object_streams:
+            kind, location = self.lookup(stream_number)
+            if kind != 1:
+                raise PDFStructureError(f"Objektivirtaa {stream_number} ei löydy")
+            dictionary, stream = self._read_indirect_object(location, stream_number)
+            if not isinstance(dictionary, dict) or stream is None:
+                raise PDFStructureError(f"Objekti {stream_number} ei ole objektivirta")
+            header = _ObjectParser(stream)
+            numbers_and_offsets = [header.read_integer() for _ in range(2 * dictionary["N"])]
+            self._object_streams[stream_number] = (
+                numbers_and_offsets,
+                stream,
+                dictionary["First"],
+            )
+        numbers_and_offsets, stream, first = self._object_streams[stream_number]
+        if 2 * index + 1 >= len(numbers_and_offsets):
+            raise PDFStructureError(f"Objektivirrassa ei ole indeksiä {index}")
+        if numbers_and_offsets[2 * index] != object_number:
+            raise PDFStructureError(f"Objektivirrassa on väärä objekti {object_number}")
+        return _ObjectParser(stream, first + numbers_and_offsets[2 * index + 1]).parse_object()
+
+
+def read_page_count(file_path: str) -> Optional[int]:
+    """
+    Lukee PDF-tiedoston sivumäärän jäsentämättä koko dokumenttia.
+
+    Args:
+        file_path: PDF-tiedoston polku.
+
+    Returns:
+        Sivumäärä, tai None, jos tiedostoa ei voida lukea kevyesti (vaurioitunut
+        rakenne, salaus tai tukematon muoto).
+
+    Raises:
+        OSError: Jos tiedoston avaaminen epäonnistuu.
+    """
+    with open(file_path, "rb") as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return None
+        try:
+            return _StructureReader(data).page_count()
+        except (PDFStructureError, KeyError, TypeError, ValueError, IndexError):
+            return None
+        finally:
+            data.close()
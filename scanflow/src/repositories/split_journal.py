@@ -0,0 +1,268 @@
+"""
+Moduuli jakotyön lokille, jonka avulla keskeytynyt jako voidaan jatkaa.
+
+Tarjoaa `SplitJournal`-luokan, joka kirjoittaa tulostushakemistoon
+JSON Lines -muotoisen, vain lisäyksiä sallivan lokin. Ensimmäinen rivi kuvaa
+työn (lähdetiedoston koko, muokkausaika ja sormenjälki sekä
+jakosuunnitelma) ja jokainen seuraava
+rivi yhden valmiin suunnitelman osan tiedostot kokoineen ja tiivisteineen.
+Yleensä osa on yksi tiedosto, mutta kokorajan ylittänyt osa voi korvautua
+useammalla. Loki poistetaan, kun jako valmistuu.
+"""
+
+import hashlib
+import json
+import os
+from typing import AbstractSet, Any, Dict, List, Optional, Sequence, Tuple
+
+from ..entities.part_result import PartResult
+from ..utils.file_fingerprint import file_sha256, quick_fingerprint
+
+JOURNAL_VERSION = 3
+JOURNAL_SUFFIX = ".scanflow-journal.jsonl"
+
+
+class SplitJournal:
+    """
+    Jakotyön loki valmiiden osien kirjaamiseen ja jatkamiseen.
+
+    Attributes:
+        journal_path (str): Lokitiedoston polku.
+        completed (Dict[int, List[PartResult]]): Jo valmiiksi todettujen
+            osien tiedostot suunnitelman indeksin mukaan. Jatkettaessa
+            sisältää vain osat, joiden kaikkien tiedostojen koko ja
+            tiiviste vastaavat lokia.
+    """
+
+    def __init__(
+        self, journal_path: str, file: Any, completed: Dict[int, List[PartResult]]
+    ):
+        """
+        Alustaa lokin. Käytä tavallisesti `begin`-luokkametodia.
+
+        Args:
+            journal_path: Lokitiedoston polku.
+            file: Avoin, lisäystilassa oleva tiedosto-olio.
+            completed: Jo valmiiksi todetut osat.
+        """
+        self.journal_path = journal_path
+        self.completed = completed
+        self._file = file
+
+    @staticmethod
+    def path_for(output_dir: str, source_path: str) -> str:
+        """
+        Palauttaa lähdetiedoston jakotyön lokin polun tulostushakemistossa.
+
+        Args:
+            output_dir: Tulostushakemisto.
+            source_path: Lähde-PDF:n polku.
+
+        Returns:
+            Lokitiedoston polku.
+        """
+        base_name = os.path.splitext(os.path.basename(source_path))[0]
+        return os.path.join(output_dir, f".{base_name}{JOURNAL_SUFFIX}")
+
+    @classmethod
+    def begin(
+        cls,
+        source_path: str,
+        tasks: Sequence[Tuple[int, int, str]],
+        *,
+        resume: bool = False,
+        skip_pages: AbstractSet[int] = frozenset(),
+    ) -> "SplitJournal":
+        """
+        Aloittaa uuden lokin tai jatkaa olemassa olevaa.
+
+        Olemassa olevaa lokia jatketaan vain, jos `resume` on True ja lokin
+        lähdetiedoston sormenjälki, jakosuunnitelma ja pois jätetyt sivut
+        vastaavat nykyisiä.
+        Muussa tapauksessa loki aloitetaan alusta.
+
+        Args:
+            source_path: Lähde-PDF:n polku.
+            tasks: Ei-tyhjä jakosuunnitelma (start_idx, end_idx, output_path)
+                   -tupleina. Kaikkien osien oletetaan olevan samassa
+                   hakemistossa.
+            resume: Jatketaanko aiempaa lokia.
+            skip_pages: Sivuindeksit, joita ei tallenneta osiin.
+
+        Returns:
+            Avattu `SplitJournal`.
+        """
+        output_dir = os.path.dirname(tasks[0][2])
+        journal_path = cls.path_for(output_dir, source_path)
+        header = cls._build_header(source_path, tasks, skip_pages)
+
+        completed: Dict[int, List[PartResult]] = {}
+        if resume and os.path.exists(journal_path):
+            entries = cls._read_entries(journal_path)
+            if entries and cls._matches(entries[0], header):
+                completed = cls._verify_parts(entries[1:], tasks)
+                file = open(journal_path, "a", encoding="utf-8") # pylint: disable=consider-using-with
+                file.write("\n")
+                return cls(journal_path, file, completed)
+
+        file = open(journal_path, "w", encoding="utf-8") # pylint: disable=consider-using-with
+        journal = cls(journal_path, file, completed)
+        journal._write(header)
+        return journal
+
+    def record(self, index: int, part_results: Sequence[PartResult]) -> None:
+        """
+        Kirjaa valmiin osan lokiin.
+
+        Args:
+            index: Osan indeksi jakosuunnitelmassa.
+            part_results: Osan tallennetut tiedostot. Tavallisesti yksi, tai
+                          useampi, jos osa jaettiin uudelleen.
+        """
+        self._write({
+            "type": "part",
+            "index": index,
+            "files": [
+                {
+                    "file": os.path.basename(part_result.output_path),
+                    "pages": [part_result.start_page, part_result.end_page],
+                    "size": part_result.size_bytes,
+                    "sha256": file_sha256(part_result.output_path),
+                }
+                for part_result in part_results
+            ],
+        })
+
+    def complete(self) -> None:
+        """Sulkee lokin ja poistaa sen, koska jako on valmis."""
+        self.close()
+        try:
+            os.remove(self.journal_path)
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        """Sulkee lokitiedoston. Loki jää levylle jatkamista varten."""
+        if not self._file.closed:
+            self._file.close()
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    @staticmethod
+    def _build_header(
+        source_path: str,
+        tasks: Sequence[Tuple[int, int, str]],
+        skip_pages: AbstractSet[int] = frozenset(),
+    ) -> Dict[str, Any]:
+        plan = [
+            [start_idx, end_idx, os.path.basename(output_path)]
+            for start_idx, end_idx, output_path in tasks
+        ]
+        plan_hash = hashlib.sha256(
+            json.dumps(plan, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        # Sormenjälki kattaa vain tiedoston alun ja lopun, joten samankokoinen
+        # keskeltä muuttunut lähde tunnistetaan muokkausajasta.
+        stat_result = os.stat(source_path)
+        header = {
+            "type": "job",
+            "version": JOURNAL_VERSION,
+            "source": os.path.abspath(source_path),
+            "source_size": stat_result.st_size,
+            "source_mtime_ns": stat_result.st_mtime_ns,
+            "source_fingerprint": quick_fingerprint(source_path),
+            "plan_hash": plan_hash,
+            "plan": plan,
+        }
+        if skip_pages:
+            header["skip_pages"] = sorted(skip_pages)
+        return header
+
+    @staticmethod
+    def _matches(stored: Dict[str, Any], header: Dict[str, Any]) -> bool:
+        return stored.get("type") == "job" and all(
+            stored.get(key) == header.get(key)
+            for key in (
+                "version", "source_size", "source_mtime_ns", "source_fingerprint",
+                "plan_hash", "skip_pages",
+            )
+        )
+
+    @staticmethod
+    def _read_entries(journal_path: str) -> List[Dict[str, Any]]:
+        entries = []
+        with open(journal_path, "r", encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return entries
+
+    @staticmethod
+    def _verify_parts(
+        entries: List[Dict[str, Any]], tasks: Sequence[Tuple[int, int, str]]
+    ) -> Dict[int, List[PartResult]]:
+        completed: Dict[int, List[PartResult]] = {}
+        for entry in entries:
+            index = entry.get("index")
+            if entry.get("type") != "part" or not isinstance(index, int):
+                continue
+            if not 0 <= index < len(tasks):
+                continue
+            part_results = SplitJournal._verify_files(entry.get("files"), tasks[index])
+            if part_results:
+                completed[index] = part_results
+        return completed
+
+    @staticmethod
+    def _verify_files(
+        files: Any, task: Tuple[int, int, str]
+    ) -> Optional[List[PartResult]]:
+        """
+        Tarkistaa osan kirjatut tiedostot levyltä.
+
+        Yksittäisen tiedoston nimen on vastattava suunnitelmaa. Korvaavien
+        tiedostojen sivujen on oltava osan sivuvälillä.
+
+        Returns:
+            Osan tiedostot, tai None, jos yksikin tiedosto puuttuu tai on muuttunut.
+        """
+        start_idx, end_idx, output_path = task
+        if not isinstance(files, list) or not files:
+            return None
+        if len(files) == 1 and files[0].get("file") != os.path.basename(output_path):
+            return None
+        output_dir = os.path.dirname(output_path)
+        part_results = []
+        for entry in files:
+            if not SplitJournal._file_matches(output_dir, entry, (start_idx, end_idx)):
+                return None
+            start_page, end_page = entry["pages"]
+            part_results.append(PartResult(
+                os.path.join(output_dir, entry["file"]), start_page, end_page,
+                size_bytes=entry["size"],
+            ))
+        return part_results
+
+    @staticmethod
+    def _file_matches(output_dir: str, entry: Any, page_range: Tuple[int, int]) -> bool:
+        name = entry.get("file") if isinstance(entry, dict) else None
+        pages = entry.get("pages") if isinstance(entry, dict) else None
+        if not isinstance(name, str) or os.path.basename(name) != name:
+            return False
+        if not isinstance(pages, list) or len(pages) != 2:
+            return False
+        if not page_range[0] + 1 <= pages[0] <= pages[1] <= page_range[1] + 1:
+            return False
+        path = os.path.join(output_dir, name)
+        try:
+            if os.path.getsize(path) != entry.get("size"):
+                return False
+            return file_sha256(path) == entry.get("sha256")
+        except OSError:
+            return False
@@ -0,0 +1,59 @@
+"""
+Moduuli SQLite-pohjaisten välimuistien yhteiselle pohjalle.
+
+Tarjoaa `SQLiteCache`-pohjaluokan, joka avaa välimuistin tietokannan,
+luo sen taulun ja pitää kirjaa osumista. Yhteyttä käytetään useasta
+säikeestä lukon takaa, ja toinen prosessi odottaa kirjoituslukkoa
+enintään `BUSY_TIMEOUT_SECONDS` sekuntia.
+"""
+
+import sqlite3
+import threading
+
+BUSY_TIMEOUT_SECONDS = 30
+
+
+class SQLiteCache:
+    """
+    Yhteinen pohja välimuisteille, jotka tallentavat merkintänsä SQLiteen.
+
+    Attributes:
+        db_path (str): Tietokantatiedoston polku.
+        hits (int): Välimuistiosumien määrä tämän instanssin elinaikana.
+        misses (int): Hutien määrä tämän instanssin elinaikana.
+    """
+
+    def __init__(self, db_path: str, schema: str):
+        """
+        Avaa tietokannan ja luo välimuistin taulun tarvittaessa.
+
+        Args:
+            db_path: Tietokantatiedoston polku.
+            schema: Taulun luova `CREATE TABLE IF NOT EXISTS` -lause.
+        """
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            db_path, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False
+        )
+        with self._connection:
+            self._connection.execute(schema)
+
+    def close(self) -> None:
+        """Sulkee tietokantayhteyden."""
+        with self._lock:
+            self._connection.close()
+
+    def _evict_least_recent(self, table: str, key_column: str, max_entries: int) -> None:
+        """
+        Poistaa vanhimmat käyttämättömät merkinnät enimmäismäärän yli.
+
+        Kutsutaan lukon ja transaktion sisällä.
+        """
+        self._connection.execute(
+            f"DELETE FROM {table} WHERE {key_column} IN ("
+            f"SELECT {key_column} FROM {table} ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (max_entries,),
+        )
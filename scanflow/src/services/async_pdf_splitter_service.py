@@ -0,0 +1,289 @@
+"""
+Asyncio-yhteensopiva palvelu PDF-tiedostojen jakamiseen.
+
+Tarjoaa `AsyncPDFSplitterService`-luokan, joka käyttää
+`PDFSplitterService`-luokan jakosuunnitelmia ja suorittaa osien
+poiminnan prosessipoolissa. Valmiit osat voidaan kuluttaa
+`async for` -silmukalla sitä mukaa kuin ne valmistuvat.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .part_workers import extract_part_in_worker, init_part_worker
+from .pdf_splitter_service import PDFSplitterService
+
+
+class AsyncPDFSplitterService:
+    """
+    Asynkroninen palvelu PDF-tiedostojen jakamiseen.
+
+    Samanaikaisesti käsittelyssä olevien osien määrä on rajattu
+    `max_concurrency`-arvoon. Uusia osia käynnistetään vasta, kun kuluttaja
+    pyytää seuraavaa valmista osaa, joten hidas kuluttaja ei saa palvelua
+    tuottamaan rajattomasti osia etukäteen.
+
+    Palvelu ei tue `SplitOptions`-asetuksia: jakotyön lokia ja jatkamista,
+    osavälimuistia, tyhjien sivujen pois jättämistä eikä edistymistapahtumia.
+    Niitä tarvitseva kutsuja voi ajaa `PDFSplitterService`-luokan
+    jakometodin tapahtumasilmukkaa estämättä `asyncio.to_thread`-funktiolla.
+    """
+
+    def __init__(
+        self,
+        splitter_service: Optional[PDFSplitterService] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        """
+        Alustaa asynkronisen jakamispalvelun.
+
+        Args:
+            splitter_service: Valinnainen PDFSplitterService-instanssi. Jos None,
+                              luodaan uusi instanssi.
+            max_concurrency: Samanaikaisten työprosessien enimmäismäärä.
+                             Oletuksena prosessorien määrä.
+
+        Raises:
+            ValueError: Jos max_concurrency on alle 1.
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("Samanaikaisuuden tulee olla vähintään 1.")
+        self.splitter_service = splitter_service or PDFSplitterService()
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+
+    async def get_pdf_info(self, file_path: str) -> Dict[str, Any]:
+        """
+        Hakee PDF-tiedoston perustiedot tapahtumasilmukkaa estämättä.
+
+        Args:
+            file_path: PDF-tiedoston polku.
+
+        Returns:
+            Sanakirja, joka sisältää sivumäärän, tiedostopolun ja tiedoston nimen.
+        """
+        return await asyncio.to_thread(self.splitter_service.get_pdf_info, file_path)
+
+    def iter_split_by_fixed_range(
+        self, file_path: str, pages_per_file: int, output_dir: str
+    ) -> AsyncIterator[str]:
+        """
+        Jakaa PDF-tiedoston kiinteän sivumäärän osiin ja tuottaa valmiit osat.
+
+        Args:
+            file_path: PDF-tiedoston polku.
+            pages_per_file: Sivujen määrä tiedostoa kohden.
+            output_dir: Kohdepolku, johon tiedostot tallennetaan.
+
+        Returns:
+            Asynkroninen iteraattori, joka tuottaa valmiiden osatiedostojen
+            polut jakojärjestyksessä.
+
+        Raises:
+            ValueError: Jos pages_per_file on alle 1 (iteroitaessa).
+            IOError: Jos tulostushakemistoa ei löydy (iteroitaessa).
+        """
+        return self._run_plan(
+            file_path,
+            output_dir,
+            lambda page_count: self.splitter_service.plan_fixed_range(
+                file_path, page_count, pages_per_file, output_dir
+            ),
+        )
+
+    def iter_split_by_custom_ranges(
+        self, file_path: str, ranges: List[Tuple[int, int]], output_dir: str
+    ) -> AsyncIterator[str]:
+        """
+        Jakaa PDF-tiedoston annettujen sivualueiden mukaan ja tuottaa valmiit osat.
+
+        Args:
+            file_path: PDF-tiedoston polku.
+            ranges: Lista (aloitussivu, lopetussivu) -tupleja, 1-pohjaisia.
+            output_dir: Kohdepolku, johon tiedostot tallennetaan.
+
+        Returns:
+            Asynkroninen iteraattori, joka tuottaa valmiiden osatiedostojen
+            polut jakojärjestyksessä.
+
+        Raises:
+            ValueError: Jos sivualueita ei ole tai jokin alue on virheellinen
+                        (iteroitaessa).
+            IOError: Jos tulostushakemistoa ei löydy (iteroitaessa).
+        """
+        return self._run_plan(
+            file_path,
+            output_dir,
+            lambda page_count: self.splitter_service.plan_custom_ranges(
+                file_path, page_count, ranges, output_dir
+            ),
+        )
+
+    async def split_by_fixed_range(
+        self, file_path: str, pages_per_file: int, output_dir: str
+    ) -> List[str]:
+        """
+        Jakaa PDF-tiedoston kiinteän sivumäärän osiin.
+
+        Args:
+            file_path: PDF-tiedoston polku.
+            pages_per_file: Sivujen määrä tiedostoa kohden.
+            output_dir: Kohdepolku, johon tiedostot tallennetaan.
+
+        Returns:
+            Lista luotujen tiedostojen polkuja.
+        """
+        return [
+            output_path
+            async for output_path in self.iter_split_by_fixed_range(
+                file_path, pages_per_file, output_dir
+            )
+        ]
+
+    async def split_by_custom_ranges(
+        self, file_path: str, ranges: List[Tuple[int, int]], output_dir: str
+    ) -> List[str]:
+        """
+        Jakaa PDF-tiedoston annettujen sivualueiden mukaan.
+
+        Args:
+            file_path: PDF-tiedoston polku.
+            ranges: Lista (aloitussivu, lopetussivu) -tupleja, 1-pohjaisia.
+            output_dir: Kohdepolku, johon tiedostot tallennetaan.
+
+        Returns:
+            Lista luotujen tiedostojen polkuja.
+        """
+        return [
+            output_path
+            async for output_path in self.iter_split_by_custom_ranges(
+                file_path, ranges, output_dir
+            )
+        ]
+
+    def _validate_output_dir(self, output_dir: str) -> None:
+        if not os.path.isdir(output_dir):
+            raise IOError(
+                f"Tulostushakemistoa ei löydy tai se ei ole hakemisto: {output_dir}"
+            )
+
+    async def _plan_tasks(
+        self,
+        file_path: str,
+        output_dir: str,
+        plan: Callable[[int], List[Tuple[int, int, str]]],
+    ) -> List[Tuple[int, int, str]]:
+        self._validate_output_dir(output_dir)
+        info = await self.get_pdf_info(file_path)
+        return plan(info["page_count"])
+
+    async def _run_plan(
+        self,
+        file_path: str,
+        output_dir: str,
+        plan: Callable[[int], List[Tuple[int, int, str]]],
+    ) -> AsyncIterator[str]:
+        """
+        Suunnittelee jaon ja suorittaa sen osat rajatulla samanaikaisuudella.
+
+        Käynnissä on kerrallaan enintään `max_concurrency` tehtävää. Jos
+        kuluttaja keskeyttää iteroinnin, tehtävä perutaan
+        (`asyncio.CancelledError`) tai osa epäonnistuu, aloittamattomat
+        tehtävät perutaan ja työprosesseja pyydetään lopettamaan jaetun
+        tapahtumaolion kautta. Kun käynnissä olleet osat ovat pysähtyneet,
+        kuluttajalle luovuttamattomat osatiedostot poistetaan.
+
+        Args:
+            file_path: Lähde-PDF:n polku.
+            output_dir: Kohdehakemisto.
+            plan: Funktio, joka palauttaa lähteen sivumäärän perusteella
+                  listan (start_idx, end_idx, output_path) -tupleja.
+
+        Yields:
+            Valmiiden osatiedostojen polut jakojärjestyksessä.
+        """
+        tasks = await self._plan_tasks(file_path, output_dir, plan)
+        if not tasks:
+            return
+
+        loop = asyncio.get_running_loop()
+        cancel_event = multiprocessing.Event()
+        executor = ProcessPoolExecutor(
+            max_workers=min(self.max_concurrency, len(tasks)),
+            initializer=init_part_worker,
+            initargs=(file_path, cancel_event),
+        )
+        pending: List[asyncio.Future] = []
+        next_task = iter(tasks)
+        yielded = 0
+        try:
+            for _ in range(self.max_concurrency):
+                self._submit_next(loop, executor, next_task, pending)
+            while pending:
+                part_result = await pending[0]
+                pending.pop(0)
+                self._submit_next(loop, executor, next_task, pending)
+                yielded += 1
+                yield part_result.output_path
+        finally:
+            if yielded < len(tasks):
+                await _abort_pending(
+                    executor, cancel_event, pending, tasks[yielded:yielded + len(pending)]
+                )
+            else:
+                executor.shutdown(wait=False)
+
+    def _submit_next(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        executor: ProcessPoolExecutor,
+        next_task: Iterator[Tuple[int, int, str]],
+        pending: List[asyncio.Future],
+    ) -> None:
+        """
+        Käynnistää suunnitelman seuraavan osan poiminnan prosessipoolissa.
+
+        Args:
+            loop: Käynnissä oleva tapahtumasilmukka.
+            executor: Jaon prosessipooli.
+            next_task: Iteraattori aloittamattomista (start_idx, end_idx,
+                       output_path) -tupleista.
+            pending: Käynnissä olevat tehtävät jakojärjestyksessä. Päivitetään.
+        """
+        task = next(next_task, None)
+        if task is not None:
+            pending.append(loop.run_in_executor(executor, extract_part_in_worker, *task))
+
+
+async def _abort_pending(
+    executor: ProcessPoolExecutor,
+    cancel_event: Any,
+    pending: List[asyncio.Future],
+    unfinished: List[Tuple[int, int, str]],
+) -> None:
+    """
+    Peruu keskeneräiset tehtävät ja poistaa niiden osatiedostot.
+
+    Pyytää työprosesseja lopettamaan ja odottaa käynnissä olevien osien
+    pysähtymistä säikeessä, jotta mikään työprosessi ei kirjoita osaa
+    poistamisen jälkeen.
+
+    Args:
+        executor: Jaon prosessipooli.
+        cancel_event: Työprosessien kanssa jaettu peruutustapahtuma.
+        pending: Kuluttajalle luovuttamattomien osien tehtävät.
+        unfinished: Samojen osien (start_idx, end_idx, output_path) -tuplet.
+    """
+    cancel_event.set()
+    for future in pending:
+        if future.done() and not future.cancelled():
+            future.exception()
+        future.cancel()
+    await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+    for _start_idx, _end_idx, output_path in unfinished:
+        try:
+            os.remove(output_path)
+        except FileNotFoundError:
+            pass
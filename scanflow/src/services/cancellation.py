@@ -0,0 +1,69 @@
+"""
+Moduuli pitkäkestoisten PDF-operaatioiden peruuttamiseen.
+
+Tarjoaa `CancellationToken`-luokan, jonka avulla kutsuja voi pyytää
+käynnissä olevan jaon keskeyttämistä, sekä `SplitCancelledError`-poikkeuksen,
+jolla palvelu ilmoittaa keskeytyksestä ja jo kirjoitetuista osista.
+"""
+
+import threading
+from typing import Any, List, Optional
+
+
+class SplitCancelledError(Exception):
+    """
+    Poikkeus, joka nostetaan, kun jako peruutetaan kesken.
+
+    Attributes:
+        written_paths (List[str]): Ennen peruutusta tallennettujen
+            osatiedostojen polut jakojärjestyksessä.
+    """
+
+    def __init__(self, written_paths: Optional[List[str]] = None):
+        self.written_paths = list(written_paths or [])
+        super().__init__(
+            f"Jako peruutettiin. Valmiita osia ehdittiin tallentaa {len(self.written_paths)}."
+        )
+
+    def __reduce__(self):
+        return (self.__class__, (self.written_paths,))
+
+
+class CancellationToken:
+    """
+    Säieturvallinen peruutuspyyntö yhteistoiminnalliseen keskeyttämiseen.
+
+    Palvelu tarkistaa tokenin tilan osien välissä sekä sivujen poiminnan ja
+    tallennuksen välissä. Token voidaan luoda myös valmiin tapahtumaolion
+    ympärille, jolloin sama peruutuspyyntö näkyy esimerkiksi työprosesseille
+    `multiprocessing.Event`-olion kautta.
+    """
+
+    def __init__(self, event: Optional[Any] = None):
+        """
+        Alustaa peruutustokenin.
+
+        Args:
+            event: Valinnainen tapahtumaolio, jolla on metodit `set` ja
+                   `is_set`. Oletuksena luodaan uusi `threading.Event`.
+        """
+        self._event = event if event is not None else threading.Event()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Palauttaa True, jos peruutusta on pyydetty."""
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Pyytää operaation peruuttamista."""
+        self._event.set()
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Nostaa poikkeuksen, jos peruutusta on pyydetty.
+
+        Raises:
+            SplitCancelledError: Jos peruutusta on pyydetty.
+        """
+        if self.is_cancelled:
+            raise SplitCancelledError()
@@ -9,6 +9,10 @@ import os
 import time
 from typing import List, Tuple, Callable, Optional
 
+from ..entities.progress_event import ProgressEvent
+from .cancellation import SplitCancelledError
+from .split_options import SplitOptions
+
 
 class FallbackPDFService:
     """
@@ -44,6 +48,7 @@ class FallbackPDFService:
         *,
         base_filename: Optional[str] = None,
         progress_callback: Optional[Callable[[int], None]] = None,
+        options: Optional[SplitOptions] = None,
     ) -> List[str]:
         """
         Simuloi PDF-tiedoston jakamista kiinteän sivumäärän mukaan.
@@ -54,22 +59,34 @@ class FallbackPDFService:
             output_dir: Hakemisto, johon tulostiedostot tallennetaan.
             base_filename: Tiedostonimen perusosa.
             progress_callback: Edistymistä seuraava callback-funktio.
+            options: Valinnaiset suoritusasetukset. Vain peruutustokenia ja
+                     edistymistapahtumien kuuntelijaa käytetään.
 
         Returns:
             Lista simuloituja tulostiedostoja.
+
+        Raises:
+            SplitCancelledError: Jos jako peruutettiin.
         """
         if base_filename is None:
             base_filename = os.path.splitext(os.path.basename(file_path))[0]
 
+        options = options or SplitOptions()
         total_parts = 3
         parts_done = 0
 
         for i in range(total_parts):
+            if options.cancel_token is not None and options.cancel_token.is_cancelled:
+                raise SplitCancelledError()
             time.sleep(0.7)
             parts_done += 1
 
             if progress_callback:
                 progress_callback(int(parts_done / total_parts * 100))
+            if options.progress_listener:
+                options.progress_listener(
+                    ProgressEvent(parts_done, total_parts, elapsed_seconds=0.7 * parts_done)
+                )
 
         return [
             os.path.join(output_dir, f"{base_filename}_part{i + 1}.pdf")
@@ -84,6 +101,7 @@ class FallbackPDFService:
         *,
         base_filename: Optional[str] = None,
         progress_callback: Optional[Callable[[int], None]] = None,
+        options: Optional[SplitOptions] = None,
     ) -> List[str]:
         """
         Simuloi PDF-tiedoston jakamista mukautettujen sivualueiden mukaan.
@@ -94,22 +112,34 @@ class FallbackPDFService:
             output_dir: Hakemisto, johon tulostiedostot tallennetaan.
             base_filename: Tiedostonimen perusosa.
             progress_callback: Edistymistä seuraava callback-funktio.
+            options: Valinnaiset suoritusasetukset. Vain peruutustokenia ja
+                     edistymistapahtumien kuuntelijaa käytetään.
 
         Returns:
             Lista simuloituja tulostiedostoja.
+
+        Raises:
+            SplitCancelledError: Jos jako peruutettiin.
         """
         if base_filename is None:
             base_filename = os.path.splitext(os.path.basename(file_path))[0]
 
+        options = options or SplitOptions()
         total_parts = len(ranges)
         parts_done = 0
 
         for i in range(total_parts):
+            if options.cancel_token is not None and options.cancel_token.is_cancelled:
+                raise SplitCancelledError()
             time.sleep(0.6)
             parts_done += 1
 
             if progress_callback:
                 progress_callback(int(parts_done / total_parts * 100))
+            if options.progress_listener:
+                options.progress_listener(
+                    ProgressEvent(parts_done, total_parts, elapsed_seconds=0.6 * parts_done)
+                )
 
         return [
             os.path.join(output_dir, f"{base_filename}_custom_part{i + 1}.pdf")
@@ -0,0 +1,186 @@
+"""
+Moduuli PDF:n jakamiseen osiin kirjanmerkkien (sisällysluettelon) mukaan.
+
+Osien rajat muodostetaan kirjanmerkeistä, joiden taso on enintään annettu
+taso. Jokaiselle osalle kootaan ne kirjanmerkit, jotka osoittavat osan
+sivuille, jolloin osa saa oman alipuunsa sisällysluettelosta. Kirjanmerkit
+käydään läpi kerran, ja osa haetaan lajitellusta rajaindeksistä
+binäärihaulla, joten kymmenien tuhansien kirjanmerkkien luettelokin
+käsitellään nopeasti.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import AbstractSet, Dict, List, Optional, Sequence, Tuple
+
+# Kirjanmerkki muodossa (taso, otsikko, sivu). Sivu on 1-pohjainen, tai -1,
+# jos kirjanmerkki ei osoita dokumentin sivulle.
+OutlineEntry = Tuple[int, str, int]
+
+LEADING_PART_TITLE = "alku"
+MAX_TITLE_LENGTH = 80
+
+_UNSAFE_FILENAME_CHARS = re.compile(r'[\x00-\x1f<>:"/\\|?*]+')
+_WHITESPACE = re.compile(r"\s+")
+
+
+class OutlinePart:
+    """
+    Yksi kirjanmerkkien mukaan muodostettu osa.
+
+    Attributes:
+        start_idx (int): Osan ensimmäisen sivun indeksi (0-pohjainen).
+        end_idx (int): Osan viimeisen sivun indeksi (0-pohjainen, sisällytetty).
+        title (str): Osan aloittavan kirjanmerkin otsikko.
+        entries (List[OutlineEntry]): Osan sivuille osoittavat kirjanmerkit
+            lähteen sivunumeroin. Tasot on normalisoitu alkamaan ykkösestä.
+    """
+
+    __slots__ = ("start_idx", "end_idx", "title", "entries")
+
+    def __init__(
+        self, start_idx: int, end_idx: int, title: str, entries: List[OutlineEntry]
+    ):
+        """
+        Alustaa uuden OutlinePart-olion.
+
+        Args:
+            start_idx: Osan ensimmäisen sivun indeksi (0-pohjainen).
+            end_idx: Osan viimeisen sivun indeksi (0-pohjainen, sisällytetty).
+            title: Osan aloittavan kirjanmerkin otsikko.
+            entries: Osan sivuille osoittavat kirjanmerkit.
+        """
+        self.start_idx = start_idx
+        self.end_idx = end_idx
+        self.title = title
+        self.entries = entries
+
+
+def safe_title(title: str) -> str:
+    """
+    Muuntaa kirjanmerkin otsikon tiedostonimeen sopivaksi.
+
+    Args:
+        title: Kirjanmerkin otsikko.
+
+    Returns:
+        Otsikko ilman tiedostonimissä kiellettyjä merkkejä, enintään
+        MAX_TITLE_LENGTH merkkiä. Tyhjän otsikon tilalla palautetaan "osa".
+    """
+    cleaned = _WHITESPACE.sub(" ", title)
+    cleaned = _UNSAFE_FILENAME_CHARS.sub("_", cleaned).strip(" .")
+    return cleaned[:MAX_TITLE_LENGTH].rstrip(" .") or "osa"
+
+
+def _normalize_levels(entries: List[OutlineEntry]) -> List[OutlineEntry]:
+    """
+    Korjaa osan kirjanmerkkien tasot kelvolliseksi hierarkiaksi.
+
+    Ensimmäinen taso on 1, eikä taso kasva kerralla yhtä enempää.
+
+    Args:
+        entries: Osan kirjanmerkit luettelon järjestyksessä.
+
+    Returns:
+        Kirjanmerkit korjatuin tasoin.
+    """
+    if not entries:
+        return entries
+    shift = min(level for level, _title, _page in entries) - 1
+    normalized = []
+    previous_level = 0
+    for level, title, page in entries:
+        level = min(level - shift, previous_level + 1)
+        normalized.append((level, title, page))
+        previous_level = level
+    return normalized
+
+
+def plan_outline_parts(
+    outline: Sequence[OutlineEntry], page_count: int, level: int = 1
+) -> List[OutlinePart]:
+    """
+    Muodostaa osat kirjanmerkeistä.
+
+    Uusi osa alkaa jokaiselta sivulta, jolle osoittaa kirjanmerkki, jonka
+    taso on enintään `level`. Saman sivun kirjanmerkeistä osan nimeksi tulee
+    luettelossa ensimmäinen. Ensimmäistä kirjanmerkkiä edeltävät sivut
+    muodostavat oman osansa. Kirjanmerkki, joka ei osoita sivulle, kuuluu
+    samaan osaan kuin sitä edeltävä kirjanmerkki.
+
+    Args:
+        outline: Sisällysluettelo `PDFRepository.get_outline`-muodossa.
+        page_count: Dokumentin sivumäärä.
+        level: Syvin taso, jonka kirjanmerkit aloittavat uuden osan.
+
+    Returns:
+        Osat sivujärjestyksessä.
+
+    Raises:
+        ValueError: Jos level on alle 1 tai yksikään kirjanmerkki ei
+                    aloita osaa.
+    """
+    if level < 1:
+        raise ValueError("Kirjanmerkkien tason tulee olla vähintään 1.")
+    titles_by_start: Dict[int, str] = {}
+    for entry_level, title, page in outline:
+        if entry_level <= level and 1 <= page <= page_count:
+            titles_by_start.setdefault(page - 1, title)
+    if not titles_by_start:
+        raise ValueError(
+            f"Dokumentissa ei ole sivuille osoittavia kirjanmerkkejä tasolla 1-{level}."
+        )
+
+    starts = sorted(titles_by_start)
+    if starts[0] > 0:
+        starts.insert(0, 0)
+        titles_by_start[0] = LEADING_PART_TITLE
+    entries: List[List[OutlineEntry]] = [[] for _ in starts]
+    part_index = 0
+    for entry_level, title, page in outline:
+        if 1 <= page <= page_count:
+            part_index = bisect_right(starts, page - 1) - 1
+        else:
+            page = -1
+        entries[part_index].append((entry_level, title, page))
+
+    ends = starts[1:] + [page_count]
+    return [
+        OutlinePart(start, end - 1, titles_by_start[start], _normalize_levels(part_entries))
+        for start, end, part_entries in zip(starts, ends, entries)
+    ]
+
+
+def rebase_outline(
+    entries: Sequence[OutlineEntry],
+    start_idx: int,
+    end_idx: int,
+    skip_pages: Optional[AbstractSet[int]] = None,
+) -> List[OutlineEntry]:
+    """
+    Muuntaa osan kirjanmerkkien sivunumerot osatiedoston sivunumeroiksi.
+
+    Pois jätetylle sivulle osoittava kirjanmerkki siirretään seuraavalle
+    osaan tallennetulle sivulle.
+
+    Args:
+        entries: Osan kirjanmerkit lähteen sivunumeroin.
+        start_idx: Osan ensimmäisen sivun indeksi lähteessä (0-pohjainen).
+        end_idx: Osan viimeisen sivun indeksi lähteessä (0-pohjainen).
+        skip_pages: Valinnaiset lähteen sivuindeksit, joita ei tallenneta osaan.
+
+    Returns:
+        Kirjanmerkit osatiedoston 1-pohjaisin sivunumeroin.
+    """
+    skipped = (
+        [page for page in range(start_idx, end_idx + 1) if page in skip_pages]
+        if skip_pages
+        else []
+    )
+    rebased = []
+    for level, title, page in entries:
+        if page > 0:
+            page_idx = page - 1
+            page = page_idx - start_idx - bisect_left(skipped, page_idx) + 1
+        rebased.append((level, title, page))
+    return rebased
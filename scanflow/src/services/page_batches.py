@@ -0,0 +1,298 @@
+"""
+Moduuli lähdetiedoston sivujen käsittelyyn erissä.
+
+Tarjoaa `PageBatchProcessor`-pohjaluokan, jota sivujen luokittelu,
+piirteiden laskenta ja tekstin poiminta käyttävät. Sivut jaetaan
+peräkkäisiin eriin, ja jokainen erä käsitellään joko kutsuvassa
+prosessissa tai työprosessissa, joka avaa lähde-PDF:n kerran. Erän
+käsittelevän funktion tulee olla moduulitason funktio, jotta se voidaan
+välittää työprosesseille. Koko tiedoston tulos tallennetaan valinnaiseen
+`PageStatsCache`-välimuistiin lähteen sisällön tiivisteen mukaan.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..repositories.page_stats_cache import PageStatsCache
+from ..repositories.pdf_repository import PDFRepository
+from ..utils import tracing
+from ..utils.file_fingerprint import file_sha256
+from .cancellation import CancellationToken, SplitCancelledError
+
+# Erän käsittelijä: (repositorio, avattu lähdedokumentti, start_idx, end_idx) -> tulos.
+ProcessRange = Callable[[PDFRepository, Any, int, int], Any]
+
+_BATCH_STATE: Dict[str, Any] = {}
+
+
+def page_batches(page_count: int, batch_size: int) -> List[Tuple[int, int]]:
+    """
+    Jakaa sivut peräkkäisiin eriin.
+
+    Args:
+        page_count: Dokumentin sivumäärä.
+        batch_size: Erän enimmäiskoko.
+
+    Returns:
+        Lista (start_idx, end_idx) -tupleja, joissa end_idx on viimeistä
+        sivua seuraava indeksi.
+    """
+    return [
+        (start, min(start + batch_size, page_count))
+        for start in range(0, page_count, batch_size)
+    ]
+
+
+def init_batch_worker(file_path: str, process_range: ProcessRange) -> None:
+    """
+    Avaa lähde-PDF:n kerran jokaista eriä käsittelevää työprosessia kohden.
+
+    Args:
+        file_path: Lähde-PDF:n polku.
+        process_range: Erän käsittelijä.
+    """
+    tracing.disable()
+    repository = PDFRepository()
+    _BATCH_STATE["repository"] = repository
+    _BATCH_STATE["source_doc"] = repository.load_pdf(file_path)
+    _BATCH_STATE["process_range"] = process_range
+
+
+def process_batch_in_worker(start_idx: int, end_idx: int) -> Any:
+    """
+    Käsittelee sivuerän työprosessissa.
+
+    Args:
+        start_idx: Ensimmäisen sivun indeksi (0-pohjainen).
+        end_idx: Viimeistä sivua seuraava indeksi.
+
+    Returns:
+        Erän käsittelijän tulos.
+    """
+    return _BATCH_STATE["process_range"](
+        _BATCH_STATE["repository"], _BATCH_STATE["source_doc"], start_idx, end_idx
+    )
+
+
+class PageBatchProcessor:
+    """
+    Yhteinen pohja luokille, jotka käsittelevät tiedoston sivut erissä.
+
+    Aliluokka määrittää erän käsittelijän `process_range`, välimuistiavaimen
+    asetukset `cache_signature` ja oletuserän koon `default_batch_size`.
+    Erien tulokset yhdistetään ja muunnetaan välimuistiin tallennettavaksi
+    `combine`-, `to_payload`- ja `from_payload`-metodeilla.
+
+    Attributes:
+        pdf_repository (PDFRepository): Repositorio sarjassa käsittelyyn.
+        workers (int): Työprosessien määrä.
+        batch_size (int): Yhdellä kertaa käsiteltävien sivujen määrä.
+        page_cache (Optional[PageStatsCache]): Valinnainen välimuisti koko
+            tiedoston tulokselle.
+    """
+
+    process_range: ProcessRange
+    cache_signature: Dict[str, Any] = {}
+    default_batch_size = 32
+
+    def __init__(
+        self,
+        pdf_repository: Optional[PDFRepository] = None,
+        workers: int = 1,
+        batch_size: Optional[int] = None,
+        page_cache: Optional[PageStatsCache] = None,
+    ):
+        """
+        Alustaa käsittelijän.
+
+        Args:
+            pdf_repository: Valinnainen PDFRepository-instanssi sarjassa
+                            käsittelyyn. Jos None, luodaan uusi.
+            workers: Työprosessien määrä. Arvolla 1 erät käsitellään
+                     kutsuvassa prosessissa.
+            batch_size: Yhdellä kertaa käsiteltävien sivujen määrä. Oletuksena
+                        `default_batch_size`.
+            page_cache: Valinnainen välimuisti. Jos annettu, saman
+                        sisältöisen tiedoston sivuja ei käsitellä uudelleen.
+
+        Raises:
+            ValueError: Jos workers tai batch_size on alle 1.
+        """
+        if batch_size is None:
+            batch_size = self.default_batch_size
+        if workers < 1:
+            raise ValueError("Työprosessien määrän tulee olla vähintään 1.")
+        if batch_size < 1:
+            raise ValueError("Erän koon tulee olla vähintään 1.")
+        self.pdf_repository = pdf_repository or PDFRepository()
+        self.workers = workers
+        self.batch_size = batch_size
+        self.page_cache = page_cache
+
+    def extract(
+        self,
+        file_path: str,
+        source_doc: Optional[Any] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Any:
+        """
+        Palauttaa tiedoston kaikkien sivujen tulokset välimuistista tai erissä laskien.
+
+        Args:
+            file_path: Lähde-PDF:n polku.
+            source_doc: Valinnainen jo avattu lähdedokumentti, jota käytetään
+                        sarjassa käsiteltäessä.
+            cancel_token: Valinnainen peruutustoken, joka tarkistetaan erien välissä.
+
+        Returns:
+            Erien tulokset `combine`-metodilla yhdistettyinä.
+
+        Raises:
+            SplitCancelledError: Jos käsittely peruutettiin.
+        """
+        if self.page_cache is None:
+            return self.combine(
+                self.map_batches(self.process_range, file_path, source_doc, cancel_token)
+            )
+        key = PageStatsCache.make_key(file_sha256(file_path), self.cache_signature)
+        cached = self.page_cache.get(key)
+        if cached is not None:
+            return self.from_payload(cached)
+        value = self.combine(
+            self.map_batches(self.process_range, file_path, source_doc, cancel_token)
+        )
+        self.page_cache.put(key, self.to_payload(value))
+        return value
+
+    def combine(self, results: List[Any]) -> Any:
+        """
+        Yhdistää erien tulokset sivujärjestyksessä.
+
+        Args:
+            results: Erien tulokset, oletuksena listoja.
+
+        Returns:
+            Sivujen tulokset yhtenä listana.
+        """
+        return [item for result in results for item in result]
+
+    def to_payload(self, value: Any) -> Any:
+        """Muuntaa tuloksen välimuistiin tallennettavaksi JSON-arvoksi."""
+        return value
+
+    def from_payload(self, payload: Any) -> Any:
+        """Muuntaa välimuistista luetun JSON-arvon tulokseksi."""
+        return payload
+
+    def map_batches(
+        self,
+        process_range: ProcessRange,
+        file_path: str,
+        source_doc: Optional[Any] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> List[Any]:
+        """
+        Käsittelee tiedoston kaikki sivut erissä.
+
+        Args:
+            process_range: Erän käsittelijä (moduulitason funktio).
+            file_path: Lähde-PDF:n polku.
+            source_doc: Valinnainen jo avattu lähdedokumentti, jota käytetään
+                        sarjassa käsiteltäessä.
+            cancel_token: Valinnainen peruutustoken, joka tarkistetaan erien välissä.
+
+        Returns:
+            Erien tulokset sivujärjestyksessä. Tyhjälle dokumentille tyhjä lista.
+
+        Raises:
+            SplitCancelledError: Jos käsittely peruutettiin.
+        """
+        opened = source_doc is None
+        if opened:
+            source_doc = self.pdf_repository.load_pdf(file_path)
+        try:
+            batches = page_batches(
+                self.pdf_repository.get_page_count(source_doc), self.batch_size
+            )
+            if self.workers <= 1 or len(batches) <= 1:
+                return _map_serial(
+                    process_range, self.pdf_repository, source_doc, batches, cancel_token
+                )
+        finally:
+            if opened:
+                self.pdf_repository.close_pdf(source_doc)
+        return _map_parallel(process_range, file_path, batches, self.workers, cancel_token)
+
+
+class PageArrayProcessor(PageBatchProcessor):
+    """
+    Pohja käsittelijöille, joiden erien tulokset ovat NumPy-taulukoita.
+
+    Tulos on liukulukutaulukko muodossa (sivut, `columns`).
+    """
+
+    columns: int
+
+    def combine(self, results: List[Any]) -> np.ndarray:
+        """
+        Yhdistää erien taulukot yhdeksi taulukoksi.
+
+        Args:
+            results: Erien taulukot.
+
+        Returns:
+            Taulukko muodossa (sivut, columns). Tyhjälle dokumentille tyhjä taulukko.
+        """
+        if not results:
+            return np.zeros((0, self.columns), dtype=np.float64)
+        return np.concatenate(results)
+
+    def to_payload(self, value: np.ndarray) -> Any:
+        """Muuntaa taulukon sisäkkäisiksi listoiksi."""
+        return value.tolist()
+
+    def from_payload(self, payload: Any) -> np.ndarray:
+        """Muuntaa sisäkkäiset listat taulukoksi."""
+        return np.asarray(payload, dtype=np.float64).reshape(-1, self.columns)
+
+
+def _map_serial(
+    process_range: ProcessRange,
+    pdf_repository: PDFRepository,
+    source_doc: Any,
+    batches: List[Tuple[int, int]],
+    cancel_token: Optional[CancellationToken],
+) -> List[Any]:
+    results = []
+    for start, end in batches:
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        results.append(process_range(pdf_repository, source_doc, start, end))
+    return results
+
+
+def _map_parallel(
+    process_range: ProcessRange,
+    file_path: str,
+    batches: List[Tuple[int, int]],
+    workers: int,
+    cancel_token: Optional[CancellationToken],
+) -> List[Any]:
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(batches)),
+        initializer=init_batch_worker,
+        initargs=(file_path, process_range),
+    ) as executor:
+        futures = [
+            executor.submit(process_batch_in_worker, start, end) for start, end in batches
+        ]
+        for future in futures:
+            if cancel_token is not None and cancel_token.is_cancelled:
+                for pending in futures:
+                    pending.cancel()
+                raise SplitCancelledError([])
+            results.append(future.result())
+    return results
@@ -0,0 +1,318 @@
+"""
+Moduuli skannattujen sivujen luokitteluun sisältö-, tyhjiksi ja erotinsivuiksi.
+
+Sivut renderöidään pieniksi harmaasävykuviksi (A4-sivulla noin 30 DPI),
+ja kuvista lasketaan erissä NumPy-tunnusluvut:
+
+- musteen peitto eli tummien pikselien osuus reunoja lukuun ottamatta
+- erotinkoodin (patch code) palkit sarakkeiden ja rivien projektioista:
+  palkki on riittävän pitkä sarake tai rivi, joka on umpimusta
+  ensimmäisestä viimeiseen tummaan pikseliinsä, ja palkkien tulee olla
+  lähekkäin
+
+Tunnusluvut lasketaan työprosesseissa, joten pääprosessiin siirtyy vain
+muutama luku sivua kohden kuvien sijaan. `PageStatsCache`-välimuistin
+kanssa saman tiedoston tunnusluvut lasketaan vain kerran.
+"""
+
+from functools import partial
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..repositories.pdf_repository import PDFRepository
+from ..utils import tracing
+from .cancellation import CancellationToken
+from .page_batches import PageArrayProcessor
+from .split_options import DEFAULT_BLANK_THRESHOLD
+
+PAGE_CONTENT = "content"
+PAGE_BLANK = "blank"
+PAGE_SEPARATOR = "separator"
+
+THUMBNAIL_WIDTH = 240
+THUMBNAIL_HEIGHT = 336
+DEFAULT_BATCH_SIZE = 32
+# Paperin sävy arvioidaan sivun vaaleimmista pikseleistä (persentiili), ja
+# musteeksi lasketaan pikseli, joka on paperia vähintään INK_CONTRAST tummempi.
+# Pienessä kuvassa ohut teksti näkyy vaaleanharmaana, joten kiinteä raja
+# tulkitsisi tekstisivun tyhjäksi.
+BACKGROUND_PERCENTILE = 90
+INK_CONTRAST = 24
+MIN_INK_LEVEL = 64
+# Reunojen osuus, joka jätetään huomiotta skannerin varjojen ja rei'itysten takia.
+EDGE_MARGIN = 0.04
+# Erotinkoodin palkit ovat umpimustia, toisin kuin pienessä kuvassa
+# harmaaksi sulava teksti.
+SOLID_INK_LEVEL = 80
+# Palkin vähimmäispituus suhteessa sivun korkeuteen tai leveyteen.
+MIN_BAR_LENGTH = 0.06
+# Umpimustien pikselien vähimmäisosuus palkin alku- ja loppupään välillä.
+BAR_FILL = 0.9
+# Erotinkoodin palkit ovat lähekkäin; esim. lomakkeen kehyksen reunat eivät ole.
+MAX_PATCH_SPAN = 0.3
+MIN_PATCH_BARS = 2
+# Palkkien musteen vähimmäisosuus sivun alasta.
+MIN_BAR_INK = 0.005
+# Palkkien ulkopuolisen musteen enimmäisosuus erotinsivulla.
+MAX_RESIDUAL_INK = 0.02
+
+# Tunnuslukutaulukon sarakkeet.
+STAT_COVERAGE = 0
+STAT_BAR_INK = 1
+STAT_BAR_COUNT = 2
+
+# Välimuistiavaimeen liitettävät asetukset, jotka vaikuttavat tunnuslukuihin.
+STATS_SIGNATURE = {
+    "width": THUMBNAIL_WIDTH,
+    "height": THUMBNAIL_HEIGHT,
+    "edge_margin": EDGE_MARGIN,
+    "background_percentile": BACKGROUND_PERCENTILE,
+    "ink_contrast": INK_CONTRAST,
+    "min_ink_level": MIN_INK_LEVEL,
+    "solid_ink_level": SOLID_INK_LEVEL,
+    "min_bar_length": MIN_BAR_LENGTH,
+    "bar_fill": BAR_FILL,
+    "max_patch_span": MAX_PATCH_SPAN,
+}
+
+
+def thumbnail_ink(thumbnails: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rajaa sivukuvista reunat ja erottaa musteen paperista.
+
+    Args:
+        thumbnails: Harmaasävykuvat muodossa (sivut, korkeus, leveys), uint8.
+
+    Returns:
+        (rajattu alue, paperin sävy sivuittain, musteen maski) -tuple.
+        Alue ja maski ovat muodossa (sivut, korkeus, leveys) ilman reunoja.
+    """
+    height, width = thumbnails.shape[1:]
+    margin_y = int(height * EDGE_MARGIN)
+    margin_x = int(width * EDGE_MARGIN)
+    region = thumbnails[:, margin_y:height - margin_y, margin_x:width - margin_x]
+    background = np.percentile(region, BACKGROUND_PERCENTILE, axis=(1, 2))
+    ink_level = np.maximum(background - INK_CONTRAST, MIN_INK_LEVEL)
+    return region, background, region < ink_level[:, np.newaxis, np.newaxis]
+
+
+def measure_thumbnails(thumbnails: np.ndarray) -> np.ndarray:
+    """
+    Laskee sivukuvien tunnusluvut yhdellä kertaa koko erälle.
+
+    Args:
+        thumbnails: Harmaasävykuvat muodossa (sivut, korkeus, leveys), uint8.
+
+    Returns:
+        Taulukko muodossa (sivut, 3): musteen peitto, palkkien musteen
+        osuus sivun alasta ja palkkien määrä. Palkit luetaan siltä
+        akselilta, jolla niiden musteen osuus on suurempi.
+    """
+    region, _background, ink = thumbnail_ink(thumbnails)
+    area = ink.shape[1] * ink.shape[2]
+    stats = np.zeros((len(thumbnails), 3), dtype=np.float64)
+    stats[:, STAT_COVERAGE] = np.count_nonzero(ink, axis=(1, 2)) / area
+
+    solid = region < SOLID_INK_LEVEL
+    # Akseli 1 tuottaa sarakeprojektion (pystypalkit), akseli 2 riviprojektion.
+    for axis in (1, 2):
+        bar_ink, bar_count = _patch_bars(solid, axis)
+        better = bar_ink > stats[:, STAT_BAR_INK]
+        stats[better, STAT_BAR_INK] = bar_ink[better]
+        stats[better, STAT_BAR_COUNT] = bar_count[better]
+    return stats
+
+
+def _patch_bars(solid: np.ndarray, axis: int) -> Tuple[np.ndarray, np.ndarray]:
+    length = solid.shape[axis]
+    counts = np.count_nonzero(solid, axis=axis)
+    first = np.argmax(solid, axis=axis)
+    last = length - 1 - np.argmax(np.flip(solid, axis=axis), axis=axis)
+    bars = (counts >= MIN_BAR_LENGTH * length) & (counts >= BAR_FILL * (last - first + 1))
+    bar_count = bars[:, 0].astype(np.int64) + np.count_nonzero(
+        bars[:, 1:] & ~bars[:, :-1], axis=1
+    )
+    span = bars.shape[1] - np.argmax(bars[:, ::-1], axis=1) - np.argmax(bars, axis=1)
+    bar_count[span > MAX_PATCH_SPAN * bars.shape[1]] = 0
+    bar_ink = np.sum(counts * bars, axis=1) / (solid.shape[1] * solid.shape[2])
+    return bar_ink, bar_count
+
+
+def classify_stats(
+    stats: np.ndarray, blank_threshold: float = DEFAULT_BLANK_THRESHOLD
+) -> List[str]:
+    """
+    Luokittelee sivut tunnuslukujen perusteella.
+
+    Args:
+        stats: `measure_thumbnails`-funktion palauttama taulukko.
+        blank_threshold: Musteen peiton yläraja tyhjälle sivulle.
+
+    Returns:
+        Sivujen luokat (`PAGE_CONTENT`, `PAGE_BLANK` tai `PAGE_SEPARATOR`).
+    """
+    coverage = stats[:, STAT_COVERAGE]
+    bar_ink = stats[:, STAT_BAR_INK]
+    separator = (
+        (stats[:, STAT_BAR_COUNT] >= MIN_PATCH_BARS)
+        & (bar_ink >= MIN_BAR_INK)
+        & (coverage - bar_ink <= MAX_RESIDUAL_INK)
+    )
+    blank = coverage <= blank_threshold
+    kinds = np.where(separator, PAGE_SEPARATOR, np.where(blank, PAGE_BLANK, PAGE_CONTENT))
+    return kinds.tolist()
+
+
+def ranges_between_separators(
+    kinds: Sequence[str], blank_is_separator: bool = True
+) -> List[Tuple[int, int]]:
+    """
+    Muodostaa erotinsivujen väliin jäävät sivualueet.
+
+    Erotinsivut eivät kuulu mihinkään alueeseen, ja peräkkäiset erotinsivut
+    tuottavat yhden rajan.
+
+    Args:
+        kinds: Sivujen luokat sivujärjestyksessä.
+        blank_is_separator: Tulkitaanko tyhjät sivut erotinsivuiksi.
+
+    Returns:
+        Lista (start_idx, end_idx) -tupleja (0-pohjaisia, sisällytettyjä).
+    """
+    cut_kinds = {PAGE_SEPARATOR, PAGE_BLANK} if blank_is_separator else {PAGE_SEPARATOR}
+    ranges = []
+    start = None
+    for index, kind in enumerate(kinds):
+        if kind in cut_kinds:
+            if start is not None:
+                ranges.append((start, index - 1))
+                start = None
+        elif start is None:
+            start = index
+    if start is not None:
+        ranges.append((start, len(kinds) - 1))
+    return ranges
+
+
+def render_thumbnails(
+    repository: PDFRepository, source_doc: Any, start_idx: int, end_idx: int
+) -> np.ndarray:
+    """
+    Renderöi sivuerän pieniksi harmaasävykuviksi.
+
+    Args:
+        repository: Renderöinnissä käytettävä PDFRepository.
+        source_doc: Avattu lähdedokumentti.
+        start_idx: Ensimmäisen sivun indeksi (0-pohjainen).
+        end_idx: Viimeistä sivua seuraava indeksi.
+
+    Returns:
+        Kuvat muodossa (sivut, THUMBNAIL_HEIGHT, THUMBNAIL_WIDTH), uint8.
+    """
+    thumbnails = np.empty((end_idx - start_idx, THUMBNAIL_HEIGHT, THUMBNAIL_WIDTH), np.uint8)
+    with tracing.span("render", start_page=start_idx + 1, end_page=end_idx):
+        for offset, page_index in enumerate(range(start_idx, end_idx)):
+            samples = repository.render_page_gray(
+                source_doc, page_index, THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT
+            )
+            thumbnails[offset] = np.frombuffer(samples, np.uint8).reshape(
+                THUMBNAIL_HEIGHT, THUMBNAIL_WIDTH
+            )
+    return thumbnails
+
+
+def measure_thumbnail_range(
+    repository: PDFRepository,
+    source_doc: Any,
+    start_idx: int,
+    end_idx: int,
+    *,
+    measure: Callable[[np.ndarray], np.ndarray],
+    span_name: str,
+) -> np.ndarray:
+    """
+    Renderöi sivuerän pieniksi kuviksi ja laskee niistä sivukohtaiset luvut.
+
+    Sivuerän käsittelijä muodostetaan `functools.partial`-oliona, jotta se
+    voidaan välittää työprosesseille.
+
+    Args:
+        repository: Renderöinnissä käytettävä PDFRepository.
+        source_doc: Avattu lähdedokumentti.
+        start_idx: Ensimmäisen sivun indeksi (0-pohjainen).
+        end_idx: Viimeistä sivua seuraava indeksi.
+        measure: Moduulitason funktio, joka laskee luvut kuvista.
+        span_name: Laskennan aikajanatapahtuman nimi.
+
+    Returns:
+        `measure`-funktion tulos.
+    """
+    thumbnails = render_thumbnails(repository, source_doc, start_idx, end_idx)
+    with tracing.span(span_name, pages=end_idx - start_idx):
+        return measure(thumbnails)
+
+
+class PageClassifier(PageArrayProcessor):
+    """
+    Renderöi sivut pieninä kuvina ja luokittelee ne erissä.
+
+    `extract` palauttaa tunnusluvut taulukkona muodossa (sivut, 3), ks.
+    `measure_thumbnails`.
+    """
+
+    process_range = partial(
+        measure_thumbnail_range, measure=measure_thumbnails, span_name="classify"
+    )
+    cache_signature = STATS_SIGNATURE
+    default_batch_size = DEFAULT_BATCH_SIZE
+    columns = 3
+
+    def measure(
+        self,
+        file_path: str,
+        source_doc: Optional[Any] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> np.ndarray:
+        """
+        Laskee tiedoston kaikkien sivujen tunnusluvut.
+
+        Args:
+            file_path: Lähde-PDF:n polku.
+            source_doc: Valinnainen jo avattu lähdedokumentti, jota käytetään
+                        sarjassa renderöitäessä.
+            cancel_token: Valinnainen peruutustoken, joka tarkistetaan erien välissä.
+
+        Returns:
+            Taulukko muodossa (sivut, 3), ks. `measure_thumbnails`.
+
+        Raises:
+            SplitCancelledError: Jos luokittelu peruutettiin.
+        """
+        return self.extract(file_path, source_doc, cancel_token)
+
+    def classify(
+        self,
+        file_path: str,
+        blank_threshold: float = DEFAULT_BLANK_THRESHOLD,
+        source_doc: Optional[Any] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> List[str]:
+        """
+        Luokittelee tiedoston kaikki sivut.
+
+        Args:
+            file_path: Lähde-PDF:n polku.
+            blank_threshold: Musteen peiton yläraja tyhjälle sivulle.
+            source_doc: Valinnainen jo avattu lähdedokumentti.
+            cancel_token: Valinnainen peruutustoken.
+
+        Returns:
+            Sivujen luokat sivujärjestyksessä.
+
+        Raises:
+            SplitCancelledError: Jos luokittelu peruutettiin.
+        """
+        return classify_stats(
+            self.measure(file_path, source_doc, cancel_token), blank_threshold
+        )
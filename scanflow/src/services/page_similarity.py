@@ -0,0 +1,239 @@
+"""
+Moduuli asiakirjojen rajojen etsimiseen sivujen visuaalisen samankaltaisuuden perusteella.
+
+Kun skannauserässä ei ole erotinsivuja eikä tekstiä, jonka kohdalta jakaa,
+asiakirjan vaihtuminen näkyy usein silti sivun ulkoasussa: kirjelomakkeen
+ylätunniste, erilainen asettelu tai paperin sävy. Sivut renderöidään
+pieninä harmaasävykuvina kuten `PageClassifier`-luokassa, ja jokaisesta
+sivusta lasketaan erissä NumPyllä tiivis piirrevektori:
+
+- musteen peitto karkeassa ruudukossa (sivun asettelu)
+- harmaasävyjen histogrammi
+- paperin sävy
+
+Vierekkäisten sivujen piirteiden etäisyys on suuri asiakirjan vaihtuessa.
+Rajat ehdotetaan sivuille, joiden etäisyys edelliseen sivuun poikkeaa
+selvästi tiedoston tavanomaisesta vaihtelusta. Piirteet tallennetaan
+`PageStatsCache`-välimuistiin, joten herkkyyttä voidaan säätää laskematta
+piirteitä uudelleen.
+"""
+
+from functools import partial
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cancellation import CancellationToken
+from .page_batches import PageArrayProcessor
+from .page_classifier import (
+    BACKGROUND_PERCENTILE,
+    DEFAULT_BATCH_SIZE,
+    EDGE_MARGIN,
+    INK_CONTRAST,
+    MIN_INK_LEVEL,
+    THUMBNAIL_HEIGHT,
+    THUMBNAIL_WIDTH,
+    measure_thumbnail_range,
+    thumbnail_ink,
+)
+from .page_text_extractor import ranges_from_start_pages
+
+GRID_ROWS = 8
+GRID_COLUMNS = 6
+HISTOGRAM_BINS = 8
+FEATURE_LENGTH = GRID_ROWS * GRID_COLUMNS + HISTOGRAM_BINS + 1
+# Piirrevektorin osat.
+_GRID = slice(0, GRID_ROWS * GRID_COLUMNS)
+_HISTOGRAM = slice(GRID_ROWS * GRID_COLUMNS, FEATURE_LENGTH - 1)
+_PAPER_TONE = FEATURE_LENGTH - 1
+
+# Etäisyyden osien painot. Kukin osa on välillä 0-1.
+LAYOUT_WEIGHT = 0.5
+HISTOGRAM_WEIGHT = 0.25
+PAPER_TONE_WEIGHT = 0.25
+# Paperin sävyero (harmaatasoina), jota pidetään täysin eri paperina.
+PAPER_TONE_RANGE = 24
+
+DEFAULT_SENSITIVITY = 0.5
+# Herkkyydellä 0 raja vaatii etäisyyden, joka on näin monta hajontaa
+# mediaanin yläpuolella; herkkyydellä 1 riittää mediaanin ylitys.
+MAX_DEVIATIONS = 4.0
+# Hajonnan alaraja, jotta lähes identtisten sivujen tiedostossa pienetkään
+# erot eivät ylitä rajaa.
+MIN_SPREAD = 0.02
+# Etäisyys, jota pienempi ero ei koskaan aloita uutta asiakirjaa.
+MIN_CUT_DISTANCE = 0.05
+
+# Välimuistiavaimeen liitettävät asetukset, jotka vaikuttavat piirteisiin.
+FEATURE_SIGNATURE = {
+    "kind": "similarity",
+    "width": THUMBNAIL_WIDTH,
+    "height": THUMBNAIL_HEIGHT,
+    "grid": [GRID_ROWS, GRID_COLUMNS],
+    "histogram_bins": HISTOGRAM_BINS,
+    "edge_margin": EDGE_MARGIN,
+    "background_percentile": BACKGROUND_PERCENTILE,
+    "ink_contrast": INK_CONTRAST,
+    "min_ink_level": MIN_INK_LEVEL,
+}
+
+
+def page_features(thumbnails: np.ndarray) -> np.ndarray:
+    """
+    Laskee sivukuvien piirrevektorit yhdellä kertaa koko erälle.
+
+    Args:
+        thumbnails: Harmaasävykuvat muodossa (sivut, korkeus, leveys), uint8.
+
+    Returns:
+        Taulukko muodossa (sivut, FEATURE_LENGTH): musteen peitto
+        ruudukon soluittain riveittäin, harmaasävyjen histogrammi
+        osuuksina ja paperin sävy välillä 0-1. Arvot on pyöristetty, jotta
+        välimuistista luetut piirteet ovat samat kuin lasketut.
+    """
+    page_count = len(thumbnails)
+    region, background, ink = thumbnail_ink(thumbnails)
+
+    cell_height = ink.shape[1] // GRID_ROWS
+    cell_width = ink.shape[2] // GRID_COLUMNS
+    cells = ink[:, :cell_height * GRID_ROWS, :cell_width * GRID_COLUMNS].reshape(
+        page_count, GRID_ROWS, cell_height, GRID_COLUMNS, cell_width
+    )
+    features = np.empty((page_count, FEATURE_LENGTH), dtype=np.float64)
+    features[:, _GRID] = cells.mean(axis=(2, 4)).reshape(page_count, -1)
+
+    bins = region.reshape(page_count, -1) // (256 // HISTOGRAM_BINS)
+    offsets = np.arange(page_count)[:, np.newaxis] * HISTOGRAM_BINS
+    counts = np.bincount(
+        (bins + offsets).ravel(), minlength=page_count * HISTOGRAM_BINS
+    ).reshape(page_count, HISTOGRAM_BINS)
+    features[:, _HISTOGRAM] = counts / max(1, bins.shape[1])
+    features[:, _PAPER_TONE] = background / 255
+    return np.round(features, 4)
+
+
+def neighbour_distances(features: np.ndarray) -> np.ndarray:
+    """
+    Laskee jokaisen sivun etäisyyden edelliseen sivuun.
+
+    Asettelun etäisyys on ruudukon (neliöjuurella tasoitetun) musteen
+    peiton kosinietäisyys, histogrammien etäisyys niiden kokonaisvaihtelu
+    ja paperin etäisyys sävyero suhteessa PAPER_TONE_RANGE-arvoon.
+
+    Args:
+        features: `page_features`-funktion palauttama taulukko.
+
+    Returns:
+        Taulukko, jonka alkio i on sivujen i ja i + 1 etäisyys välillä 0-1.
+    """
+    if len(features) < 2:
+        return np.zeros(0, dtype=np.float64)
+    grid = np.sqrt(features[:, _GRID])
+    previous, current = grid[:-1], grid[1:]
+    norms = np.linalg.norm(previous, axis=1) * np.linalg.norm(current, axis=1)
+    similarity = np.sum(previous * current, axis=1) / np.where(norms > 0, norms, 1)
+    # Tyhjä sivu on kaukana sisältösivusta mutta lähellä toista tyhjää sivua.
+    empty = norms == 0
+    similarity[empty] = ~np.any(previous[empty], axis=1) & ~np.any(current[empty], axis=1)
+    layout = np.clip(1 - similarity, 0, 1)
+
+    histogram = np.abs(np.diff(features[:, _HISTOGRAM], axis=0)).sum(axis=1) / 2
+    paper_tone = np.minimum(
+        np.abs(np.diff(features[:, _PAPER_TONE])) * 255 / PAPER_TONE_RANGE, 1
+    )
+    return (
+        LAYOUT_WEIGHT * layout
+        + HISTOGRAM_WEIGHT * histogram
+        + PAPER_TONE_WEIGHT * paper_tone
+    )
+
+
+def suggest_cut_points(
+    distances: Sequence[float], sensitivity: float = DEFAULT_SENSITIVITY
+) -> List[int]:
+    """
+    Ehdottaa sivut, joilta uusi asiakirja alkaa.
+
+    Raja on sivulla, jonka etäisyys edelliseen sivuun ylittää tiedoston
+    etäisyyksien mediaanin vähintään `(1 - sensitivity) * MAX_DEVIATIONS`
+    hajonnalla (mediaanipoikkeama). Raja ei riipu sivujen määrästä, joten
+    herkkyys toimii samoin lyhyissä ja pitkissä tiedostoissa.
+
+    Args:
+        distances: `neighbour_distances`-funktion palauttamat etäisyydet.
+        sensitivity: Herkkyys välillä 0-1. Suurempi arvo ehdottaa enemmän rajoja.
+
+    Returns:
+        Uusien asiakirjojen ensimmäisten sivujen indeksit (0-pohjaisia)
+        nousevassa järjestyksessä. Ensimmäinen sivu ei sisälly listaan.
+
+    Raises:
+        ValueError: Jos herkkyys ei ole välillä 0-1.
+    """
+    if not 0 <= sensitivity <= 1:
+        raise ValueError("Herkkyyden tulee olla välillä 0-1.")
+    distances = np.asarray(distances, dtype=np.float64)
+    if len(distances) == 0:
+        return []
+    median = np.median(distances)
+    spread = max(1.4826 * np.median(np.abs(distances - median)), MIN_SPREAD)
+    threshold = max(MIN_CUT_DISTANCE, median + (1 - sensitivity) * MAX_DEVIATIONS * spread)
+    return (np.flatnonzero(distances >= threshold) + 1).tolist()
+
+
+def suggest_ranges(
+    distances: Sequence[float], sensitivity: float = DEFAULT_SENSITIVITY
+) -> List[Tuple[int, int]]:
+    """
+    Ehdottaa asiakirjojen sivualueet sivujen etäisyyksistä.
+
+    Args:
+        distances: `neighbour_distances`-funktion palauttamat etäisyydet.
+        sensitivity: Herkkyys välillä 0-1.
+
+    Returns:
+        Lista (start_idx, end_idx) -tupleja (0-pohjaisia, sisällytettyjä).
+
+    Raises:
+        ValueError: Jos herkkyys ei ole välillä 0-1.
+    """
+    cut_points = suggest_cut_points(distances, sensitivity)
+    return ranges_from_start_pages([0] + cut_points, len(distances) + 1)
+
+
+class PageFeatureExtractor(PageArrayProcessor):
+    """
+    Renderöi sivut pieninä kuvina ja laskee niiden piirrevektorit erissä.
+
+    `extract` palauttaa taulukon muodossa (sivut, FEATURE_LENGTH), ks.
+    `page_features`.
+    """
+
+    process_range = partial(
+        measure_thumbnail_range, measure=page_features, span_name="page_features"
+    )
+    cache_signature = FEATURE_SIGNATURE
+    default_batch_size = DEFAULT_BATCH_SIZE
+    columns = FEATURE_LENGTH
+
+    def distances(
+        self,
+        file_path: str,
+        source_doc: Optional[Any] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> np.ndarray:
+        """
+        Laskee tiedoston vierekkäisten sivujen etäisyydet.
+
+        Args:
+            file_path: Lähde-PDF:n polku.
+            source_doc: Valinnainen jo avattu lähdedokumentti.
+            cancel_token: Valinnainen peruutustoken.
+
+        Returns:
+            Etäisyydet `neighbour_distances`-muodossa.
+
+        Raises:
+            SplitCancelledError: Jos laskenta peruutettiin.
+        """
+        return neighbour_distances(self.extract(file_path, source_doc, cancel_token))
@@ -0,0 +1,107 @@
+"""
+Moduuli sivujen tekstin poimintaan ja tekstihakuun perustuvaan jakoon.
+
+Sivujen tekstit poimitaan erissä, tarvittaessa rinnakkain työprosesseissa,
+ja niistä muodostetaan lähdetiedoston sivutekstihakemisto (lista tekstejä
+sivujärjestyksessä). `PageStatsCache`-välimuistin kanssa hakemisto
+tallennetaan levylle, joten samaa tiedostoa voidaan hakea eri
+hakulausekkeilla poimimatta tekstiä uudelleen. Sivujen välilyönnit ja
+rivinvaihdot yhdistetään yhdeksi välilyönniksi, jotta rivin yli jatkuva
+otsikko löytyy tavallisella hakulausekkeella.
+"""
+
+import re
+from typing import Any, List, Pattern, Tuple
+
+from ..repositories.pdf_repository import PDFRepository
+from ..utils import tracing
+from .page_batches import PageBatchProcessor
+
+DEFAULT_BATCH_SIZE = 64
+# Sivutekstit pidetään omassa taulussaan ja tiedostossaan
+# (`~/.scanflow/page_text_cache.sqlite3`). Merkintä on koko lähdetiedoston
+# tekstit, joten merkintöjä säilytetään tunnuslukuja vähemmän.
+TEXT_CACHE_TABLE = "page_text"
+TEXT_CACHE_MAX_ENTRIES = 200
+TEXT_SIGNATURE = {"kind": "text", "whitespace": "collapsed"}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def compile_pattern(pattern: str, ignore_case: bool = False) -> Pattern[str]:
+    """
+    Kääntää käyttäjän antaman hakulausekkeen.
+
+    Args:
+        pattern: Säännöllinen lauseke (Pythonin `re`-syntaksi).
+        ignore_case: Jätetäänkö kirjainkoko huomiotta.
+
+    Returns:
+        Käännetty lauseke.
+
+    Raises:
+        ValueError: Jos lauseke on tyhjä tai virheellinen.
+    """
+    if not pattern:
+        raise ValueError("Hakulauseke ei voi olla tyhjä.")
+    try:
+        return re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+    except re.error as error:
+        raise ValueError(f"Virheellinen hakulauseke: {error}") from error
+
+
+def find_matching_pages(texts: List[str], pattern: Pattern[str]) -> List[int]:
+    """
+    Etsii sivut, joiden teksti vastaa hakulauseketta.
+
+    Args:
+        texts: Sivujen tekstit sivujärjestyksessä.
+        pattern: Käännetty hakulauseke.
+
+    Returns:
+        Vastaavien sivujen indeksit (0-pohjaisia) nousevassa järjestyksessä.
+    """
+    return [index for index, text in enumerate(texts) if pattern.search(text)]
+
+
+def ranges_from_start_pages(start_pages: List[int], page_count: int) -> List[Tuple[int, int]]:
+    """
+    Muodostaa osat, jotka alkavat annetuilta sivuilta.
+
+    Ensimmäistä aloitussivua edeltävät sivut muodostavat oman osansa.
+
+    Args:
+        start_pages: Osien aloitussivujen indeksit nousevassa järjestyksessä.
+        page_count: Dokumentin sivumäärä.
+
+    Returns:
+        Lista (start_idx, end_idx) -tupleja (0-pohjaisia, sisällytettyjä).
+    """
+    if not start_pages or page_count == 0:
+        return []
+    starts = start_pages if start_pages[0] == 0 else [0] + start_pages
+    ends = [start - 1 for start in starts[1:]] + [page_count - 1]
+    return list(zip(starts, ends))
+
+
+def _extract_page_range(
+    repository: PDFRepository, source_doc: Any, start_idx: int, end_idx: int
+) -> List[str]:
+    with tracing.span("extract_text", pages=end_idx - start_idx):
+        return [
+            _WHITESPACE.sub(" ", repository.get_page_text(source_doc, page_index)).strip()
+            for page_index in range(start_idx, end_idx)
+        ]
+
+
+class PageTextExtractor(PageBatchProcessor):
+    """
+    Poimii tiedoston sivujen tekstit erissä ja tallentaa ne välimuistiin.
+
+    `extract` palauttaa sivujen tekstit sivujärjestyksessä, välilyönnit
+    yhdistettyinä.
+    """
+
+    process_range = staticmethod(_extract_page_range)
+    cache_signature = TEXT_SIGNATURE
+    default_batch_size = DEFAULT_BATCH_SIZE
@@ -0,0 +1,406 @@
+"""
+Moduuli osien poimintaan ja tallentamiseen, myös rinnakkain työprosesseissa.
+
+Tarjoaa funktion yhden osan poimintaan ja tallennukseen sekä
+prosessipoolin työprosessien funktiot. Jokainen työprosessi avaa
+lähde-PDF:n kerran ja käsittelee sille jaetut osat erissä.
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+from ..entities.part_result import PartResult
+from ..repositories.pdf_repository import PDFRepository
+from ..utils import tracing
+from .cancellation import CancellationToken, SplitCancelledError
+from .outline_planner import OutlineEntry, rebase_outline
+from .split_options import SplitOptions
+
+_WORKER_STATE: Dict[str, Any] = {}
+_CANCEL_POLL_SECONDS = 0.05
+
+
+def init_part_worker(
+    file_path: str,
+    cancel_event: Optional[Any] = None,
+    trace_spool_dir: Optional[str] = None,
+    skip_pages: FrozenSet[int] = frozenset(),
+    outlines: Optional[Dict[int, List[OutlineEntry]]] = None,
+) -> None:
+    """
+    Avaa lähde-PDF:n kerran jokaista työprosessia kohden.
+
+    Suoritetaan prosessipoolin initializer-funktiona, joten jokainen
+    työprosessi jäsentää lähdetiedoston vain kerran riippumatta siitä,
+    montako osaa se käsittelee.
+
+    Args:
+        file_path: Lähde-PDF:n polku.
+        cancel_event: Valinnainen `multiprocessing.Event`, jonka asettaminen
+                      pyytää työprosessia lopettamaan kesken.
+        trace_spool_dir: Valinnainen pääprosessin jäljittimen välihakemisto.
+                         Jos annettu, työprosessi jäljittää omat vaiheensa.
+        skip_pages: Sivuindeksit, joita ei tallenneta osiin.
+        outlines: Valinnaiset osien kirjanmerkit osan aloitussivun indeksin
+                  mukaan.
+    """
+    # Fork-käynnistyksessä työprosessi perii pääprosessin jäljittimen,
+    # jonka tapahtumat katoaisivat prosessin mukana.
+    if trace_spool_dir is not None:
+        tracing.enable_worker(trace_spool_dir)
+    else:
+        tracing.disable()
+    repository = PDFRepository()
+    _WORKER_STATE["repository"] = repository
+    with tracing.span("worker_init"):
+        _WORKER_STATE["source_doc"] = repository.load_pdf(file_path)
+    _WORKER_STATE["cancel_token"] = (
+        CancellationToken(cancel_event) if cancel_event is not None else None
+    )
+    _WORKER_STATE["skip_pages"] = skip_pages
+    _WORKER_STATE["outlines"] = outlines or {}
+
+
+def file_size(path: str) -> int:
+    """Palauttaa tiedoston koon tavuina, tai 0, jos tiedostoa ei voi lukea."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def extract_and_save_part(
+    repository: PDFRepository,
+    source_doc: Any,
+    task: Tuple[int, int, str],
+    *,
+    cancel_token: Optional[CancellationToken] = None,
+    skip_pages: Optional[FrozenSet[int]] = None,
+    outline: Optional[List[OutlineEntry]] = None,
+) -> PartResult:
+    """
+    Poimii sivut, tallentaa osatiedoston ja mittaa vaiheiden keston.
+
+    Args:
+        repository: Käytettävä PDFRepository-instanssi.
+        source_doc: Lähde-PDF-dokumentti.
+        task: Tuple (start_idx, end_idx, output_path), jossa indeksit ovat
+              0-pohjaisia.
+        cancel_token: Valinnainen peruutustoken, joka tarkistetaan poiminnan
+                      ja tallennuksen välissä.
+        skip_pages: Valinnaiset sivuindeksit, joita ei poimita osaan.
+        outline: Valinnaiset osan kirjanmerkit lähteen sivunumeroin.
+                 Kirjanmerkit kirjoitetaan osaan osan sivunumeroin.
+
+    Returns:
+        Tallennetun osan tiedot `PartResult`-oliona.
+
+    Raises:
+        SplitCancelledError: Jos jako peruutettiin ennen tallennusta.
+    """
+    start_idx, end_idx, output_path = task
+    new_doc = None
+    try:
+        started = time.perf_counter()
+        with tracing.span("extract", start_page=start_idx + 1, end_page=end_idx + 1):
+            extract_options = {"skip_pages": skip_pages} if skip_pages else {}
+            new_doc = repository.extract_pages(
+                source_doc, start_idx, end_idx, **extract_options
+            )
+            if outline:
+                repository.set_outline(
+                    new_doc, rebase_outline(outline, start_idx, end_idx, skip_pages)
+                )
+        extracted = time.perf_counter()
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        with tracing.span("save", start_page=start_idx + 1, end_page=end_idx + 1):
+            repository.save_pdf(new_doc, output_path)
+        saved = time.perf_counter()
+    finally:
+        if new_doc:
+            repository.close_pdf(new_doc)
+    return PartResult(
+        output_path,
+        start_idx + 1,
+        end_idx + 1,
+        size_bytes=file_size(output_path),
+        extract_seconds=extracted - started,
+        save_seconds=saved - extracted,
+    )
+
+
+def extract_part_in_worker(start_idx: int, end_idx: int, output_path: str) -> PartResult:
+    """
+    Poimii ja tallentaa yhden osan työprosessissa.
+
+    Args:
+        start_idx: Aloitussivun indeksi (0-pohjainen).
+        end_idx: Lopetussivun indeksi (0-pohjainen).
+        output_path: Kohdetiedoston polku.
+
+    Returns:
+        Tallennetun osan tiedot `PartResult`-oliona.
+    """
+    return extract_and_save_part(
+        _WORKER_STATE["repository"],
+        _WORKER_STATE["source_doc"],
+        (start_idx, end_idx, output_path),
+        cancel_token=_WORKER_STATE.get("cancel_token"),
+        skip_pages=_WORKER_STATE.get("skip_pages"),
+        outline=_WORKER_STATE.get("outlines", {}).get(start_idx),
+    )
+
+
+def extract_parts_in_worker(tasks: List[Tuple[int, int, str]]) -> List[PartResult]:
+    """
+    Poimii ja tallentaa joukon osia työprosessissa.
+
+    Jos jako peruutetaan kesken, palautetaan siihen mennessä tallennetut
+    osat, jotta kutsuja voi raportoida ne.
+
+    Args:
+        tasks: Lista (start_idx, end_idx, output_path) -tupleja.
+
+    Returns:
+        Tallennettujen osien tiedot tehtävien järjestyksessä.
+    """
+    cancel_token = _WORKER_STATE.get("cancel_token")
+    results = []
+    with tracing.span("chunk", parts=len(tasks)):
+        try:
+            for start_idx, end_idx, output_path in tasks:
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                results.append(extract_part_in_worker(start_idx, end_idx, output_path))
+        except SplitCancelledError:
+            pass
+    return results
+
+
+def _split_into_chunks(
+    tasks: List[Tuple[int, int, str]], pool_size: int
+) -> List[List[Tuple[int, int, str]]]:
+    """
+    Jakaa tehtävät eriin, joita on noin neljä työprosessia kohden.
+
+    Args:
+        tasks: Lista (start_idx, end_idx, output_path) -tupleja.
+        pool_size: Työprosessien määrä.
+
+    Returns:
+        Tehtävät erinä alkuperäisessä järjestyksessä.
+    """
+    chunksize = max(1, len(tasks) // (pool_size * 4))
+    return [tasks[i:i + chunksize] for i in range(0, len(tasks), chunksize)]
+
+
+def notify_progress(
+    progress_callback: Optional[Callable[[int], None]], parts_done: int, total_parts: int
+) -> None:
+    """
+    Ilmoittaa edistymisen prosentteina valinnaiselle callbackille.
+
+    Args:
+        progress_callback: Valinnainen edistymisen raportointi -callback.
+        parts_done: Valmiiden osien määrä.
+        total_parts: Osien kokonaismäärä.
+    """
+    if progress_callback:
+        progress_callback(int((parts_done / total_parts) * 100))
+
+
+def iter_parts_in_pool(
+    file_path: str,
+    tasks: List[Tuple[int, int, str]],
+    *,
+    skip_pages: FrozenSet[int],
+    outlines: Dict[int, List[OutlineEntry]],
+    progress_callback: Optional[Callable[[int], None]],
+    options: SplitOptions,
+) -> Iterator[PartResult]:
+    """
+    Käsittelee osat rinnakkain prosessipoolissa.
+
+    Jokainen työprosessi avaa lähdetiedoston polun perusteella kerran
+    ja käsittelee sille jaetut osat erissä. Valmiit osat palautetaan
+    alkuperäisessä järjestyksessä, joten edistymisraportointi pysyy
+    monotonisena. Työprosessit käyttävät omaa `PDFRepository`-instanssiaan,
+    koska avattua dokumenttia ei voi siirtää prosessien välillä.
+
+    Peruutustokenia seurataan odotettaessa eriä, ja peruutuspyyntö
+    välitetään työprosesseille jaetun tapahtumaolion kautta, joten
+    työprosessit lopettavat viimeistään keskeneräisen osan jälkeen.
+
+    Args:
+        file_path: Lähde-PDF:n polku.
+        tasks: Lista (start_idx, end_idx, output_path) -tupleja.
+        skip_pages: Sivuindeksit, joita ei tallenneta osiin.
+        outlines: Osien kirjanmerkit osan aloitussivun indeksin mukaan.
+        progress_callback: Valinnainen edistymisen raportointi -callback.
+        options: Suoritusasetukset. Työprosessien enimmäismäärä ja
+                 peruutustoken luetaan niistä.
+
+    Yields:
+        Jokaisen tallennetun osan tiedot jakojärjestyksessä.
+
+    Raises:
+        SplitCancelledError: Jos jako peruutetaan. Poikkeus sisältää
+                             kaikkien jo tallennettujen osien polut.
+    """
+    if not tasks:
+        return
+
+    pool_size = min(options.workers, len(tasks))
+    cancel_event = multiprocessing.Event()
+    tracer = tracing.get_tracer()
+    with ProcessPoolExecutor(
+        max_workers=pool_size,
+        initializer=init_part_worker,
+        initargs=(
+            file_path,
+            cancel_event,
+            tracer.worker_spool_dir() if tracer is not None else None,
+            skip_pages,
+            outlines,
+        ),
+    ) as executor:
+        futures = [
+            executor.submit(extract_parts_in_worker, chunk)
+            for chunk in _split_into_chunks(tasks, pool_size)
+        ]
+        yield from _collect_chunks(
+            futures,
+            cancel_event,
+            total_parts=len(tasks),
+            progress_callback=progress_callback,
+            cancel_token=options.cancel_token,
+        )
+
+
+def _collect_chunks(
+    futures: List[Any],
+    cancel_event: Any,
+    *,
+    total_parts: int,
+    progress_callback: Optional[Callable[[int], None]],
+    cancel_token: Optional[CancellationToken],
+) -> Iterator[PartResult]:
+    """
+    Tuottaa erien osat järjestyksessä ja pysäyttää muut erät keskeytyksessä.
+
+    Peruutus, erän virhe tai kesken suljettu generaattori asettaa
+    työprosessien peruutustapahtuman ja peruu aloittamattomat erät,
+    jottei pooli jää odottamaan niiden valmistumista. Muissa kuin
+    peruutustilanteissa käynnissä olleiden erien tallentamat osat, joita ei
+    vielä tuotettu kutsujalle, poistetaan, jottei niitä jää levylle.
+
+    Args:
+        futures: Erien `Future`-oliot jakojärjestyksessä.
+        cancel_event: Työprosesseille jaettu `multiprocessing.Event`.
+        total_parts: Osien kokonaismäärä.
+        progress_callback: Valinnainen edistymisen raportointi -callback.
+        cancel_token: Valinnainen peruutustoken.
+
+    Yields:
+        Jokaisen tallennetun osan tiedot jakojärjestyksessä.
+
+    Raises:
+        SplitCancelledError: Jos jako peruutetaan. Poikkeus sisältää
+                             kaikkien jo tallennettujen osien polut.
+    """
+    written_paths = []
+    consumed = 0
+    try:
+        for index, future in enumerate(futures):
+            with tracing.span("wait_chunk", chunk=index):
+                chunk_results = _wait_for_chunk(future, cancel_token)
+            if chunk_results is None:
+                raise SplitCancelledError()
+            consumed += 1
+            for part_result in chunk_results:
+                written_paths.append(part_result.output_path)
+                notify_progress(progress_callback, len(written_paths), total_parts)
+                yield part_result
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+    except BaseException as error:
+        cancel_event.set()
+        _abort_chunks(error, futures[consumed:], written_paths)
+        raise
+
+
+def _wait_for_chunk(
+    future: Any, cancel_token: Optional[CancellationToken]
+) -> Optional[List[PartResult]]:
+    """
+    Odottaa erän valmistumista ja seuraa samalla peruutusta.
+
+    Args:
+        future: Erän `Future`-olio.
+        cancel_token: Valinnainen peruutustoken.
+
+    Returns:
+        Erän tulokset, tai None jos jako peruutettiin odotuksen aikana.
+    """
+    if cancel_token is None:
+        return future.result()
+    while True:
+        if cancel_token.is_cancelled:
+            return None
+        try:
+            return future.result(timeout=_CANCEL_POLL_SECONDS)
+        except FuturesTimeoutError:
+            continue
+
+
+def _abort_chunks(error: BaseException, futures: List[Any], written_paths: List[str]) -> None:
+    """
+    Pysäyttää odottamattomat erät keskeytyksen jälkeen.
+
+    Args:
+        error: Keskeytyksen aiheuttanut poikkeus.
+        futures: Odottamattomien erien `Future`-oliot.
+        written_paths: Kutsujalle jo tuotettujen osien polut.
+
+    Raises:
+        SplitCancelledError: Jos keskeytys oli peruutus. Poikkeus sisältää
+                             myös odottamattomien erien tallentamat osat.
+    """
+    drained_paths = _drain_cancelled_chunks(futures)
+    if isinstance(error, SplitCancelledError):
+        raise SplitCancelledError(written_paths + drained_paths) from error
+    for path in drained_paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _drain_cancelled_chunks(futures: List[Any]) -> List[str]:
+    """
+    Peruu aloittamattomat erät ja kerää käynnissä olleiden erien osat.
+
+    Args:
+        futures: Odottamattomien erien `Future`-oliot.
+
+    Returns:
+        Peruutuksen aikana jo tallennettujen osien polut.
+    """
+    for future in futures:
+        future.cancel()
+    written_paths = []
+    for future in futures:
+        if future.cancelled():
+            continue
+        try:
+            chunk_results = future.result()
+        except Exception:  # pylint: disable=broad-exception-caught
+            # Epäonnistuneen erän virhe on jo välitetty kutsujalle tai
+            # korvautuu peruutuksella; muiden erien osat kerätään silti.
+            continue
+        written_paths.extend(part_result.output_path for part_result in chunk_results)
+    return written_paths
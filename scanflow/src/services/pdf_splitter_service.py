@@ -3,52 +3,96 @@ Palveluluokka PDF-tiedostojen jakamiseen.
 
 Tarjoaa korkeamman tason toiminnallisuuden PDF-tiedostojen jakamiseen
 käyttäen `PDFRepository`-luokkaa tiedosto-operaatioihin. Pystyy jakamaan
-PDF:n joko kiinteän sivumäärän mukaan tai käyttäjän määrittelemien
-mukautettujen sivualueiden perusteella.
+PDF:n joko kiinteän sivumäärän mukaan, käyttäjän määrittelemien
+mukautettujen sivualueiden perusteella tai esimerkiksi kirjanmerkkien
+mukaan.
 """
 
-import math
 import os
-from contextlib import contextmanager
-from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
+from ..entities.part_result import PartResult
+from ..repositories.page_stats_cache import PageStatsCache
+from ..repositories.part_cache import PartCache
+from ..repositories.pdf_info_cache import PDFInfoCache
 from ..repositories.pdf_repository import PDFRepository
-
-
-class OutputConfig(TypedDict):
-    """
-    Tulostusasetusten tyyppi PDF-jakamisoperaatioille.
-
-    Attributes:
-        dir: Hakemistopolku, johon tiedostot tallennetaan
-        base_filename: Tiedostonimen perusosa (ilman päätettä)
-        formatter: Funktio, joka muodostaa tiedoston nimen
-        original_file_path: Alkuperäisen tiedoston polku
-    """
-
-    dir: str
-    base_filename: str
-    formatter: Callable
-    original_file_path: str
+from .cancellation import CancellationToken
+from .page_classifier import PageClassifier
+from .page_similarity import DEFAULT_SENSITIVITY, PageFeatureExtractor, suggest_ranges
+from .page_text_extractor import PageTextExtractor, compile_pattern
+from .size_planner import DEFAULT_MAX_RESPLITS
+from .split_modes import (
+    SizeLimit,
+    build_output_config,
+    custom_range_parts,
+    fixed_range_parts,
+    format_custom_filename,
+    format_fixed_filename,
+    format_outline_filename,
+    plan_custom_ranges,
+    plan_fixed_range,
+    plan_max_size,
+    plan_outline,
+    plan_separator_pages,
+    plan_similarity,
+    plan_text_pattern,
+    resolve_part_task,
+)
+from .split_observers import SplitObserver
+from .split_options import SplitOptions, resolve_split_options
+from .split_runner import SplitRunner
 
 
 class PDFSplitterService:
     """Palvelu PDF-tiedostojen jakamiseen eri kriteereillä."""
 
-    def __init__(self, pdf_repository: Optional[PDFRepository] = None):
+    def __init__(
+        self,
+        pdf_repository: Optional[PDFRepository] = None,
+        *,
+        info_cache: Optional[PDFInfoCache] = None,
+        part_cache: Optional[PartCache] = None,
+        observer: Optional[SplitObserver] = None,
+        page_stats_cache: Optional[PageStatsCache] = None,
+        page_text_cache: Optional[PageStatsCache] = None,
+    ):
         """
         Alustaa PDF-jakamispalvelun.
 
         Args:
             pdf_repository: Valinnainen PDFRepository-instanssi. Jos None,
                            luodaan uusi instanssi.
+            info_cache: Valinnainen pysyvä välimuisti tiedostojen perustiedoille.
+            part_cache: Valinnainen välimuisti valmiille osatiedostoille.
+                        Jos annettu, saman lähteen samat sivuvälit tuotetaan
+                        välimuistista poimimatta niitä uudelleen.
+            observer: Valinnainen tarkkailija, jolle ilmoitetaan jaon
+                      vaiheiden kestot sekä osien koot ja sivumäärät. Jos
+                      None, mittauksia ei kerätä lainkaan.
+            page_stats_cache: Valinnainen välimuisti sivujen luokittelun
+                              tunnusluvuille. Jos annettu, saman lähteen
+                              sivuja ei renderöidä uudelleen tyhjiä sivuja
+                              tai erotinsivuja etsittäessä.
+            page_text_cache: Valinnainen välimuisti sivujen teksteille
+                             (ks. `page_text_extractor.TEXT_CACHE_TABLE`). Jos
+                             annettu, saman lähteen tekstiä ei poimita
+                             uudelleen tekstihaun mukaan jaettaessa.
         """
         self.pdf_repository = pdf_repository or PDFRepository()
+        self.info_cache = info_cache
+        self.part_cache = part_cache
+        self.observer = observer
+        self.page_stats_cache = page_stats_cache
+        self.page_text_cache = page_text_cache
 
     def get_pdf_info(self, file_path: str) -> Dict[str, Any]:
         """
         Hakee ja palauttaa perustiedot annetusta PDF-tiedostosta.
 
+        Sivumäärä luetaan kevyesti tiedostorakenteesta ilman täyttä
+        jäsennystä. Jos välimuisti on käytössä ja tiedosto on jo käsitelty,
+        tiedot palautetaan lukematta tiedostoa lainkaan.
+
         Args:
             file_path: PDF-tiedoston polku.
 
@@ -56,236 +100,574 @@ class PDFSplitterService:
             Sanakirja, joka sisältää tiedoston perustiedot: sivumäärä,
             tiedostopolku ja tiedoston nimi.
         """
-        with self._open_source_pdf(file_path) as pdf_document:
-            page_count = self.pdf_repository.get_page_count(pdf_document)
-            return {
-                "page_count": page_count,
-                "file_path": file_path,
-                "file_name": os.path.basename(file_path),
-            }
-
-    @contextmanager
-    def _open_source_pdf(self, file_path: str) -> Iterator[Any]:
+        cached = self.info_cache.get(file_path) if self.info_cache is not None else None
+        if cached is not None:
+            page_count = cached["page_count"]
+        else:
+            page_count = self.pdf_repository.count_pages(file_path)
+            if self.info_cache is not None:
+                self.info_cache.put(file_path, page_count)
+        return {
+            "page_count": page_count,
+            "file_path": file_path,
+            "file_name": os.path.basename(file_path),
+        }
+
+    def get_pdf_details(self, file_path: str) -> Dict[str, Any]:
         """
-        Avaa lähde-PDF:n ja varmistaa sen sulkemisen context managerilla.
+        Hakee tiedoston sivumäärän, metatiedot ja sivukoot.
+
+        Tulokset tallennetaan välimuistiin, jos se on käytössä.
 
         Args:
-            file_path: Avattavan PDF-tiedoston polku.
+            file_path: PDF-tiedoston polku.
 
-        Yields:
-            Avattu PDF-dokumentti.
+        Returns:
+            Sanakirja avaimilla 'page_count', 'metadata', 'page_sizes',
+            'file_path' ja 'file_name'.
         """
-        pdf_document = None
-        try:
-            pdf_document = self.pdf_repository.load_pdf(file_path)
-            yield pdf_document
-        finally:
-            if pdf_document:
-                self.pdf_repository.close_pdf(pdf_document)
-
-    def _extract_and_save_part(
-        self,
-        source_doc: Any,
-        start_idx: int,
-        end_idx: int,
-        output_path: str,
-    ) -> None:
+        cached = self.info_cache.get(file_path) if self.info_cache is not None else None
+        if cached is not None and cached["metadata"] is not None:
+            details = cached
+        else:
+            with self._runner().open_source_pdf(file_path) as pdf_document:
+                details = {
+                    "page_count": self.pdf_repository.get_page_count(pdf_document),
+                    "metadata": self.pdf_repository.get_metadata(pdf_document),
+                    "page_sizes": self.pdf_repository.get_page_sizes(pdf_document),
+                }
+            if self.info_cache is not None:
+                self.info_cache.put(file_path, **details)
+        return {
+            **details,
+            "file_path": file_path,
+            "file_name": os.path.basename(file_path),
+        }
+
+    def plan_fixed_range(
+        self, file_path: str, page_count: int, pages_per_file: int, output_dir: str
+    ) -> List[Tuple[int, int, str]]:
         """
-        Poimii sivut, tallentaa osatiedoston ja sulkee sen.
+        Laskee kiinteän jaon osat avaamatta lähdetiedostoa.
 
         Args:
-            source_doc: Lähde-PDF-dokumentti.
-            start_idx: Aloitussivun indeksi (0-pohjainen).
-            end_idx: Lopetussivun indeksi (0-pohjainen).
-            output_path: Kohdetiedoston polku.
+            file_path: Lähde-PDF:n polku.
+            page_count: Lähde-PDF:n sivumäärä.
+            pages_per_file: Sivujen määrä tiedostoa kohden.
+            output_dir: Kohdehakemisto.
+
+        Returns:
+            Lista (start_idx, end_idx, output_path) -tupleja jakojärjestyksessä.
+
+        Raises:
+            ValueError: Jos pages_per_file on alle 1.
         """
-        new_doc = None
-        try:
-            new_doc = self.pdf_repository.extract_pages(source_doc, start_idx, end_idx)
-            self.pdf_repository.save_pdf(new_doc, output_path)
-        finally:
-            if new_doc:
-                self.pdf_repository.close_pdf(new_doc)
+        if pages_per_file < 1:
+            raise ValueError("Sivujen määrän per tiedosto tulee olla vähintään 1.")
+        output_config = build_output_config(file_path, output_dir, format_fixed_filename)
+        return [
+            resolve_part_task(output_config, part_info)
+            for part_info in fixed_range_parts(page_count, pages_per_file)
+        ]
 
-    def _format_fixed_output_filename(
-        self, base_filename: str, part_info: Tuple[int, int, int, int]
-    ) -> str:
+    def plan_custom_ranges(
+        self,
+        file_path: str,
+        page_count: int,
+        ranges: List[Tuple[int, int]],
+        output_dir: str,
+    ) -> List[Tuple[int, int, str]]:
         """
-        Muotoilee tiedostonimen kiinteän jaon osalle.
+        Laskee mukautetun jaon osat avaamatta lähdetiedostoa.
 
         Args:
-            base_filename: Pohjatiedoston nimi ilman tiedostopäätettä.
-            part_info: Tuple, joka sisältää (start_idx, end_idx, start_page_user, end_page_user).
+            file_path: Lähde-PDF:n polku.
+            page_count: Lähde-PDF:n sivumäärä.
+            ranges: Lista (aloitussivu, lopetussivu) -tupleja, 1-pohjaisia.
+            output_dir: Kohdehakemisto.
 
         Returns:
-            Muotoiltu tiedostonimi kiinteän jaon osalle.
+            Lista (start_idx, end_idx, output_path) -tupleja jakojärjestyksessä.
+
+        Raises:
+            ValueError: Jos sivualueita ei ole tai jokin alue on virheellinen.
         """
-        _start_idx, _end_idx, start_page_user, end_page_user = part_info
-        return f"{base_filename}_sivut_{start_page_user}-{end_page_user}.pdf"
+        if not ranges:
+            raise ValueError("Vähintään yksi sivualue on määritettävä.")
+        output_config = build_output_config(file_path, output_dir, format_custom_filename)
+        return [
+            resolve_part_task(output_config, part_info)
+            for part_info in custom_range_parts(page_count, ranges)
+        ]
 
-    def _format_custom_output_filename(
-        self, base_filename: str, part_info: Tuple[int, int, int, int, int]
-    ) -> str:
+    def measure_page_similarity(
+        self,
+        file_path: str,
+        workers: int = 1,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> List[float]:
         """
-        Muotoilee tiedostonimen mukautetun jaon osalle.
+        Laskee tiedoston vierekkäisten sivujen visuaaliset etäisyydet.
+
+        Etäisyydet lasketaan kerran, minkä jälkeen `suggest_similarity_ranges`
+        muodostaa sivualueet millä tahansa herkkyydellä avaamatta tiedostoa.
+        Jos sivujen tunnuslukujen välimuisti on käytössä, myös sivujen
+        piirteet luetaan siitä.
 
         Args:
-            base_filename: Pohjatiedoston nimi ilman tiedostopäätettä.
-            part_info: Tuple, joka sisältää 
-            (index, start_idx, end_idx, start_page_user, end_page_user).
+            file_path: PDF-tiedoston polku.
+            workers: Renderöivien työprosessien määrä.
+            cancel_token: Valinnainen peruutustoken.
 
         Returns:
-            Muotoiltu tiedostonimi mukautetun jaon osalle.
+            Lista, jonka alkio i on sivujen i ja i + 1 (0-pohjaisia)
+            etäisyys välillä 0-1.
+
+        Raises:
+            ValueError: Jos workers on alle 1.
+            SplitCancelledError: Jos laskenta peruutettiin.
         """
-        index, _start_idx, _end_idx, start_page_user, end_page_user = part_info
-        return f"{base_filename}_alue_{index + 1}_sivut_{start_page_user}-{end_page_user}.pdf"
+        extractor = PageFeatureExtractor(
+            self.pdf_repository, workers=workers, page_cache=self.page_stats_cache
+        )
+        return extractor.distances(file_path, cancel_token=cancel_token).tolist()
 
-    def _validate_custom_range(
-        self, start_user: int, end_user: int, page_count: int
-    ) -> None:
+    @staticmethod
+    def suggest_similarity_ranges(
+        distances: Sequence[float], sensitivity: float = DEFAULT_SENSITIVITY
+    ) -> List[Tuple[int, int]]:
         """
-        Tarkistaa mukautetun alueen kelvollisuuden.
+        Ehdottaa asiakirjojen sivualueet sivujen etäisyyksistä.
 
         Args:
-            start_user: Käyttäjän antama aloitussivun numero (1-pohjainen).
-            end_user: Käyttäjän antama lopetussivun numero (1-pohjainen).
-            page_count: Dokumentin kokonaissivumäärä.
+            distances: `measure_page_similarity`-metodin palauttamat etäisyydet.
+            sensitivity: Herkkyys välillä 0-1. Suurempi arvo ehdottaa enemmän rajoja.
+
+        Returns:
+            Lista (aloitussivu, lopetussivu) -tupleja, 1-pohjaisia, samassa
+            muodossa kuin `split_by_custom_ranges` ottaa ne vastaan.
 
         Raises:
-            ValueError: Jos annettu alue on virheellinen tai rajojen ulkopuolella.
-        """
-        start_idx = start_user - 1
-        end_idx = end_user - 1
-        if not (
-            0 <= start_idx < page_count
-            and 0 <= end_idx < page_count
-            and start_idx <= end_idx
-        ):
-            error_msg_part1 = (
-                f"Virheellinen tai rajojen ulkopuolinen alue: "
-                f"{start_user}-{end_user}."
+            ValueError: Jos herkkyys ei ole välillä 0-1.
+        """
+        return [
+            (start + 1, end + 1)
+            for start, end in suggest_ranges(distances, sensitivity)
+        ]
+
+    def _runner(self) -> SplitRunner:
+        """Luo jaon suorittajan palvelun nykyisistä riippuvuuksista."""
+        return SplitRunner(
+            self.pdf_repository,
+            part_cache=self.part_cache,
+            observer=self.observer,
+            page_stats_cache=self.page_stats_cache,
+        )
+
+    def _validate_output_dir(self, output_dir: str) -> None:
+        if not os.path.isdir(output_dir):
+            raise IOError(
+                f"Tulostushakemistoa ei löydy tai se ei ole hakemisto: {output_dir}"
             )
-            error_msg_part2 = f"Sivuja dokumentissa: 1-{page_count}"
-            raise ValueError(error_msg_part1 + error_msg_part2)
 
-    def _fixed_range_part_iterator(
-        self, page_count: int, pages_per_file: int
-    ) -> Iterator[Tuple[int, int, int, int]]:
+    def iter_split_by_fixed_range(
+        self,
+        file_path: str,
+        pages_per_file: int,
+        output_dir: str,
+        *,
+        base_filename: Optional[str] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        options: Optional[SplitOptions] = None,
+        **aliases: Any,
+    ) -> Iterator[PartResult]:
         """
-        Generaattori kiinteän jaon osien indeksien ja sivunumeroiden luomiseen.
+        Jakaa PDF-tiedoston kiinteän sivumäärän osiin ja tuottaa osat sitä mukaa
+        kuin ne valmistuvat.
+
+        Parametrit tarkistetaan heti kutsuttaessa. Lähdetiedosto avataan
+        vasta, kun ensimmäistä osaa pyydetään, ja suljetaan, kun iterointi
+        päättyy tai generaattori suljetaan.
 
         Args:
-            page_count: Dokumentin kokonaissivumäärä.
+            file_path: PDF-tiedoston polku.
             pages_per_file: Sivujen määrä tiedostoa kohden.
+            output_dir: Kohdepolku, johon tiedostot tallennetaan.
+            base_filename: Valinnainen tulostiedostojen perusnimi.
+            progress_callback: Valinnainen edistymisen raportointi -callback.
+            options: Valinnaiset suoritusasetukset (ks. `SplitOptions`).
+            **aliases: Avainsanat `workers`, `cancel_token` ja `resume`, jotka
+                       korvaavat asetusten vastaavat kentät.
+
+        Returns:
+            Iteraattori, joka tuottaa jokaisen osan `PartResult`-oliona.
 
-        Yields:
-            Tuple (start_idx, end_idx, start_page_user, end_page_user), jossa
-            start_idx ja end_idx ovat 0-pohjaisia indeksejä ja
-            start_page_user ja end_page_user ovat käyttäjälle näytettäviä
-            1-pohjaisia numeroita.
+        Raises:
+            ValueError: Jos pages_per_file on alle 1.
+            IOError: Jos tulostushakemistoa ei löydy.
         """
-        if page_count == 0:
-            return
-        for i in range(math.ceil(page_count / pages_per_file)):
-            start_idx = i * pages_per_file
-            end_idx = min((i + 1) * pages_per_file - 1, page_count - 1)
-            yield start_idx, end_idx, start_idx + 1, end_idx + 1
+        options = resolve_split_options(options, aliases)
+        if pages_per_file < 1:
+            raise ValueError("Sivujen määrän per tiedosto tulee olla vähintään 1.")
+        self._validate_output_dir(output_dir)
+
+        output_config = build_output_config(
+            file_path, output_dir, format_fixed_filename, base_filename
+        )
+        return self._runner().run(
+            file_path,
+            output_config,
+            plan_fixed_range(pages_per_file),
+            progress_callback=progress_callback,
+            options=options,
+        )
 
-    def _custom_range_part_iterator(
-        self, page_count: int, ranges: List[Tuple[int, int]]
-    ) -> Iterator[Tuple[int, int, int, int, int]]:
+    def iter_split_by_custom_ranges(
+        self,
+        file_path: str,
+        ranges: List[Tuple[int, int]],
+        output_dir: str,
+        *,
+        base_filename: Optional[str] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        options: Optional[SplitOptions] = None,
+        **aliases: Any,
+    ) -> Iterator[PartResult]:
         """
-        Generaattori mukautettujen osien indeksien ja sivunumeroiden luomiseen.
+        Jakaa PDF-tiedoston sivualueiden mukaan ja tuottaa osat sitä mukaa
+        kuin ne valmistuvat.
+
+        Parametrit tarkistetaan heti kutsuttaessa. Yksittäiset sivualueet
+        tarkistetaan sivumäärää vasten, kun lähdetiedosto on avattu.
 
         Args:
-            page_count: Dokumentin kokonaissivumäärä.
+            file_path: PDF-tiedoston polku.
             ranges: Lista (aloitussivu, lopetussivu) -tupleja, jossa sivunumerot ovat 1-pohjaisia.
+            output_dir: Kohdepolku, johon tiedostot tallennetaan.
+            base_filename: Valinnainen tulostiedostojen perusnimi.
+            progress_callback: Valinnainen edistymisen raportointi -callback.
+            options: Valinnaiset suoritusasetukset (ks. `SplitOptions`).
+            **aliases: Avainsanat `workers`, `cancel_token` ja `resume`, jotka
+                       korvaavat asetusten vastaavat kentät.
 
-        Yields:
-            Tuple (i, start_idx, end_idx, start_user, end_user), jossa
-            i on järjestysnumero, start_idx ja end_idx ovat 0-pohjaisia indeksejä ja
-            start_user ja end_user ovat käyttäjän antamia 1-pohjaisia sivunumeroita.
+        Returns:
+            Iteraattori, joka tuottaa jokaisen osan `PartResult`-oliona.
 
         Raises:
-            ValueError: Jos dokumentti on tyhjä mutta alueita yritetään määrittää.
+            ValueError: Jos sivualueita ei ole määritetty.
+            IOError: Jos tulostushakemistoa ei löydy.
         """
-        if page_count == 0 and ranges:
-            raise ValueError("Cannot split an empty document based on ranges.")
-        for i, (start_user, end_user) in enumerate(ranges):
-            self._validate_custom_range(start_user, end_user, page_count)
-            start_idx = start_user - 1
-            end_idx = end_user - 1
-            yield i, start_idx, end_idx, start_user, end_user
+        options = resolve_split_options(options, aliases)
+        if not ranges:
+            raise ValueError("Vähintään yksi sivualue on määritettävä.")
+        self._validate_output_dir(output_dir)
+
+        output_config = build_output_config(
+            file_path, output_dir, format_custom_filename, base_filename
+        )
+        return self._runner().run(
+            file_path,
+            output_config,
+            plan_custom_ranges(ranges),
+            progress_callback=progress_callback,
+            options=options,
+        )
 
-    def _process_single_part(
+    def iter_split_by_max_size(
         self,
-        source_doc: Any,
-        output_config: OutputConfig,
-        part_info: Tuple,
-    ) -> str:
+        file_path: str,
+        max_bytes: int,
+        output_dir: str,
+        *,
+        base_filename: Optional[str] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        max_resplits: int = DEFAULT_MAX_RESPLITS,
+        options: Optional[SplitOptions] = None,
+        **aliases: Any,
+    ) -> Iterator[PartResult]:
         """
-        Käsittelee yhden osan jaon: poimii sivut ja tallentaa tiedoston.
+        Jakaa PDF-tiedoston peräkkäisiin osiin, joiden koko on enintään max_bytes.
+
+        Jokaisen sivun koko arvioidaan sen tarvitsemista objekteista
+        (sisältövirrat, kuvat, fontit), ja sivut kootaan ahneesti osiin
+        arvion perusteella ilman koetallennuksia. Osan koko tarkistetaan
+        ennen kuin se kirjataan lokiin tai välimuistiin. Jos tallennettu osa
+        ylittää rajan, se poistetaan ja sen sivut jaetaan uudelleen
+        toteutuneella arviovirheellä korjatulla rajalla, enintään
+        max_resplits kertaa. Korvaavat osat kirjataan lokiin ja näkyvät
+        edistymistapahtumissa, mutta niitä ei tallenneta osavälimuistiin.
+
+        Yksittäinen sivu, joka ylittää rajan yksinäänkin, tallennetaan
+        omaksi osakseen.
 
         Args:
-            source_doc: Lähde-PDF-dokumentti.
-            output_config: Asetukset tulostusta varten.
-            part_info: Tiedot käsiteltävästä osasta (iteratorin tuottama).
+            file_path: PDF-tiedoston polku.
+            max_bytes: Osatiedoston enimmäiskoko tavuina.
+            output_dir: Kohdepolku, johon tiedostot tallennetaan.
+            base_filename: Valinnainen tulostiedostojen perusnimi.
+            progress_callback: Valinnainen edistymisen raportointi -callback.
+            max_resplits: Kuinka monta kertaa rajan ylittänyt osa enintään
+                          jaetaan uudelleen.
+            options: Valinnaiset suoritusasetukset (ks. `SplitOptions`).
+            **aliases: Avainsanat `workers`, `cancel_token` ja `resume`, jotka
+                       korvaavat asetusten vastaavat kentät.
 
         Returns:
-            Luodun tiedoston polku.
+            Iteraattori, joka tuottaa jokaisen osan `PartResult`-oliona
+            sivujärjestyksessä.
+
+        Raises:
+            ValueError: Jos max_bytes on alle 1 tai max_resplits on negatiivinen.
+            IOError: Jos tulostushakemistoa ei löydy.
         """
-        is_custom_range = len(part_info) == 5
-        start_idx = part_info[1] if is_custom_range else part_info[0]
-        end_idx = part_info[2] if is_custom_range else part_info[1]
+        options = resolve_split_options(options, aliases)
+        if max_bytes < 1:
+            raise ValueError("Osan enimmäiskoon tulee olla vähintään 1 tavu.")
+        if max_resplits < 0:
+            raise ValueError("Uudelleenjakojen määrä ei voi olla negatiivinen.")
+        self._validate_output_dir(output_dir)
+
+        output_config = build_output_config(
+            file_path, output_dir, format_fixed_filename, base_filename
+        )
+        size_limit = SizeLimit(max_bytes, max_resplits)
+        runner = self._runner()
+        return runner.run(
+            file_path,
+            output_config,
+            plan_max_size(self.pdf_repository, size_limit),
+            progress_callback=progress_callback,
+            options=options,
+            check_part=lambda part_result: runner.resplit_oversized_part(
+                file_path,
+                output_config,
+                part_result,
+                size_limit=size_limit,
+                attempts_left=max_resplits,
+                cancel_token=options.cancel_token,
+            ),
+        )
+
+    def iter_split_by_separator_pages(
+        self,
+        file_path: str,
+        output_dir: str,
+        *,
+        base_filename: Optional[str] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        blank_is_separator: bool = True,
+        options: Optional[SplitOptions] = None,
+        **aliases: Any,
+    ) -> Iterator[PartResult]:
+        """
+        Jakaa skannauserän asiakirjoiksi erotinsivujen kohdalta.
 
-        output_dir = output_config["dir"]
-        filename_formatter = output_config["formatter"]
-        original_file_path = output_config["original_file_path"]
-        true_base_filename = os.path.splitext(os.path.basename(original_file_path))[0]
+        Sivut luokitellaan pienistä renderöinneistä (ks. `PageClassifier`).
+        Jokainen erotinsivu (patch code -arkki tai tyhjä sivu) on raja
+        asiakirjojen välillä, eikä erotinsivuja tallenneta osiin.
+        Peräkkäiset erotinsivut, kuten kaksipuolisesti skannatun
+        erotinarkin molemmat puolet, tuottavat yhden rajan. Tyhjien sivujen
+        pois jättäminen vaikuttaa vain, kun blank_is_separator on False.
 
-        output_filename = filename_formatter(true_base_filename, part_info)
-        output_path = os.path.join(output_dir, output_filename)
+        Args:
+            file_path: PDF-tiedoston polku.
+            output_dir: Kohdepolku, johon tiedostot tallennetaan.
+            base_filename: Valinnainen tulostiedostojen perusnimi.
+            progress_callback: Valinnainen edistymisen raportointi -callback.
+            blank_is_separator: Tulkitaanko tyhjät sivut erotinsivuiksi. Jos
+                                False, vain patch code -arkit jakavat erän.
+            options: Valinnaiset suoritusasetukset (ks. `SplitOptions`).
+            **aliases: Avainsanat `workers`, `cancel_token` ja `resume`, jotka
+                       korvaavat asetusten vastaavat kentät.
 
-        self._extract_and_save_part(source_doc, start_idx, end_idx, output_path)
-        return output_path
+        Returns:
+            Iteraattori, joka tuottaa jokaisen asiakirjan `PartResult`-oliona.
+
+        Raises:
+            IOError: Jos tulostushakemistoa ei löydy.
+        """
+        options = resolve_split_options(options, aliases)
+        self._validate_output_dir(output_dir)
 
-    def _process_split_parts(
+        output_config = build_output_config(
+            file_path, output_dir, format_custom_filename, base_filename
+        )
+        classifier = PageClassifier(
+            self.pdf_repository, workers=options.workers, page_cache=self.page_stats_cache
+        )
+        return self._runner().run(
+            file_path,
+            output_config,
+            plan_separator_pages(
+                classifier, file_path, blank_is_separator=blank_is_separator, options=options
+            ),
+            progress_callback=progress_callback,
+            options=options,
+        )
+
+    def iter_split_by_outline(
         self,
-        source_doc: Any,
-        output_config: OutputConfig,
-        part_iterator: Iterator[Tuple],
+        file_path: str,
+        output_dir: str,
         *,
-        progress_callback: Optional[Callable[[int], None]],
-        total_parts: int,
-    ) -> List[str]:
+        level: int = 1,
+        base_filename: Optional[str] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        options: Optional[SplitOptions] = None,
+        **aliases: Any,
+    ) -> Iterator[PartResult]:
         """
-        Käsittelee osien jaon pääsilmukan.
+        Jakaa PDF-tiedoston osiin sisällysluettelon kirjanmerkkien kohdalta.
+
+        Sisällysluettelo luetaan kerran (ks. `plan_outline_parts`). Uusi osa
+        alkaa jokaiselta sivulta, jolle osoittaa kirjanmerkki tasolla
+        1-`level`, ja osa nimetään kirjanmerkin otsikon mukaan. Jokainen osa
+        saa sivuilleen osoittavat kirjanmerkit omaksi sisällysluettelokseen.
 
         Args:
-            source_doc: Lähde-PDF-dokumentti.
-            output_config: Asetukset tulostusta varten.
-            part_iterator: Iteraattori, joka tuottaa osat.
+            file_path: PDF-tiedoston polku.
+            output_dir: Kohdepolku, johon tiedostot tallennetaan.
+            level: Syvin kirjanmerkkien taso, joka aloittaa uuden osan.
+            base_filename: Valinnainen tulostiedostojen perusnimi.
             progress_callback: Valinnainen edistymisen raportointi -callback.
-            total_parts: Osien kokonaismäärä.
+            options: Valinnaiset suoritusasetukset (ks. `SplitOptions`).
+            **aliases: Avainsanat `workers`, `cancel_token` ja `resume`, jotka
+                       korvaavat asetusten vastaavat kentät.
 
         Returns:
-            Lista luotujen tiedostojen polkuja.
+            Iteraattori, joka tuottaa jokaisen osan `PartResult`-oliona.
+
+        Raises:
+            ValueError: Jos level on alle 1 tai dokumentissa ei ole osia
+                        aloittavia kirjanmerkkejä (iteroitaessa).
+            IOError: Jos tulostushakemistoa ei löydy.
         """
-        output_files = []
-        if total_parts == 0:
-            return []
+        options = resolve_split_options(options, aliases)
+        if level < 1:
+            raise ValueError("Kirjanmerkkien tason tulee olla vähintään 1.")
+        self._validate_output_dir(output_dir)
 
-        for parts_done, part_info in enumerate(part_iterator, 1):
-            output_path = self._process_single_part(
-                source_doc, output_config, part_info
-            )
-            output_files.append(output_path)
+        output_config = build_output_config(
+            file_path, output_dir, format_outline_filename, base_filename
+        )
+        return self._runner().run(
+            file_path,
+            output_config,
+            plan_outline(self.pdf_repository, output_config, level),
+            progress_callback=progress_callback,
+            options=options,
+        )
+
+    def iter_split_by_text_pattern(
+        self,
+        file_path: str,
+        pattern: str,
+        output_dir: str,
+        *,
+        ignore_case: bool = False,
+        base_filename: Optional[str] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        options: Optional[SplitOptions] = None,
+        **aliases: Any,
+    ) -> Iterator[PartResult]:
+        """
+        Jakaa PDF-tiedoston osiin sivuilta, joiden teksti vastaa hakulauseketta.
+
+        Uusi osa alkaa jokaiselta sivulta, jonka tekstistä lauseke löytyy,
+        esimerkiksi laskun otsikosta "Lasku nro". Ensimmäistä osumaa
+        edeltävät sivut muodostavat oman osansa. Sivujen tekstit poimitaan
+        `PageTextExtractor`-luokalla, ja niiden välilyönnit on yhdistetty.
+
+        Args:
+            file_path: PDF-tiedoston polku.
+            pattern: Säännöllinen lauseke (Pythonin `re`-syntaksi).
+            output_dir: Kohdepolku, johon tiedostot tallennetaan.
+            ignore_case: Jätetäänkö kirjainkoko huomiotta.
+            base_filename: Valinnainen tulostiedostojen perusnimi.
+            progress_callback: Valinnainen edistymisen raportointi -callback.
+            options: Valinnaiset suoritusasetukset (ks. `SplitOptions`).
+            **aliases: Avainsanat `workers`, `cancel_token` ja `resume`, jotka
+                       korvaavat asetusten vastaavat kentät.
+
+        Returns:
+            Iteraattori, joka tuottaa jokaisen osan `PartResult`-oliona.
+
+        Raises:
+            ValueError: Jos lauseke on virheellinen tai yksikään sivu ei
+                        vastaa lauseketta (iteroitaessa).
+            IOError: Jos tulostushakemistoa ei löydy.
+        """
+        options = resolve_split_options(options, aliases)
+        regex = compile_pattern(pattern, ignore_case)
+        self._validate_output_dir(output_dir)
+
+        output_config = build_output_config(
+            file_path, output_dir, format_custom_filename, base_filename
+        )
+        extractor = PageTextExtractor(
+            self.pdf_repository, workers=options.workers, page_cache=self.page_text_cache
+        )
+        return self._runner().run(
+            file_path,
+            output_config,
+            plan_text_pattern(extractor, file_path, regex, options=options),
+            progress_callback=progress_callback,
+            options=options,
+        )
+
+    def iter_split_by_similarity(
+        self,
+        file_path: str,
+        output_dir: str,
+        *,
+        sensitivity: float = DEFAULT_SENSITIVITY,
+        base_filename: Optional[str] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        options: Optional[SplitOptions] = None,
+        **aliases: Any,
+    ) -> Iterator[PartResult]:
+        """
+        Jakaa PDF-tiedoston asiakirjoiksi sivujen visuaalisen samankaltaisuuden perusteella.
+
+        Uusi osa alkaa sivulta, joka poikkeaa ulkoasultaan selvästi edellisestä
+        sivusta (ks. `measure_page_similarity` ja `suggest_similarity_ranges`).
+        Osat nimetään sivualueiden mukaan kuten mukautetussa jaossa.
+
+        Args:
+            file_path: PDF-tiedoston polku.
+            output_dir: Kohdepolku, johon tiedostot tallennetaan.
+            sensitivity: Herkkyys välillä 0-1. Suurempi arvo tuottaa enemmän osia.
+            base_filename: Valinnainen tulostiedostojen perusnimi.
+            progress_callback: Valinnainen edistymisen raportointi -callback.
+            options: Valinnaiset suoritusasetukset (ks. `SplitOptions`).
+            **aliases: Avainsanat `workers`, `cancel_token` ja `resume`, jotka
+                       korvaavat asetusten vastaavat kentät.
+
+        Returns:
+            Iteraattori, joka tuottaa jokaisen osan `PartResult`-oliona.
 
-            if progress_callback:
-                progress = int((parts_done / total_parts) * 100)
-                progress_callback(progress)
+        Raises:
+            ValueError: Jos herkkyys ei ole välillä 0-1.
+            IOError: Jos tulostushakemistoa ei löydy.
+        """
+        options = resolve_split_options(options, aliases)
+        if not 0 <= sensitivity <= 1:
+            raise ValueError("Herkkyyden tulee olla välillä 0-1.")
+        self._validate_output_dir(output_dir)
 
-        return output_files
+        output_config = build_output_config(
+            file_path, output_dir, format_custom_filename, base_filename
+        )
+        extractor = PageFeatureExtractor(
+            self.pdf_repository, workers=options.workers, page_cache=self.page_stats_cache
+        )
+        return self._runner().run(
+            file_path,
+            output_config,
+            plan_similarity(extractor, file_path, sensitivity, options=options),
+            progress_callback=progress_callback,
+            options=options,
+        )
 
     def split_by_fixed_range(
         self,
@@ -295,6 +677,8 @@ class PDFSplitterService:
         *,
         base_filename: Optional[str] = None,
         progress_callback: Optional[Callable[[int], None]] = None,
+        options: Optional[SplitOptions] = None,
+        **aliases: Any,
     ) -> List[str]:
         """
         Jakaa PDF-tiedoston osiin, joissa on kiinteä määrä sivuja.
@@ -305,6 +689,9 @@ class PDFSplitterService:
             output_dir: Kohdepolku, johon tiedostot tallennetaan.
             base_filename: Valinnainen tulostiedostojen perusnimi.
             progress_callback: Valinnainen edistymisen raportointi -callback.
+            options: Valinnaiset suoritusasetukset (ks. `SplitOptions`).
+            **aliases: Avainsanat `workers`, `cancel_token` ja `resume`, jotka
+                       korvaavat asetusten vastaavat kentät.
 
         Returns:
             Lista luotujen tiedostojen polkuja.
@@ -312,40 +699,21 @@ class PDFSplitterService:
         Raises:
             ValueError: Jos pages_per_file on alle 1.
             IOError: Jos tulostushakemistoa ei löydy.
+            SplitCancelledError: Jos jako peruutettiin. Poikkeus sisältää jo
+                                 tallennettujen osien polut.
         """
-        if pages_per_file < 1:
-            raise ValueError("Sivujen määrän per tiedosto tulee olla vähintään 1.")
-        if not os.path.isdir(output_dir):
-            raise IOError(
-                f"Tulostushakemistoa ei löydy tai se ei ole hakemisto: {output_dir}"
-            )
-
-        final_base_filename = (
-            base_filename or os.path.splitext(os.path.basename(file_path))[0]
-        )
-
-        with self._open_source_pdf(file_path) as pdf_document:
-            page_count = self.pdf_repository.get_page_count(pdf_document)
-            part_iterator = self._fixed_range_part_iterator(page_count, pages_per_file)
-            total_parts = (
-                math.ceil(page_count / pages_per_file) if page_count > 0 else 0
-            )
-
-            output_config: OutputConfig = {
-                "dir": output_dir,
-                "base_filename": final_base_filename,
-                "formatter": self._format_fixed_output_filename,
-                "original_file_path": file_path,
-            }
-
-            output_files = self._process_split_parts(
-                source_doc=pdf_document,
-                output_config=output_config,
-                part_iterator=part_iterator,
+        return [
+            part_result.output_path
+            for part_result in self.iter_split_by_fixed_range(
+                file_path,
+                pages_per_file,
+                output_dir,
+                base_filename=base_filename,
                 progress_callback=progress_callback,
-                total_parts=total_parts,
+                options=options,
+                **aliases,
             )
-        return output_files
+        ]
 
     def split_by_custom_ranges(
         self,
@@ -355,6 +723,8 @@ class PDFSplitterService:
         *,
         base_filename: Optional[str] = None,
         progress_callback: Optional[Callable[[int], None]] = None,
+        options: Optional[SplitOptions] = None,
+        **aliases: Any,
     ) -> List[str]:
         """
         Jakaa PDF-tiedoston osiin käyttäjän määrittelemien sivualueiden mukaan.
@@ -365,42 +735,263 @@ class PDFSplitterService:
             output_dir: Kohdepolku, johon tiedostot tallennetaan.
             base_filename: Valinnainen tulostiedostojen perusnimi.
             progress_callback: Valinnainen edistymisen raportointi -callback.
+            options: Valinnaiset suoritusasetukset (ks. `SplitOptions`).
+            **aliases: Avainsanat `workers`, `cancel_token` ja `resume`, jotka
+                       korvaavat asetusten vastaavat kentät.
 
         Returns:
             Lista luotujen tiedostojen polkuja.
 
         Raises:
-            ValueError: Jos ei ole määritetty yhtään sivualuetta.
+            ValueError: Jos sivualueita ei ole määritetty.
             IOError: Jos tulostushakemistoa ei löydy.
+            SplitCancelledError: Jos jako peruutettiin. Poikkeus sisältää jo
+                                 tallennettujen osien polut.
         """
-        if not ranges:
-            raise ValueError("Vähintään yksi sivualue on määritettävä.")
-        if not os.path.isdir(output_dir):
-            raise IOError(
-                f"Tulostushakemistoa ei löydy tai se ei ole hakemisto: {output_dir}"
+        return [
+            part_result.output_path
+            for part_result in self.iter_split_by_custom_ranges(
+                file_path,
+                ranges,
+                output_dir,
+                base_filename=base_filename,
+                progress_callback=progress_callback,
+                options=options,
+                **aliases,
             )
+        ]
 
-        final_base_filename = (
-            base_filename or os.path.splitext(os.path.basename(file_path))[0]
-        )
+    def split_by_max_size(
+        self,
+        file_path: str,
+        max_bytes: int,
+        output_dir: str,
+        *,
+        base_filename: Optional[str] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        max_resplits: int = DEFAULT_MAX_RESPLITS,
+        options: Optional[SplitOptions] = None,
+        **aliases: Any,
+    ) -> List[str]:
+        """
+        Jakaa PDF-tiedoston osiin, joiden koko on enintään max_bytes.
+
+        Args:
+            file_path: PDF-tiedoston polku.
+            max_bytes: Osatiedoston enimmäiskoko tavuina.
+            output_dir: Kohdepolku, johon tiedostot tallennetaan.
+            base_filename: Valinnainen tulostiedostojen perusnimi.
+            progress_callback: Valinnainen edistymisen raportointi -callback.
+            max_resplits: Kuinka monta kertaa rajan ylittänyt osa enintään
+                          jaetaan uudelleen.
+            options: Valinnaiset suoritusasetukset (ks. `SplitOptions`).
+            **aliases: Avainsanat `workers`, `cancel_token` ja `resume`, jotka
+                       korvaavat asetusten vastaavat kentät.
+
+        Returns:
+            Lista luotujen tiedostojen polkuja sivujärjestyksessä.
+
+        Raises:
+            ValueError: Jos max_bytes on alle 1 tai max_resplits on negatiivinen.
+            IOError: Jos tulostushakemistoa ei löydy.
+            SplitCancelledError: Jos jako peruutettiin. Poikkeus sisältää jo
+                                 tallennettujen osien polut.
+        """
+        return [
+            part_result.output_path
+            for part_result in self.iter_split_by_max_size(
+                file_path,
+                max_bytes,
+                output_dir,
+                base_filename=base_filename,
+                progress_callback=progress_callback,
+                options=options,
+                **aliases,
+                max_resplits=max_resplits,
+            )
+        ]
+
+    def split_by_separator_pages(
+        self,
+        file_path: str,
+        output_dir: str,
+        *,
+        base_filename: Optional[str] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        blank_is_separator: bool = True,
+        options: Optional[SplitOptions] = None,
+        **aliases: Any,
+    ) -> List[str]:
+        """
+        Jakaa skannauserän asiakirjoiksi erotinsivujen kohdalta.
+
+        Args:
+            file_path: PDF-tiedoston polku.
+            output_dir: Kohdepolku, johon tiedostot tallennetaan.
+            base_filename: Valinnainen tulostiedostojen perusnimi.
+            progress_callback: Valinnainen edistymisen raportointi -callback.
+            blank_is_separator: Tulkitaanko tyhjät sivut erotinsivuiksi.
+            options: Valinnaiset suoritusasetukset (ks. `SplitOptions`).
+            **aliases: Avainsanat `workers`, `cancel_token` ja `resume`, jotka
+                       korvaavat asetusten vastaavat kentät.
+
+        Returns:
+            Lista luotujen tiedostojen polkuja sivujärjestyksessä.
+
+        Raises:
+            IOError: Jos tulostushakemistoa ei löydy.
+            SplitCancelledError: Jos jako peruutettiin. Poikkeus sisältää jo
+                                 tallennettujen osien polut.
+        """
+        return [
+            part_result.output_path
+            for part_result in self.iter_split_by_separator_pages(
+                file_path,
+                output_dir,
+                base_filename=base_filename,
+                progress_callback=progress_callback,
+                blank_is_separator=blank_is_separator,
+                options=options,
+                **aliases,
+            )
+        ]
+
+    def split_by_outline(
+        self,
+        file_path: str,
+        output_dir: str,
+        *,
+        level: int = 1,
+        base_filename: Optional[str] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        options: Optional[SplitOptions] = None,
+        **aliases: Any,
+    ) -> List[str]:
+        """
+        Jakaa PDF-tiedoston osiin sisällysluettelon kirjanmerkkien kohdalta.
+
+        Args:
+            file_path: PDF-tiedoston polku.
+            output_dir: Kohdepolku, johon tiedostot tallennetaan.
+            level: Syvin kirjanmerkkien taso, joka aloittaa uuden osan.
+            base_filename: Valinnainen tulostiedostojen perusnimi.
+            progress_callback: Valinnainen edistymisen raportointi -callback.
+            options: Valinnaiset suoritusasetukset (ks. `SplitOptions`).
+            **aliases: Avainsanat `workers`, `cancel_token` ja `resume`, jotka
+                       korvaavat asetusten vastaavat kentät.
+
+        Returns:
+            Lista luotujen tiedostojen polkuja sivujärjestyksessä.
 
-        with self._open_source_pdf(file_path) as pdf_document:
-            page_count = self.pdf_repository.get_page_count(pdf_document)
-            part_iterator = self._custom_range_part_iterator(page_count, ranges)
-            total_parts = len(ranges)
-
-            output_config: OutputConfig = {
-                "dir": output_dir,
-                "base_filename": final_base_filename,
-                "formatter": self._format_custom_output_filename,
-                "original_file_path": file_path,
-            }
-
-            output_files = self._process_split_parts(
-                source_doc=pdf_document,
-                output_config=output_config,
-                part_iterator=part_iterator,
+        Raises:
+            ValueError: Jos level on alle 1 tai dokumentissa ei ole osia
+                        aloittavia kirjanmerkkejä.
+            IOError: Jos tulostushakemistoa ei löydy.
+            SplitCancelledError: Jos jako peruutettiin.
+        """
+        return [
+            part_result.output_path
+            for part_result in self.iter_split_by_outline(
+                file_path,
+                output_dir,
+                level=level,
+                base_filename=base_filename,
+                progress_callback=progress_callback,
+                options=options,
+                **aliases,
+            )
+        ]
+
+    def split_by_text_pattern(
+        self,
+        file_path: str,
+        pattern: str,
+        output_dir: str,
+        *,
+        ignore_case: bool = False,
+        base_filename: Optional[str] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        options: Optional[SplitOptions] = None,
+        **aliases: Any,
+    ) -> List[str]:
+        """
+        Jakaa PDF-tiedoston osiin sivuilta, joiden teksti vastaa hakulauseketta.
+
+        Args:
+            file_path: PDF-tiedoston polku.
+            pattern: Säännöllinen lauseke (Pythonin `re`-syntaksi).
+            output_dir: Kohdepolku, johon tiedostot tallennetaan.
+            ignore_case: Jätetäänkö kirjainkoko huomiotta.
+            base_filename: Valinnainen tulostiedostojen perusnimi.
+            progress_callback: Valinnainen edistymisen raportointi -callback.
+            options: Valinnaiset suoritusasetukset (ks. `SplitOptions`).
+            **aliases: Avainsanat `workers`, `cancel_token` ja `resume`, jotka
+                       korvaavat asetusten vastaavat kentät.
+
+        Returns:
+            Lista luotujen tiedostojen polkuja sivujärjestyksessä.
+
+        Raises:
+            ValueError: Jos lauseke on virheellinen tai yksikään sivu ei
+                        vastaa lauseketta.
+            IOError: Jos tulostushakemistoa ei löydy.
+            SplitCancelledError: Jos jako peruutettiin.
+        """
+        return [
+            part_result.output_path
+            for part_result in self.iter_split_by_text_pattern(
+                file_path,
+                pattern,
+                output_dir,
+                ignore_case=ignore_case,
+                base_filename=base_filename,
+                progress_callback=progress_callback,
+                options=options,
+                **aliases,
+            )
+        ]
+
+    def split_by_similarity(
+        self,
+        file_path: str,
+        output_dir: str,
+        *,
+        sensitivity: float = DEFAULT_SENSITIVITY,
+        base_filename: Optional[str] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        options: Optional[SplitOptions] = None,
+        **aliases: Any,
+    ) -> List[str]:
+        """
+        Jakaa PDF-tiedoston asiakirjoiksi sivujen visuaalisen samankaltaisuuden perusteella.
+
+        Args:
+            file_path: PDF-tiedoston polku.
+            output_dir: Kohdepolku, johon tiedostot tallennetaan.
+            sensitivity: Herkkyys välillä 0-1. Suurempi arvo tuottaa enemmän osia.
+            base_filename: Valinnainen tulostiedostojen perusnimi.
+            progress_callback: Valinnainen edistymisen raportointi -callback.
+            options: Valinnaiset suoritusasetukset (ks. `SplitOptions`).
+            **aliases: Avainsanat `workers`, `cancel_token` ja `resume`, jotka
+                       korvaavat asetusten vastaavat kentät.
+
+        Returns:
+            Lista luotujen tiedostojen polkuja sivujärjestyksessä.
+
+        Raises:
+            ValueError: Jos herkkyys ei ole välillä 0-1.
+            IOError: Jos tulostushakemistoa ei löydy.
+            SplitCancelledError: Jos jako peruutettiin.
+        """
+        return [
+            part_result.output_path
+            for part_result in self.iter_split_by_similarity(
+                file_path,
+                output_dir,
+                sensitivity=sensitivity,
+                base_filename=base_filename,
                 progress_callback=progress_callback,
-                total_parts=total_parts,
+                options=options,
+                **aliases,
             )
-        return output_files
+        ]
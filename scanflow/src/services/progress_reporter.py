@@ -0,0 +1,104 @@
+"""
+Moduuli jaon edistymisen kokoamiseen ja harventamiseen.
+
+Tarjoaa `ProgressReporter`-luokan, joka kokoaa valmistuneiden osien tiedot
+`ProgressEvent`-olioiksi ja välittää ne kuuntelijalle enintään annetulla
+taajuudella. Näin suuret jaot eivät tulvi käyttöliittymän tapahtumajonoa.
+"""
+
+import time
+from typing import Callable, Optional
+
+from ..entities.part_result import PartResult
+from ..entities.progress_event import ProgressEvent
+
+DEFAULT_PROGRESS_RATE_HZ = 30.0
+
+
+class ProgressReporter:
+    """
+    Kokoaa osien tulokset edistymistapahtumiksi ja harventaa ne.
+
+    Ensimmäinen valmistunut osa raportoidaan aina heti, ja sen jälkeen
+    tapahtumia lähetetään enintään `max_rate_hz` kertaa sekunnissa.
+    `finish`-kutsu takaa, että viimeinen tapahtuma kuvaa valmista jakoa.
+    """
+
+    def __init__(
+        self,
+        listener: Callable[[ProgressEvent], None],
+        total_parts: int,
+        *,
+        max_rate_hz: float = DEFAULT_PROGRESS_RATE_HZ,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """
+        Alustaa edistymisen raportoijan.
+
+        Args:
+            listener: Funktio, joka vastaanottaa edistymistapahtumat.
+            total_parts: Osien kokonaismäärä.
+            max_rate_hz: Tapahtumien enimmäistaajuus hertseinä.
+            clock: Aikalähde sekunteina (testejä varten vaihdettavissa).
+
+        Raises:
+            ValueError: Jos max_rate_hz ei ole positiivinen.
+        """
+        if max_rate_hz <= 0:
+            raise ValueError("Edistymistapahtumien taajuuden tulee olla positiivinen.")
+        self._listener = listener
+        self._clock = clock
+        self._min_interval = 1.0 / max_rate_hz
+        self._started = clock()
+        self._last_emitted: Optional[float] = None
+        self._emitted_parts = -1
+        # Kertyvä tila; kuuntelijalle lähetetään aina tästä otettu kopio.
+        self._progress = ProgressEvent(0, total_parts)
+
+    def part_done(self, part_result: PartResult) -> None:
+        """
+        Kirjaa valmistuneen osan ja lähettää tapahtuman, jos väli on kulunut.
+
+        Args:
+            part_result: Valmistuneen osan tiedot.
+        """
+        progress = self._progress
+        progress.parts_done += 1
+        progress.pages_done += part_result.page_count
+        progress.bytes_written += part_result.size_bytes
+        progress.current_part = part_result
+
+        now = self._clock()
+        if self._last_emitted is None or now - self._last_emitted >= self._min_interval:
+            self._emit(now)
+
+    def add_parts(self, count: int) -> None:
+        """
+        Kasvattaa osien kokonaismäärää, kun osa korvautuu useammalla.
+
+        Args:
+            count: Lisättävien osien määrä.
+        """
+        self._progress.total_parts += count
+
+    def finish(self) -> None:
+        """
+        Lähettää viimeisen tapahtuman, ellei valmista tilaa ole jo raportoitu.
+        """
+        if self._emitted_parts != self._progress.parts_done:
+            self._emit(self._clock())
+
+    def _emit(self, now: float) -> None:
+        progress = self._progress
+        self._last_emitted = now
+        self._emitted_parts = progress.parts_done
+        self._listener(
+            ProgressEvent(
+                progress.parts_done,
+                progress.total_parts,
+                pages_done=progress.pages_done,
+                bytes_written=progress.bytes_written,
+                elapsed_seconds=now - self._started,
+                current_part=progress.current_part,
+            )
+        )
@@ -0,0 +1,105 @@
+"""
+Moduuli PDF:n jakamiseen osiin tiedostokoon perusteella.
+
+Osat muodostetaan sivukohtaisista koon arvioista (`PDFRepository.
+estimate_page_costs`) ahneesti: sivuja lisätään osaan niin kauan kuin
+osan arvioitu koko pysyy rajan alla. Usean sivun jakamat objektit, kuten
+fontit, lasketaan osaan vain kerran.
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Luettelo, sivupuu, xref-taulu ja trailer.
+PART_OVERHEAD_BYTES = 400
+# Sivun merkintä sivupuussa ja tallennuksen sivukohtainen lisäys.
+PAGE_OVERHEAD_BYTES = 60
+# Osuus rajasta, joka jätetään arvion virheen varalle.
+SIZE_MARGIN = 0.01
+# Kuinka monta kertaa rajan ylittänyt osa enintään jaetaan uudelleen.
+DEFAULT_MAX_RESPLITS = 2
+
+
+def estimate_part_size(page_costs: Iterable[Dict[int, int]]) -> int:
+    """
+    Arvioi sivuista koostuvan osan koon tallennettuna.
+
+    Args:
+        page_costs: Osan sivujen objektien koot.
+
+    Returns:
+        Arvioitu koko tavuina.
+    """
+    objects: Dict[int, int] = {}
+    page_count = 0
+    for costs in page_costs:
+        objects.update(costs)
+        page_count += 1
+    return PART_OVERHEAD_BYTES + page_count * PAGE_OVERHEAD_BYTES + sum(objects.values())
+
+
+def pack_pages_by_size(
+    page_costs: Sequence[Dict[int, int]], max_bytes: int, first_index: int = 0
+) -> List[Tuple[int, int]]:
+    """
+    Jakaa sivut peräkkäisiin osiin, joiden arvioitu koko on enintään max_bytes.
+
+    Sivu, jonka arvio yksinäänkin ylittää rajan, muodostaa oman osansa.
+
+    Args:
+        page_costs: Sivujen objektien koot sivujärjestyksessä.
+        max_bytes: Osan arvioidun koon yläraja tavuina.
+        first_index: Ensimmäisen sivun indeksi lähdedokumentissa.
+
+    Returns:
+        Lista (start_idx, end_idx) -tupleja (0-pohjaisia, sisällytettyjä).
+    """
+    ranges: List[Tuple[int, int]] = []
+    part_objects: Dict[int, int] = {}
+    part_size = PART_OVERHEAD_BYTES
+    part_start = first_index
+    for offset, costs in enumerate(page_costs):
+        index = first_index + offset
+        added = PAGE_OVERHEAD_BYTES + sum(
+            size for xref, size in costs.items() if xref not in part_objects
+        )
+        if index > part_start and part_size + added > max_bytes:
+            ranges.append((part_start, index - 1))
+            part_objects = {}
+            part_size = PART_OVERHEAD_BYTES
+            part_start = index
+            added = PAGE_OVERHEAD_BYTES + sum(costs.values())
+        part_objects.update(costs)
+        part_size += added
+    if page_costs:
+        ranges.append((part_start, first_index + len(page_costs) - 1))
+    return ranges
+
+
+def plan_resplit(
+    page_costs: Sequence[Dict[int, int]], first_index: int, actual_bytes: int, max_bytes: int
+) -> List[Tuple[int, int]]:
+    """
+    Jakaa rajan ylittäneen osan sivut uudelleen vähintään kahteen osaan.
+
+    Raja skaalataan osan arvion ja toteutuneen koon suhteella, jotta sama
+    arviovirhe ei toistu uusissa osissa. Jos skaalattukaan raja ei jaa
+    sivuja, osa puolitetaan.
+
+    Args:
+        page_costs: Osan sivujen objektien koot sivujärjestyksessä
+                    (vähintään kaksi sivua).
+        first_index: Osan ensimmäisen sivun indeksi lähdedokumentissa.
+        actual_bytes: Tallennetun osan toteutunut koko tavuina.
+        max_bytes: Osatiedoston enimmäiskoko tavuina.
+
+    Returns:
+        Lista (start_idx, end_idx) -tupleja (0-pohjaisia, sisällytettyjä).
+    """
+    budget = int(
+        max_bytes * estimate_part_size(page_costs) / actual_bytes * (1 - SIZE_MARGIN)
+    )
+    ranges = pack_pages_by_size(page_costs, budget, first_index)
+    if len(ranges) < 2:
+        middle = first_index + len(page_costs) // 2
+        ranges = [(first_index, middle - 1), (middle, first_index + len(page_costs) - 1)]
+    return ranges
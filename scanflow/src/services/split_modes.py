@@ -0,0 +1,441 @@
+"""
+Moduuli jakotapojen suunnitelmille.
+
+Jokainen jakotapa kuvataan tulostusasetuksina (`OutputConfig`) ja
+suunnittelufunktiona, joka palauttaa avatun lähdedokumentin ja sen
+sivumäärän perusteella osat (osaiteraattori, osien kokonaismäärä).
+`SplitRunner` suorittaa suunnitelmat jakotavasta riippumatta.
+"""
+
+import math
+import os
+from typing import (
+    Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Pattern, Tuple, TypedDict,
+)
+
+from ..repositories.pdf_repository import PDFRepository
+from .outline_planner import OutlineEntry, plan_outline_parts, safe_title
+from .page_classifier import PageClassifier, ranges_between_separators
+from .page_similarity import PageFeatureExtractor, suggest_ranges
+from .page_text_extractor import (
+    PageTextExtractor,
+    find_matching_pages,
+    ranges_from_start_pages,
+)
+from .size_planner import SIZE_MARGIN, pack_pages_by_size
+from .split_options import SplitOptions
+
+PlanParts = Callable[[Any, int], Tuple[Iterator[Tuple], int]]
+
+
+class OutputConfig(TypedDict):
+    """
+    Tulostusasetusten tyyppi PDF-jakamisoperaatioille.
+
+    Attributes:
+        dir: Hakemistopolku, johon tiedostot tallennetaan
+        base_filename: Tiedostonimen perusosa (ilman päätettä)
+        formatter: Funktio, joka muodostaa tiedoston nimen
+        original_file_path: Alkuperäisen tiedoston polku
+        skip_pages: Lähteen sivuindeksit, joita ei tallenneta osiin
+        outlines: Osien kirjanmerkit lähteen sivunumeroin osan
+                  aloitussivun indeksin mukaan
+    """
+
+    dir: str
+    base_filename: str
+    formatter: Callable
+    original_file_path: str
+    skip_pages: FrozenSet[int]
+    outlines: Dict[int, List[OutlineEntry]]
+
+
+class SizeLimit:
+    """
+    Kokoon perustuvan jaon raja osien tarkistusta varten.
+
+    Attributes:
+        page_costs: Sivujen koon arviot. Täytetään suunnittelussa.
+        max_bytes: Osatiedoston enimmäiskoko tavuina.
+        max_resplits: Uudelleenjakojen enimmäismäärä osaa kohden.
+    """
+
+    __slots__ = ("page_costs", "max_bytes", "max_resplits")
+
+    def __init__(self, max_bytes: int, max_resplits: int):
+        self.page_costs: List[Dict[int, int]] = []
+        self.max_bytes = max_bytes
+        self.max_resplits = max_resplits
+
+
+def format_fixed_filename(
+    base_filename: str, part_info: Tuple[int, int, int, int]
+) -> str:
+    """
+    Muotoilee tiedostonimen kiinteän jaon osalle.
+
+    Args:
+        base_filename: Pohjatiedoston nimi ilman tiedostopäätettä.
+        part_info: Tuple, joka sisältää (start_idx, end_idx, start_page_user, end_page_user).
+
+    Returns:
+        Muotoiltu tiedostonimi kiinteän jaon osalle.
+    """
+    _start_idx, _end_idx, start_page_user, end_page_user = part_info
+    return f"{base_filename}_sivut_{start_page_user}-{end_page_user}.pdf"
+
+
+def format_custom_filename(
+    base_filename: str, part_info: Tuple[int, int, int, int, int]
+) -> str:
+    """
+    Muotoilee tiedostonimen mukautetun jaon osalle.
+
+    Args:
+        base_filename: Pohjatiedoston nimi ilman tiedostopäätettä.
+        part_info: Tuple, joka sisältää 
+        (index, start_idx, end_idx, start_page_user, end_page_user).
+
+    Returns:
+        Muotoiltu tiedostonimi mukautetun jaon osalle.
+    """
+    index, _start_idx, _end_idx, start_page_user, end_page_user = part_info
+    return f"{base_filename}_alue_{index + 1}_sivut_{start_page_user}-{end_page_user}.pdf"
+
+
+def format_outline_filename(
+    base_filename: str, part_info: Tuple[int, int, int, int, int, str]
+) -> str:
+    """
+    Muotoilee tiedostonimen kirjanmerkkien mukaan jaetulle osalle.
+
+    Args:
+        base_filename: Pohjatiedoston nimi ilman tiedostopäätettä.
+        part_info: Tuple, joka sisältää
+        (index, start_idx, end_idx, start_page_user, end_page_user, title).
+
+    Returns:
+        Muotoiltu tiedostonimi, jossa on osan järjestysnumero ja
+        kirjanmerkin otsikko.
+    """
+    index, _start_idx, _end_idx, _start_user, _end_user, title = part_info
+    return f"{base_filename}_{index + 1:03d}_{safe_title(title)}.pdf"
+
+
+def build_output_config(
+    file_path: str,
+    output_dir: str,
+    formatter: Callable,
+    base_filename: Optional[str] = None,
+) -> OutputConfig:
+    """
+    Muodostaa jakotoiminnon tulostusasetukset.
+
+    Args:
+        file_path: Lähde-PDF:n polku.
+        output_dir: Kohdehakemisto.
+        formatter: Funktio, joka muodostaa osatiedoston nimen.
+        base_filename: Valinnainen tulostiedostojen perusnimi.
+
+    Returns:
+        Tulostusasetukset `OutputConfig`-muodossa.
+    """
+    return {
+        "dir": output_dir,
+        "base_filename": base_filename
+        or os.path.splitext(os.path.basename(file_path))[0],
+        "formatter": formatter,
+        "original_file_path": file_path,
+        "skip_pages": frozenset(),
+        "outlines": {},
+    }
+
+
+def resolve_part_task(
+    output_config: OutputConfig, part_info: Tuple
+) -> Tuple[int, int, str]:
+    """
+    Muuntaa iteraattorin tuottaman osan tiedot poimintatehtäväksi.
+
+    Args:
+        output_config: Asetukset tulostusta varten.
+        part_info: Tiedot käsiteltävästä osasta (iteratorin tuottama).
+
+    Returns:
+        Tuple (start_idx, end_idx, output_path).
+    """
+    is_custom_range = len(part_info) >= 5
+    start_idx = part_info[1] if is_custom_range else part_info[0]
+    end_idx = part_info[2] if is_custom_range else part_info[1]
+
+    output_dir = output_config["dir"]
+    filename_formatter = output_config["formatter"]
+    original_file_path = output_config["original_file_path"]
+    true_base_filename = os.path.splitext(os.path.basename(original_file_path))[0]
+
+    output_filename = filename_formatter(true_base_filename, part_info)
+    return start_idx, end_idx, os.path.join(output_dir, output_filename)
+
+
+def _validate_custom_range(
+    start_user: int, end_user: int, page_count: int
+) -> None:
+    """
+    Tarkistaa mukautetun alueen kelvollisuuden.
+
+    Args:
+        start_user: Käyttäjän antama aloitussivun numero (1-pohjainen).
+        end_user: Käyttäjän antama lopetussivun numero (1-pohjainen).
+        page_count: Dokumentin kokonaissivumäärä.
+
+    Raises:
+        ValueError: Jos annettu alue on virheellinen tai rajojen ulkopuolella.
+    """
+    start_idx = start_user - 1
+    end_idx = end_user - 1
+    if not 0 <= start_idx <= end_idx < page_count:
+        error_msg_part1 = (
+            f"Virheellinen tai rajojen ulkopuolinen alue: "
+            f"{start_user}-{end_user}."
+        )
+        error_msg_part2 = f"Sivuja dokumentissa: 1-{page_count}"
+        raise ValueError(error_msg_part1 + error_msg_part2)
+
+
+def fixed_range_parts(
+    page_count: int, pages_per_file: int
+) -> Iterator[Tuple[int, int, int, int]]:
+    """
+    Generaattori kiinteän jaon osien indeksien ja sivunumeroiden luomiseen.
+
+    Args:
+        page_count: Dokumentin kokonaissivumäärä.
+        pages_per_file: Sivujen määrä tiedostoa kohden.
+
+    Yields:
+        Tuple (start_idx, end_idx, start_page_user, end_page_user), jossa
+        start_idx ja end_idx ovat 0-pohjaisia indeksejä ja
+        start_page_user ja end_page_user ovat käyttäjälle näytettäviä
+        1-pohjaisia numeroita.
+    """
+    if page_count == 0:
+        return
+    for i in range(math.ceil(page_count / pages_per_file)):
+        start_idx = i * pages_per_file
+        end_idx = min((i + 1) * pages_per_file - 1, page_count - 1)
+        yield start_idx, end_idx, start_idx + 1, end_idx + 1
+
+
+def custom_range_parts(
+    page_count: int, ranges: List[Tuple[int, int]]
+) -> Iterator[Tuple[int, int, int, int, int]]:
+    """
+    Generaattori mukautettujen osien indeksien ja sivunumeroiden luomiseen.
+
+    Args:
+        page_count: Dokumentin kokonaissivumäärä.
+        ranges: Lista (aloitussivu, lopetussivu) -tupleja, jossa sivunumerot ovat 1-pohjaisia.
+
+    Yields:
+        Tuple (i, start_idx, end_idx, start_user, end_user), jossa
+        i on järjestysnumero, start_idx ja end_idx ovat 0-pohjaisia indeksejä ja
+        start_user ja end_user ovat käyttäjän antamia 1-pohjaisia sivunumeroita.
+
+    Raises:
+        ValueError: Jos dokumentti on tyhjä mutta alueita yritetään määrittää.
+    """
+    if page_count == 0 and ranges:
+        raise ValueError("Cannot split an empty document based on ranges.")
+    for i, (start_user, end_user) in enumerate(ranges):
+        _validate_custom_range(start_user, end_user, page_count)
+        start_idx = start_user - 1
+        end_idx = end_user - 1
+        yield i, start_idx, end_idx, start_user, end_user
+
+
+def plan_fixed_range(pages_per_file: int) -> PlanParts:
+    """
+    Muodostaa kiinteän jaon suunnitelman.
+
+    Args:
+        pages_per_file: Sivujen määrä tiedostoa kohden.
+
+    Returns:
+        Suunnittelufunktio.
+    """
+
+    def plan_parts(_source_doc: Any, page_count: int) -> Tuple[Iterator[Tuple], int]:
+        total_parts = (
+            math.ceil(page_count / pages_per_file) if page_count > 0 else 0
+        )
+        return fixed_range_parts(page_count, pages_per_file), total_parts
+
+    return plan_parts
+
+
+def plan_custom_ranges(ranges: List[Tuple[int, int]]) -> PlanParts:
+    """
+    Muodostaa mukautetun jaon suunnitelman.
+
+    Args:
+        ranges: Lista (aloitussivu, lopetussivu) -tupleja, 1-pohjaisia.
+
+    Returns:
+        Suunnittelufunktio. Alueet tarkistetaan sivumäärää vasten.
+    """
+
+    def plan_parts(_source_doc: Any, page_count: int) -> Tuple[Iterator[Tuple], int]:
+        return custom_range_parts(page_count, ranges), len(ranges)
+
+    return plan_parts
+
+
+def plan_max_size(pdf_repository: PDFRepository, size_limit: SizeLimit) -> PlanParts:
+    """
+    Muodostaa kokoon perustuvan jaon suunnitelman sivujen koon arvioista.
+
+    Args:
+        pdf_repository: Repositorio sivujen koon arviointiin.
+        size_limit: Kokoraja. Sivujen koon arviot tallennetaan siihen
+                    osien tarkistusta varten.
+
+    Returns:
+        Suunnittelufunktio.
+    """
+
+    def plan_parts(source_doc: Any, _page_count: int) -> Tuple[Iterator[Tuple], int]:
+        size_limit.page_costs = pdf_repository.estimate_page_costs(source_doc)
+        ranges = pack_pages_by_size(
+            size_limit.page_costs, int(size_limit.max_bytes * (1 - SIZE_MARGIN))
+        )
+        return iter([(start, end, start + 1, end + 1) for start, end in ranges]), len(ranges)
+
+    return plan_parts
+
+
+def _numbered_parts(ranges: List[Tuple[int, int]]) -> Tuple[Iterator[Tuple], int]:
+    part_infos = [
+        (index, start, end, start + 1, end + 1)
+        for index, (start, end) in enumerate(ranges)
+    ]
+    return iter(part_infos), len(part_infos)
+
+
+def plan_separator_pages(
+    classifier: PageClassifier,
+    file_path: str,
+    *,
+    blank_is_separator: bool,
+    options: SplitOptions,
+) -> PlanParts:
+    """
+    Muodostaa erotinsivujen mukaisen jaon suunnitelman.
+
+    Args:
+        classifier: Sivujen luokittelija.
+        file_path: Lähde-PDF:n polku.
+        blank_is_separator: Tulkitaanko tyhjät sivut erotinsivuiksi.
+        options: Suoritusasetukset. Tyhjän sivun raja ja peruutustoken
+                 luetaan niistä.
+
+    Returns:
+        Suunnittelufunktio.
+    """
+
+    def plan_parts(source_doc: Any, _page_count: int) -> Tuple[Iterator[Tuple], int]:
+        kinds = classifier.classify(
+            file_path, options.blank_threshold, source_doc, options.cancel_token
+        )
+        return _numbered_parts(ranges_between_separators(kinds, blank_is_separator))
+
+    return plan_parts
+
+
+def plan_outline(
+    pdf_repository: PDFRepository, output_config: OutputConfig, level: int
+) -> PlanParts:
+    """
+    Muodostaa kirjanmerkkien mukaisen jaon suunnitelman.
+
+    Args:
+        pdf_repository: Repositorio sisällysluettelon lukemiseen.
+        output_config: Asetukset tulostusta varten. Osien kirjanmerkit
+                       tallennetaan niihin.
+        level: Syvin kirjanmerkkien taso, joka aloittaa uuden osan.
+
+    Returns:
+        Suunnittelufunktio.
+    """
+
+    def plan_parts(source_doc: Any, page_count: int) -> Tuple[Iterator[Tuple], int]:
+        outline = pdf_repository.get_outline(source_doc)
+        parts = plan_outline_parts(outline, page_count, level)
+        output_config["outlines"] = {
+            part.start_idx: part.entries for part in parts if part.entries
+        }
+        part_infos = [
+            (index, part.start_idx, part.end_idx, part.start_idx + 1, part.end_idx + 1,
+             part.title)
+            for index, part in enumerate(parts)
+        ]
+        return iter(part_infos), len(part_infos)
+
+    return plan_parts
+
+
+def plan_text_pattern(
+    extractor: PageTextExtractor,
+    file_path: str,
+    regex: Pattern[str],
+    *,
+    options: SplitOptions,
+) -> PlanParts:
+    """
+    Muodostaa tekstihaun mukaisen jaon suunnitelman.
+
+    Args:
+        extractor: Sivujen tekstien poimija.
+        file_path: Lähde-PDF:n polku.
+        regex: Käännetty hakulauseke.
+        options: Suoritusasetukset. Peruutustoken luetaan niistä.
+
+    Returns:
+        Suunnittelufunktio. Se nostaa ValueError-poikkeuksen, jos yksikään
+        sivu ei vastaa lauseketta.
+    """
+
+    def plan_parts(source_doc: Any, page_count: int) -> Tuple[Iterator[Tuple], int]:
+        texts = extractor.extract(file_path, source_doc, options.cancel_token)
+        start_pages = find_matching_pages(texts, regex)
+        if not start_pages:
+            raise ValueError(f"Yksikään sivu ei vastaa hakulauseketta: {regex.pattern}")
+        return _numbered_parts(ranges_from_start_pages(start_pages, page_count))
+
+    return plan_parts
+
+
+def plan_similarity(
+    extractor: PageFeatureExtractor,
+    file_path: str,
+    sensitivity: float,
+    *,
+    options: SplitOptions,
+) -> PlanParts:
+    """
+    Muodostaa sivujen samankaltaisuuden mukaisen jaon suunnitelman.
+
+    Args:
+        extractor: Sivujen piirteiden poimija.
+        file_path: Lähde-PDF:n polku.
+        sensitivity: Herkkyys välillä 0-1.
+        options: Suoritusasetukset. Peruutustoken luetaan niistä.
+
+    Returns:
+        Suunnittelufunktio.
+    """
+
+    def plan_parts(source_doc: Any, _page_count: int) -> Tuple[Iterator[Tuple], int]:
+        distances = extractor.distances(file_path, source_doc, options.cancel_token)
+        return _numbered_parts(suggest_ranges(distances, sensitivity))
+
+    return plan_parts
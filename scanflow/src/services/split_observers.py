@@ -0,0 +1,460 @@
+"""
+Moduuli PDF-jaon vaiheiden mittausten tarkkailijoille.
+
+`PDFSplitterService` ilmoittaa tarkkailijalle jaon alkamisesta, työtason
+vaiheista (lähteen avaus ja jakosuunnitelma), jokaisesta valmiista osasta
+(poiminnan ja tallennuksen kesto, koko ja sivumäärä) sekä jaon päättymisestä.
+Oletuksena palvelulla ei ole tarkkailijaa, jolloin mittauksia ei kerätä
+lainkaan.
+
+Valmiit tarkkailijat:
+
+- `HistogramObserver`: kokoaa vaiheiden kestot histogrammeiksi ja tuottaa
+  yhteenvedon.
+- `JsonLinesObserver`: kirjoittaa jokaisen tapahtuman JSON-rivinä
+  tiedostoon `~/.scanflow/split_events.jsonl`.
+- `PrometheusTextfileObserver`: kirjoittaa histogrammit Prometheus-
+  tekstimuotoon node exporterin textfile-keräimen luettavaksi.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, TextIO
+
+from ..entities.part_result import PartResult
+from ..utils.app_paths import get_app_dir
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+PART_STAGES = ("extract", "save")
+
+
+class SplitObserver:
+    """
+    Tarkkailijan perusluokka. Kaikki metodit ovat oletuksena tyhjiä.
+
+    Aliluokat ylikirjoittavat vain tarvitsemansa metodit. Metodeja kutsutaan
+    jakoa suorittavasta säikeestä.
+    """
+
+    def job_started(self, file_path: str) -> None:
+        """
+        Kutsutaan, kun jako alkaa.
+
+        Args:
+            file_path: Lähde-PDF:n polku.
+        """
+
+    def stage_finished(
+        self, stage: str, seconds: float, pages: int = 0, size_bytes: int = 0
+    ) -> None:
+        """
+        Kutsutaan, kun työtason vaihe ("load" tai "plan") valmistuu.
+
+        Args:
+            stage: Vaiheen nimi.
+            seconds: Vaiheen kesto sekunteina.
+            pages: Vaiheen käsittelemien sivujen määrä.
+            size_bytes: Vaiheen käsittelemien tavujen määrä.
+        """
+
+    def part_finished(self, part_result: PartResult) -> None:
+        """
+        Kutsutaan jokaisen osan valmistuttua jakojärjestyksessä.
+
+        Args:
+            part_result: Osan tiedot vaiheiden kestoineen.
+        """
+
+    def job_finished(self, file_path: str, seconds: float, succeeded: bool) -> None:
+        """
+        Kutsutaan, kun jako päättyy onnistuneesti, virheeseen tai peruutukseen.
+
+        Args:
+            file_path: Lähde-PDF:n polku.
+            seconds: Jaon kokonaiskesto sekunteina.
+            succeeded: True, jos kaikki osat valmistuivat.
+        """
+
+
+class CompositeObserver(SplitObserver):
+    """Välittää tapahtumat usealle tarkkailijalle annetussa järjestyksessä."""
+
+    def __init__(self, observers: Sequence[SplitObserver]):
+        """
+        Alustaa yhdistelmätarkkailijan.
+
+        Args:
+            observers: Tarkkailijat, joille tapahtumat välitetään.
+        """
+        self.observers = list(observers)
+
+    def job_started(self, file_path: str) -> None:
+        for observer in self.observers:
+            observer.job_started(file_path)
+
+    def stage_finished(
+        self, stage: str, seconds: float, pages: int = 0, size_bytes: int = 0
+    ) -> None:
+        for observer in self.observers:
+            observer.stage_finished(stage, seconds, pages, size_bytes)
+
+    def part_finished(self, part_result: PartResult) -> None:
+        for observer in self.observers:
+            observer.part_finished(part_result)
+
+    def job_finished(self, file_path: str, seconds: float, succeeded: bool) -> None:
+        for observer in self.observers:
+            observer.job_finished(file_path, seconds, succeeded)
+
+
+class Histogram:
+    """
+    Kumulatiivinen histogrammi kiinteillä ylärajoilla (Prometheus-tyyliin).
+
+    Attributes:
+        bounds (Sequence[float]): Lokeroiden ylärajat nousevassa järjestyksessä.
+        counts (List[int]): Havaintojen määrä lokeroittain; viimeinen lokero
+            on rajaton (+Inf).
+        count (int): Havaintojen kokonaismäärä.
+        total (float): Havaintojen summa.
+        maximum (float): Suurin havainto.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "total", "maximum")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Lisää havainnon histogrammiin.
+
+        Args:
+            value: Havaittu arvo.
+        """
+        index = 0
+        while index < len(self.bounds) and value > self.bounds[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+
+    def quantile(self, q: float) -> float:
+        """
+        Arvioi kvantiilin lokeron ylärajana.
+
+        Args:
+            q: Kvantiili välillä 0–1.
+
+        Returns:
+            Sen lokeron yläraja, johon kvantiili osuu. Rajattomassa lokerossa
+            palautetaan suurin havainto. Tyhjälle histogrammille 0.0.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                if index < len(self.bounds):
+                    return min(self.bounds[index], self.maximum)
+                break
+        return self.maximum
+
+
+class HistogramObserver(SplitObserver):
+    """
+    Kokoaa vaiheiden kestot histogrammeiksi sekä osien koot ja sivumäärät.
+
+    Välimuistista tai jakolokista saadut osat, joiden kummankin vaiheen
+    kesto on nolla, lasketaan osiin mutta eivät vääristä kestohistogrammeja.
+
+    Attributes:
+        histograms (Dict[str, Histogram]): Kestohistogrammit vaiheittain.
+        parts (int): Valmiiden osien määrä.
+        pages (int): Valmiiden osien yhteenlaskettu sivumäärä.
+        bytes_written (int): Valmiiden osien yhteenlaskettu koko.
+        jobs (Dict[str, int]): Päättyneiden jakojen määrä tuloksen mukaan.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Alustaa histogrammitarkkailijan.
+
+        Args:
+            buckets: Kestohistogrammien lokeroiden ylärajat sekunteina.
+        """
+        self.buckets = tuple(buckets)
+        self.histograms: Dict[str, Histogram] = {}
+        self.parts = 0
+        self.pages = 0
+        self.bytes_written = 0
+        self.jobs = {"ok": 0, "error": 0}
+        self._lock = threading.Lock()
+
+    def stage_finished(
+        self, stage: str, seconds: float, pages: int = 0, size_bytes: int = 0
+    ) -> None:
+        with self._lock:
+            self._histogram(stage).observe(seconds)
+
+    def part_finished(self, part_result: PartResult) -> None:
+        with self._lock:
+            self.parts += 1
+            self.pages += part_result.page_count
+            self.bytes_written += part_result.size_bytes
+            if part_result.extract_seconds or part_result.save_seconds:
+                self._histogram("extract").observe(part_result.extract_seconds)
+                self._histogram("save").observe(part_result.save_seconds)
+
+    def job_finished(self, file_path: str, seconds: float, succeeded: bool) -> None:
+        with self._lock:
+            self._histogram("job").observe(seconds)
+            self.jobs["ok" if succeeded else "error"] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Palauttaa yhteenvedon vaiheiden kestoista ja osien määristä.
+
+        Returns:
+            Sanakirja avaimilla 'buckets', 'parts', 'pages', 'bytes_written',
+            'jobs' ja 'stages'. 'stages' sisältää jokaiselle vaiheelle
+            havaintojen määrän, summan, keskiarvon, p50-, p90- ja p99-arviot,
+            maksimin sekä lokerokohtaiset määrät. Yhteenveto voidaan yhdistää
+            toiseen tarkkailijaan `merge`-metodilla.
+        """
+        with self._lock:
+            return {
+                "buckets": list(self.buckets),
+                "parts": self.parts,
+                "pages": self.pages,
+                "bytes_written": self.bytes_written,
+                "jobs": dict(self.jobs),
+                "stages": {
+                    stage: {
+                        "count": histogram.count,
+                        "total_seconds": histogram.total,
+                        "mean_seconds": (
+                            histogram.total / histogram.count if histogram.count else 0.0
+                        ),
+                        "p50_seconds": histogram.quantile(0.5),
+                        "p90_seconds": histogram.quantile(0.9),
+                        "p99_seconds": histogram.quantile(0.99),
+                        "max_seconds": histogram.maximum,
+                        "bucket_counts": list(histogram.counts),
+                    }
+                    for stage, histogram in self.histograms.items()
+                },
+            }
+
+    def merge(self, summary: Dict[str, Any]) -> None:
+        """
+        Lisää toisen tarkkailijan yhteenvedon tämän tarkkailijan lukuihin.
+
+        Käytetään, kun jaot ajetaan eri prosesseissa ja mittaukset kootaan
+        lopuksi yhteen.
+
+        Args:
+            summary: `summary`-metodin palauttama yhteenveto.
+
+        Raises:
+            ValueError: Jos yhteenvedon lokerot poikkeavat tämän
+                        tarkkailijan lokeroista.
+        """
+        if tuple(summary["buckets"]) != self.buckets:
+            raise ValueError("Histogrammien lokerot eivät täsmää.")
+        with self._lock:
+            self.parts += summary["parts"]
+            self.pages += summary["pages"]
+            self.bytes_written += summary["bytes_written"]
+            for result, count in summary["jobs"].items():
+                self.jobs[result] = self.jobs.get(result, 0) + count
+            for stage, stats in summary["stages"].items():
+                histogram = self._histogram(stage)
+                histogram.counts = [
+                    own + other for own, other in zip(histogram.counts, stats["bucket_counts"])
+                ]
+                histogram.count += stats["count"]
+                histogram.total += stats["total_seconds"]
+                histogram.maximum = max(histogram.maximum, stats["max_seconds"])
+
+    def format_summary(self) -> str:
+        """
+        Muotoilee yhteenvedon luettavaksi tekstiksi.
+
+        Returns:
+            Monirivinen yhteenveto.
+        """
+        summary = self.summary()
+        lines = [
+            f"Osia {summary['parts']}, sivuja {summary['pages']}, "
+            f"{summary['bytes_written'] / (1024 * 1024):.1f} Mt"
+        ]
+        for stage, stats in summary["stages"].items():
+            lines.append(
+                f"  {stage}: {stats['count']} kpl, yhteensä {stats['total_seconds']:.3f} s, "
+                f"p50 ≤ {stats['p50_seconds'] * 1000:.1f} ms, "
+                f"p99 ≤ {stats['p99_seconds'] * 1000:.1f} ms, "
+                f"max {stats['max_seconds'] * 1000:.1f} ms"
+            )
+        return "\n".join(lines)
+
+    def _histogram(self, stage: str) -> Histogram:
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = Histogram(self.buckets)
+        return histogram
+
+
+class JsonLinesObserver(SplitObserver):
+    """
+    Kirjoittaa jokaisen tapahtuman JSON-rivinä tiedostoon.
+
+    Tiedosto avataan jaon alkaessa lisäystilassa ja suljetaan jaon
+    päättyessä, joten usean jaon tapahtumat kertyvät samaan tiedostoon.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Alustaa tarkkailijan.
+
+        Args:
+            path: Tapahtumatiedoston polku. Oletuksena
+                  `~/.scanflow/split_events.jsonl`.
+        """
+        self.path = path or os.path.join(get_app_dir(), "split_events.jsonl")
+        self._file: Optional[TextIO] = None
+        self._file_path: Optional[str] = None
+
+    def job_started(self, file_path: str) -> None:
+        if self._file is None:
+            # Rivipuskurointi pitää rivit ehjinä, kun usea prosessi kirjoittaa
+            # samaan tiedostoon.
+            self._file = open( # pylint: disable=consider-using-with
+                self.path, "a", encoding="utf-8", buffering=1
+            )
+        self._file_path = file_path
+        self._write({"event": "job_started", "file": file_path})
+
+    def stage_finished(
+        self, stage: str, seconds: float, pages: int = 0, size_bytes: int = 0
+    ) -> None:
+        self._write({
+            "event": "stage", "stage": stage, "seconds": seconds,
+            "pages": pages, "bytes": size_bytes,
+        })
+
+    def part_finished(self, part_result: PartResult) -> None:
+        self._write({
+            "event": "part",
+            "output": part_result.output_path,
+            "start_page": part_result.start_page,
+            "end_page": part_result.end_page,
+            "pages": part_result.page_count,
+            "bytes": part_result.size_bytes,
+            "extract_seconds": part_result.extract_seconds,
+            "save_seconds": part_result.save_seconds,
+        })
+
+    def job_finished(self, file_path: str, seconds: float, succeeded: bool) -> None:
+        self._write({
+            "event": "job_finished", "seconds": seconds, "succeeded": succeeded,
+        })
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        if self._file is None:
+            return
+        entry = {"time": time.time(), "job": self._file_path, **entry}
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+class PrometheusTextfileObserver(HistogramObserver):
+    """
+    Kirjoittaa kootut mittaukset Prometheus-tekstimuotoon jokaisen jaon jälkeen.
+
+    Tiedosto kirjoitetaan ensin väliaikaisena ja nimetään sitten
+    lopulliseksi, jotta node exporter ei koskaan lue keskeneräistä
+    tiedostoa. Arvot ovat kumulatiivisia tarkkailijan elinajalta.
+    """
+
+    def __init__(self, path: Optional[str] = None, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Alustaa tarkkailijan.
+
+        Args:
+            path: Kohdetiedoston polku (päätteenä `.prom`). Oletuksena
+                  `~/.scanflow/metrics/scanflow.prom`.
+            buckets: Kestohistogrammien lokeroiden ylärajat sekunteina.
+        """
+        super().__init__(buckets)
+        self.path = path or os.path.join(get_app_dir("metrics"), "scanflow.prom")
+
+    def job_finished(self, file_path: str, seconds: float, succeeded: bool) -> None:
+        super().job_finished(file_path, seconds, succeeded)
+        self.write()
+
+    def render(self) -> str:
+        """
+        Muodostaa mittaukset Prometheus-tekstimuodossa.
+
+        Returns:
+            Tekstimuotoiset mittarit.
+        """
+        with self._lock:
+            lines: List[str] = [
+                "# HELP scanflow_split_stage_seconds Duration of split stages.",
+                "# TYPE scanflow_split_stage_seconds histogram",
+            ]
+            for stage, histogram in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(
+                        f'scanflow_split_stage_seconds_bucket{{stage="{stage}",le="{bound:g}"}} '
+                        f"{cumulative}"
+                    )
+                lines.append(
+                    f'scanflow_split_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} '
+                    f"{histogram.count}"
+                )
+                lines.append(
+                    f'scanflow_split_stage_seconds_sum{{stage="{stage}"}} {histogram.total}'
+                )
+                lines.append(
+                    f'scanflow_split_stage_seconds_count{{stage="{stage}"}} {histogram.count}'
+                )
+            for name, help_text, value in (
+                ("scanflow_split_parts_total", "Split parts produced.", self.parts),
+                ("scanflow_split_pages_total", "Pages written to split parts.", self.pages),
+                ("scanflow_split_bytes_total", "Bytes written to split parts.", self.bytes_written),
+            ):
+                lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} counter",
+                              f"{name} {value}"])
+            lines.extend([
+                "# HELP scanflow_split_jobs_total Finished split jobs by result.",
+                "# TYPE scanflow_split_jobs_total counter",
+            ])
+            for result, count in self.jobs.items():
+                lines.append(f'scanflow_split_jobs_total{{result="{result}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> None:
+        """Kirjoittaa mittaukset kohdetiedostoon atomisesti."""
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(self.render())
+        os.replace(temp_path, self.path)
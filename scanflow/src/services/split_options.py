@@ -0,0 +1,109 @@
+"""
+Moduuli jakometodien yhteisille suoritusasetuksille.
+
+Tarjoaa `SplitOptions`-luokan, joka kokoaa kaikille jakotavoille yhteiset
+asetukset: rinnakkaisuuden, peruutuksen, edistymisen raportoinnin,
+jakotyön lokin ja tyhjien sivujen pois jättämisen. Jakotavan omat
+parametrit, kuten sivumäärä tai hakulauseke, annetaan jakometodille
+erikseen. `resolve_split_options` yhdistää asetuksiin jakometodien
+aiemmat avainsana-argumentit `workers`, `cancel_token` ja `resume`.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional
+
+from ..entities.progress_event import ProgressEvent
+from .cancellation import CancellationToken
+from .progress_reporter import DEFAULT_PROGRESS_RATE_HZ
+
+# Musteen peiton yläraja tyhjälle sivulle.
+DEFAULT_BLANK_THRESHOLD = 0.001
+
+# Jakometodien aiemmat avainsana-argumentit, jotka vastaavat asetusten kenttiä.
+OPTION_ALIASES = ("workers", "cancel_token", "resume")
+
+
+@dataclass(frozen=True)
+class SplitOptions:  # pylint: disable=too-many-instance-attributes
+    """
+    Jaon suoritusasetukset, jotka ovat samat kaikille jakotavoille.
+
+    Attributes:
+        workers: Työprosessien määrä. Arvolla 1 osat käsitellään sarjassa,
+                 suuremmalla arvolla prosessipoolissa. Sama määrä käytetään
+                 myös sivujen renderöinnissä ja tekstin poiminnassa.
+        cancel_token: Valinnainen peruutustoken, jolla jako voidaan
+                      keskeyttää osien välissä.
+        progress_listener: Valinnainen kuuntelija `ProgressEvent`-olioille,
+                           jotka sisältävät osat, sivut, tavut, nopeuden ja
+                           aika-arvion. Viimeinen tapahtuma kuvaa aina
+                           valmista jakoa.
+        progress_rate_hz: Edistymistapahtumien enimmäistaajuus hertseinä.
+        journal: Kirjoitetaanko tulostushakemistoon jakotyön loki, jonka
+                 avulla keskeytynyt jako voidaan jatkaa. Loki poistetaan,
+                 kun jako valmistuu.
+        resume: Jatketaanko aiemmin keskeytynyttä jakoa lokin perusteella.
+                Valmiit osat tarkistetaan koon ja tiivisteen avulla ja
+                ohitetaan. Toteuttaa myös lokin kirjoituksen.
+        drop_blank_pages: Jätetäänkö tyhjät sivut, kuten kaksipuolisen
+                          skannauksen tyhjät kääntöpuolet, pois osista. Osa,
+                          jonka kaikki sivut ovat tyhjiä, jätetään kokonaan pois.
+        blank_threshold: Musteen peiton yläraja tyhjälle sivulle.
+        dropped_pages_callback: Valinnainen callback, jolle annetaan pois
+                                jätetyt sivut (1-pohjaisia) ennen ensimmäistä
+                                osaa.
+    """
+
+    workers: int = 1
+    cancel_token: Optional[CancellationToken] = None
+    progress_listener: Optional[Callable[[ProgressEvent], None]] = None
+    progress_rate_hz: float = DEFAULT_PROGRESS_RATE_HZ
+    journal: bool = False
+    resume: bool = False
+    drop_blank_pages: bool = False
+    blank_threshold: float = DEFAULT_BLANK_THRESHOLD
+    dropped_pages_callback: Optional[Callable[[List[int]], None]] = None
+
+    def __post_init__(self):
+        """
+        Tarkistaa asetusten arvot.
+
+        Raises:
+            ValueError: Jos workers on alle 1, progress_rate_hz ei ole
+                        positiivinen tai blank_threshold on negatiivinen.
+        """
+        if self.workers < 1:
+            raise ValueError("Työprosessien määrän tulee olla vähintään 1.")
+        if self.progress_rate_hz <= 0:
+            raise ValueError("Edistymistapahtumien taajuuden tulee olla positiivinen.")
+        if self.blank_threshold < 0:
+            raise ValueError("Tyhjän sivun raja ei voi olla negatiivinen.")
+
+    @property
+    def uses_journal(self) -> bool:
+        """Palauttaa True, jos jako kirjoittaa tai jatkaa jakotyön lokia."""
+        return self.journal or self.resume
+
+
+def resolve_split_options(
+    options: Optional[SplitOptions], aliases: Dict[str, Any]
+) -> SplitOptions:
+    """
+    Yhdistää jakometodin avainsana-argumentit suoritusasetuksiin.
+
+    Args:
+        options: Valinnaiset suoritusasetukset. Jos None, käytetään oletuksia.
+        aliases: Jakometodille annetut avainsanat `OPTION_ALIASES`-joukosta.
+                 Ne korvaavat asetusten vastaavat kentät.
+
+    Returns:
+        Suoritusasetukset.
+
+    Raises:
+        TypeError: Jos aliases sisältää tuntemattoman avainsanan.
+    """
+    unknown = sorted(set(aliases) - set(OPTION_ALIASES))
+    if unknown:
+        raise TypeError(f"Tuntematon avainsana-argumentti: {', '.join(unknown)}")
+    options = options or SplitOptions()
+    return replace(options, **aliases) if aliases else options
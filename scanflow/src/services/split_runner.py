@@ -0,0 +1,831 @@
+"""
+Moduuli jakosuunnitelmien suorittamiseen.
+
+Tarjoaa `SplitRunner`-luokan, joka suorittaa jakotavan suunnitelman
+jakotavasta riippumatta: avaa lähteen, jättää tyhjät sivut tarvittaessa
+pois, palauttaa jakotyön lokista ja osavälimuistista jo valmiit osat,
+käsittelee puuttuvat osat sarjassa tai rinnakkain ja raportoi edistymisen
+sekä tapahtumat tarkkailijalle.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..entities.part_result import PartResult
+from ..repositories.page_stats_cache import PageStatsCache
+from ..repositories.part_cache import PartCache
+from ..repositories.pdf_repository import PDFRepository
+from ..repositories.split_journal import SplitJournal
+from ..utils import tracing
+from ..utils.file_fingerprint import file_sha256
+from .cancellation import CancellationToken, SplitCancelledError
+from .page_classifier import PAGE_BLANK, PageClassifier
+from .part_workers import extract_and_save_part, file_size, iter_parts_in_pool, notify_progress
+from .progress_reporter import ProgressReporter
+from .size_planner import plan_resplit
+from .split_modes import OutputConfig, PlanParts, SizeLimit, resolve_part_task
+from .split_observers import SplitObserver
+from .split_options import SplitOptions
+
+
+class _SourceDigest:
+    """
+    Lähdetiedoston sisällön tiiviste, joka lasketaan vasta tarvittaessa.
+
+    Attributes:
+        file_path: Lähde-PDF:n polku.
+        size: Lähdetiedoston koko tavuina.
+    """
+
+    __slots__ = ("file_path", "size", "_value")
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.size = os.path.getsize(file_path)
+        self._value: Optional[str] = None
+
+    def value(self) -> str:
+        """Palauttaa lähdetiedoston SHA-256-tiivisteen ja laskee sen ensimmäisellä kutsulla."""
+        if self._value is None:
+            self._value = file_sha256(self.file_path)
+        return self._value
+
+
+class _SplitPlan:
+    """
+    Suoritettava jakosuunnitelma.
+
+    Attributes:
+        part_iterator: Käsiteltävät (valmiista puuttuvat) osat.
+        total_parts: Suunnitelman osien kokonaismäärä.
+        ready: Lokista tai välimuistista jo valmiiden osien tiedostot
+            indeksin mukaan.
+        cache_keys: Välimuistiin tallennettavien osien avainten osat
+            (start_idx, end_idx, tallennusasetukset) indeksin mukaan.
+        source_digest: Lähteen tiiviste välimuistiavaimia varten.
+        split_journal: Valinnainen jakotyön loki.
+        check_part: Valinnainen tarkistus, joka palauttaa käsitellyn osan
+            sellaisenaan tai sen korvaavat osat ennen kirjaamista.
+    """
+
+    __slots__ = (
+        "part_iterator", "total_parts", "ready", "cache_keys", "source_digest",
+        "split_journal", "check_part",
+    )
+
+    def __init__(self, part_iterator: Iterator[Tuple], total_parts: int):
+        self.part_iterator = part_iterator
+        self.total_parts = total_parts
+        self.ready: Dict[int, List[PartResult]] = {}
+        self.cache_keys: Dict[int, Tuple[int, int, Dict[str, Any]]] = {}
+        self.source_digest: Optional[_SourceDigest] = None
+        self.split_journal: Optional[SplitJournal] = None
+        self.check_part: Optional[Callable[[PartResult], List[PartResult]]] = None
+
+    @property
+    def pending_parts(self) -> int:
+        """Palauttaa käsiteltävien osien määrän."""
+        return self.total_parts - len(self.ready)
+
+
+def _part_signature(
+    save_signature: Dict[str, Any], output_config: OutputConfig, start_idx: int, end_idx: int
+) -> Dict[str, Any]:
+    """
+    Muodostaa osan tallennusasetukset osavälimuistin avainta varten.
+
+    Osan välistä pois jätetyt sivut ja osan kirjanmerkit lisätään
+    tallennusasetuksiin vain, jos niitä on, joten osa ilman niitä on
+    välimuistissa sama kuin tavallisessa jaossa.
+
+    Args:
+        save_signature: Repositorion tallennusasetukset.
+        output_config: Asetukset tulostusta varten.
+        start_idx: Osan ensimmäinen sivu (0-pohjainen).
+        end_idx: Osan viimeinen sivu (0-pohjainen).
+
+    Returns:
+        Osan tallennusasetukset.
+    """
+    part_signature = dict(save_signature)
+    skip_pages = output_config["skip_pages"]
+    part_skips = [page for page in range(start_idx, end_idx + 1) if page in skip_pages]
+    if part_skips:
+        part_signature["skip_pages"] = part_skips
+    if output_config["outlines"].get(start_idx):
+        part_signature["outline"] = output_config["outlines"][start_idx]
+    return part_signature
+
+
+class SplitRunner:
+    """
+    Suorittaa jakotapojen suunnitelmat.
+
+    Suorittaja on kevyt, ja `PDFSplitterService` luo sen jokaista jakoa
+    varten omista riippuvuuksistaan.
+    """
+
+    def __init__(
+        self,
+        pdf_repository: PDFRepository,
+        *,
+        part_cache: Optional[PartCache] = None,
+        observer: Optional[SplitObserver] = None,
+        page_stats_cache: Optional[PageStatsCache] = None,
+    ):
+        """
+        Alustaa suorittajan.
+
+        Args:
+            pdf_repository: Repositorio PDF-tiedostojen käsittelyyn.
+            part_cache: Valinnainen välimuisti valmiille osatiedostoille.
+            observer: Valinnainen tarkkailija jaon tapahtumille.
+            page_stats_cache: Valinnainen välimuisti sivujen luokittelun
+                              tunnusluvuille tyhjiä sivuja etsittäessä.
+        """
+        self.pdf_repository = pdf_repository
+        self.part_cache = part_cache
+        self.observer = observer
+        self.page_stats_cache = page_stats_cache
+
+    @contextmanager
+    def open_source_pdf(self, file_path: str) -> Iterator[Any]:
+        """
+        Avaa lähde-PDF:n ja varmistaa sen sulkemisen context managerilla.
+
+        Jos repositoriolla on dokumenttivälimuisti, lämmin dokumentti
+        lainataan välimuistista ja palautetaan sinne sulkemisen sijaan.
+
+        Args:
+            file_path: Avattavan PDF-tiedoston polku.
+
+        Yields:
+            Avattu PDF-dokumentti.
+        """
+        pdf_document = None
+        try:
+            with tracing.span("open"):
+                pdf_document = self.pdf_repository.load_pdf(file_path)
+            yield pdf_document
+        finally:
+            if pdf_document:
+                self.pdf_repository.close_pdf(pdf_document)
+
+    def _process_single_part(
+        self,
+        source_doc: Any,
+        output_config: OutputConfig,
+        part_info: Tuple,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> PartResult:
+        """
+        Käsittelee yhden osan jaon: poimii sivut ja tallentaa tiedoston.
+
+        Args:
+            source_doc: Lähde-PDF-dokumentti.
+            output_config: Asetukset tulostusta varten.
+            part_info: Tiedot käsiteltävästä osasta (iteratorin tuottama).
+            cancel_token: Valinnainen peruutustoken.
+
+        Returns:
+            Tallennetun osan tiedot `PartResult`-oliona.
+        """
+        task = resolve_part_task(output_config, part_info)
+        return extract_and_save_part(
+            self.pdf_repository,
+            source_doc,
+            task,
+            cancel_token=cancel_token,
+            skip_pages=output_config.get("skip_pages"),
+            outline=output_config.get("outlines", {}).get(task[0]),
+        )
+
+    def _process_split_parts(
+        self,
+        source_doc: Any,
+        output_config: OutputConfig,
+        part_iterator: Iterator[Tuple],
+        *,
+        progress_callback: Optional[Callable[[int], None]],
+        total_parts: int,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Iterator[PartResult]:
+        """
+        Käsittelee osien jaon pääsilmukan.
+
+        Peruutustoken tarkistetaan ennen jokaista osaa sekä jokaisen osan
+        poiminnan ja tallennuksen välissä.
+
+        Args:
+            source_doc: Lähde-PDF-dokumentti.
+            output_config: Asetukset tulostusta varten.
+            part_iterator: Iteraattori, joka tuottaa osat.
+            progress_callback: Valinnainen edistymisen raportointi -callback.
+            total_parts: Osien kokonaismäärä.
+            cancel_token: Valinnainen peruutustoken.
+
+        Yields:
+            Jokaisen tallennetun osan tiedot heti osan valmistuttua.
+
+        Raises:
+            SplitCancelledError: Jos jako peruutetaan. Poikkeus sisältää jo
+                                 tallennettujen osien polut.
+        """
+        if total_parts == 0:
+            return
+
+        written_paths = []
+        try:
+            for parts_done, part_info in enumerate(part_iterator, 1):
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                part_result = self._process_single_part(
+                    source_doc, output_config, part_info, cancel_token
+                )
+                written_paths.append(part_result.output_path)
+                notify_progress(progress_callback, parts_done, total_parts)
+                yield part_result
+        except SplitCancelledError as error:
+            raise SplitCancelledError(written_paths) from error
+
+    def run(
+        self,
+        file_path: str,
+        output_config: OutputConfig,
+        plan_parts: PlanParts,
+        *,
+        progress_callback: Optional[Callable[[int], None]],
+        options: Optional[SplitOptions],
+        check_part: Optional[Callable[[PartResult], List[PartResult]]] = None,
+    ) -> Iterator[PartResult]:
+        """
+        Suorittaa jaon ja ilmoittaa sen tapahtumat tarkkailijalle ja jäljittimelle.
+
+        Kaikki jakotavat kulkevat tämän metodin kautta: jakotapa antaa vain
+        tulostusasetukset ja suunnitelman, ja `SplitOptions` määrää, miten
+        suunnitelma suoritetaan. Ilman tarkkailijaa ja jäljitystä jako
+        palautetaan sellaisenaan ilman kääreitä. Jäljityksen tila luetaan,
+        kun jako aloitetaan.
+
+        Args:
+            file_path: Lähde-PDF:n polku.
+            output_config: Asetukset tulostusta varten.
+            plan_parts: Funktio, joka palauttaa avatun lähdedokumentin ja
+                        sivumäärän perusteella (osaiteraattori, osien
+                        kokonaismäärä).
+            progress_callback: Valinnainen edistymisen raportointi -callback.
+            options: Valinnaiset suoritusasetukset. Jos None, käytetään
+                     oletuksia.
+            check_part: Valinnainen tarkistus, joka palauttaa käsitellyn osan
+                        sellaisenaan tai sen korvaavat osat. Korvaavat osat
+                        kirjataan lokiin ja edistymiseen alkuperäisen sijaan.
+
+        Returns:
+            Iteraattori, joka tuottaa jokaisen osan jakojärjestyksessä.
+        """
+        part_results = self._iter_split_parts(
+            file_path,
+            output_config,
+            plan_parts,
+            progress_callback=progress_callback,
+            options=options or SplitOptions(),
+            check_part=check_part,
+        )
+        if self.observer is not None:
+            part_results = self._observe_split(file_path, part_results, self.observer)
+        if tracing.get_tracer() is not None:
+            part_results = self._trace_split(file_path, part_results)
+        return part_results
+
+    @staticmethod
+    def _trace_split(file_path: str, part_results: Iterator[PartResult]) -> Iterator[PartResult]:
+        """
+        Merkitsee koko jaon yhdeksi "job"-vaiheeksi aikajanalle.
+
+        Args:
+            file_path: Lähde-PDF:n polku.
+            part_results: Iteraattori valmistuneista osista.
+
+        Yields:
+            Samat osat samassa järjestyksessä.
+        """
+        with tracing.span("job", file=os.path.basename(file_path)):
+            yield from part_results
+
+    @staticmethod
+    def _observe_split(
+        file_path: str, part_results: Iterator[PartResult], observer: SplitObserver
+    ) -> Iterator[PartResult]:
+        """
+        Välittää jaon alun, osat ja lopun tarkkailijalle.
+
+        Args:
+            file_path: Lähde-PDF:n polku.
+            part_results: Iteraattori valmistuneista osista.
+            observer: Tapahtumat vastaanottava tarkkailija.
+
+        Yields:
+            Samat osat samassa järjestyksessä.
+        """
+        observer.job_started(file_path)
+        started = time.perf_counter()
+        succeeded = False
+        try:
+            for part_result in part_results:
+                observer.part_finished(part_result)
+                yield part_result
+            succeeded = True
+        finally:
+            observer.job_finished(file_path, time.perf_counter() - started, succeeded)
+
+    def _iter_split_parts(
+        self,
+        file_path: str,
+        output_config: OutputConfig,
+        plan_parts: PlanParts,
+        *,
+        progress_callback: Optional[Callable[[int], None]],
+        options: SplitOptions,
+        check_part: Optional[Callable[[PartResult], List[PartResult]]],
+    ) -> Iterator[PartResult]:
+        """
+        Avaa lähteen, suunnittelee osat ja käsittelee ne sarjassa tai rinnakkain.
+
+        Rinnakkaisessa tilassa osat validoidaan ja lähdetiedosto suljetaan
+        ennen prosessipoolin käynnistämistä, koska työprosessit avaavat
+        lähteen itse.
+
+        Args:
+            file_path: Lähde-PDF:n polku.
+            output_config: Asetukset tulostusta varten.
+            plan_parts: Funktio, joka palauttaa (osaiteraattori, osien
+                        kokonaismäärä).
+            progress_callback: Valinnainen edistymisen raportointi -callback.
+            options: Suoritusasetukset.
+            check_part: Valinnainen käsiteltyjen osien tarkistus.
+
+        Yields:
+            Jokaisen tallennetun osan tiedot jakojärjestyksessä.
+        """
+        observer = self.observer
+        started = time.perf_counter()
+        with self.open_source_pdf(file_path) as pdf_document:
+            page_count = self.pdf_repository.get_page_count(pdf_document)
+            loaded = time.perf_counter()
+            if observer is not None:
+                observer.stage_finished(
+                    "load", loaded - started, pages=page_count, size_bytes=file_size(file_path)
+                )
+            with tracing.span("plan"):
+                plan = self._plan_split(
+                    file_path, pdf_document, output_config, plan_parts(pdf_document, page_count),
+                    options,
+                )
+            plan.check_part = check_part
+            if observer is not None:
+                observer.stage_finished("plan", time.perf_counter() - loaded)
+
+            if options.workers <= 1 or plan.pending_parts <= 1:
+                yield from self._finish_parts(
+                    self._process_split_parts(
+                        source_doc=pdf_document,
+                        output_config=output_config,
+                        part_iterator=plan.part_iterator,
+                        progress_callback=progress_callback,
+                        total_parts=plan.pending_parts,
+                        cancel_token=options.cancel_token,
+                    ),
+                    plan,
+                    options,
+                )
+                return
+            tasks = [
+                resolve_part_task(output_config, part_info)
+                for part_info in plan.part_iterator
+            ]
+
+        yield from self._finish_parts(
+            iter_parts_in_pool(
+                file_path,
+                tasks,
+                skip_pages=output_config["skip_pages"],
+                outlines=output_config["outlines"],
+                progress_callback=progress_callback,
+                options=options,
+            ),
+            plan,
+            options,
+        )
+
+    def _plan_split(
+        self,
+        file_path: str,
+        source_doc: Any,
+        output_config: OutputConfig,
+        planned: Tuple[Iterator[Tuple], int],
+        options: SplitOptions,
+    ) -> "_SplitPlan":
+        """
+        Viimeistelee jakotavan suunnitelman suoritusasetusten mukaan.
+
+        Tyhjät sivut jätetään tarvittaessa pois. Lokia tai osavälimuistia
+        käytettäessä suunnitelma muodostetaan kokonaan etukäteen, ja jo
+        valmiit tai välimuistista tuotetut osat merkitään valmiiksi.
+
+        Args:
+            file_path: Lähde-PDF:n polku.
+            source_doc: Avattu lähdedokumentti.
+            output_config: Asetukset tulostusta varten. Päivitetään.
+            planned: Jakotavan suunnitelma (osaiteraattori, osien määrä).
+            options: Suoritusasetukset.
+
+        Returns:
+            Suoritettava suunnitelma.
+        """
+        part_iterator, total_parts = planned
+        if options.drop_blank_pages:
+            part_iterator, total_parts, dropped_pages = self._exclude_blank_pages(
+                file_path, source_doc, output_config, part_iterator, options
+            )
+            if options.dropped_pages_callback is not None:
+                options.dropped_pages_callback(dropped_pages)
+        plan = _SplitPlan(part_iterator, total_parts)
+        if (options.uses_journal or self.part_cache is not None) and total_parts > 0:
+            self._restore_ready_parts(file_path, output_config, plan, options)
+        return plan
+
+    def _restore_ready_parts(
+        self,
+        file_path: str,
+        output_config: OutputConfig,
+        plan: "_SplitPlan",
+        options: SplitOptions,
+    ) -> None:
+        """
+        Avaa jakotyön lokin ja tuottaa osavälimuistista löytyvät osat.
+
+        Lokista tai välimuistista valmiit osat poistetaan suunnitelman
+        osaiteraattorista.
+
+        Args:
+            file_path: Lähde-PDF:n polku.
+            output_config: Asetukset tulostusta varten.
+            plan: Suunnitelma. Päivitetään.
+            options: Suoritusasetukset.
+        """
+        part_infos = list(plan.part_iterator)
+        all_tasks = [resolve_part_task(output_config, info) for info in part_infos]
+        if options.uses_journal:
+            plan.split_journal = SplitJournal.begin(
+                file_path,
+                all_tasks,
+                resume=options.resume,
+                skip_pages=output_config["skip_pages"],
+            )
+            plan.ready.update(plan.split_journal.completed)
+        if self.part_cache is not None:
+            try:
+                plan.source_digest = _SourceDigest(file_path)
+                plan.cache_keys = self._materialize_cached_parts(
+                    plan.source_digest, all_tasks, plan.ready, output_config,
+                    options.cancel_token,
+                )
+            except BaseException:
+                if plan.split_journal is not None:
+                    plan.split_journal.close()
+                raise
+        plan.part_iterator = iter([
+            info for index, info in enumerate(part_infos) if index not in plan.ready
+        ])
+
+    def _materialize_cached_parts(
+        self,
+        source_digest: _SourceDigest,
+        tasks: List[Tuple[int, int, str]],
+        ready: Dict[int, List[PartResult]],
+        output_config: OutputConfig,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Dict[int, Tuple[int, int, Dict[str, Any]]]:
+        """
+        Tuottaa osavälimuistista löytyvät osat suoraan tulostushakemistoon.
+
+        Välimuistista tuotetut osat lisätään `ready`-sanakirjaan. Jos
+        välimuistissa ei ole saman kokoisen lähteen osia, osia ei haeta eikä
+        lähteen tiivistettä lasketa ennen kuin ensimmäinen osa tallennetaan.
+
+        Args:
+            source_digest: Lähdetiedoston tiiviste.
+            tasks: Koko suunnitelma (start_idx, end_idx, output_path) -tupleina.
+            ready: Jo valmiit osat suunnitelman indeksin mukaan. Päivitetään.
+            output_config: Asetukset tulostusta varten. Pois jätettävät sivut
+                           ja osien kirjanmerkit luetaan niistä.
+            cancel_token: Valinnainen peruutustoken.
+
+        Returns:
+            Välimuistista puuttuneiden osien avainten osat suunnitelman
+            indeksin mukaan, jotta osat voidaan tallentaa välimuistiin
+            käsittelyn jälkeen.
+        """
+        may_hit = self.part_cache.may_contain_source(source_digest.size)
+        save_signature = self.pdf_repository.get_save_signature()
+        missing_keys = {}
+        for index, (start_idx, end_idx, output_path) in enumerate(tasks):
+            if index in ready:
+                continue
+            key_parts = (
+                start_idx,
+                end_idx,
+                _part_signature(save_signature, output_config, start_idx, end_idx),
+            )
+            if not may_hit:
+                missing_keys[index] = key_parts
+                continue
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            size_bytes = self.part_cache.materialize(
+                PartCache.make_key(source_digest.value(), *key_parts), output_path
+            )
+            if size_bytes is None:
+                missing_keys[index] = key_parts
+            else:
+                ready[index] = [
+                    PartResult(output_path, start_idx + 1, end_idx + 1, size_bytes=size_bytes)
+                ]
+        return missing_keys
+
+    def _exclude_blank_pages(
+        self,
+        file_path: str,
+        source_doc: Any,
+        output_config: OutputConfig,
+        part_iterator: Iterator[Tuple],
+        options: SplitOptions,
+    ) -> Tuple[Iterator[Tuple], int, List[int]]:
+        """
+        Tunnistaa tyhjät sivut ja poistaa ne suunnitelman osista.
+
+        Tyhjät sivut lisätään tulostusasetusten `skip_pages`-joukkoon. Osat,
+        joiden kaikki sivut ovat tyhjiä, jätetään kokonaan pois.
+
+        Args:
+            file_path: Lähde-PDF:n polku.
+            source_doc: Avattu lähdedokumentti.
+            output_config: Asetukset tulostusta varten. Päivitetään.
+            part_iterator: Suunnitelman osat.
+            options: Suoritusasetukset. Työprosessien määrä, tyhjän sivun
+                     raja ja peruutustoken luetaan niistä.
+
+        Returns:
+            Tuple (jäljelle jäävien osien iteraattori, osien määrä,
+            osista pois jätetyt sivut 1-pohjaisina ja nousevassa järjestyksessä).
+        """
+        classifier = PageClassifier(
+            self.pdf_repository, workers=options.workers, page_cache=self.page_stats_cache
+        )
+        with tracing.span("detect_blank"):
+            kinds = classifier.classify(
+                file_path, options.blank_threshold, source_doc, options.cancel_token
+            )
+        blank_pages = frozenset(
+            index for index, kind in enumerate(kinds) if kind == PAGE_BLANK
+        )
+        output_config["skip_pages"] = blank_pages
+        kept = []
+        dropped = set()
+        for part_info in part_iterator:
+            start_idx, end_idx = resolve_part_task(output_config, part_info)[:2]
+            part_pages = range(start_idx, end_idx + 1)
+            dropped.update(blank_pages.intersection(part_pages))
+            if not blank_pages.issuperset(part_pages):
+                kept.append(part_info)
+        return iter(kept), len(kept), [index + 1 for index in sorted(dropped)]
+
+    def _finish_parts(
+        self,
+        part_results: Iterator[PartResult],
+        plan: "_SplitPlan",
+        options: SplitOptions,
+    ) -> Iterator[PartResult]:
+        """
+        Lomittaa valmiit osat käsiteltyihin ja raportoi koko jaon edistymisen.
+
+        Args:
+            part_results: Iteraattori käsiteltävistä (puuttuvista) osista.
+            plan: Suoritettava suunnitelma.
+            options: Suoritusasetukset.
+
+        Returns:
+            Iteraattori kaikista suunnitelman osista suunnitelman järjestyksessä.
+        """
+        reporter = (
+            ProgressReporter(
+                options.progress_listener,
+                plan.total_parts,
+                max_rate_hz=options.progress_rate_hz,
+            )
+            if options.progress_listener is not None
+            else None
+        )
+        return self._report_progress(
+            self._collect_parts(part_results, plan, reporter), reporter
+        )
+
+    def _collect_parts(
+        self,
+        part_results: Iterator[PartResult],
+        plan: "_SplitPlan",
+        reporter: Optional[ProgressReporter],
+    ) -> Iterator[PartResult]:
+        """
+        Lomittaa jo valmiit osat käsiteltyihin ja kirjaa uudet osat.
+
+        Käsitellyt osat tarkistetaan ennen kirjaamista. Uudet osat
+        tallennetaan osavälimuistiin ja kaikki lokista puuttuvat osat
+        kirjataan jakotyön lokiin. Jos osa korvautuu useammalla, korvaavat
+        osat lisätään raportoijan osien määrään.
+
+        Args:
+            part_results: Iteraattori käsiteltävistä (puuttuvista) osista
+                          suunnitelman järjestyksessä.
+            plan: Suoritettava suunnitelma.
+            reporter: Valinnainen edistymisen raportoija.
+
+        Yields:
+            Kaikki suunnitelman osat suunnitelman järjestyksessä.
+
+        Raises:
+            SplitCancelledError: Jos jako peruutetaan. Poikkeus sisältää
+                                 käsiteltyjen osien levyllä olevat polut.
+        """
+        split_journal = plan.split_journal
+        if (
+            split_journal is None and not plan.ready and not plan.cache_keys
+            and plan.check_part is None
+        ):
+            yield from part_results
+            return
+        written_paths: List[str] = []
+        try:
+            for index in range(plan.total_parts):
+                parts = self._next_parts(part_results, plan, index, written_paths)
+                if reporter is not None and len(parts) > 1:
+                    reporter.add_parts(len(parts) - 1)
+                if split_journal is not None and index not in split_journal.completed:
+                    split_journal.record(index, parts)
+                yield from parts
+        except SplitCancelledError as error:
+            remaining = [
+                path for path in error.written_paths
+                if path not in written_paths and os.path.exists(path)
+            ]
+            raise SplitCancelledError(written_paths + remaining) from error
+        finally:
+            if split_journal is not None:
+                split_journal.close()
+        if split_journal is not None:
+            split_journal.complete()
+
+    def _next_parts(
+        self,
+        part_results: Iterator[PartResult],
+        plan: "_SplitPlan",
+        index: int,
+        written_paths: List[str],
+    ) -> List[PartResult]:
+        """
+        Palauttaa suunnitelman osan tiedostot valmiista tai käsitellyistä osista.
+
+        Käsitelty osa tarkistetaan ja tallennetaan osavälimuistiin. Korvattua
+        osaa tai sen korvaajia ei tallenneta osavälimuistiin.
+
+        Args:
+            part_results: Iteraattori käsiteltävistä (puuttuvista) osista.
+            plan: Suoritettava suunnitelma.
+            index: Osan indeksi suunnitelmassa.
+            written_paths: Käsiteltyjen osien polut. Päivitetään.
+
+        Returns:
+            Valmis osa, käsitelty osa tai sen korvaavat osat.
+
+        Raises:
+            RuntimeError: Jos käsittely päättyi ennen kuin kaikki suunnitelman
+                          osat valmistuivat.
+        """
+        if index in plan.ready:
+            return plan.ready[index]
+        part_result = next(part_results, None)
+        if part_result is None:
+            raise RuntimeError(
+                f"Osien käsittely päättyi ennen osaa {index + 1}/{plan.total_parts}."
+            )
+        if plan.check_part is not None:
+            parts = plan.check_part(part_result)
+            written_paths.extend(part.output_path for part in parts)
+            if parts != [part_result]:
+                return parts
+        else:
+            written_paths.append(part_result.output_path)
+        if index in plan.cache_keys:
+            source_digest = plan.source_digest
+            self.part_cache.store(
+                PartCache.make_key(source_digest.value(), *plan.cache_keys[index]),
+                part_result.output_path,
+                source_size=source_digest.size,
+            )
+        return [part_result]
+
+    @staticmethod
+    def _report_progress(
+        part_results: Iterator[PartResult], reporter: Optional[ProgressReporter]
+    ) -> Iterator[PartResult]:
+        """
+        Välittää osien tulokset edistymisen raportoijalle.
+
+        Args:
+            part_results: Iteraattori valmistuneista osista.
+            reporter: Valinnainen raportoija. Jos None, osat välitetään sellaisenaan.
+
+        Yields:
+            Samat osat samassa järjestyksessä.
+        """
+        if reporter is None:
+            yield from part_results
+            return
+        for part_result in part_results:
+            reporter.part_done(part_result)
+            yield part_result
+        reporter.finish()
+
+    def resplit_oversized_part(
+        self,
+        file_path: str,
+        output_config: OutputConfig,
+        part_result: PartResult,
+        *,
+        size_limit: SizeLimit,
+        attempts_left: int,
+        cancel_token: Optional[CancellationToken],
+    ) -> List[PartResult]:
+        """
+        Korvaa rajan ylittävän osan pienemmillä osilla.
+
+        Args:
+            file_path: Lähde-PDF:n polku.
+            output_config: Asetukset tulostusta varten.
+            part_result: Tarkistettava osa.
+            size_limit: Kokoraja ja sivujen koon arviot.
+            attempts_left: Jäljellä olevien uudelleenjakojen määrä.
+            cancel_token: Valinnainen peruutustoken.
+
+        Returns:
+            Osa sellaisenaan tai sen korvaavat osat sivujärjestyksessä.
+
+        Raises:
+            SplitCancelledError: Jos jako peruutetaan. Poikkeus sisältää jo
+                                 tallennettujen korvaavien osien polut.
+        """
+        if (
+            part_result.size_bytes <= size_limit.max_bytes
+            or part_result.page_count == 1
+            or attempts_left <= 0
+        ):
+            return [part_result]
+        start_idx = part_result.start_page - 1
+        ranges = [
+            (range_start, range_end)
+            for range_start, range_end in plan_resplit(
+                size_limit.page_costs[start_idx:part_result.end_page],
+                start_idx,
+                part_result.size_bytes,
+                size_limit.max_bytes,
+            )
+            if not output_config["skip_pages"].issuperset(range(range_start, range_end + 1))
+        ]
+        os.remove(part_result.output_path)
+        replacements: List[PartResult] = []
+        try:
+            with self.open_source_pdf(file_path) as source_doc:
+                for range_start, range_end in ranges:
+                    if cancel_token is not None:
+                        cancel_token.raise_if_cancelled()
+                    replacement = self._process_single_part(
+                        source_doc,
+                        output_config,
+                        (range_start, range_end, range_start + 1, range_end + 1),
+                        cancel_token,
+                    )
+                    replacements.extend(self.resplit_oversized_part(
+                        file_path,
+                        output_config,
+                        replacement,
+                        size_limit=size_limit,
+                        attempts_left=attempts_left - 1,
+                        cancel_token=cancel_token,
+                    ))
+        except SplitCancelledError as error:
+            raise SplitCancelledError(
+                [part.output_path for part in replacements] + error.written_paths
+            ) from error
+        return replacements
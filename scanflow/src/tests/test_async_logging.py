@@ -0,0 +1,86 @@
+from src.utils.async_logging import (
+    create_rotating_file_handler,
+    get_job_context,
+    job_context,
+    start_queue_logging,
+    stop_queue_logging,
+)
+import json
+import logging
+import os
+import tempfile
+import threading
+import unittest
+
+
+class TestAsyncLogging(unittest.TestCase):
+    """Testiluokka jonopohjaisen JSON-lokituksen testaamiseen."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.temp_dir.name, "scanflow.log")
+        root_logger = logging.getLogger()
+        self._saved_handlers = list(root_logger.handlers)
+        self._saved_level = root_logger.level
+
+    def tearDown(self):
+        stop_queue_logging()
+        root_logger = logging.getLogger()
+        root_logger.handlers[:] = self._saved_handlers
+        root_logger.setLevel(self._saved_level)
+        self.temp_dir.cleanup()
+
+    def _read_entries(self):
+        with open(self.log_file, encoding="utf-8") as file:
+            return [json.loads(line) for line in file]
+
+    def test_job_context_nests_and_resets(self):
+        with job_context(job_id="a", file="x.pdf"):
+            with job_context(file="y.pdf"):
+                self.assertEqual(get_job_context(), {"job_id": "a", "file": "y.pdf"})
+            self.assertEqual(get_job_context()["file"], "x.pdf")
+        self.assertEqual(get_job_context(), {})
+
+    def test_records_are_written_as_json_with_context(self):
+        start_queue_logging(create_rotating_file_handler(self.log_file))
+        logger = logging.getLogger("scanflow.testi")
+
+        def log_in_thread():
+            with job_context(job_id="säie"):
+                logger.debug("osa %d valmis", 7)
+
+        with job_context(job_id="pää"):
+            logger.info("jako alkaa")
+            thread = threading.Thread(target=log_in_thread)
+            thread.start()
+            thread.join()
+            try:
+                raise ValueError("rikki")
+            except ValueError:
+                logger.exception("virhe")
+        logger.warning("ilman kontekstia")
+        stop_queue_logging()
+
+        entries = self._read_entries()
+        self.assertEqual([entry["message"] for entry in entries],
+                         ["jako alkaa", "osa 7 valmis", "virhe", "ilman kontekstia"])
+        self.assertEqual(entries[0]["job_id"], "pää")
+        self.assertEqual(entries[1]["job_id"], "säie")
+        self.assertEqual(entries[1]["level"], "DEBUG")
+        self.assertIn("ValueError: rikki", entries[2]["exception"])
+        self.assertNotIn("job_id", entries[3])
+        self.assertEqual(logging.getLogger().handlers, [])
+
+    def test_file_is_rotated_by_size(self):
+        start_queue_logging(
+            create_rotating_file_handler(self.log_file, max_bytes=500, backup_count=2)
+        )
+        logger = logging.getLogger("scanflow.testi")
+        for index in range(50):
+            logger.info("rivi %d", index)
+        stop_queue_logging()
+
+        self.assertTrue(os.path.exists(f"{self.log_file}.1"))
+        self.assertTrue(os.path.exists(f"{self.log_file}.2"))
+        self.assertFalse(os.path.exists(f"{self.log_file}.3"))
+        self.assertEqual(self._read_entries()[-1]["message"], "rivi 49")
@@ -0,0 +1,129 @@
+from src.services.async_pdf_splitter_service import AsyncPDFSplitterService
+import asyncio
+import os
+import tempfile
+import unittest
+import fitz
+
+
+class TestAsyncPDFSplitterService(unittest.TestCase):
+    """Testiluokka AsyncPDFSplitterService-luokan toiminnallisuuksien testaamiseen."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.temp_dir.name, "osat")
+        os.makedirs(self.output_dir)
+        self.source_path = os.path.join(self.temp_dir.name, "lahde.pdf")
+        doc = fitz.open()
+        for i in range(12):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Sivu {i + 1}")
+        doc.save(self.source_path)
+        doc.close()
+        self.service = AsyncPDFSplitterService(max_concurrency=2)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            AsyncPDFSplitterService(max_concurrency=0)
+
+    def test_get_pdf_info(self):
+        info = asyncio.run(self.service.get_pdf_info(self.source_path))
+        self.assertEqual(info["page_count"], 12)
+        self.assertEqual(info["file_name"], "lahde.pdf")
+
+    def test_split_by_fixed_range(self):
+        result = asyncio.run(
+            self.service.split_by_fixed_range(self.source_path, 5, self.output_dir)
+        )
+        self.assertEqual(
+            [os.path.basename(p) for p in result],
+            ["lahde_sivut_1-5.pdf", "lahde_sivut_6-10.pdf", "lahde_sivut_11-12.pdf"],
+        )
+        for path in result:
+            self.assertTrue(os.path.exists(path))
+
+    def test_iter_split_by_custom_ranges_yields_in_order(self):
+        async def collect():
+            return [
+                path
+                async for path in self.service.iter_split_by_custom_ranges(
+                    self.source_path, [(3, 4), (1, 1), (12, 12)], self.output_dir
+                )
+            ]
+
+        result = asyncio.run(collect())
+        self.assertEqual(
+            [os.path.basename(p) for p in result],
+            [
+                "lahde_alue_1_sivut_3-4.pdf",
+                "lahde_alue_2_sivut_1-1.pdf",
+                "lahde_alue_3_sivut_12-12.pdf",
+            ],
+        )
+
+    def test_invalid_output_dir(self):
+        missing_dir = os.path.join(self.temp_dir.name, "puuttuu")
+        with self.assertRaisesRegex(IOError, "Tulostushakemistoa ei löydy"):
+            asyncio.run(
+                self.service.split_by_fixed_range(self.source_path, 2, missing_dir)
+            )
+
+    def test_invalid_range(self):
+        with self.assertRaisesRegex(ValueError, "rajojen ulkopuolinen alue: 10-20"):
+            asyncio.run(
+                self.service.split_by_custom_ranges(
+                    self.source_path, [(10, 20)], self.output_dir
+                )
+            )
+
+    def test_early_exit_stops_producing_parts(self):
+        service = AsyncPDFSplitterService(max_concurrency=1)
+
+        async def take_first():
+            stream = service.iter_split_by_fixed_range(
+                self.source_path, 1, self.output_dir
+            )
+            async for path in stream:
+                await stream.aclose()
+                return path
+            return None
+
+        first = asyncio.run(take_first())
+        self.assertTrue(first.endswith("lahde_sivut_1-1.pdf"))
+        self.assertEqual(os.listdir(self.output_dir), ["lahde_sivut_1-1.pdf"])
+
+    def test_cancellation_propagates(self):
+        received = []
+
+        async def cancel_consumer():
+            first_part = asyncio.Event()
+
+            async def consume():
+                stream = self.service.iter_split_by_fixed_range(
+                    self.source_path, 1, self.output_dir
+                )
+                try:
+                    async for path in stream:
+                        received.append(path)
+                        first_part.set()
+                        await asyncio.sleep(10)
+                finally:
+                    await stream.aclose()
+
+            task = asyncio.create_task(consume())
+            await first_part.wait()
+            task.cancel()
+            await task
+
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(cancel_consumer())
+        self.assertEqual(len(received), 1)
+        self.assertEqual(
+            os.listdir(self.output_dir), [os.path.basename(received[0])]
+        )
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+from src.services.cancellation import CancellationToken, SplitCancelledError
+from src.services.pdf_splitter_service import PDFSplitterService
+import multiprocessing
+import os
+import pickle
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import fitz
+from src.repositories.pdf_repository import PDFRepository
+from src.services.split_options import SplitOptions
+
+
+class TestCancellationToken(unittest.TestCase):
+    """Testiluokka peruutustokenin ja peruutuspoikkeuksen testaamiseen."""
+
+    def test_cancel(self):
+        token = CancellationToken()
+        self.assertFalse(token.is_cancelled)
+        token.raise_if_cancelled()
+
+        token.cancel()
+
+        self.assertTrue(token.is_cancelled)
+        with self.assertRaises(SplitCancelledError):
+            token.raise_if_cancelled()
+
+    def test_wraps_existing_event(self):
+        event = threading.Event()
+        token = CancellationToken(event)
+        event.set()
+        self.assertTrue(token.is_cancelled)
+
+    def test_error_survives_pickling(self):
+        error = pickle.loads(pickle.dumps(SplitCancelledError(["a.pdf", "b.pdf"])))
+        self.assertEqual(error.written_paths, ["a.pdf", "b.pdf"])
+        self.assertIn("2", str(error))
+
+
+class TestSplitCancellation(unittest.TestCase):
+    """Testaa jaon peruuttamista oikeilla PDF-tiedostoilla."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.temp_dir.name, "osat")
+        os.makedirs(self.output_dir)
+        self.source_path = os.path.join(self.temp_dir.name, "lahde.pdf")
+        doc = fitz.open()
+        for _ in range(40):
+            doc.new_page()
+        doc.save(self.source_path)
+        doc.close()
+        self.service = PDFSplitterService()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _cancel_after(self, token, parts):
+        calls = []
+
+        def callback(_progress):
+            calls.append(_progress)
+            if len(calls) == parts:
+                token.cancel()
+        return callback
+
+    def test_serial_cancel_between_parts(self):
+        token = CancellationToken()
+        with self.assertRaises(SplitCancelledError) as context:
+            self.service.split_by_fixed_range(
+                self.source_path,
+                1,
+                self.output_dir,
+                progress_callback=self._cancel_after(token, 3),
+                options=SplitOptions(cancel_token=token),
+            )
+
+        self.assertEqual(
+            [os.path.basename(path) for path in context.exception.written_paths],
+            ["lahde_sivut_1-1.pdf", "lahde_sivut_2-2.pdf", "lahde_sivut_3-3.pdf"],
+        )
+        self.assertEqual(len(os.listdir(self.output_dir)), 3)
+
+    def test_cancel_between_extract_and_save(self):
+        token = CancellationToken()
+        repository = MagicMock()
+        repository.get_page_count.return_value = 4
+
+        def extract_pages(*_args):
+            token.cancel()
+            return MagicMock()
+
+        repository.extract_pages.side_effect = extract_pages
+        service = PDFSplitterService(repository)
+
+        with self.assertRaises(SplitCancelledError) as context:
+            service.split_by_fixed_range(
+                self.source_path, 2, self.output_dir, options=SplitOptions(cancel_token=token),
+            )
+
+        self.assertEqual(context.exception.written_paths, [])
+        repository.save_pdf.assert_not_called()
+        repository.close_pdf.assert_called()
+
+    def test_parallel_cancel_reports_all_written_parts(self):
+        token = CancellationToken()
+        yielded = []
+        with self.assertRaises(SplitCancelledError) as context:
+            for part_result in self.service.iter_split_by_fixed_range(
+                self.source_path,
+                1,
+                self.output_dir,
+                options=SplitOptions(workers=2, cancel_token=token),
+            ):
+                yielded.append(part_result.output_path)
+                token.cancel()
+
+        written_paths = context.exception.written_paths
+        self.assertEqual(written_paths[:len(yielded)], yielded)
+        self.assertLess(len(written_paths), 40)
+        self.assertEqual(
+            sorted(written_paths),
+            sorted(os.path.join(self.output_dir, name) for name in os.listdir(self.output_dir)),
+        )
+
+    def test_parallel_cancel_latency(self):
+        token = CancellationToken()
+        cancelled_at = []
+
+        def cancel_on_first_part(_progress):
+            if not cancelled_at:
+                cancelled_at.append(time.perf_counter())
+                token.cancel()
+
+        with self.assertRaises(SplitCancelledError):
+            self.service.split_by_fixed_range(
+                self.source_path,
+                1,
+                self.output_dir,
+                progress_callback=cancel_on_first_part,
+                options=SplitOptions(workers=2, cancel_token=token),
+            )
+
+        self.assertLess(time.perf_counter() - cancelled_at[0], 0.5)
+
+    @unittest.skipUnless(
+        multiprocessing.get_start_method() == "fork",
+        "työprosessien on perittävä korvattu tallennus",
+    )
+    def test_parallel_chunk_error_stops_remaining_chunks(self):
+        original_save = PDFRepository.save_pdf
+
+        def save_pdf(repository, pdf_document, output_path):
+            if output_path.endswith("_sivut_2-2.pdf"):
+                raise IOError("Levy täynnä")
+            return original_save(repository, pdf_document, output_path)
+
+        with patch.object(PDFRepository, "save_pdf", save_pdf):
+            with self.assertRaisesRegex(IOError, "Levy täynnä"):
+                self.service.split_by_fixed_range(
+                    self.source_path, 1, self.output_dir, options=SplitOptions(workers=2),
+                )
+
+        self.assertLess(len(os.listdir(self.output_dir)), 30)
+
+    def test_without_cancel_completes(self):
+        result = self.service.split_by_fixed_range(
+            self.source_path,
+            10,
+            self.output_dir,
+            options=SplitOptions(workers=2, cancel_token=CancellationToken()),
+        )
+        self.assertEqual(len(result), 4)
@@ -0,0 +1,332 @@
+from src import cli
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+import fitz
+from src.repositories.page_stats_cache import PageStatsCache
+from src.repositories.part_cache import PartCache
+
+
+class TestCli(unittest.TestCase):
+    """Testiluokka komentorivikäyttöliittymän testaamiseen."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.temp_dir.name, "syote")
+        self.output_dir = os.path.join(self.temp_dir.name, "osat")
+        os.makedirs(self.input_dir)
+        os.makedirs(self.output_dir)
+        self.pdf_path = self._create_pdf("testi.pdf", 5)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _create_pdf(self, name, page_count):
+        path = os.path.join(self.input_dir, name)
+        doc = fitz.open()
+        for _ in range(page_count):
+            doc.new_page()
+        doc.save(path)
+        doc.close()
+        return path
+
+    def _run(self, *argv):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+            exit_code = cli.main(["--json", *argv])
+        return exit_code, json.loads(stdout.getvalue())
+
+    def test_parse_ranges(self):
+        self.assertEqual(cli.parse_ranges("1-3, 5,8-10"), [(1, 3), (5, 5), (8, 10)])
+
+    def test_parse_ranges_invalid(self):
+        with self.assertRaises(argparse.ArgumentTypeError):
+            cli.parse_ranges("1-a")
+        with self.assertRaises(argparse.ArgumentTypeError):
+            cli.parse_ranges(" , ")
+
+    def test_info(self):
+        exit_code, results = self._run("info", self.pdf_path)
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(results[0]["page_count"], 5)
+        self.assertEqual(results[0]["file_name"], "testi.pdf")
+        self.assertEqual(results[0]["size_bytes"], os.path.getsize(self.pdf_path))
+
+    def test_info_missing_file_reports_error(self):
+        missing = os.path.join(self.input_dir, "puuttuu.pdf")
+        exit_code, results = self._run("info", self.pdf_path, missing)
+
+        self.assertEqual(exit_code, 1)
+        self.assertTrue(results[0]["ok"])
+        self.assertFalse(results[1]["ok"])
+        self.assertIn("error", results[1])
+
+    def test_split_fixed(self):
+        exit_code, results = self._run(
+            "split", "fixed", self.pdf_path, "--pages", "2", "--output", self.output_dir
+        )
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(
+            [os.path.basename(path) for path in results[0]["output_files"]],
+            ["testi_sivut_1-2.pdf", "testi_sivut_3-4.pdf", "testi_sivut_5-5.pdf"],
+        )
+
+    def test_split_custom(self):
+        exit_code, results = self._run(
+            "split", "custom", self.pdf_path, "--ranges", "1-2,4",
+            "--output", self.output_dir,
+        )
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(len(results[0]["output_files"]), 2)
+        with fitz.open(results[0]["output_files"][0]) as doc:
+            self.assertEqual(doc.page_count, 2)
+
+    def test_parse_size(self):
+        self.assertEqual(cli.parse_size("10M"), 10 * 1024 * 1024)
+        self.assertEqual(cli.parse_size("500k"), 500 * 1024)
+        self.assertEqual(cli.parse_size("1.5GB"), int(1.5 * 1024 ** 3))
+        self.assertEqual(cli.parse_size("2048"), 2048)
+        for value in ("", "M", "10X", "0", "inf"):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                cli.parse_size(value)
+
+    def test_split_size(self):
+        exit_code, results = self._run(
+            "split", "size", self.pdf_path, "--max-size", "1M",
+            "--output", self.output_dir,
+        )
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(len(results[0]["output_files"]), 1)
+        with fitz.open(results[0]["output_files"][0]) as doc:
+            self.assertEqual(doc.page_count, 5)
+
+    def test_split_separators(self):
+        doc = fitz.open(self.pdf_path)
+        doc[2].draw_rect(fitz.Rect(200, 60, 210, 200), color=None, fill=(0, 0, 0))
+        doc[2].draw_rect(fitz.Rect(230, 60, 240, 200), color=None, fill=(0, 0, 0))
+        for index in (0, 1, 3, 4):
+            doc[index].insert_text((72, 72), "Asiakirja " * 8, fontsize=24)
+        doc.saveIncr()
+        doc.close()
+
+        exit_code, results = self._run(
+            "split", "separators", self.pdf_path, "--output", self.output_dir,
+        )
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(
+            [os.path.basename(path) for path in results[0]["output_files"]],
+            ["testi_alue_1_sivut_1-2.pdf", "testi_alue_2_sivut_4-5.pdf"],
+        )
+
+    def test_split_outline(self):
+        doc = fitz.open(self.pdf_path)
+        doc.set_toc([[1, "Alku", 1], [1, "Loppu", 4], [2, "Kohta", 5]])
+        doc.saveIncr()
+        doc.close()
+
+        exit_code, results = self._run(
+            "split", "outline", self.pdf_path, "--level", "2", "--output", self.output_dir,
+        )
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(
+            [os.path.basename(path) for path in results[0]["output_files"]],
+            ["testi_001_Alku.pdf", "testi_002_Loppu.pdf", "testi_003_Kohta.pdf"],
+        )
+
+    def test_split_outline_without_bookmarks(self):
+        exit_code, results = self._run(
+            "split", "outline", self.pdf_path, "--output", self.output_dir,
+        )
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn("kirjanmerkkejä", results[0]["error"])
+
+    def test_split_pattern(self):
+        doc = fitz.open(self.pdf_path)
+        for index in (1, 3):
+            doc[index].insert_text((72, 72), f"LASKU NRO {index}")
+        doc.saveIncr()
+        doc.close()
+
+        exit_code, results = self._run(
+            "split", "pattern", self.pdf_path, "--pattern", r"lasku nro \d",
+            "--ignore-case", "--output", self.output_dir,
+        )
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(
+            [os.path.basename(path) for path in results[0]["output_files"]],
+            ["testi_alue_1_sivut_1-1.pdf", "testi_alue_2_sivut_2-3.pdf",
+             "testi_alue_3_sivut_4-5.pdf"],
+        )
+
+    def test_split_similarity(self):
+        doc = fitz.open(self.pdf_path)
+        for index in (2, 3, 4):
+            doc[index].draw_rect(fitz.Rect(40, 40, 560, 200), color=None, fill=(0, 0, 0))
+        doc.saveIncr()
+        doc.close()
+
+        exit_code, results = self._run(
+            "split", "similarity", self.pdf_path, "--sensitivity", "0.5",
+            "--output", self.output_dir,
+        )
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(
+            [os.path.basename(path) for path in results[0]["output_files"]],
+            ["testi_alue_1_sivut_1-2.pdf", "testi_alue_2_sivut_3-5.pdf"],
+        )
+
+    def test_split_similarity_invalid_sensitivity(self):
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            cli.main(["split", "similarity", self.pdf_path, "--sensitivity", "1.5",
+                      "--output", self.output_dir])
+
+    def test_split_drop_blank(self):
+        doc = fitz.open(self.pdf_path)
+        for index in (0, 2, 3):
+            doc[index].insert_text((72, 72), "Asiakirja " * 8, fontsize=24)
+        doc.saveIncr()
+        doc.close()
+
+        exit_code, results = self._run(
+            "split", "fixed", self.pdf_path, "--pages", "2", "--output", self.output_dir,
+            "--drop-blank",
+        )
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(results[0]["dropped_pages"], [2, 5])
+        self.assertEqual(len(results[0]["output_files"]), 2)
+
+    def test_split_with_cache_reports_stats(self):
+        cache_dir = os.path.join(self.temp_dir.name, "cache")
+        argv = ("split", "fixed", self.pdf_path, "--pages", "2",
+                "--output", self.output_dir, "--cache")
+        stats_path = os.path.join(self.temp_dir.name, "stats.sqlite3")
+        with patch("src.cli.PartCache", lambda: PartCache(cache_dir)), \
+                patch("src.cli.PageStatsCache",
+                      lambda **kwargs: PageStatsCache(stats_path, **kwargs)):
+            self._run(*argv)
+            exit_code, results = self._run(*argv)
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(results[0]["part_cache"]["hits"], 3)
+        self.assertEqual(results[0]["part_cache"]["hit_rate"], 1.0)
+
+    def test_split_with_memprofile(self):
+        exit_code, results = self._run(
+            "split", "fixed", self.pdf_path, "--pages", "2",
+            "--output", self.output_dir, "--workers", "2", "--memprofile",
+        )
+
+        self.assertEqual(exit_code, 0)
+        report = results[0]["memory_profile"]
+        self.assertEqual(len(report["parts"]), 3)
+        self.assertEqual(report["stages"]["save_pdf"]["calls"], 3)
+
+    def test_split_with_trace(self):
+        trace_path = os.path.join(self.temp_dir.name, "trace.json")
+        exit_code, results = self._run(
+            "split", "custom", self.pdf_path, "--ranges", "1-2,4",
+            "--output", self.output_dir, "--trace", trace_path,
+        )
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(results[0]["trace_file"], trace_path)
+        with open(trace_path, encoding="utf-8") as file:
+            names = [event["name"] for event in json.load(file)["traceEvents"]]
+        self.assertEqual(names.count("save"), 2)
+
+    def test_split_with_profile(self):
+        home = os.path.join(self.temp_dir.name, "koti")
+        with patch.dict(os.environ, {"HOME": home}):
+            exit_code, results = self._run(
+                "split", "fixed", self.pdf_path, "--pages", "2",
+                "--output", self.output_dir, "--workers", "2", "--profile",
+            )
+
+        self.assertEqual(exit_code, 0)
+        profile_path = results[0]["profile"]
+        self.assertEqual(
+            os.path.dirname(profile_path), os.path.join(home, ".scanflow", "profiles")
+        )
+        self.assertTrue(os.path.exists(profile_path.replace(".pstats", ".txt")))
+
+    def test_split_custom_invalid_range(self):
+        exit_code, results = self._run(
+            "split", "custom", self.pdf_path, "--ranges", "4-9",
+            "--output", self.output_dir,
+        )
+
+        self.assertEqual(exit_code, 1)
+        self.assertFalse(results[0]["ok"])
+
+    def test_batch_with_jobs(self):
+        self._create_pdf("toinen.pdf", 2)
+        exit_code, results = self._run(
+            "batch", self.input_dir, "--pages", "1", "--output", self.output_dir,
+            "--jobs", "2",
+        )
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(
+            [os.path.basename(result["file_path"]) for result in results],
+            ["testi.pdf", "toinen.pdf"],
+        )
+        self.assertEqual(len(os.listdir(self.output_dir)), 7)
+
+    def test_batch_with_observers(self):
+        self._create_pdf("toinen.pdf", 2)
+        home = os.path.join(self.temp_dir.name, "koti")
+        with patch.dict(os.environ, {"HOME": home}):
+            exit_code, results = self._run(
+                "batch", self.input_dir, "--pages", "1", "--output", self.output_dir,
+                "--jobs", "2", "--observe", "prometheus", "--observe", "jsonl",
+            )
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(results[0]["split_metrics"]["parts"], 5)
+        with open(os.path.join(home, ".scanflow", "metrics", "scanflow.prom"),
+                  encoding="utf-8") as file:
+            metrics = file.read()
+        self.assertIn("scanflow_split_parts_total 7", metrics)
+        self.assertIn('scanflow_split_jobs_total{result="ok"} 2', metrics)
+        with open(os.path.join(home, ".scanflow", "split_events.jsonl"),
+                  encoding="utf-8") as file:
+            events = [json.loads(line)["event"] for line in file]
+        self.assertEqual(events.count("part"), 7)
+        self.assertEqual(events.count("job_finished"), 2)
+
+    def test_batch_missing_directory(self):
+        exit_code, results = self._run(
+            "batch", os.path.join(self.temp_dir.name, "puuttuu"), "--pages", "1"
+        )
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn("Hakemistoa ei löydy", results[0]["error"])
+
+    def test_does_not_import_pyqt(self):
+        code = (
+            "import sys, src.cli; "
+            "sys.exit(any(name.startswith('PyQt') for name in sys.modules))"
+        )
+        project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+        completed = subprocess.run(
+            [sys.executable, "-c", code], cwd=project_root, capture_output=True, check=False
+        )
+
+        self.assertEqual(completed.returncode, 0)
@@ -0,0 +1,151 @@
+from src.repositories.document_cache import DocumentCache
+from src.repositories.pdf_repository import PDFRepository
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+import fitz
+
+
+def _write_pdf(path, pages=2):
+    doc = fitz.open()
+    for _ in range(pages):
+        doc.new_page()
+    doc.save(path)
+    doc.close()
+
+
+class TestDocumentCache(unittest.TestCase):
+    """Testiluokka DocumentCache-luokan toiminnallisuuksien testaamiseen."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path_a = os.path.join(self.temp_dir.name, "a.pdf")
+        self.path_b = os.path.join(self.temp_dir.name, "b.pdf")
+        _write_pdf(self.path_a)
+        _write_pdf(self.path_b, pages=3)
+        self.opener = MagicMock(side_effect=fitz.open)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_negative_budget_rejected(self):
+        with self.assertRaises(ValueError):
+            DocumentCache(max_bytes=-1)
+
+    def test_warm_handle_is_reused(self):
+        cache = DocumentCache()
+        first = cache.acquire(self.path_a, self.opener)
+        self.assertTrue(cache.release(first))
+        second = cache.acquire(self.path_a, self.opener)
+        cache.release(second)
+
+        self.assertIs(first, second)
+        self.assertFalse(second.is_closed)
+        self.opener.assert_called_once_with(self.path_a)
+
+    def test_modified_file_is_reopened(self):
+        cache = DocumentCache()
+        first = cache.acquire(self.path_a, self.opener)
+        cache.release(first)
+
+        _write_pdf(self.path_a, pages=5)
+        stat_result = os.stat(self.path_a)
+        os.utime(self.path_a, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+
+        second = cache.acquire(self.path_a, self.opener)
+        self.assertIsNot(first, second)
+        self.assertTrue(first.is_closed)
+        self.assertEqual(second.page_count, 5)
+        cache.release(second)
+
+    def test_lru_eviction_respects_budget(self):
+        size_a = os.path.getsize(self.path_a)
+        cache = DocumentCache(max_bytes=size_a + os.path.getsize(self.path_b) - 1)
+        doc_a = cache.acquire(self.path_a, self.opener)
+        cache.release(doc_a)
+        doc_b = cache.acquire(self.path_b, self.opener)
+        cache.release(doc_b)
+
+        self.assertEqual(len(cache), 1)
+        self.assertTrue(doc_a.is_closed)
+        self.assertFalse(doc_b.is_closed)
+        self.assertLessEqual(cache.total_bytes, cache.max_bytes)
+
+    def test_evicted_document_stays_open_while_leased(self):
+        cache = DocumentCache()
+        document = cache.acquire(self.path_a, self.opener)
+        cache.invalidate(self.path_a)
+        self.assertFalse(document.is_closed)
+        self.assertTrue(cache.release(document))
+        self.assertTrue(document.is_closed)
+        self.assertEqual(len(cache), 0)
+
+    def test_clear_closes_idle_documents(self):
+        cache = DocumentCache()
+        document = cache.acquire(self.path_a, self.opener)
+        cache.release(document)
+        cache.clear()
+        self.assertTrue(document.is_closed)
+        self.assertEqual(cache.total_bytes, 0)
+
+    def test_release_unknown_document(self):
+        cache = DocumentCache()
+        self.assertFalse(cache.release(MagicMock()))
+
+    def test_shared_handle_is_leased_to_one_thread_at_a_time(self):
+        cache = DocumentCache()
+        document = cache.acquire(self.path_a, self.opener)
+        acquired = threading.Event()
+
+        def other_thread():
+            cache.release(cache.acquire(self.path_a, self.opener))
+            acquired.set()
+
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        time.sleep(0.1)
+        self.assertFalse(acquired.is_set())
+        cache.release(document)
+        thread.join(timeout=2)
+        self.assertTrue(acquired.is_set())
+        self.opener.assert_called_once()
+
+
+class TestPDFRepositoryWithDocumentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "a.pdf")
+        _write_pdf(self.path)
+        self.cache = DocumentCache()
+        self.repository = PDFRepository(document_cache=self.cache)
+
+    def tearDown(self):
+        self.cache.clear()
+        self.temp_dir.cleanup()
+
+    def test_close_pdf_returns_document_to_cache(self):
+        document = self.repository.load_pdf(self.path)
+        self.repository.close_pdf(document)
+        self.assertFalse(document.is_closed)
+        self.assertIs(self.repository.load_pdf(self.path), document)
+        self.repository.close_pdf(document)
+
+    def test_uncached_documents_are_closed(self):
+        source = self.repository.load_pdf(self.path)
+        extracted = self.repository.extract_pages(source, 0, 0)
+        self.repository.close_pdf(extracted)
+        self.repository.close_pdf(source)
+        self.assertTrue(extracted.is_closed)
+        self.assertFalse(source.is_closed)
+
+    def test_missing_file_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            self.repository.load_pdf(os.path.join(self.temp_dir.name, "puuttuu.pdf"))
+
+
+if __name__ == "__main__":
+    unittest.main()
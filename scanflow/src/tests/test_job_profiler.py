@@ -0,0 +1,45 @@
+from src.utils.job_profiler import JobProfiler
+import os
+import pstats
+import tempfile
+import unittest
+
+
+def _busy_function():
+    return sum(number * number for number in range(1000))
+
+
+class TestJobProfiler(unittest.TestCase):
+    """Testiluokka jakotyön profiloijan testaamiseen."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_saves_pstats_and_summary(self):
+        profiler = JobProfiler("lähde tiedosto.pdf", self.temp_dir.name, top_n=2)
+        with profiler:
+            _busy_function()
+
+        self.assertTrue(profiler.pstats_path.endswith("-lähde_tiedosto.pdf.pstats"))
+        stats = pstats.Stats(profiler.pstats_path)
+        self.assertTrue(
+            any(function[2] == "_busy_function" for function in stats.stats)
+        )
+        with open(profiler.summary_path, encoding="utf-8") as file:
+            summary = file.read()
+        self.assertIn("_busy_function", summary)
+        self.assertIn("due to restriction <2>", summary)
+
+    def test_saves_profile_when_job_fails(self):
+        profiler = JobProfiler(output_dir=self.temp_dir.name)
+        with self.assertRaises(RuntimeError), profiler:
+            raise RuntimeError("virhe")
+
+        self.assertTrue(os.path.exists(profiler.pstats_path))
+
+    def test_invalid_top_n(self):
+        with self.assertRaises(ValueError):
+            JobProfiler(top_n=0)
@@ -0,0 +1,90 @@
+from src.repositories.pdf_repository import PDFRepository
+from src.services.pdf_splitter_service import PDFSplitterService
+from src.utils.memory_profiler import (
+    MemoryProfiler,
+    ProfilingRepository,
+    current_rss_bytes,
+    format_report,
+)
+import os
+import tempfile
+import tracemalloc
+import unittest
+from unittest.mock import patch
+import fitz
+
+
+class TestMemoryProfiler(unittest.TestCase):
+    """Testiluokka muistiprofiloijan testaamiseen."""
+
+    def test_invalid_interval(self):
+        with self.assertRaises(ValueError):
+            MemoryProfiler(sample_interval=0)
+
+    def test_stage_and_growth(self):
+        rss_values = iter(range(100 * 1024 * 1024, 200 * 1024 * 1024, 1024))
+
+        with patch(
+            "src.utils.memory_profiler.current_rss_bytes", lambda: next(rss_values)
+        ), MemoryProfiler(sample_interval=60) as profiler:
+            for _ in range(5):
+                with profiler.stage("vaihe"):
+                    pass
+                profiler.part_done(2)
+
+        report = profiler.report()
+        self.assertEqual(report["stages"]["vaihe"]["calls"], 5)
+        self.assertEqual(len(report["parts"]), 5)
+        self.assertEqual(report["parts"][0]["pages"], 2)
+        self.assertGreater(report["peak_rss_mb"], report["baseline_rss_mb"])
+        # Jokaista osaa kohden otetaan kolme RSS-lukemaa, 1 kt kukin.
+        self.assertAlmostEqual(report["rss_growth_per_part_kb"], 3.0)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_report_without_parts(self):
+        with MemoryProfiler() as profiler:
+            pass
+        report = profiler.report()
+        self.assertIsNone(report["steady_rss_mb"])
+        self.assertIsNone(report["rss_growth_per_part_kb"])
+        self.assertIn("Kasvu per osa: -", format_report(report))
+
+    def test_current_rss(self):
+        rss = current_rss_bytes()
+        if rss is not None:
+            self.assertGreater(rss, 0)
+
+
+class TestProfilingRepository(unittest.TestCase):
+    """Testaa profiloivaa repositoriota oikealla jaolla."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source_path = os.path.join(self.temp_dir.name, "lahde.pdf")
+        doc = fitz.open()
+        for _ in range(6):
+            doc.new_page()
+        doc.save(self.source_path)
+        doc.close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_split_reports_stages_and_parts(self):
+        profiler = MemoryProfiler()
+        service = PDFSplitterService(ProfilingRepository(PDFRepository(), profiler))
+
+        with profiler:
+            result = service.split_by_fixed_range(self.source_path, 2, self.temp_dir.name)
+
+        report = profiler.report()
+        self.assertEqual(len(result), 3)
+        self.assertEqual(report["stages"]["load_pdf"]["calls"], 1)
+        self.assertEqual(report["stages"]["extract_pages"]["calls"], 3)
+        self.assertEqual(report["stages"]["save_pdf"]["calls"], 3)
+        self.assertEqual([part["pages"] for part in report["parts"]], [2, 2, 2])
+        self.assertIn("extract_pages", format_report(report))
+
+    def test_delegates_other_methods(self):
+        repository = ProfilingRepository(PDFRepository(), MemoryProfiler())
+        self.assertEqual(repository.count_pages(self.source_path), 6)
@@ -0,0 +1,198 @@
+from src.repositories.part_cache import PartCache
+from src.services.outline_planner import (
+    LEADING_PART_TITLE,
+    plan_outline_parts,
+    rebase_outline,
+    safe_title,
+)
+from src.services.pdf_splitter_service import PDFSplitterService
+from src.services.split_options import SplitOptions
+import os
+import tempfile
+import unittest
+import fitz
+
+
+class TestOutlinePlanner(unittest.TestCase):
+    """Testiluokka kirjanmerkkeihin perustuvan jakosuunnitelman testaamiseen."""
+
+    def setUp(self):
+        self.outline = [
+            (1, "Johdanto", 2),
+            (2, "Tausta", 3),
+            (1, "Menetelmät", 5),
+            (2, "Aineisto", 5),
+            (3, "Otanta", 6),
+            (2, "Ei kohdetta", -1),
+            (3, "Alakohta", 7),
+            (1, "Liitteet", 9),
+        ]
+
+    def _describe(self, parts):
+        return [(part.start_idx, part.end_idx, part.title) for part in parts]
+
+    def test_first_level_parts(self):
+        parts = plan_outline_parts(self.outline, 10)
+
+        self.assertEqual(
+            self._describe(parts),
+            [(0, 0, LEADING_PART_TITLE), (1, 3, "Johdanto"), (4, 7, "Menetelmät"),
+             (8, 9, "Liitteet")],
+        )
+        self.assertEqual(parts[0].entries, [])
+        self.assertEqual(parts[1].entries, [(1, "Johdanto", 2), (2, "Tausta", 3)])
+
+    def test_deeper_level_splits_sections(self):
+        parts = plan_outline_parts(self.outline, 10, level=2)
+
+        self.assertEqual(
+            self._describe(parts)[1:],
+            [(1, 1, "Johdanto"), (2, 3, "Tausta"), (4, 7, "Menetelmät"), (8, 9, "Liitteet")],
+        )
+        self.assertEqual(parts[2].entries, [(1, "Tausta", 3)])
+
+    def test_entries_follow_their_part_and_levels_are_normalized(self):
+        outline = [(2, "Kohta", 1), (4, "Syvä", 2), (2, "Toinen", 3)]
+
+        parts = plan_outline_parts(outline, 4, level=2)
+
+        self.assertEqual(parts[0].entries, [(1, "Kohta", 1), (2, "Syvä", 2)])
+        self.assertEqual(parts[1].entries, [(1, "Toinen", 3)])
+
+    def test_entry_without_destination_stays_with_previous(self):
+        parts = plan_outline_parts(self.outline, 10)
+
+        self.assertIn((2, "Ei kohdetta", -1), parts[2].entries)
+        self.assertEqual(parts[2].entries[-1], (3, "Alakohta", 7))
+
+    def test_without_bookmarks(self):
+        with self.assertRaises(ValueError):
+            plan_outline_parts([], 3)
+        with self.assertRaises(ValueError):
+            plan_outline_parts([(2, "Syvä", 1)], 3, level=1)
+        with self.assertRaises(ValueError):
+            plan_outline_parts(self.outline, 10, level=0)
+
+    def test_rebase_outline(self):
+        entries = [(1, "Luku", 5), (2, "Kohta", 6), (2, "Kohta", -1), (2, "Loppu", 8)]
+
+        self.assertEqual(
+            rebase_outline(entries, 4, 7),
+            [(1, "Luku", 1), (2, "Kohta", 2), (2, "Kohta", -1), (2, "Loppu", 4)],
+        )
+        self.assertEqual(
+            [page for _level, _title, page in rebase_outline(entries, 4, 7, {1, 4, 6})],
+            [1, 1, -1, 2],
+        )
+
+    def test_safe_title(self):
+        self.assertEqual(safe_title('Luku 1: "A/B"?'), "Luku 1_ _A_B_")
+        self.assertEqual(safe_title("  Otsikko \n  jatkuu. "), "Otsikko jatkuu")
+        self.assertEqual(safe_title("..."), "osa")
+        self.assertEqual(len(safe_title("x" * 500)), 80)
+
+    def test_large_outline(self):
+        outline = []
+        for chapter in range(5000):
+            outline.append((1, f"Luku {chapter}", chapter * 4 + 1))
+            outline.extend(
+                (2, f"Kohta {section}", chapter * 4 + section + 1) for section in range(4)
+            )
+
+        parts = plan_outline_parts(outline, 20000)
+
+        self.assertEqual(len(parts), 5000)
+        self.assertEqual(sum(len(part.entries) for part in parts), len(outline))
+
+
+class TestSplitByOutline(unittest.TestCase):
+    """Testaa kirjanmerkkien mukaan jakamista oikeilla PDF-tiedostoilla."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.temp_dir.name, "osat")
+        os.makedirs(self.output_dir)
+        self.source_path = os.path.join(self.temp_dir.name, "kirja.pdf")
+        doc = fitz.open()
+        for page_number in range(8):
+            doc.new_page().insert_text((72, 72), f"Sivu {page_number + 1} " * 6, fontsize=24)
+        doc.set_toc([
+            [1, "Kansi", 1],
+            [1, "Luku 1: Alku", 2],
+            [2, "Tausta", 3],
+            [1, "Luku 2", 5],
+            [2, "Aineisto", 6],
+            [3, "Otanta", 7],
+        ])
+        doc.save(self.source_path)
+        doc.close()
+        self.service = PDFSplitterService()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _outline(self, path):
+        with fitz.open(path) as doc:
+            return doc.page_count, doc.get_toc()
+
+    def test_split_by_outline(self):
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                result = self.service.split_by_outline(
+                    self.source_path, self.output_dir, options=SplitOptions(workers=workers),
+                )
+
+                self.assertEqual(
+                    [os.path.basename(path) for path in result],
+                    ["kirja_001_Kansi.pdf", "kirja_002_Luku 1_ Alku.pdf", "kirja_003_Luku 2.pdf"],
+                )
+                self.assertEqual(
+                    self._outline(result[2]),
+                    (4, [[1, "Luku 2", 1], [2, "Aineisto", 2], [3, "Otanta", 3]]),
+                )
+
+    def test_split_by_deeper_level(self):
+        result = self.service.split_by_outline(self.source_path, self.output_dir, level=2)
+
+        self.assertEqual(len(result), 5)
+        self.assertEqual(self._outline(result[4]), (3, [[1, "Aineisto", 1], [2, "Otanta", 2]]))
+
+    def test_outline_is_rebased_around_dropped_pages(self):
+        doc = fitz.open(self.source_path)
+        doc.delete_page(4)
+        doc.insert_page(4)
+        doc.set_toc([[1, "Luku", 1], [2, "Tyhjän jälkeen", 6]])
+        doc.saveIncr()
+        doc.close()
+
+        result = self.service.split_by_outline(
+            self.source_path, self.output_dir, options=SplitOptions(drop_blank_pages=True),
+        )
+
+        self.assertEqual(
+            self._outline(result[0]), (7, [[1, "Luku", 1], [2, "Tyhjän jälkeen", 5]])
+        )
+
+    def test_part_cache_key_includes_outline(self):
+        cache = PartCache(os.path.join(self.temp_dir.name, "cache"))
+        self.addCleanup(cache.close)
+        service = PDFSplitterService(part_cache=cache)
+        service.split_by_custom_ranges(self.source_path, [(5, 8)], self.output_dir)
+
+        result = service.split_by_outline(self.source_path, self.output_dir)
+
+        self.assertEqual(cache.get_stats()["hits"], 0)
+        self.assertEqual(self._outline(result[2])[1][0], [1, "Luku 2", 1])
+
+    def test_document_without_outline(self):
+        doc = fitz.open(self.source_path)
+        doc.set_toc([])
+        doc.saveIncr()
+        doc.close()
+
+        with self.assertRaises(ValueError):
+            self.service.split_by_outline(self.source_path, self.output_dir)
+
+    def test_invalid_level(self):
+        with self.assertRaises(ValueError):
+            self.service.iter_split_by_outline(self.source_path, self.output_dir, level=0)
@@ -0,0 +1,288 @@
+from src.repositories.page_stats_cache import PageStatsCache
+from src.repositories.part_cache import PartCache
+from src.repositories.pdf_repository import PDFRepository
+from src.services.cancellation import CancellationToken, SplitCancelledError
+from src.services.page_classifier import (
+    PAGE_BLANK,
+    PAGE_CONTENT,
+    PAGE_SEPARATOR,
+    THUMBNAIL_HEIGHT,
+    THUMBNAIL_WIDTH,
+    PageClassifier,
+    classify_stats,
+    measure_thumbnails,
+    ranges_between_separators,
+)
+from src.services.pdf_splitter_service import PDFSplitterService
+from src.services.split_options import SplitOptions
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import fitz
+import numpy as np
+
+_MM = 72 / 25.4
+
+
+def _add_text_page(doc, seed):
+    page = doc.new_page()
+    rng = np.random.default_rng(seed)
+    words = " ".join(
+        "".join(rng.choice(list("abcdefghijklmnoprstuvy"), rng.integers(2, 9)))
+        for _ in range(300)
+    )
+    page.insert_textbox(fitz.Rect(72, 72, 523, 770), words, fontsize=10)
+
+
+def _add_patch_page(doc, horizontal=False):
+    page = doc.new_page()
+    offset = 200
+    for width in (2, 5, 2, 5):
+        if horizontal:
+            rect = fitz.Rect(100, offset, 100 + 50 * _MM, offset + width * _MM)
+        else:
+            rect = fitz.Rect(offset, 60, offset + width * _MM, 60 + 50 * _MM)
+        page.draw_rect(rect, color=None, fill=(0, 0, 0))
+        offset += (width + 4) * _MM
+    page.insert_text((100, 400), "PATCH T", fontsize=14)
+
+
+class TestPageStatistics(unittest.TestCase):
+    """Testiluokka sivukuvien tunnuslukujen ja luokittelun testaamiseen."""
+
+    def setUp(self):
+        self.pages = np.full((3, THUMBNAIL_HEIGHT, THUMBNAIL_WIDTH), 235, dtype=np.uint8)
+        rng = np.random.default_rng(0)
+        text_rows = self.pages[1, 40:300]
+        text_rows[rng.random(text_rows.shape) < 0.2] = 150
+        for column in (100, 110, 118, 128):
+            self.pages[2, 30:100, column:column + 4] = 10
+
+    def test_classifies_blank_content_and_separator(self):
+        kinds = classify_stats(measure_thumbnails(self.pages))
+
+        self.assertEqual(kinds, [PAGE_BLANK, PAGE_CONTENT, PAGE_SEPARATOR])
+
+    def test_counts_patch_bars(self):
+        stats = measure_thumbnails(self.pages)
+
+        self.assertEqual(stats[2, 2], 4)
+        self.assertEqual(stats[1, 2], 0)
+
+    def test_frame_is_not_separator(self):
+        frame = np.full((1, THUMBNAIL_HEIGHT, THUMBNAIL_WIDTH), 235, dtype=np.uint8)
+        frame[0, 30:300, 20:24] = 10
+        frame[0, 30:300, 210:214] = 10
+
+        self.assertEqual(classify_stats(measure_thumbnails(frame)), [PAGE_CONTENT])
+
+    def test_blank_threshold_is_tunable(self):
+        stats = measure_thumbnails(self.pages)
+
+        self.assertEqual(classify_stats(stats, blank_threshold=1.0)[1], PAGE_BLANK)
+
+    def test_ranges_between_separators(self):
+        kinds = [
+            PAGE_SEPARATOR, PAGE_CONTENT, PAGE_CONTENT, PAGE_SEPARATOR, PAGE_BLANK,
+            PAGE_CONTENT, PAGE_BLANK, PAGE_CONTENT,
+        ]
+
+        self.assertEqual(ranges_between_separators(kinds), [(1, 2), (5, 5), (7, 7)])
+        self.assertEqual(
+            ranges_between_separators(kinds, blank_is_separator=False), [(1, 2), (4, 7)]
+        )
+        self.assertEqual(ranges_between_separators([PAGE_BLANK, PAGE_SEPARATOR]), [])
+
+
+class TestPageClassifier(unittest.TestCase):
+    """Testaa sivujen luokittelua ja erotinsivuihin perustuvaa jakoa."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = self.temp_dir.name
+        self.source_path = os.path.join(self.temp_dir.name, "erä.pdf")
+        doc = fitz.open()
+        _add_text_page(doc, 1)
+        _add_text_page(doc, 2)
+        _add_patch_page(doc)
+        doc.new_page()
+        _add_text_page(doc, 3)
+        _add_patch_page(doc, horizontal=True)
+        _add_text_page(doc, 4)
+        doc.save(self.source_path)
+        doc.close()
+        self.expected_kinds = [
+            PAGE_CONTENT, PAGE_CONTENT, PAGE_SEPARATOR, PAGE_BLANK,
+            PAGE_CONTENT, PAGE_SEPARATOR, PAGE_CONTENT,
+        ]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_classify_serial_and_parallel(self):
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                classifier = PageClassifier(workers=workers, batch_size=3)
+
+                self.assertEqual(classifier.classify(self.source_path), self.expected_kinds)
+
+    def test_classify_cancelled(self):
+        token = CancellationToken()
+        token.cancel()
+
+        with self.assertRaises(SplitCancelledError):
+            PageClassifier().classify(self.source_path, cancel_token=token)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            PageClassifier(workers=0)
+        with self.assertRaises(ValueError):
+            PageClassifier(batch_size=0)
+
+    def test_split_by_separator_pages(self):
+        result = PDFSplitterService().split_by_separator_pages(
+            self.source_path, self.output_dir
+        )
+
+        self.assertEqual(
+            [os.path.basename(path) for path in result],
+            ["erä_alue_1_sivut_1-2.pdf", "erä_alue_2_sivut_5-5.pdf", "erä_alue_3_sivut_7-7.pdf"],
+        )
+
+    def test_split_by_patch_sheets_only(self):
+        result = PDFSplitterService().split_by_separator_pages(
+            self.source_path,
+            self.output_dir,
+            blank_is_separator=False,
+            options=SplitOptions(workers=2),
+        )
+
+        self.assertEqual(
+            [os.path.basename(path) for path in result],
+            ["erä_alue_1_sivut_1-2.pdf", "erä_alue_2_sivut_4-5.pdf", "erä_alue_3_sivut_7-7.pdf"],
+        )
+
+
+class TestDropBlankPages(unittest.TestCase):
+    """Testaa tyhjien sivujen poistamista jaon yhteydessä."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = self.temp_dir.name
+        self.source_path = os.path.join(self.temp_dir.name, "duplex.pdf")
+        doc = fitz.open()
+        for seed, blank in enumerate((False, True, False, False, True, True, False)):
+            if blank:
+                doc.new_page()
+            else:
+                _add_text_page(doc, seed)
+        doc.save(self.source_path)
+        doc.close()
+        self.repository = PDFRepository()
+        self.dropped = []
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _page_counts(self, paths):
+        counts = []
+        for path in paths:
+            with fitz.open(path) as doc:
+                counts.append(doc.page_count)
+        return counts
+
+    def test_fixed_range_drops_blank_pages(self):
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                self.dropped.clear()
+                result = PDFSplitterService(self.repository).split_by_fixed_range(
+                    self.source_path,
+                    2,
+                    self.output_dir,
+                    options=SplitOptions(
+                        workers=workers,
+                        drop_blank_pages=True,
+                        dropped_pages_callback=self.dropped.extend,
+                    ),
+                )
+
+                self.assertEqual(
+                    [os.path.basename(path) for path in result],
+                    ["duplex_sivut_1-2.pdf", "duplex_sivut_3-4.pdf", "duplex_sivut_7-7.pdf"],
+                )
+                self.assertEqual(self._page_counts(result), [1, 2, 1])
+                self.assertEqual(self.dropped, [2, 5, 6])
+
+    def test_custom_ranges_report_only_pages_inside_ranges(self):
+        result = PDFSplitterService(self.repository).split_by_custom_ranges(
+            self.source_path,
+            [(1, 3)],
+            self.output_dir,
+            options=SplitOptions(drop_blank_pages=True, dropped_pages_callback=self.dropped.extend),
+        )
+
+        self.assertEqual(self._page_counts(result), [2])
+        self.assertEqual(self.dropped, [2])
+
+    def test_fully_blank_parts_are_omitted(self):
+        result = PDFSplitterService(self.repository).split_by_fixed_range(
+            self.source_path,
+            2,
+            self.output_dir,
+            options=SplitOptions(
+                drop_blank_pages=True,
+                blank_threshold=1.0,
+                dropped_pages_callback=self.dropped.extend,
+            ),
+        )
+
+        self.assertEqual(result, [])
+        self.assertEqual(self.dropped, [1, 2, 3, 4, 5, 6, 7])
+
+    def test_invalid_blank_threshold(self):
+        with self.assertRaises(ValueError):
+            PDFSplitterService(self.repository).split_by_fixed_range(
+                self.source_path,
+                2,
+                self.output_dir,
+                options=SplitOptions(drop_blank_pages=True, blank_threshold=-0.1),
+            )
+
+    def test_repeated_split_uses_stats_cache(self):
+        stats_cache = PageStatsCache(os.path.join(self.temp_dir.name, "stats.sqlite3"))
+        self.addCleanup(stats_cache.close)
+        service = PDFSplitterService(self.repository, page_stats_cache=stats_cache)
+        service.split_by_fixed_range(
+            self.source_path, 2, self.output_dir, options=SplitOptions(drop_blank_pages=True),
+        )
+
+        with patch.object(self.repository, "render_page_gray") as render_page_gray:
+            result = service.split_by_fixed_range(
+                self.source_path,
+                2,
+                self.output_dir,
+                options=SplitOptions(
+                    drop_blank_pages=True,
+                    dropped_pages_callback=self.dropped.extend,
+                ),
+            )
+
+        render_page_gray.assert_not_called()
+        self.assertEqual(len(result), 3)
+        self.assertEqual(self.dropped, [2, 5, 6])
+        self.assertEqual(stats_cache.get_stats()["hits"], 1)
+
+    def test_part_cache_distinguishes_dropped_pages(self):
+        part_cache = PartCache(os.path.join(self.temp_dir.name, "parts"))
+        self.addCleanup(part_cache.close)
+        service = PDFSplitterService(self.repository, part_cache=part_cache)
+        service.split_by_fixed_range(self.source_path, 2, self.output_dir)
+
+        result = service.split_by_fixed_range(
+            self.source_path, 2, self.output_dir, options=SplitOptions(drop_blank_pages=True),
+        )
+
+        self.assertEqual(self._page_counts(result), [1, 2, 1])
+        stats = part_cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
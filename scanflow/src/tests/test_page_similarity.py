@@ -0,0 +1,167 @@
+from src.repositories.page_stats_cache import PageStatsCache
+from src.repositories.pdf_repository import PDFRepository
+from src.services.page_classifier import THUMBNAIL_HEIGHT, THUMBNAIL_WIDTH
+from src.services.page_similarity import (
+    FEATURE_LENGTH,
+    PageFeatureExtractor,
+    neighbour_distances,
+    page_features,
+    suggest_cut_points,
+    suggest_ranges,
+)
+from src.services.pdf_splitter_service import PDFSplitterService
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import fitz
+import numpy as np
+
+
+def _add_letter_page(doc):
+    page = doc.new_page()
+    page.insert_textbox(fitz.Rect(72, 72, 520, 760), "Kirje " * 300, fontsize=11)
+
+
+def _add_form_page(doc):
+    page = doc.new_page()
+    page.draw_rect(page.rect, color=None, fill=(0.85, 0.85, 0.85))
+    for row in range(10):
+        page.draw_rect(
+            fitz.Rect(72, 120 + row * 60, 520, 160 + row * 60), color=(0, 0, 0), width=2
+        )
+
+
+def _add_report_page(doc):
+    page = doc.new_page()
+    page.draw_rect(fitz.Rect(40, 40, 560, 120), color=None, fill=(0.1, 0.1, 0.1))
+    page.insert_textbox(fitz.Rect(72, 200, 520, 500), "Raportti " * 100, fontsize=11)
+
+
+class TestSimilarityHelpers(unittest.TestCase):
+    """Testiluokka piirrevektoreiden ja rajaehdotusten testaamiseen."""
+
+    def setUp(self):
+        self.white = np.full((THUMBNAIL_HEIGHT, THUMBNAIL_WIDTH), 255, np.uint8)
+        self.top_heavy = self.white.copy()
+        self.top_heavy[40:120, 30:210] = 0
+        self.bottom_heavy = self.white.copy()
+        self.bottom_heavy[220:300, 30:210] = 0
+
+    def test_page_features(self):
+        features = page_features(np.stack([self.white, self.top_heavy, self.white // 2 + 100]))
+
+        self.assertEqual(features.shape, (3, FEATURE_LENGTH))
+        self.assertEqual(features[0, :48].sum(), 0)
+        self.assertGreater(features[1, :24].sum(), 0)
+        self.assertEqual(features[1, 24:48].sum(), 0)
+        np.testing.assert_allclose(features[:, 48:56].sum(axis=1), 1, atol=1e-3)
+        self.assertEqual(features[0, -1], 1.0)
+        self.assertLess(features[2, -1], 1.0)
+
+    def test_neighbour_distances(self):
+        pages = np.stack([
+            self.top_heavy, self.top_heavy, self.bottom_heavy, self.white, self.white
+        ])
+
+        distances = neighbour_distances(page_features(pages))
+
+        self.assertEqual(len(distances), 4)
+        self.assertAlmostEqual(distances[0], 0)
+        self.assertGreater(distances[1], 0.4)
+        self.assertGreater(distances[2], 0.5)
+        self.assertAlmostEqual(distances[3], 0)
+        self.assertEqual(len(neighbour_distances(page_features(pages[:1]))), 0)
+
+    def test_paper_tone_change_is_a_distance(self):
+        tinted = (self.top_heavy.astype(np.int16) - 30).clip(0).astype(np.uint8)
+
+        distances = neighbour_distances(page_features(np.stack([self.top_heavy, tinted])))
+
+        self.assertGreater(distances[0], 0.2)
+
+    def test_suggest_cut_points_follows_sensitivity(self):
+        distances = [0.01, 0.02, 0.6, 0.03, 0.1, 0.02, 0.01, 0.7]
+
+        self.assertEqual(suggest_cut_points(distances, 0), [3, 8])
+        self.assertEqual(suggest_cut_points(distances, 1), [3, 5, 8])
+        self.assertEqual(suggest_cut_points([0.01] * 5, 1), [])
+        self.assertEqual(suggest_cut_points([], 0.5), [])
+
+    def test_suggest_ranges(self):
+        self.assertEqual(
+            suggest_ranges([0.0, 0.9, 0.0, 0.0], 0.5), [(0, 1), (2, 4)]
+        )
+        self.assertEqual(suggest_ranges([], 0.5), [(0, 0)])
+
+    def test_invalid_sensitivity(self):
+        with self.assertRaises(ValueError):
+            suggest_cut_points([0.1], 1.5)
+        with self.assertRaises(ValueError):
+            suggest_cut_points([0.1], -0.1)
+
+
+class TestSplitBySimilarity(unittest.TestCase):
+    """Testaa sivujen samankaltaisuuteen perustuvaa jakoa oikeilla PDF-tiedostoilla."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.temp_dir.name, "osat")
+        os.makedirs(self.output_dir)
+        self.source_path = os.path.join(self.temp_dir.name, "era.pdf")
+        doc = fitz.open()
+        for add_page, page_count in (
+            (_add_letter_page, 3), (_add_form_page, 2), (_add_report_page, 3)
+        ):
+            for _ in range(page_count):
+                add_page(doc)
+        doc.save(self.source_path)
+        doc.close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_extract_serial_and_parallel(self):
+        serial = PageFeatureExtractor(batch_size=3).extract(self.source_path)
+        parallel = PageFeatureExtractor(workers=2, batch_size=3).extract(self.source_path)
+
+        self.assertEqual(serial.shape, (8, FEATURE_LENGTH))
+        np.testing.assert_array_equal(serial, parallel)
+
+    def test_cached_features_are_not_rendered_again(self):
+        cache = PageStatsCache(os.path.join(self.temp_dir.name, "stats.sqlite3"))
+        self.addCleanup(cache.close)
+        first = PageFeatureExtractor(page_cache=cache).extract(self.source_path)
+
+        with patch.object(PDFRepository, "render_page_gray") as render_page_gray:
+            second = PageFeatureExtractor(page_cache=cache).extract(self.source_path)
+
+        render_page_gray.assert_not_called()
+        np.testing.assert_array_equal(first, second)
+        self.assertEqual(cache.get_stats(), {"hits": 1, "misses": 1, "entries": 1})
+
+    def test_suggested_ranges(self):
+        service = PDFSplitterService()
+
+        distances = service.measure_page_similarity(self.source_path)
+
+        self.assertEqual(len(distances), 7)
+        for sensitivity in (0, 0.5, 1):
+            self.assertEqual(
+                service.suggest_similarity_ranges(distances, sensitivity),
+                [(1, 3), (4, 5), (6, 8)],
+            )
+
+    def test_split_by_similarity(self):
+        result = PDFSplitterService().split_by_similarity(self.source_path, self.output_dir)
+
+        self.assertEqual(
+            [os.path.basename(path) for path in result],
+            ["era_alue_1_sivut_1-3.pdf", "era_alue_2_sivut_4-5.pdf", "era_alue_3_sivut_6-8.pdf"],
+        )
+
+    def test_invalid_sensitivity_raises_eagerly(self):
+        with self.assertRaises(ValueError):
+            PDFSplitterService().iter_split_by_similarity(
+                self.source_path, self.output_dir, sensitivity=2
+            )
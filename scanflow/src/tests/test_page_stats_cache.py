@@ -0,0 +1,68 @@
+from src.repositories.page_stats_cache import PageStatsCache
+import os
+import tempfile
+import unittest
+
+
+class TestPageStatsCache(unittest.TestCase):
+    """Testiluokka sivujen tunnuslukujen välimuistin testaamiseen."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = PageStatsCache(
+            os.path.join(self.temp_dir.name, "stats.sqlite3"), max_entries=2
+        )
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def test_make_key_depends_on_all_inputs(self):
+        key = PageStatsCache.make_key("abc", {"width": 240})
+        self.assertEqual(key, PageStatsCache.make_key("abc", {"width": 240}))
+        self.assertNotEqual(key, PageStatsCache.make_key("abd", {"width": 240}))
+        self.assertNotEqual(key, PageStatsCache.make_key("abc", {"width": 120}))
+
+    def test_miss_then_hit(self):
+        self.assertIsNone(self.cache.get("avain"))
+
+        self.cache.put("avain", [[0.0, 0.0, 0.0], [0.25, 0.01, 4.0]])
+
+        self.assertEqual(self.cache.get("avain"), [[0.0, 0.0, 0.0], [0.25, 0.01, 4.0]])
+        self.assertEqual(self.cache.get_stats(), {"hits": 1, "misses": 1, "entries": 1})
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put("a", [[1.0]])
+        self.cache.put("b", [[2.0]])
+        self.cache.get("a")
+
+        self.cache.put("c", [[3.0]])
+
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), [[1.0]])
+        self.assertEqual(self.cache.get_stats()["entries"], 2)
+
+    def test_clear(self):
+        self.cache.put("a", [[1.0]])
+        self.cache.get("a")
+
+        self.cache.clear()
+
+        self.assertEqual(self.cache.get_stats(), {"hits": 0, "misses": 0, "entries": 0})
+
+    def test_tables_are_separate(self):
+        texts = PageStatsCache(self.cache.db_path, table="page_text")
+        self.addCleanup(texts.close)
+        self.cache.put("a", [[1.0]])
+
+        texts.put("a", ["Lasku nro 1 – äö", ""])
+
+        self.assertEqual(self.cache.get("a"), [[1.0]])
+        self.assertEqual(texts.get("a"), ["Lasku nro 1 – äö", ""])
+        self.assertEqual(texts.get_stats(), {"hits": 1, "misses": 0, "entries": 1})
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            PageStatsCache(os.path.join(self.temp_dir.name, "toinen.sqlite3"), max_entries=0)
+        with self.assertRaises(ValueError):
+            PageStatsCache(self.cache.db_path, table="page_text; DROP TABLE page_stats")
@@ -0,0 +1,145 @@
+from src.repositories.page_stats_cache import PageStatsCache
+from src.repositories.pdf_repository import PDFRepository
+from src.services.cancellation import CancellationToken, SplitCancelledError
+from src.services.page_text_extractor import (
+    TEXT_CACHE_TABLE,
+    PageTextExtractor,
+    compile_pattern,
+    find_matching_pages,
+    ranges_from_start_pages,
+)
+from src.services.pdf_splitter_service import PDFSplitterService
+from src.services.split_options import SplitOptions
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import fitz
+
+
+class TestPatternHelpers(unittest.TestCase):
+    """Testiluokka hakulausekkeen ja osien rajojen apufunktioiden testaamiseen."""
+
+    def test_compile_pattern(self):
+        self.assertTrue(compile_pattern("lasku", ignore_case=True).search("LASKU NRO 1"))
+        self.assertIsNone(compile_pattern("lasku").search("LASKU NRO 1"))
+
+    def test_invalid_pattern(self):
+        with self.assertRaisesRegex(ValueError, "tyhjä"):
+            compile_pattern("")
+        with self.assertRaisesRegex(ValueError, "Virheellinen hakulauseke"):
+            compile_pattern("Lasku (nro")
+
+    def test_find_matching_pages(self):
+        texts = ["Kansi", "Lasku nro 1", "jatkuu", "Lasku nro 2"]
+        self.assertEqual(find_matching_pages(texts, compile_pattern(r"nro \d")), [1, 3])
+
+    def test_ranges_from_start_pages(self):
+        self.assertEqual(ranges_from_start_pages([0, 3], 5), [(0, 2), (3, 4)])
+        self.assertEqual(ranges_from_start_pages([2, 4], 6), [(0, 1), (2, 3), (4, 5)])
+        self.assertEqual(ranges_from_start_pages([], 6), [])
+
+
+class TestPageTextExtraction(unittest.TestCase):
+    """Testaa sivutekstien poimintaa ja tekstihaun mukaan jakamista."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.temp_dir.name, "osat")
+        os.makedirs(self.output_dir)
+        self.source_path = os.path.join(self.temp_dir.name, "laskut.pdf")
+        self.page_texts = [
+            "Saatekirje", "Lasku nro 101", "Erittely", "Lasku nro 102", "Lasku nro 103",
+            "Liite", "Liite",
+        ]
+        doc = fitz.open()
+        for page_number, text in enumerate(self.page_texts):
+            doc.new_page().insert_text(
+                (72, 72), f"{text}\nsivu {page_number + 1} " * 4, fontsize=20
+            )
+        doc.save(self.source_path)
+        doc.close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_extract_serial_and_parallel(self):
+        serial = PageTextExtractor(batch_size=3).extract(self.source_path)
+        parallel = PageTextExtractor(workers=2, batch_size=2).extract(self.source_path)
+
+        self.assertEqual(serial, parallel)
+        self.assertEqual(len(serial), 7)
+        self.assertTrue(serial[1].startswith("Lasku nro 101 sivu 2 Lasku nro 101"))
+
+    def test_cached_texts_are_not_extracted_again(self):
+        cache = PageStatsCache(
+            os.path.join(self.temp_dir.name, "texts.sqlite3"), table=TEXT_CACHE_TABLE
+        )
+        self.addCleanup(cache.close)
+        first = PageTextExtractor(page_cache=cache).extract(self.source_path)
+
+        with patch.object(PDFRepository, "get_page_text") as get_page_text:
+            second = PageTextExtractor(page_cache=cache).extract(self.source_path)
+
+        get_page_text.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertEqual(cache.get_stats(), {"hits": 1, "misses": 1, "entries": 1})
+
+    def test_extract_cancelled(self):
+        cancel_token = CancellationToken()
+        cancel_token.cancel()
+
+        with self.assertRaises(SplitCancelledError):
+            PageTextExtractor(batch_size=2).extract(self.source_path, cancel_token=cancel_token)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            PageTextExtractor(workers=0)
+        with self.assertRaises(ValueError):
+            PageTextExtractor(batch_size=0)
+
+    def test_split_by_text_pattern(self):
+        service = PDFSplitterService()
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                result = service.split_by_text_pattern(
+                    self.source_path,
+                    r"Lasku nro \d+",
+                    self.output_dir,
+                    options=SplitOptions(workers=workers),
+                )
+
+                self.assertEqual(
+                    [os.path.basename(path) for path in result],
+                    ["laskut_alue_1_sivut_1-1.pdf", "laskut_alue_2_sivut_2-3.pdf",
+                     "laskut_alue_3_sivut_4-4.pdf", "laskut_alue_4_sivut_5-7.pdf"],
+                )
+
+    def test_repeated_searches_reuse_text_index(self):
+        cache = PageStatsCache(
+            os.path.join(self.temp_dir.name, "texts.sqlite3"), table=TEXT_CACHE_TABLE
+        )
+        self.addCleanup(cache.close)
+        service = PDFSplitterService(page_text_cache=cache)
+        service.split_by_text_pattern(self.source_path, "Lasku", self.output_dir)
+
+        with patch.object(PDFRepository, "get_page_text") as get_page_text:
+            result = service.split_by_text_pattern(
+                self.source_path, "liite", self.output_dir, ignore_case=True
+            )
+
+        get_page_text.assert_not_called()
+        self.assertEqual(len(result), 3)
+        self.assertEqual(cache.get_stats()["hits"], 1)
+
+    def test_no_matching_pages(self):
+        with self.assertRaisesRegex(ValueError, "Yksikään sivu"):
+            PDFSplitterService().split_by_text_pattern(
+                self.source_path, "Tilausvahvistus", self.output_dir
+            )
+
+    def test_invalid_pattern_raises_eagerly(self):
+        with self.assertRaises(ValueError):
+            PDFSplitterService().iter_split_by_text_pattern(
+                self.source_path, "(", self.output_dir
+            )
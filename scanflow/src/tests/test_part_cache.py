@@ -0,0 +1,193 @@
+from src.repositories.part_cache import PartCache
+from src.repositories.pdf_repository import PDFRepository
+from src.services.pdf_splitter_service import PDFSplitterService
+from src.services.split_options import SplitOptions
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+import fitz
+
+
+class TestPartCache(unittest.TestCase):
+    """Testiluokka osavälimuistin testaamiseen."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = PartCache(os.path.join(self.temp_dir.name, "cache"), max_bytes=100)
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "wb") as file:
+            file.write(content)
+        return path
+
+    def _read(self, path):
+        with open(path, "rb") as file:
+            return file.read()
+
+    def test_make_key_depends_on_all_inputs(self):
+        key = PartCache.make_key("abc", 0, 1, {"deflate": True})
+        self.assertEqual(key, PartCache.make_key("abc", 0, 1, {"deflate": True}))
+        self.assertNotEqual(key, PartCache.make_key("abd", 0, 1, {"deflate": True}))
+        self.assertNotEqual(key, PartCache.make_key("abc", 0, 2, {"deflate": True}))
+        self.assertNotEqual(key, PartCache.make_key("abc", 0, 1, {"deflate": False}))
+
+    def test_miss_then_hit(self):
+        target = os.path.join(self.temp_dir.name, "kohde.pdf")
+        self.assertIsNone(self.cache.materialize("avain", target))
+
+        self.cache.store("avain", self._write("osa.pdf", b"sisalto"))
+        self.assertEqual(self.cache.materialize("avain", target), 7)
+
+        self.assertEqual(self._read(target), b"sisalto")
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+        self.assertEqual(stats["total_bytes"], 7)
+        self.assertEqual(stats["bytes_served"], 7)
+
+    def test_materialize_replaces_existing_file(self):
+        self.cache.store("avain", self._write("osa.pdf", b"uusi"))
+        target = self._write("kohde.pdf", b"vanha sisalto")
+
+        self.cache.materialize("avain", target)
+
+        self.assertEqual(self._read(target), b"uusi")
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        self.cache.store("a", self._write("a.pdf", b"a" * 40))
+        time.sleep(0.01)
+        self.cache.store("b", self._write("b.pdf", b"b" * 40))
+        time.sleep(0.01)
+        self.cache.materialize("a", os.path.join(self.temp_dir.name, "a2.pdf"))
+        time.sleep(0.01)
+        self.cache.store("c", self._write("c.pdf", b"c" * 40))
+
+        target = os.path.join(self.temp_dir.name, "kohde.pdf")
+        self.assertIsNone(self.cache.materialize("b", target))
+        self.assertIsNotNone(self.cache.materialize("a", target))
+        self.assertIsNotNone(self.cache.materialize("c", target))
+        self.assertLessEqual(self.cache.get_stats()["total_bytes"], 100)
+
+    def test_skips_part_larger_than_cache(self):
+        self.cache.store("iso", self._write("iso.pdf", b"x" * 101))
+        self.assertEqual(self.cache.get_stats()["entries"], 0)
+
+    def test_modified_blob_is_discarded(self):
+        part_path = self._write("osa.pdf", b"sisalto")
+        self.cache.store("avain", part_path)
+        blob_path = self.cache._blob_path("avain")
+        os.utime(blob_path, ns=(0, 0))
+
+        target = os.path.join(self.temp_dir.name, "kohde.pdf")
+        self.assertIsNone(self.cache.materialize("avain", target))
+        self.assertEqual(self.cache.get_stats()["entries"], 0)
+
+    def test_falls_back_to_copy(self):
+        self.cache.store("avain", self._write("osa.pdf", b"sisalto"))
+        target = os.path.join(self.temp_dir.name, "kohde.pdf")
+
+        with patch("src.repositories.part_cache._reflink", return_value=False), \
+                patch("os.link", side_effect=OSError("ei linkkejä")):
+            self.assertEqual(self.cache.materialize("avain", target), 7)
+
+        self.assertEqual(self._read(target), b"sisalto")
+
+    def test_may_contain_source(self):
+        self.assertFalse(self.cache.may_contain_source(1000))
+
+        self.cache.store("avain", self._write("osa.pdf", b"sisalto"), source_size=1000)
+
+        self.assertTrue(self.cache.may_contain_source(1000))
+        self.assertFalse(self.cache.may_contain_source(1001))
+
+    def test_clear(self):
+        self.cache.store("avain", self._write("osa.pdf", b"sisalto"), source_size=1000)
+        self.cache.clear()
+        self.assertEqual(self.cache.get_stats()["entries"], 0)
+        self.assertFalse(self.cache.may_contain_source(1000))
+        self.assertFalse(os.path.exists(self.cache._blob_path("avain")))
+
+
+class TestSplitWithPartCache(unittest.TestCase):
+    """Testaa osavälimuistin käyttöä jaossa oikeilla PDF-tiedostoilla."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.temp_dir.name, "osat")
+        os.makedirs(self.output_dir)
+        self.source_path = os.path.join(self.temp_dir.name, "lahde.pdf")
+        doc = fitz.open()
+        for page_number in range(6):
+            doc.new_page().insert_text((72, 72), f"Sivu {page_number + 1}")
+        doc.save(self.source_path)
+        doc.close()
+        self.cache = PartCache(os.path.join(self.temp_dir.name, "cache"))
+        self.repository = PDFRepository()
+        self.service = PDFSplitterService(self.repository, part_cache=self.cache)
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def test_repeated_split_uses_cache(self):
+        first = self.service.split_by_fixed_range(self.source_path, 2, self.output_dir)
+        with open(first[0], "rb") as file:
+            first_content = file.read()
+        for path in first:
+            os.remove(path)
+
+        with patch.object(
+            self.repository, "extract_pages", wraps=self.repository.extract_pages
+        ) as extract_pages:
+            second = self.service.split_by_fixed_range(self.source_path, 2, self.output_dir)
+
+        extract_pages.assert_not_called()
+        self.assertEqual(second, first)
+        with open(second[0], "rb") as file:
+            self.assertEqual(file.read(), first_content)
+        self.assertEqual(self.cache.get_stats()["hits"], 3)
+
+    def test_source_is_not_hashed_before_cache_can_hit(self):
+        with patch(
+            "src.services.split_runner.file_sha256", return_value="tiiviste"
+        ) as sha256, patch.object(
+            self.cache, "materialize", wraps=self.cache.materialize
+        ) as materialize:
+            results = self.service.split_by_fixed_range(self.source_path, 2, self.output_dir)
+
+        materialize.assert_not_called()
+        sha256.assert_called_once_with(self.source_path)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(self.cache.get_stats()["entries"], 3)
+
+    def test_only_changed_ranges_are_extracted(self):
+        self.service.split_by_custom_ranges(
+            self.source_path, [(1, 2), (3, 4)], self.output_dir
+        )
+
+        with patch.object(
+            self.repository, "extract_pages", wraps=self.repository.extract_pages
+        ) as extract_pages:
+            results = list(self.service.iter_split_by_custom_ranges(
+                self.source_path,
+                [(1, 2), (3, 5)],
+                self.output_dir,
+                options=SplitOptions(workers=1),
+            ))
+
+        extract_pages.assert_called_once()
+        self.assertEqual([part.start_page for part in results], [1, 3])
+        self.assertEqual(results[1].page_count, 3)
+
+    def test_parallel_split_populates_cache(self):
+        self.service.split_by_fixed_range(
+            self.source_path, 1, self.output_dir, options=SplitOptions(workers=2),
+        )
+        self.assertEqual(self.cache.get_stats()["entries"], 6)
@@ -0,0 +1,33 @@
+import pickle
+import unittest
+from ..entities.part_result import PartResult
+
+
+class TestPartResult(unittest.TestCase):
+
+    def test_constructor_sets_attributes_correctly(self):
+        result = PartResult(
+            "/polku/osa.pdf", 3, 5, size_bytes=1024, extract_seconds=0.25, save_seconds=0.5
+        )
+
+        self.assertEqual(result.output_path, "/polku/osa.pdf")
+        self.assertEqual((result.start_page, result.end_page), (3, 5))
+        self.assertEqual(result.size_bytes, 1024)
+        self.assertEqual(result.extract_seconds, 0.25)
+        self.assertEqual(result.save_seconds, 0.5)
+        self.assertEqual(result.page_count, 3)
+
+    def test_uses_slots(self):
+        result = PartResult("/polku/osa.pdf", 1, 1)
+        with self.assertRaises(AttributeError):
+            result.extra = True
+
+    def test_survives_pickling(self):
+        result = pickle.loads(pickle.dumps(PartResult("/polku/osa.pdf", 2, 4, size_bytes=10)))
+        self.assertEqual(result.output_path, "/polku/osa.pdf")
+        self.assertEqual(result.page_count, 3)
+        self.assertEqual(result.size_bytes, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
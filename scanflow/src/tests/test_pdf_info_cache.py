@@ -0,0 +1,139 @@
+from src.repositories.pdf_info_cache import PDFInfoCache
+from src.repositories.pdf_repository import PDFRepository
+from src.services.pdf_splitter_service import PDFSplitterService
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+import fitz
+
+
+class TestPDFInfoCache(unittest.TestCase):
+    """Testiluokka PDFInfoCache-luokan toiminnallisuuksien testaamiseen."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "info.sqlite3")
+        self.cache = PDFInfoCache(db_path=self.db_path, max_entries=2)
+        self.pdf_path = self._write_file("a.pdf", b"%PDF-1.7 sisalto")
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def _write_file(self, name, content):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "wb") as file:
+            file.write(content)
+        return path
+
+    def test_invalid_max_entries(self):
+        with self.assertRaises(ValueError):
+            PDFInfoCache(db_path=self.db_path, max_entries=0)
+
+    def test_miss_then_hit(self):
+        self.assertIsNone(self.cache.get(self.pdf_path))
+        self.cache.put(
+            self.pdf_path, 3, {"title": "Otsikko"}, [(595.0, 842.0), (595.0, 842.0)]
+        )
+        entry = self.cache.get(self.pdf_path)
+
+        self.assertEqual(entry["page_count"], 3)
+        self.assertEqual(entry["metadata"], {"title": "Otsikko"})
+        self.assertEqual(entry["page_sizes"], [(595.0, 842.0), (595.0, 842.0)])
+        self.assertEqual(self.cache.get_stats(), {"hits": 1, "misses": 1, "entries": 1})
+
+    def test_entries_persist_across_instances(self):
+        self.cache.put(self.pdf_path, 4)
+        reopened = PDFInfoCache(db_path=self.db_path)
+        try:
+            entry = reopened.get(self.pdf_path)
+            self.assertEqual(entry["page_count"], 4)
+            self.assertIsNone(entry["metadata"])
+            self.assertIsNone(entry["page_sizes"])
+        finally:
+            reopened.close()
+
+    def test_content_change_with_same_mtime_is_a_miss(self):
+        self.cache.put(self.pdf_path, 4)
+        stat_result = os.stat(self.pdf_path)
+        with open(self.pdf_path, "wb") as file:
+            file.write(b"%PDF-1.7 SISALTO")
+        os.utime(self.pdf_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns))
+
+        self.assertIsNone(self.cache.get(self.pdf_path))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        other = self._write_file("b.pdf", b"%PDF-1.7 b")
+        third = self._write_file("c.pdf", b"%PDF-1.7 c")
+        self.cache.put(self.pdf_path, 1)
+        self.cache.put(other, 2)
+        self.cache.get(self.pdf_path)
+        self.cache.put(third, 3)
+
+        self.assertEqual(self.cache.get_stats()["entries"], 2)
+        self.assertIsNotNone(self.cache.get(self.pdf_path))
+        self.assertIsNone(self.cache.get(other))
+        self.assertIsNotNone(self.cache.get(third))
+
+    def test_invalidate_and_clear(self):
+        self.cache.put(self.pdf_path, 1)
+        self.cache.invalidate(self.pdf_path)
+        self.assertIsNone(self.cache.get(self.pdf_path))
+
+        self.cache.put(self.pdf_path, 1)
+        self.cache.clear()
+        self.assertEqual(self.cache.get_stats(), {"hits": 0, "misses": 0, "entries": 0})
+
+    def test_missing_file_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            self.cache.get(os.path.join(self.temp_dir.name, "puuttuu.pdf"))
+
+
+class TestPDFSplitterServiceWithInfoCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pdf_path = os.path.join(self.temp_dir.name, "lahde.pdf")
+        doc = fitz.open()
+        doc.new_page(width=200, height=300)
+        doc.new_page(width=300, height=200)
+        doc.set_metadata({"title": "Testi"})
+        doc.save(self.pdf_path)
+        doc.close()
+        self.cache = PDFInfoCache(db_path=os.path.join(self.temp_dir.name, "info.db"))
+        self.repository = MagicMock(wraps=PDFRepository())
+        self.service = PDFSplitterService(self.repository, info_cache=self.cache)
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def test_second_lookup_does_not_open_file(self):
+        first = self.service.get_pdf_info(self.pdf_path)
+        second = self.service.get_pdf_info(self.pdf_path)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first["page_count"], 2)
+        self.repository.count_pages.assert_called_once_with(self.pdf_path)
+        self.repository.load_pdf.assert_not_called()
+        self.assertEqual(self.cache.get_stats()["hits"], 1)
+
+    def test_details_after_info_fills_in_metadata(self):
+        self.service.get_pdf_info(self.pdf_path)
+        details = self.service.get_pdf_details(self.pdf_path)
+        self.assertEqual(details["metadata"]["title"], "Testi")
+        self.assertEqual(self.service.get_pdf_info(self.pdf_path)["page_count"], 2)
+        self.repository.load_pdf.assert_called_once()
+
+    def test_details_include_metadata_and_page_sizes(self):
+        details = self.service.get_pdf_details(self.pdf_path)
+        self.assertEqual(details["metadata"]["title"], "Testi")
+        self.assertEqual(details["page_sizes"], [(200.0, 300.0), (300.0, 200.0)])
+        self.assertEqual(details["file_name"], "lahde.pdf")
+        self.assertEqual(self.service.get_pdf_details(self.pdf_path), details)
+        self.repository.load_pdf.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
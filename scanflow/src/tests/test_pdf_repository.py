@@ -1,6 +1,6 @@
 from src.repositories.pdf_repository import PDFRepository
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import call, patch, MagicMock
 import os
 import sys
 import fitz
@@ -123,6 +123,30 @@ class TestPDFRepository(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "Dokumentti on suljettu."):
             self.repository.get_page_count(self.mock_doc)
 
+    @patch("os.path.exists", return_value=True)
+    @patch("src.repositories.pdf_repository.read_page_count", return_value=12)
+    @patch("fitz.open")
+    def test_count_pages_fast_path(self, mock_fitz_open, mock_read, mock_exists):
+        self.assertEqual(self.repository.count_pages(self.test_file_path), 12)
+        mock_read.assert_called_once_with(self.test_file_path)
+        mock_fitz_open.assert_not_called()
+
+    @patch("os.path.exists", return_value=True)
+    @patch("src.repositories.pdf_repository.read_page_count", return_value=None)
+    @patch("fitz.open")
+    def test_count_pages_falls_back_to_fitz(self, mock_fitz_open, mock_read, mock_exists):
+        mock_fitz_open.return_value = self.mock_doc
+        self.mock_doc.page_count = 9
+
+        self.assertEqual(self.repository.count_pages(self.test_file_path), 9)
+        mock_fitz_open.assert_called_once_with(self.test_file_path)
+        self.mock_doc.close.assert_called_once()
+
+    @patch("os.path.exists", return_value=False)
+    def test_count_pages_file_not_found(self, mock_exists):
+        with self.assertRaisesRegex(FileNotFoundError, "Tiedostoa ei löydy"):
+            self.repository.count_pages(self.test_file_path)
+
     def test_get_metadata_success(self):
         test_metadata = {"title": "Test Title", "author": "Test Author"}
         self.mock_doc.metadata = test_metadata
@@ -139,6 +163,71 @@ class TestPDFRepository(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "Dokumentti on suljettu."):
             self.repository.get_metadata(self.mock_doc)
 
+    def test_get_page_sizes(self):
+        self.mock_doc.page_count = 2
+        self.mock_doc.page_cropbox.side_effect = [
+            fitz.Rect(0, 0, 100, 200),
+            fitz.Rect(0, 0, 300, 150),
+        ]
+        result = self.repository.get_page_sizes(self.mock_doc)
+        self.assertEqual(result, [(100.0, 200.0), (300.0, 150.0)])
+
+    def test_get_page_sizes_closed_document(self):
+        self.mock_doc.is_closed = True
+        with self.assertRaisesRegex(ValueError, "Dokumentti on suljettu."):
+            self.repository.get_page_sizes(self.mock_doc)
+
+    def test_get_outline(self):
+        self.mock_doc.get_toc.return_value = [[1, "Luku", 1], [2, "Kohta", -1]]
+        self.assertEqual(
+            self.repository.get_outline(self.mock_doc), [[1, "Luku", 1], [2, "Kohta", -1]]
+        )
+
+    def test_set_outline(self):
+        self.repository.set_outline(self.mock_doc, [(1, "Luku", 1)])
+        self.mock_doc.set_toc.assert_called_once_with([[1, "Luku", 1]])
+
+    def test_outline_closed_document(self):
+        self.mock_doc.is_closed = True
+        with self.assertRaisesRegex(ValueError, "Dokumentti on suljettu."):
+            self.repository.get_outline(self.mock_doc)
+        with self.assertRaisesRegex(ValueError, "Dokumentti on suljettu."):
+            self.repository.set_outline(self.mock_doc, [])
+
+    def test_render_page_gray_fixed_size(self):
+        doc = fitz.open()
+        doc.new_page(width=595, height=842)
+        page = doc.new_page(width=842, height=595)
+        page.draw_rect(page.rect, color=None, fill=(0, 0, 0))
+        try:
+            blank = self.repository.render_page_gray(doc, 0, 40, 56)
+            black = self.repository.render_page_gray(doc, 1, 40, 56)
+        finally:
+            doc.close()
+        self.assertEqual(len(blank), 40 * 56)
+        self.assertEqual(len(black), 40 * 56)
+        self.assertEqual(set(blank), {255})
+        self.assertEqual(set(black), {0})
+
+    def test_get_page_text(self):
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), "Lasku nro 42")
+        try:
+            text = self.repository.get_page_text(doc, 0)
+        finally:
+            doc.close()
+        self.assertEqual(text.strip(), "Lasku nro 42")
+
+    def test_get_page_text_closed_document(self):
+        self.mock_doc.is_closed = True
+        with self.assertRaisesRegex(ValueError, "Dokumentti on suljettu."):
+            self.repository.get_page_text(self.mock_doc, 0)
+
+    def test_render_page_gray_closed_document(self):
+        self.mock_doc.is_closed = True
+        with self.assertRaisesRegex(ValueError, "Dokumentti on suljettu."):
+            self.repository.render_page_gray(self.mock_doc, 0, 40, 56)
+
     @patch("fitz.open")
     def test_extract_pages_success(self, mock_fitz_open_new):
         mock_new_doc = MagicMock()
@@ -191,6 +280,23 @@ class TestPDFRepository(unittest.TestCase):
             self.mock_doc, from_page=0, to_page=4
         )
 
+    @patch("fitz.open")
+    def test_extract_pages_skips_pages(self, mock_fitz_open_new):
+        mock_new_doc = MagicMock()
+        mock_fitz_open_new.return_value = mock_new_doc
+        self.mock_doc.page_count = 10
+
+        self.repository.extract_pages(self.mock_doc, 2, 8, skip_pages={1, 3, 5, 6, 9})
+
+        self.assertEqual(
+            mock_new_doc.insert_pdf.call_args_list,
+            [
+                call(self.mock_doc, from_page=2, to_page=2),
+                call(self.mock_doc, from_page=4, to_page=4),
+                call(self.mock_doc, from_page=7, to_page=8),
+            ],
+        )
+
     def test_extract_pages_closed_document(self):
         self.mock_doc.is_closed = True
         with self.assertRaisesRegex(ValueError, "Alkuperäinen dokumentti on suljettu."):
@@ -1,9 +1,13 @@
 from src.repositories.pdf_repository import PDFRepository
+from src.services.part_workers import iter_parts_in_pool
 from src.services.pdf_splitter_service import PDFSplitterService
+from src.services.split_options import SplitOptions
 import unittest
 from unittest.mock import patch, MagicMock, call
 import os
 import math
+import tempfile
+import fitz
 
 
 class TestPDFSplitterService(unittest.TestCase):
@@ -43,7 +47,7 @@ class TestPDFSplitterService(unittest.TestCase):
             MockRepoCheck.assert_not_called()
 
     def test_get_pdf_info_success(self):
-        self.mock_repository.get_page_count.return_value = 15
+        self.mock_repository.count_pages.return_value = 15
         result = self.service.get_pdf_info(self.test_file_path)
         expected_result = {
             "page_count": 15,
@@ -51,19 +55,16 @@ class TestPDFSplitterService(unittest.TestCase):
             "file_name": os.path.basename(self.test_file_path),
         }
         self.assertEqual(result, expected_result)
-        self.mock_repository.load_pdf.assert_called_once_with(self.test_file_path)
-        self.mock_repository.get_page_count.assert_called_once_with(
-            self.mock_loaded_doc
-        )
-        self.mock_repository.close_pdf.assert_called_once_with(self.mock_loaded_doc)
+        self.mock_repository.count_pages.assert_called_once_with(self.test_file_path)
+        self.mock_repository.load_pdf.assert_not_called()
 
     def test_get_pdf_info_load_failure(self):
-        self.mock_repository.load_pdf.side_effect = FileNotFoundError(
+        self.mock_repository.count_pages.side_effect = FileNotFoundError(
             "Tiedostoa ei löytynyt"
         )
         with self.assertRaises(FileNotFoundError):
             self.service.get_pdf_info(self.test_file_path)
-        self.mock_repository.load_pdf.assert_called_once_with(self.test_file_path)
+        self.mock_repository.count_pages.assert_called_once_with(self.test_file_path)
         self.mock_repository.close_pdf.assert_not_called()
 
     @patch("os.path.isdir", return_value=True)
@@ -352,5 +353,176 @@ class TestPDFSplitterService(unittest.TestCase):
         mock_isdir.assert_called_once_with(self.output_dir)
 
 
+    @patch("os.path.isdir", return_value=True)
+    def test_iter_split_by_fixed_range_is_lazy(self, mock_isdir):
+        self.mock_repository.get_page_count.return_value = 4
+        parts = self.service.iter_split_by_fixed_range(
+            self.test_file_path, 2, self.output_dir
+        )
+        self.mock_repository.load_pdf.assert_not_called()
+
+        first = next(parts)
+        self.assertEqual((first.start_page, first.end_page), (1, 2))
+        self.assertEqual(self.mock_repository.save_pdf.call_count, 1)
+
+        parts.close()
+        self.mock_repository.close_pdf.assert_called_with(self.mock_loaded_doc)
+        self.assertEqual(self.mock_repository.save_pdf.call_count, 1)
+
+    @patch("os.path.isdir", return_value=True)
+    def test_iter_split_by_custom_ranges_yields_part_results(self, mock_isdir):
+        results = list(
+            self.service.iter_split_by_custom_ranges(
+                self.test_file_path, [(2, 4), (9, 10)], self.output_dir
+            )
+        )
+        self.assertEqual(
+            [(r.start_page, r.end_page) for r in results], [(2, 4), (9, 10)]
+        )
+        self.assertTrue(results[0].output_path.endswith("_alue_1_sivut_2-4.pdf"))
+        for result in results:
+            self.assertGreaterEqual(result.extract_seconds, 0)
+            self.assertGreaterEqual(result.save_seconds, 0)
+
+    def test_iter_split_validates_eagerly(self):
+        with self.assertRaises(ValueError):
+            self.service.iter_split_by_fixed_range(
+                self.test_file_path, 0, self.output_dir
+            )
+        with self.assertRaises(ValueError):
+            self.service.iter_split_by_custom_ranges(
+                self.test_file_path, [], self.output_dir
+            )
+
+    def test_split_by_fixed_range_invalid_workers(self):
+        with self.assertRaisesRegex(
+            ValueError, "Työprosessien määrän tulee olla vähintään 1."
+        ):
+            self.service.split_by_fixed_range(
+                self.test_file_path, 2, self.output_dir, options=SplitOptions(workers=0),
+            )
+
+
+class TestPDFSplitterServiceParallel(unittest.TestCase):
+    """Testaa rinnakkaista jakoa oikeilla PDF-tiedostoilla."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = self.temp_dir.name
+        self.source_path = os.path.join(self.temp_dir.name, "lahde.pdf")
+        doc = fitz.open()
+        for i in range(7):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Sivu {i + 1}")
+        doc.save(self.source_path)
+        doc.close()
+        self.service = PDFSplitterService()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _page_count(self, path):
+        with fitz.open(path) as doc:
+            return doc.page_count
+
+    def test_split_by_fixed_range_parallel_matches_serial_order(self):
+        progress_values = []
+        result = self.service.split_by_fixed_range(
+            self.source_path,
+            3,
+            self.output_dir,
+            progress_callback=progress_values.append,
+            options=SplitOptions(workers=2),
+        )
+        expected_paths = [
+            os.path.join(self.output_dir, "lahde_sivut_1-3.pdf"),
+            os.path.join(self.output_dir, "lahde_sivut_4-6.pdf"),
+            os.path.join(self.output_dir, "lahde_sivut_7-7.pdf"),
+        ]
+        self.assertEqual(result, expected_paths)
+        self.assertEqual([self._page_count(p) for p in result], [3, 3, 1])
+        self.assertEqual(progress_values, sorted(progress_values))
+        self.assertEqual(progress_values[-1], 100)
+
+    def test_split_by_custom_ranges_parallel(self):
+        result = self.service.split_by_custom_ranges(
+            self.source_path,
+            [(1, 2), (3, 3), (4, 7)],
+            self.output_dir,
+            options=SplitOptions(workers=3),
+        )
+        self.assertEqual(
+            [os.path.basename(p) for p in result],
+            [
+                "lahde_alue_1_sivut_1-2.pdf",
+                "lahde_alue_2_sivut_3-3.pdf",
+                "lahde_alue_3_sivut_4-7.pdf",
+            ],
+        )
+        self.assertEqual([self._page_count(p) for p in result], [2, 1, 4])
+
+    def test_iter_split_reports_sizes(self):
+        for workers in (1, 2):
+            results = list(
+                self.service.iter_split_by_fixed_range(
+                    self.source_path, 4, self.output_dir, options=SplitOptions(workers=workers),
+                )
+            )
+            self.assertEqual([r.page_count for r in results], [4, 3])
+            for result in results:
+                self.assertEqual(result.size_bytes, os.path.getsize(result.output_path))
+
+    def test_progress_listener_reports_final_event(self):
+        for workers in (1, 2):
+            events = []
+            self.service.split_by_fixed_range(
+                self.source_path,
+                1,
+                self.output_dir,
+                options=SplitOptions(
+                    workers=workers,
+                    progress_listener=events.append,
+                    progress_rate_hz=1000.0,
+                ),
+            )
+            final = events[-1]
+            self.assertEqual(final.percent, 100)
+            self.assertEqual(final.parts_done, 7)
+            self.assertEqual(final.pages_done, 7)
+            self.assertGreater(final.bytes_written, 0)
+            self.assertEqual(
+                [event.parts_done for event in events],
+                sorted(event.parts_done for event in events),
+            )
+
+    def test_failed_parallel_split_removes_unreported_parts(self):
+        output_dir = os.path.join(self.temp_dir.name, "osat")
+        os.makedirs(output_dir)
+        tasks = [(99, 99, os.path.join(output_dir, "virheellinen.pdf"))] + [
+            (page, page, os.path.join(output_dir, f"osa_{page}.pdf")) for page in range(7)
+        ]
+
+        with self.assertRaises(RuntimeError):
+            list(iter_parts_in_pool(
+                self.source_path,
+                tasks,
+                skip_pages=frozenset(),
+                outlines={},
+                progress_callback=None,
+                options=SplitOptions(workers=2),
+            ))
+
+        self.assertEqual(os.listdir(output_dir), [])
+
+    def test_split_by_custom_ranges_parallel_invalid_range(self):
+        with self.assertRaisesRegex(ValueError, "rajojen ulkopuolinen alue: 5-9"):
+            self.service.split_by_custom_ranges(
+                self.source_path,
+                [(1, 2), (5, 9)],
+                self.output_dir,
+                options=SplitOptions(workers=2),
+            )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,140 @@
+from src.repositories.pdf_structure_reader import read_page_count
+import os
+import tempfile
+import unittest
+import zlib
+import fitz
+
+
+def _write_pdf(path, page_count, **save_options):
+    doc = fitz.open()
+    for i in range(page_count):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Sivu {i + 1}")
+    doc.save(path, **save_options)
+    doc.close()
+
+
+def _png_up_rows(rows, columns):
+    encoded = bytearray()
+    previous = bytes(columns)
+    for row in rows:
+        encoded.append(2)
+        encoded.extend((value - above) & 0xFF for value, above in zip(row, previous))
+        previous = row
+    return bytes(encoded)
+
+
+class TestReadPageCount(unittest.TestCase):
+    """Testaa sivumäärän lukemista suoraan tiedostorakenteesta."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.temp_dir.name, name)
+
+    def test_classic_xref_table(self):
+        path = self._path("taulukko.pdf")
+        _write_pdf(path, 7)
+        self.assertEqual(read_page_count(path), 7)
+
+    def test_xref_stream_with_object_streams(self):
+        path = self._path("virta.pdf")
+        _write_pdf(path, 5, use_objstms=1, garbage=3)
+        self.assertEqual(read_page_count(path), 5)
+
+    def test_incremental_update_uses_newest_trailer(self):
+        path = self._path("inkrementaalinen.pdf")
+        _write_pdf(path, 3)
+        doc = fitz.open(path)
+        doc.new_page()
+        doc.new_page()
+        doc.saveIncr()
+        doc.close()
+        self.assertEqual(read_page_count(path), 5)
+
+    def test_large_flat_page_tree(self):
+        path = self._path("suuri.pdf")
+        doc = fitz.open()
+        for _ in range(3000):
+            doc.new_page()
+        doc.save(path)
+        doc.close()
+        self.assertEqual(read_page_count(path), 3000)
+
+    def test_png_predicted_xref_stream(self):
+        objects = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 10 10] >>",
+        ]
+        content = bytearray(b"%PDF-1.5\n")
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(len(content))
+            content += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+        xref_offset = len(content)
+        rows = [bytes([0, 0, 0, 0])] + [
+            bytes([1]) + offset.to_bytes(2, "big") + b"\x00" for offset in offsets
+        ] + [bytes([1]) + xref_offset.to_bytes(2, "big") + b"\x00"]
+        stream = zlib.compress(_png_up_rows(rows, 4))
+        content += (
+            b"4 0 obj\n<< /Type /XRef /Size 5 /W [1 2 1] /Root 1 0 R "
+            b"/Filter /FlateDecode /DecodeParms << /Predictor 12 /Columns 4 >> "
+            b"/Length %d >>\nstream\n" % len(stream)
+        )
+        content += stream + b"\nendstream\nendobj\nstartxref\n%d\n%%%%EOF\n" % xref_offset
+        path = self._path("ennustin.pdf")
+        with open(path, "wb") as file:
+            file.write(content)
+
+        self.assertEqual(read_page_count(path), 1)
+        with fitz.open(path) as doc:
+            self.assertEqual(doc.page_count, 1)
+
+    def test_encrypted_document_returns_none(self):
+        path = self._path("salattu.pdf")
+        _write_pdf(
+            path,
+            2,
+            encryption=fitz.PDF_ENCRYPT_AES_256,
+            owner_pw="omistaja",
+            user_pw="kayttaja",
+        )
+        self.assertIsNone(read_page_count(path))
+
+    def test_truncated_document_returns_none(self):
+        path = self._path("katkaistu.pdf")
+        _write_pdf(path, 4)
+        with open(path, "rb") as file:
+            content = file.read()
+        with open(path, "wb") as file:
+            file.write(content[: len(content) // 2])
+        self.assertIsNone(read_page_count(path))
+
+    def test_wrong_xref_offset_returns_none(self):
+        path = self._path("siirtyma.pdf")
+        _write_pdf(path, 2)
+        with open(path, "rb") as file:
+            content = file.read()
+        marker = content.rindex(b"startxref")
+        with open(path, "wb") as file:
+            file.write(content[:marker] + b"startxref\n12\n%%EOF\n")
+        self.assertIsNone(read_page_count(path))
+
+    def test_empty_and_non_pdf_files_return_none(self):
+        empty_path = self._path("tyhja.pdf")
+        open(empty_path, "wb").close()
+        text_path = self._path("teksti.pdf")
+        with open(text_path, "wb") as file:
+            file.write(b"ei ole pdf")
+        self.assertIsNone(read_page_count(empty_path))
+        self.assertIsNone(read_page_count(text_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
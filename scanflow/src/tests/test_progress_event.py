@@ -0,0 +1,43 @@
+from src.entities.part_result import PartResult
+from src.entities.progress_event import ProgressEvent
+import unittest
+
+
+class TestProgressEvent(unittest.TestCase):
+    """Testiluokka ProgressEvent-luokan toiminnallisuuksien testaamiseen."""
+
+    def test_rates_and_eta(self):
+        event = ProgressEvent(
+            25, 100, pages_done=50, bytes_written=1000, elapsed_seconds=5.0
+        )
+
+        self.assertEqual(event.percent, 25)
+        self.assertFalse(event.is_final)
+        self.assertAlmostEqual(event.parts_per_second, 5.0)
+        self.assertAlmostEqual(event.pages_per_second, 10.0)
+        self.assertAlmostEqual(event.bytes_per_second, 200.0)
+        self.assertAlmostEqual(event.eta_seconds, 15.0)
+
+    def test_eta_unknown_before_first_part(self):
+        event = ProgressEvent(0, 10)
+
+        self.assertIsNone(event.eta_seconds)
+        self.assertEqual(event.parts_per_second, 0.0)
+
+    def test_final_event(self):
+        part = PartResult("/polku/osa.pdf", 1, 2)
+        event = ProgressEvent(4, 4, elapsed_seconds=2.0, current_part=part)
+
+        self.assertEqual(event.percent, 100)
+        self.assertTrue(event.is_final)
+        self.assertEqual(event.eta_seconds, 0.0)
+        self.assertIs(event.current_part, part)
+
+    def test_empty_split_is_complete(self):
+        self.assertEqual(ProgressEvent(0, 0).percent, 100)
+
+    def test_repr(self):
+        self.assertEqual(
+            repr(ProgressEvent(1, 2, pages_done=3, bytes_written=4)),
+            "ProgressEvent(parts=1/2, pages_done=3, bytes_written=4)",
+        )
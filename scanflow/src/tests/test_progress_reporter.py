@@ -0,0 +1,84 @@
+from src.entities.part_result import PartResult
+from src.services.progress_reporter import ProgressReporter
+import unittest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProgressReporter(unittest.TestCase):
+    """Testiluokka ProgressReporter-luokan toiminnallisuuksien testaamiseen."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.events = []
+
+    def _reporter(self, total_parts, rate=10.0):
+        return ProgressReporter(
+            self.events.append, total_parts, max_rate_hz=rate, clock=self.clock
+        )
+
+    def _part(self, index, pages=2, size=100):
+        return PartResult(f"osa_{index}.pdf", index, index + pages - 1, size_bytes=size)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            ProgressReporter(self.events.append, 1, max_rate_hz=0)
+
+    def test_coalesces_events_to_rate(self):
+        reporter = self._reporter(1000)
+        for index in range(1000):
+            self.clock.now = index * 0.001
+            reporter.part_done(self._part(index))
+
+        self.assertEqual(len(self.events), 10)
+        self.assertEqual(self.events[0].parts_done, 1)
+        self.assertEqual([event.parts_done for event in self.events[1:3]], [101, 201])
+
+    def test_finish_emits_final_event(self):
+        reporter = self._reporter(3)
+        for index in range(3):
+            self.clock.now = index * 0.01
+            reporter.part_done(self._part(index))
+        reporter.finish()
+
+        final = self.events[-1]
+        self.assertEqual(len(self.events), 2)
+        self.assertEqual(final.percent, 100)
+        self.assertEqual(final.pages_done, 6)
+        self.assertEqual(final.bytes_written, 300)
+        self.assertEqual(final.current_part.output_path, "osa_2.pdf")
+
+    def test_finish_does_not_duplicate_final_event(self):
+        reporter = self._reporter(2)
+        reporter.part_done(self._part(0))
+        self.clock.now = 1.0
+        reporter.part_done(self._part(1))
+        reporter.finish()
+
+        self.assertEqual([event.parts_done for event in self.events], [1, 2])
+
+    def test_finish_without_parts(self):
+        reporter = self._reporter(0)
+        reporter.finish()
+
+        self.assertEqual(len(self.events), 1)
+        self.assertTrue(self.events[0].is_final)
+
+    def test_add_parts_grows_total(self):
+        reporter = self._reporter(2)
+        reporter.part_done(self._part(0))
+        reporter.add_parts(1)
+        self.clock.now = 1.0
+        reporter.part_done(self._part(1))
+        reporter.part_done(self._part(2))
+        reporter.finish()
+
+        self.assertEqual(self.events[-1].total_parts, 3)
+        self.assertFalse(self.events[1].is_final)
+        self.assertTrue(self.events[-1].is_final)
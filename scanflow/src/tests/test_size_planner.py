@@ -0,0 +1,208 @@
+from src.repositories.pdf_repository import PDFRepository
+from src.services.pdf_splitter_service import PDFSplitterService
+from src.services.size_planner import (
+    PAGE_OVERHEAD_BYTES,
+    PART_OVERHEAD_BYTES,
+    estimate_part_size,
+    pack_pages_by_size,
+    plan_resplit,
+)
+from src.repositories.split_journal import SplitJournal
+from src.services.split_options import SplitOptions
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import patch
+import fitz
+
+_REAL_ESTIMATE = PDFRepository.estimate_page_costs
+
+
+def underestimate_page_costs(repository, doc):
+    """Arvioi sivut neljäsosaan, jotta osat ylittävät rajan tallennettuina."""
+    return [
+        {xref: size // 4 for xref, size in costs.items()}
+        for costs in _REAL_ESTIMATE(repository, doc)
+    ]
+
+
+class TestSizePlanner(unittest.TestCase):
+    """Testiluokka kokoon perustuvan jakosuunnitelman testaamiseen."""
+
+    def test_shared_objects_are_counted_once(self):
+        pages = [{1: 100, 99: 1000}, {2: 100, 99: 1000}]
+
+        self.assertEqual(
+            estimate_part_size(pages),
+            PART_OVERHEAD_BYTES + 2 * PAGE_OVERHEAD_BYTES + 1200,
+        )
+
+    def test_pack_pages_respects_limit(self):
+        pages = [{index: 1000} for index in range(10)]
+        limit = PART_OVERHEAD_BYTES + 3 * (PAGE_OVERHEAD_BYTES + 1000)
+
+        ranges = pack_pages_by_size(pages, limit)
+
+        self.assertEqual(ranges, [(0, 2), (3, 5), (6, 8), (9, 9)])
+        for start, end in ranges:
+            self.assertLessEqual(estimate_part_size(pages[start:end + 1]), limit)
+
+    def test_shared_font_allows_more_pages(self):
+        pages = [{index: 100, 500: 5000} for index in range(10)]
+
+        ranges = pack_pages_by_size(pages, 8000)
+
+        self.assertEqual(ranges, [(0, 9)])
+
+    def test_oversized_page_gets_own_part_and_offset(self):
+        pages = [{1: 10}, {2: 50000}, {3: 10}]
+
+        self.assertEqual(
+            pack_pages_by_size(pages, 1000, first_index=4), [(4, 4), (5, 5), (6, 6)]
+        )
+        self.assertEqual(pack_pages_by_size([], 1000), [])
+
+    def test_plan_resplit_scales_budget_by_actual_size(self):
+        pages = [{index: 1000} for index in range(4)]
+        max_bytes = estimate_part_size(pages)
+
+        ranges = plan_resplit(pages, 10, actual_bytes=2 * max_bytes, max_bytes=max_bytes)
+
+        self.assertEqual(ranges, [(10, 10), (11, 11), (12, 12), (13, 13)])
+
+    def test_plan_resplit_halves_when_budget_does_not_split(self):
+        pages = [{1: 10}, {1: 10}, {1: 10}]
+
+        self.assertEqual(
+            plan_resplit(pages, 0, actual_bytes=1, max_bytes=10**6), [(0, 0), (1, 2)]
+        )
+
+
+class TestSplitByMaxSize(unittest.TestCase):
+    """Testaa kokoon perustuvaa jakoa oikeilla PDF-tiedostoilla."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = self.temp_dir.name
+        self.source_path = os.path.join(self.temp_dir.name, "lahde.pdf")
+        doc = fitz.open()
+        for i in range(12):
+            page = doc.new_page()
+            text = random.Random(i).randbytes(1500).hex()
+            page.insert_textbox(page.rect + (36, 36, -36, -36), text, fontsize=6)
+        doc.save(self.source_path)
+        doc.close()
+        self.service = PDFSplitterService()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _page_counts(self, paths):
+        counts = []
+        for path in paths:
+            with fitz.open(path) as doc:
+                counts.append(doc.page_count)
+        return counts
+
+    def test_estimate_page_costs_covers_every_page(self):
+        repository = PDFRepository()
+        doc = repository.load_pdf(self.source_path)
+        try:
+            costs = repository.estimate_page_costs(doc)
+        finally:
+            repository.close_pdf(doc)
+
+        self.assertEqual(len(costs), 12)
+        self.assertTrue(all(sum(page.values()) > 0 for page in costs))
+        shared = set(costs[0]).intersection(*costs[1:])
+        self.assertTrue(shared, "Sivujen jakaman fontin pitäisi näkyä kaikilla sivuilla")
+
+    def test_parts_stay_under_limit(self):
+        max_bytes = 10000
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                output_dir = os.path.join(self.output_dir, str(workers))
+                os.makedirs(output_dir)
+
+                result = self.service.split_by_max_size(
+                    self.source_path, max_bytes, output_dir, options=SplitOptions(workers=workers),
+                )
+
+                self.assertGreater(len(result), 1)
+                self.assertEqual(sum(self._page_counts(result)), 12)
+                for path in result:
+                    self.assertLessEqual(os.path.getsize(path), max_bytes)
+
+    def test_underestimated_part_is_split_again(self):
+        max_bytes = 10000
+        with patch.object(PDFRepository, "estimate_page_costs", underestimate_page_costs):
+            result = self.service.split_by_max_size(
+                self.source_path, max_bytes, self.output_dir
+            )
+
+        self.assertGreater(len(result), 1)
+        self.assertEqual(sum(self._page_counts(result)), 12)
+        for path in result:
+            self.assertLessEqual(os.path.getsize(path), max_bytes)
+        self.assertEqual(
+            sorted(os.listdir(self.output_dir)),
+            sorted(["lahde.pdf"] + [os.path.basename(p) for p in result]),
+        )
+
+    def test_replacements_are_journaled_and_reported(self):
+        events = []
+        recorded = []
+        real_record = SplitJournal.record
+
+        def record(journal, index, part_results):
+            recorded.append([part.output_path for part in part_results])
+            real_record(journal, index, part_results)
+
+        with patch.object(PDFRepository, "estimate_page_costs", underestimate_page_costs), \
+                patch.object(SplitJournal, "record", record):
+            result = self.service.split_by_max_size(
+                self.source_path,
+                10000,
+                self.output_dir,
+                options=SplitOptions(journal=True, progress_listener=events.append),
+            )
+
+        self.assertEqual([path for paths in recorded for path in paths], result)
+        self.assertTrue(any(len(paths) > 1 for paths in recorded))
+        self.assertEqual(events[-1].parts_done, len(result))
+        self.assertEqual(events[-1].total_parts, len(result))
+        self.assertTrue(events[-1].is_final)
+
+    def test_resume_restores_replacement_parts(self):
+        with patch.object(PDFRepository, "estimate_page_costs", underestimate_page_costs):
+            parts = self.service.iter_split_by_max_size(
+                self.source_path, 10000, self.output_dir, options=SplitOptions(journal=True)
+            )
+            interrupted = [next(parts).output_path for _ in range(2)]
+            parts.close()
+            mtimes = [os.stat(path).st_mtime_ns for path in interrupted]
+
+            result = self.service.split_by_max_size(
+                self.source_path, 10000, self.output_dir, options=SplitOptions(resume=True)
+            )
+
+        self.assertEqual(result[:2], interrupted)
+        self.assertEqual([os.stat(path).st_mtime_ns for path in interrupted], mtimes)
+        self.assertEqual(sum(self._page_counts(result)), 12)
+        self.assertFalse(
+            os.path.exists(SplitJournal.path_for(self.output_dir, self.source_path))
+        )
+
+    def test_single_oversized_page_is_kept(self):
+        result = self.service.split_by_max_size(self.source_path, 100, self.output_dir)
+
+        self.assertEqual(self._page_counts(result), [1] * 12)
+
+    def test_invalid_arguments(self):
+        for kwargs in ({"max_bytes": 0}, {"max_bytes": 1000, "max_resplits": -1}):
+            with self.subTest(kwargs=kwargs):
+                with self.assertRaises(ValueError):
+                    self.service.split_by_max_size(
+                        self.source_path, output_dir=self.output_dir, **kwargs
+                    )
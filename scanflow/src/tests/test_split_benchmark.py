@@ -0,0 +1,98 @@
+from src.benchmarks import corpus, split_benchmark
+import os
+import tempfile
+import unittest
+import fitz
+
+
+class TestCorpus(unittest.TestCase):
+    """Testiluokka synteettisten aineistojen luonnin testaamiseen."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_corpus_is_deterministic(self):
+        names = ["text", "many_pages"]
+        first = corpus.ensure_corpus(os.path.join(self.temp_dir.name, "a"), names, 0.01)
+        second = corpus.ensure_corpus(os.path.join(self.temp_dir.name, "b"), names, 0.01)
+
+        for name in names:
+            with open(first[name], "rb") as file_a, open(second[name], "rb") as file_b:
+                self.assertEqual(file_a.read(), file_b.read())
+        with fitz.open(first["many_pages"]) as doc:
+            self.assertEqual(doc.page_count, 100)
+            self.assertIn("Sivu 100", doc[99].get_text())
+
+    def test_deep_tree_is_nested(self):
+        path = corpus.ensure_corpus(self.temp_dir.name, ["deep_tree"], 0.02)["deep_tree"]
+
+        with fitz.open(path) as doc:
+            self.assertEqual(doc.page_count, 20)
+            self.assertIn("Sivu 11", doc[10].get_text())
+            root_pages = doc.xref_get_key(doc.pdf_catalog(), "Pages")[1]
+            parent = doc.xref_get_key(doc.page_xref(0), "Parent")[1]
+            self.assertNotEqual(parent, root_pages)
+
+    def test_unknown_corpus(self):
+        with self.assertRaises(ValueError):
+            corpus.ensure_corpus(self.temp_dir.name, ["tuntematon"])
+
+
+class TestSplitBenchmark(unittest.TestCase):
+    """Testiluokka jaon suorituskykytestin apufunktioille."""
+
+    def test_custom_ranges_skip_every_other_range(self):
+        self.assertEqual(
+            split_benchmark.custom_ranges(25, 5), [(1, 5), (11, 15), (21, 25)]
+        )
+        self.assertEqual(split_benchmark.custom_ranges(3, 10), [(1, 3)])
+
+    def test_compare_flags_regressions(self):
+        baseline = {
+            "text/fixed/1": {"pages_per_second": 100.0, "peak_rss_mb": 100.0},
+            "text/fixed/10": {"pages_per_second": 100.0, "peak_rss_mb": 100.0},
+        }
+        results = {
+            "text/fixed/1": {"pages_per_second": 70.0, "peak_rss_mb": 100.0},
+            "text/fixed/10": {"pages_per_second": 95.0, "peak_rss_mb": 150.0},
+            "text/fixed/100": {"pages_per_second": 1.0, "peak_rss_mb": 1.0},
+        }
+
+        regressions = split_benchmark.compare(results, baseline, tolerance=0.25)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("text/fixed/1:"))
+        self.assertIn("RSS", regressions[1])
+
+    def test_baseline_round_trip(self):
+        results = {"text/fixed/1": {
+            "pages_per_second": 10.0, "mb_per_second": 1.0, "peak_rss_mb": 50.0,
+            "seconds": 1.0,
+        }}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "perustaso.json")
+            split_benchmark.save_baseline(path, results, 0.5)
+
+            loaded = split_benchmark.load_baseline(path, 0.5)
+            self.assertEqual(loaded["text/fixed/1"]["pages_per_second"], 10.0)
+            self.assertNotIn("seconds", loaded["text/fixed/1"])
+            self.assertIsNone(split_benchmark.load_baseline(path, 1.0))
+            self.assertIsNone(split_benchmark.load_baseline(os.path.join(temp_dir, "x"), 0.5))
+
+    def test_run_case_in_subprocess(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = corpus.ensure_corpus(temp_dir, ["deep_tree"], 0.02)["deep_tree"]
+            result = split_benchmark.run_case(path, "custom", 5, repeat=1)
+
+        self.assertEqual(result["parts"], 2)
+        self.assertEqual(result["pages"], 10)
+        self.assertGreater(result["pages_per_second"], 0)
+        self.assertGreater(result["bytes_written"], 0)
+
+    def test_peak_rss(self):
+        rss = split_benchmark.peak_rss_mb()
+        if rss is not None:
+            self.assertGreater(rss, 0)
@@ -0,0 +1,259 @@
+from src.repositories.split_journal import SplitJournal
+from src.services.cancellation import CancellationToken, SplitCancelledError
+from src.services.pdf_splitter_service import PDFSplitterService
+from src.entities.part_result import PartResult
+from src.services.split_options import SplitOptions
+import json
+import os
+import tempfile
+import unittest
+import fitz
+
+
+class TestSplitJournal(unittest.TestCase):
+    """Testiluokka jakotyön lokin testaamiseen."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source_path = os.path.join(self.temp_dir.name, "lahde.pdf")
+        with open(self.source_path, "wb") as file:
+            file.write(b"%PDF-1.4 lahde")
+        self.tasks = [
+            (index, index, os.path.join(self.temp_dir.name, f"osa_{index}.pdf"))
+            for index in range(3)
+        ]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_part(self, index, content=b"osa"):
+        output_path = self.tasks[index][2]
+        with open(output_path, "wb") as file:
+            file.write(content)
+        return PartResult(output_path, index + 1, index + 1, size_bytes=len(content))
+
+    def _read_lines(self, journal):
+        with open(journal.journal_path, "r", encoding="utf-8") as file:
+            return [json.loads(line) for line in file if line.strip()]
+
+    def test_path_for(self):
+        self.assertEqual(
+            SplitJournal.path_for("osat", "/polku/lahde.pdf"),
+            os.path.join("osat", ".lahde.scanflow-journal.jsonl"),
+        )
+
+    def test_records_header_and_parts(self):
+        journal = SplitJournal.begin(self.source_path, self.tasks)
+        journal.record(0, [self._write_part(0)])
+        journal.close()
+
+        header, part = self._read_lines(journal)
+        self.assertEqual(header["type"], "job")
+        self.assertEqual(header["plan"][0], [0, 0, "osa_0.pdf"])
+        self.assertEqual(part["index"], 0)
+        self.assertEqual(part["files"][0]["file"], "osa_0.pdf")
+        self.assertEqual(part["files"][0]["size"], 3)
+        self.assertEqual(len(part["files"][0]["sha256"]), 64)
+
+    def test_resume_skips_verified_parts(self):
+        journal = SplitJournal.begin(self.source_path, self.tasks)
+        journal.record(0, [self._write_part(0)])
+        journal.record(1, [self._write_part(1)])
+        journal.close()
+
+        resumed = SplitJournal.begin(self.source_path, self.tasks, resume=True)
+        resumed.close()
+
+        self.assertEqual(sorted(resumed.completed), [0, 1])
+        self.assertEqual(resumed.completed[1][0].start_page, 2)
+
+    def test_resume_restores_replacement_files(self):
+        tasks = [(0, 3, os.path.join(self.temp_dir.name, "osa.pdf"))]
+        replacements = []
+        for start_page, end_page in ((1, 2), (3, 4)):
+            output_path = os.path.join(self.temp_dir.name, f"osa_{start_page}-{end_page}.pdf")
+            with open(output_path, "wb") as file:
+                file.write(b"osa")
+            replacements.append(PartResult(output_path, start_page, end_page, size_bytes=3))
+        journal = SplitJournal.begin(self.source_path, tasks)
+        journal.record(0, replacements)
+        journal.close()
+
+        resumed = SplitJournal.begin(self.source_path, tasks, resume=True)
+        resumed.close()
+
+        self.assertEqual(
+            [part.output_path for part in resumed.completed[0]],
+            [part.output_path for part in replacements],
+        )
+
+    def test_resume_rejects_modified_part(self):
+        journal = SplitJournal.begin(self.source_path, self.tasks)
+        journal.record(0, [self._write_part(0)])
+        journal.close()
+        self._write_part(0, b"muu")
+
+        resumed = SplitJournal.begin(self.source_path, self.tasks, resume=True)
+        resumed.close()
+
+        self.assertEqual(resumed.completed, {})
+
+    def test_resume_restarts_when_source_middle_changes(self):
+        with open(self.source_path, "wb") as file:
+            file.write(b"%PDF-1.4 " + bytes(256 * 1024))
+        journal = SplitJournal.begin(self.source_path, self.tasks)
+        journal.record(0, [self._write_part(0)])
+        journal.close()
+        with open(self.source_path, "r+b") as file:
+            file.seek(128 * 1024)
+            file.write(b"X")
+        stat_result = os.stat(self.source_path)
+        os.utime(self.source_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+
+        resumed = SplitJournal.begin(self.source_path, self.tasks, resume=True)
+        resumed.close()
+
+        self.assertEqual(resumed.completed, {})
+
+    def test_resume_restarts_when_plan_changes(self):
+        journal = SplitJournal.begin(self.source_path, self.tasks)
+        journal.record(0, [self._write_part(0)])
+        journal.close()
+
+        resumed = SplitJournal.begin(self.source_path, self.tasks[:2], resume=True)
+        resumed.close()
+
+        self.assertEqual(resumed.completed, {})
+        self.assertEqual(len(self._read_lines(resumed)), 1)
+
+    def test_resume_restarts_when_skipped_pages_change(self):
+        journal = SplitJournal.begin(self.source_path, self.tasks)
+        journal.record(0, [self._write_part(0)])
+        journal.close()
+
+        resumed = SplitJournal.begin(
+            self.source_path, self.tasks, resume=True, skip_pages=frozenset({1})
+        )
+        resumed.close()
+
+        self.assertEqual(resumed.completed, {})
+        self.assertEqual(self._read_lines(resumed)[0]["skip_pages"], [1])
+
+    def test_resume_ignores_torn_line(self):
+        journal = SplitJournal.begin(self.source_path, self.tasks)
+        journal.record(0, [self._write_part(0)])
+        journal.close()
+        with open(journal.journal_path, "a", encoding="utf-8") as file:
+            file.write('{"type": "part", "ind')
+
+        resumed = SplitJournal.begin(self.source_path, self.tasks, resume=True)
+        resumed.record(1, [self._write_part(1)])
+        resumed.close()
+
+        again = SplitJournal.begin(self.source_path, self.tasks, resume=True)
+        again.close()
+        self.assertEqual(sorted(again.completed), [0, 1])
+
+    def test_complete_removes_journal(self):
+        journal = SplitJournal.begin(self.source_path, self.tasks)
+        journal.complete()
+        self.assertFalse(os.path.exists(journal.journal_path))
+
+
+class TestResumableSplit(unittest.TestCase):
+    """Testaa keskeytyneen jaon jatkamista oikeilla PDF-tiedostoilla."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.temp_dir.name, "osat")
+        os.makedirs(self.output_dir)
+        self.source_path = os.path.join(self.temp_dir.name, "lahde.pdf")
+        doc = fitz.open()
+        for _ in range(6):
+            doc.new_page()
+        doc.save(self.source_path)
+        doc.close()
+        self.service = PDFSplitterService()
+        self.journal_path = SplitJournal.path_for(self.output_dir, self.source_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _interrupt_after(self, parts, workers=1):
+        token = CancellationToken()
+        calls = []
+
+        def callback(progress):
+            calls.append(progress)
+            if len(calls) == parts:
+                token.cancel()
+
+        with self.assertRaises(SplitCancelledError):
+            self.service.split_by_fixed_range(
+                self.source_path,
+                1,
+                self.output_dir,
+                progress_callback=callback,
+                options=SplitOptions(workers=workers, cancel_token=token, journal=True),
+            )
+
+    def test_resume_continues_from_first_missing_part(self):
+        self._interrupt_after(2)
+        self.assertTrue(os.path.exists(self.journal_path))
+        first_part = os.path.join(self.output_dir, "lahde_sivut_1-1.pdf")
+        first_mtime = os.stat(first_part).st_mtime_ns
+
+        result = self.service.split_by_fixed_range(
+            self.source_path, 1, self.output_dir, options=SplitOptions(resume=True),
+        )
+
+        self.assertEqual(
+            [os.path.basename(path) for path in result],
+            [f"lahde_sivut_{page}-{page}.pdf" for page in range(1, 7)],
+        )
+        self.assertEqual(os.stat(first_part).st_mtime_ns, first_mtime)
+        self.assertFalse(os.path.exists(self.journal_path))
+
+    def test_resume_in_parallel(self):
+        self._interrupt_after(2)
+
+        result = self.service.split_by_fixed_range(
+            self.source_path, 1, self.output_dir, options=SplitOptions(workers=2, resume=True),
+        )
+
+        self.assertEqual(len(result), 6)
+        self.assertFalse(os.path.exists(self.journal_path))
+
+    def test_resume_keyword(self):
+        self._interrupt_after(2)
+
+        result = self.service.split_by_fixed_range(
+            self.source_path, 1, self.output_dir, workers=2, resume=True
+        )
+
+        self.assertEqual(len(result), 6)
+        self.assertFalse(os.path.exists(self.journal_path))
+
+    def test_unknown_keyword_is_rejected(self):
+        with self.assertRaises(TypeError):
+            self.service.iter_split_by_fixed_range(
+                self.source_path, 1, self.output_dir, journal=True
+            )
+
+    def test_progress_counts_resumed_parts(self):
+        self._interrupt_after(3)
+        events = []
+
+        self.service.split_by_fixed_range(
+            self.source_path,
+            1,
+            self.output_dir,
+            options=SplitOptions(resume=True, progress_listener=events.append),
+        )
+
+        self.assertEqual(events[-1].parts_done, 6)
+        self.assertTrue(events[-1].is_final)
+
+    def test_without_journal_writes_no_journal(self):
+        self.service.split_by_fixed_range(self.source_path, 2, self.output_dir)
+        self.assertEqual(len(os.listdir(self.output_dir)), 3)
@@ -0,0 +1,54 @@
+from src.services.split_modes import (
+    build_output_config,
+    custom_range_parts,
+    fixed_range_parts,
+    format_custom_filename,
+    format_fixed_filename,
+    format_outline_filename,
+    plan_fixed_range,
+    resolve_part_task,
+)
+import os
+import unittest
+
+
+class TestSplitModes(unittest.TestCase):
+    """Testiluokka jakotapojen suunnitelmien testaamiseen."""
+
+    def test_fixed_range_parts(self):
+        self.assertEqual(
+            list(fixed_range_parts(5, 2)), [(0, 1, 1, 2), (2, 3, 3, 4), (4, 4, 5, 5)]
+        )
+        self.assertEqual(list(fixed_range_parts(0, 2)), [])
+
+    def test_plan_fixed_range_counts_parts(self):
+        part_iterator, total_parts = plan_fixed_range(3)(None, 7)
+
+        self.assertEqual(total_parts, 3)
+        self.assertEqual(len(list(part_iterator)), 3)
+
+    def test_custom_range_parts_validates_ranges(self):
+        self.assertEqual(list(custom_range_parts(5, [(2, 3)])), [(0, 1, 2, 2, 3)])
+        for ranges in ([(0, 1)], [(3, 2)], [(4, 6)]):
+            with self.subTest(ranges=ranges):
+                with self.assertRaises(ValueError):
+                    list(custom_range_parts(5, ranges))
+
+    def test_filenames(self):
+        self.assertEqual(format_fixed_filename("doc", (0, 1, 1, 2)), "doc_sivut_1-2.pdf")
+        self.assertEqual(
+            format_custom_filename("doc", (1, 2, 4, 3, 5)), "doc_alue_2_sivut_3-5.pdf"
+        )
+        self.assertEqual(
+            format_outline_filename("doc", (0, 0, 2, 1, 3, "Luku 1")), "doc_001_Luku 1.pdf"
+        )
+
+    def test_resolve_part_task(self):
+        output_config = build_output_config(
+            os.path.join("lahde", "doc.pdf"), "osat", format_custom_filename
+        )
+
+        self.assertEqual(
+            resolve_part_task(output_config, (0, 2, 4, 3, 5)),
+            (2, 4, os.path.join("osat", "doc_alue_1_sivut_3-5.pdf")),
+        )
@@ -0,0 +1,177 @@
+from src.entities.part_result import PartResult
+from src.repositories.pdf_repository import PDFRepository
+from src.services.pdf_splitter_service import PDFSplitterService
+from src.services.split_observers import (
+    CompositeObserver,
+    Histogram,
+    HistogramObserver,
+    JsonLinesObserver,
+    PrometheusTextfileObserver,
+    SplitObserver,
+)
+import json
+import os
+import tempfile
+import unittest
+import fitz
+
+
+class RecordingObserver(SplitObserver):
+    def __init__(self):
+        self.events = []
+
+    def job_started(self, file_path):
+        self.events.append(("job_started", file_path))
+
+    def stage_finished(self, stage, seconds, pages=0, size_bytes=0):
+        self.events.append(("stage", stage, pages))
+
+    def part_finished(self, part_result):
+        self.events.append(("part", part_result.start_page, part_result.end_page))
+
+    def job_finished(self, file_path, seconds, succeeded):
+        self.events.append(("job_finished", succeeded))
+
+
+class TestHistogram(unittest.TestCase):
+    """Testiluokka histogrammin testaamiseen."""
+
+    def test_observe_and_quantile(self):
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.05, 0.5, 3.0):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.counts, [2, 1, 1])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.total, 3.6)
+        self.assertEqual(histogram.quantile(0.5), 0.1)
+        self.assertEqual(histogram.quantile(0.75), 1.0)
+        self.assertEqual(histogram.quantile(0.99), 3.0)
+        self.assertEqual(Histogram().quantile(0.5), 0.0)
+
+
+class TestHistogramObserver(unittest.TestCase):
+    """Testiluokka histogrammitarkkailijan testaamiseen."""
+
+    def test_summary_and_merge(self):
+        observer = HistogramObserver()
+        observer.stage_finished("load", 0.02, pages=10)
+        observer.part_finished(PartResult(
+            "a.pdf", 1, 5, size_bytes=100, extract_seconds=0.01, save_seconds=0.02
+        ))
+        observer.part_finished(PartResult("b.pdf", 6, 10, size_bytes=50))
+        observer.job_finished("lahde.pdf", 0.1, True)
+
+        summary = observer.summary()
+        self.assertEqual(summary["parts"], 2)
+        self.assertEqual(summary["pages"], 10)
+        self.assertEqual(summary["bytes_written"], 150)
+        self.assertEqual(summary["jobs"], {"ok": 1, "error": 0})
+        # Välimuistista saatu osa ei kasvata kestohistogrammeja.
+        self.assertEqual(summary["stages"]["extract"]["count"], 1)
+        self.assertIn("save:", observer.format_summary())
+
+        merged = HistogramObserver()
+        merged.merge(json.loads(json.dumps(summary)))
+        merged.merge(summary)
+        self.assertEqual(merged.summary()["parts"], 4)
+        self.assertEqual(merged.summary()["stages"]["job"]["count"], 2)
+
+    def test_merge_rejects_other_buckets(self):
+        with self.assertRaises(ValueError):
+            HistogramObserver((1.0,)).merge(HistogramObserver().summary())
+
+
+class TestFileObservers(unittest.TestCase):
+    """Testiluokka tiedostoon kirjoittavien tarkkailijoiden testaamiseen."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_json_lines(self):
+        path = os.path.join(self.temp_dir.name, "tapahtumat.jsonl")
+        observer = JsonLinesObserver(path)
+        for _ in range(2):
+            observer.job_started("lahde.pdf")
+            observer.part_finished(PartResult(
+                "a.pdf", 1, 2, size_bytes=10, extract_seconds=0.1, save_seconds=0.2
+            ))
+            observer.job_finished("lahde.pdf", 0.5, True)
+
+        with open(path, encoding="utf-8") as file:
+            entries = [json.loads(line) for line in file]
+        self.assertEqual(len(entries), 6)
+        self.assertEqual(entries[1]["event"], "part")
+        self.assertEqual(entries[1]["pages"], 2)
+        self.assertEqual(entries[1]["job"], "lahde.pdf")
+
+    def test_prometheus_textfile(self):
+        path = os.path.join(self.temp_dir.name, "scanflow.prom")
+        observer = PrometheusTextfileObserver(path, buckets=(0.1, 1.0))
+        observer.part_finished(PartResult(
+            "a.pdf", 1, 3, size_bytes=10, extract_seconds=0.05, save_seconds=0.5
+        ))
+        observer.job_finished("lahde.pdf", 2.0, False)
+
+        with open(path, encoding="utf-8") as file:
+            lines = file.read().splitlines()
+        self.assertIn('scanflow_split_stage_seconds_bucket{stage="save",le="0.1"} 0', lines)
+        self.assertIn('scanflow_split_stage_seconds_bucket{stage="save",le="1"} 1', lines)
+        self.assertIn('scanflow_split_stage_seconds_bucket{stage="job",le="+Inf"} 1', lines)
+        self.assertIn("scanflow_split_pages_total 3", lines)
+        self.assertIn('scanflow_split_jobs_total{result="error"} 1', lines)
+        self.assertEqual(os.listdir(self.temp_dir.name), ["scanflow.prom"])
+
+
+class TestServiceObserver(unittest.TestCase):
+    """Testaa tarkkailijan kytkentää jakopalveluun."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source_path = os.path.join(self.temp_dir.name, "lahde.pdf")
+        doc = fitz.open()
+        for _ in range(5):
+            doc.new_page()
+        doc.save(self.source_path)
+        doc.close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_split_reports_events(self):
+        recorder = RecordingObserver()
+        histogram = HistogramObserver()
+        service = PDFSplitterService(
+            PDFRepository(), observer=CompositeObserver([recorder, histogram])
+        )
+
+        service.split_by_fixed_range(self.source_path, 2, self.temp_dir.name)
+
+        self.assertEqual(recorder.events, [
+            ("job_started", self.source_path),
+            ("stage", "load", 5),
+            ("stage", "plan", 0),
+            ("part", 1, 2),
+            ("part", 3, 4),
+            ("part", 5, 5),
+            ("job_finished", True),
+        ])
+        self.assertEqual(histogram.summary()["stages"]["save"]["count"], 3)
+
+    def test_failed_split_is_reported(self):
+        recorder = RecordingObserver()
+        service = PDFSplitterService(PDFRepository(), observer=recorder)
+
+        with self.assertRaises(ValueError):
+            service.split_by_custom_ranges(self.source_path, [(4, 9)], self.temp_dir.name)
+
+        self.assertEqual(recorder.events[-1], ("job_finished", False))
+
+    def test_without_observer_returns_plain_iterator(self):
+        service = PDFSplitterService(PDFRepository())
+        parts = service.iter_split_by_fixed_range(self.source_path, 5, self.temp_dir.name)
+        self.assertEqual(parts.__name__, "_iter_split_parts")
+        self.assertEqual(len(list(parts)), 1)
@@ -0,0 +1,54 @@
+from src.services.cancellation import CancellationToken
+from src.services.split_options import DEFAULT_BLANK_THRESHOLD, SplitOptions, resolve_split_options
+import dataclasses
+import unittest
+
+
+class TestSplitOptions(unittest.TestCase):
+    """Testiluokka SplitOptions-luokan toiminnallisuuksien testaamiseen."""
+
+    def test_defaults(self):
+        options = SplitOptions()
+
+        self.assertEqual(options.workers, 1)
+        self.assertIsNone(options.cancel_token)
+        self.assertFalse(options.uses_journal)
+        self.assertEqual(options.blank_threshold, DEFAULT_BLANK_THRESHOLD)
+
+    def test_resume_uses_journal(self):
+        self.assertTrue(SplitOptions(journal=True).uses_journal)
+        self.assertTrue(SplitOptions(resume=True).uses_journal)
+
+    def test_invalid_values(self):
+        for kwargs in ({"workers": 0}, {"progress_rate_hz": 0}, {"blank_threshold": -0.1}):
+            with self.subTest(kwargs=kwargs):
+                with self.assertRaises(ValueError):
+                    SplitOptions(**kwargs)
+
+    def test_options_are_immutable(self):
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            SplitOptions().workers = 2
+
+    def test_resolve_applies_keyword_aliases(self):
+        token = CancellationToken()
+        options = resolve_split_options(
+            SplitOptions(journal=True), {"workers": 2, "cancel_token": token, "resume": True}
+        )
+
+        self.assertEqual(options.workers, 2)
+        self.assertIs(options.cancel_token, token)
+        self.assertTrue(options.resume)
+        self.assertTrue(options.journal)
+
+    def test_resolve_without_aliases(self):
+        options = SplitOptions(workers=3)
+        self.assertIs(resolve_split_options(options, {}), options)
+        self.assertEqual(resolve_split_options(None, {}), SplitOptions())
+
+    def test_resolve_rejects_unknown_keyword(self):
+        with self.assertRaises(TypeError):
+            resolve_split_options(None, {"journal": True})
+
+    def test_resolve_validates_aliases(self):
+        with self.assertRaises(ValueError):
+            resolve_split_options(None, {"workers": 0})
@@ -0,0 +1,31 @@
+from src.benchmarks import startup_benchmark
+import unittest
+
+
+class TestStartupBenchmark(unittest.TestCase):
+    """Testiluokka käynnistysajan suorituskykytestin apufunktioille."""
+
+    def test_summarize_uses_median(self):
+        samples = [
+            {"import_seconds": 0.3, "first_paint_seconds": 1.0},
+            {"import_seconds": 0.1, "first_paint_seconds": 0.5},
+            {"import_seconds": 0.2, "first_paint_seconds": 0.7},
+        ]
+        summary = startup_benchmark.summarize(samples)
+
+        self.assertAlmostEqual(summary["import_seconds"], 0.2)
+        self.assertAlmostEqual(summary["first_paint_seconds"], 0.7)
+        self.assertIsNone(summary["service_ready_seconds"])
+
+    def test_check_budget(self):
+        summary = {"import_seconds": 0.2, "first_paint_seconds": 1.5}
+
+        self.assertEqual(startup_benchmark.check_budget(summary, 0.5, 2.0), [])
+        failures = startup_benchmark.check_budget(summary, 0.1, 1.0)
+        self.assertEqual(len(failures), 2)
+        self.assertIn("import_seconds", failures[0])
+
+    def test_check_budget_missing_measurement(self):
+        failures = startup_benchmark.check_budget({"import_seconds": 0.1}, 0.5, 1.0)
+
+        self.assertEqual(failures, ["first_paint_seconds: mittaus puuttuu"])
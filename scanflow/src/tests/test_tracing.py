@@ -0,0 +1,84 @@
+from src.repositories.pdf_repository import PDFRepository
+from src.services.pdf_splitter_service import PDFSplitterService
+from src.services.split_options import SplitOptions
+from src.utils import tracing
+import json
+import os
+import tempfile
+import unittest
+import fitz
+
+
+class TestTracing(unittest.TestCase):
+    """Testiluokka aikajanan jäljityksen testaamiseen."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source_path = os.path.join(self.temp_dir.name, "lahde.pdf")
+        doc = fitz.open()
+        for _ in range(6):
+            doc.new_page()
+        doc.save(self.source_path)
+        doc.close()
+        self.output_dir = os.path.join(self.temp_dir.name, "osat")
+        os.makedirs(self.output_dir)
+
+    def tearDown(self):
+        tracing.disable()
+        self.temp_dir.cleanup()
+
+    def _split_traced(self, workers):
+        tracer = tracing.enable()
+        service = PDFSplitterService(PDFRepository())
+        service.split_by_fixed_range(
+            self.source_path, 2, self.output_dir, options=SplitOptions(workers=workers),
+        )
+        tracing.disable()
+        path = tracer.write(os.path.join(self.temp_dir.name, "trace.json"))
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)["traceEvents"]
+
+    def test_disabled_span_is_shared_null_context(self):
+        self.assertIsNone(tracing.get_tracer())
+        self.assertIs(tracing.span("a"), tracing.span("b"))
+
+    def test_span_records_complete_event(self):
+        tracer = tracing.enable()
+        with tracing.span("vaihe", osa=1):
+            pass
+
+        event = tracer.collect()[-1]
+        self.assertEqual(event["name"], "vaihe")
+        self.assertEqual(event["ph"], "X")
+        self.assertEqual(event["args"], {"osa": 1})
+        self.assertIs(tracing.disable(), tracer)
+
+    def test_serial_split_trace(self):
+        events = self._split_traced(workers=1)
+
+        names = [event["name"] for event in events if event["ph"] == "X"]
+        for name in ("job", "open", "plan"):
+            self.assertEqual(names.count(name), 1)
+        self.assertEqual(names.count("extract"), 3)
+        self.assertEqual(names.count("save"), 3)
+        job = next(event for event in events if event["name"] == "job")
+        save = next(event for event in events if event["name"] == "save")
+        self.assertGreaterEqual(save["ts"], job["ts"])
+
+    def test_parallel_split_includes_worker_events(self):
+        events = self._split_traced(workers=2)
+
+        main_pid = os.getpid()
+        worker_events = [
+            event for event in events if event["pid"] != main_pid and event["ph"] == "X"
+        ]
+        worker_names = {event["name"] for event in worker_events}
+        self.assertTrue({"worker_init", "chunk", "extract", "save"} <= worker_names)
+        self.assertEqual(
+            sum(1 for event in worker_events if event["name"] == "save"), 3
+        )
+        self.assertTrue(any(event["name"] == "wait_chunk" for event in events))
+        self.assertFalse(
+            [name for name in os.listdir(tempfile.gettempdir())
+             if name.startswith("scanflow-trace-")]
+        )
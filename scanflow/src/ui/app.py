@@ -2,12 +2,14 @@
 Scanflow-sovelluksen pääikkuna ja käyttöliittymän logiikka.
 
 Tämä moduuli sisältää sovelluksen päänäkymän (MainWindow) sekä
-Worker-luokan PDF-tiedostojen käsittelyä varten taustasäikeessä.
+Worker-, PDFLoadWorker- ja SimilarityWorker-luokat PDF-tiedostojen
+jakamista, lataamista ja sivualueiden ehdottamista varten taustasäikeessä.
 """
 
 import os
 import logging
-from typing import List, Tuple, Optional, Any
+import uuid
+from typing import Any, Callable, List, Optional, Tuple
 from PyQt6.QtWidgets import ( 
     QMainWindow,
     QWidget,
@@ -19,11 +21,14 @@ from PyQt6.QtWidgets import (
     QGroupBox,
     QFileDialog,
     QProgressBar,
+    QLabel,
     QLineEdit,
     QSizePolicy,
     QScrollArea,
+    QSlider,
 ) # pylint: disable=no-name-in-module
-from PyQt6.QtCore import Qt, QThread, QObject, pyqtSignal, pyqtSlot 
+from PyQt6.QtCore import Qt, QThread, QObject, QTimer, pyqtSignal, pyqtSlot 
+from PyQt6.QtGui import QKeySequence, QShortcut
 from src.ui.styles import BaseStyles, ButtonStyles, ContainerStyles, DialogStyles, QtTheme
 from src.ui.components.drop_area_widget import DropAreaWidget
 from src.ui.components.custom_range_manager import CustomRangeManager
@@ -31,6 +36,11 @@ from src.ui.components.notification_manager import NotificationManager
 from src.ui.components.fixed_range_settings import FixedRangeSettings
 from src.ui.components.file_info_section import FileInfoSection
 from src.ui.components.mode_selector import ModeSelectorGroup
+from src.services.cancellation import CancellationToken, SplitCancelledError
+from src.services.split_options import SplitOptions
+from src.entities.progress_event import ProgressEvent
+from src.utils.async_logging import job_context
+from src.utils.job_profiler import JobProfiler
 
 logger = logging.getLogger(__name__)
 
@@ -45,12 +55,25 @@ class Worker(QObject):
         output_dir: Tallennuskansion polku.
         base_filename: Tiedostojen nimen perusosa.
         settings: Jakamisasetukset.
+        profile: Profiloidaanko jako cProfile-työkalulla. Profiili
+            tallennetaan hakemistoon `~/.scanflow/profiles`.
     """
     finished = pyqtSignal(list)
     error = pyqtSignal(str)
     progress = pyqtSignal(int)
-
-    def __init__(self, service, mode: int, file_path: str, output_dir: str, base_filename: str, settings: Any):
+    progress_event = pyqtSignal(object)
+    profile_saved = pyqtSignal(str)
+
+    def __init__(
+        self,
+        service,
+        mode: int,
+        file_path: str,
+        output_dir: str,
+        base_filename: str,
+        settings: Any,
+        profile: bool = False,
+    ):
         super().__init__()
         self.service = service
         self.mode = mode
@@ -58,13 +81,45 @@ class Worker(QObject):
         self.output_dir = output_dir
         self.base_filename = base_filename
         self.settings = settings
+        self.profile = profile
         self._is_cancelled = False
+        self._cancel_token = CancellationToken()
 
     @pyqtSlot()
     def run(self):
         """
         Suorittaa PDF-tiedoston jakamisen valitulla tilalla ja asetuksilla.
+
+        Jos profilointi on valittu, jako suoritetaan profiloijan sisällä ja
+        tallennetun profiilin polku lähetetään `profile_saved`-signaalilla.
+        Kaikkiin jaon aikana kirjattuihin lokitietueisiin liitetään jaon
+        tunniste ja lähdetiedoston nimi.
         """
+        with job_context(job_id=uuid.uuid4().hex[:12], file=os.path.basename(self.file_path)):
+            logger.info("Jako alkaa tilassa %d", self.mode)
+            if self.profile:
+                self._profile_split()
+            else:
+                self._split()
+
+    def _profile_split(self):
+        try:
+            profiler = JobProfiler(self.base_filename)
+            with profiler:
+                self._split()
+        except OSError as e:
+            logger.error("Profiilin tallennus epäonnistui: %s", str(e))
+            return
+        logger.info("Jaon profiili tallennettu: %s", profiler.pstats_path)
+        self.profile_saved.emit(profiler.pstats_path)
+
+    def _split_options(self) -> SplitOptions:
+        return SplitOptions(
+            cancel_token=self._cancel_token,
+            progress_listener=self._on_progress_event,
+        )
+
+    def _split(self):
         try:
             output_files = []
             if self._is_cancelled:
@@ -77,8 +132,13 @@ class Worker(QObject):
                         pages_per_file,
                         self.output_dir,
                         base_filename=self.base_filename,
-                        progress_callback=self.progress.emit,
+                        options=self._split_options(),
+                    )
+                except SplitCancelledError as e:
+                    logger.info(
+                        "Jako peruutettiin, %d osaa ehdittiin tallentaa", len(e.written_paths)
                     )
+                    return
                 except FileNotFoundError:
                     if not self._is_cancelled:
                         self.error.emit(
@@ -110,8 +170,13 @@ class Worker(QObject):
                         ranges_to_split,
                         self.output_dir,
                         base_filename=self.base_filename,
-                        progress_callback=self.progress.emit,
+                        options=self._split_options(),
+                    )
+                except SplitCancelledError as e:
+                    logger.info(
+                        "Jako peruutettiin, %d osaa ehdittiin tallentaa", len(e.written_paths)
                     )
+                    return
                 except FileNotFoundError:
                     if not self._is_cancelled:
                         self.error.emit(
@@ -144,32 +209,214 @@ class Worker(QObject):
                     "Virhe PDF:n jakamisessa. Tarkista loki lisätietoja varten."
                 )
 
+    def _on_progress_event(self, event: ProgressEvent):
+        self.progress.emit(event.percent)
+        self.progress_event.emit(event)
+
+    def cancel(self):
+        """
+        Keskeyttää työn suorittamisen. Palvelu lopettaa jaon viimeistään
+        keskeneräisen osan jälkeen.
+        """
+        self._is_cancelled = True
+        self._cancel_token.cancel()
+
+class PDFLoadWorker(QObject):
+    """
+    Lataa PDF-tiedoston tiedot taustasäikeessä vaihe kerrallaan.
+
+    Tiedot lähetetään sitä mukaa, kun ne valmistuvat: ensin tiedoston koko,
+    sitten sivumäärä ja lopuksi metatiedot. Jokainen signaali sisältää
+    pyynnön tunnisteen, jonka avulla vastaanottaja voi ohittaa vanhentuneiden
+    latausten tulokset.
+
+    Args:
+        service: PDF-käsittelypalvelu.
+        request_id: Latauspyynnön tunniste.
+        file_path: PDF-tiedoston polku.
+    """
+    size_loaded = pyqtSignal(int, str, int)
+    page_count_loaded = pyqtSignal(int, int)
+    metadata_loaded = pyqtSignal(int, dict)
+    error = pyqtSignal(int, str)
+    done = pyqtSignal()
+
+    def __init__(self, service, request_id: int, file_path: str):
+        super().__init__()
+        self.service = service
+        self.request_id = request_id
+        self.file_path = file_path
+        self._is_cancelled = False
+
+    @pyqtSlot()
+    def run(self):
+        """
+        Suorittaa latauksen vaiheet ja lopettaa, jos lataus peruutetaan.
+        """
+        try:
+            self._load()
+        finally:
+            self.done.emit()
+
+    def _load(self):
+        try:
+            size_bytes = os.path.getsize(self.file_path)
+            if self._is_cancelled:
+                return
+            self.size_loaded.emit(
+                self.request_id, os.path.basename(self.file_path), size_bytes
+            )
+            pdf_info = self.service.get_pdf_info(self.file_path)
+            if self._is_cancelled:
+                return
+            self.page_count_loaded.emit(self.request_id, pdf_info["page_count"])
+        except FileNotFoundError:
+            logger.exception("Tiedostoa ei löydy")
+            self._emit_error("Tiedostoa ei löydy. Tarkista tiedoston sijainti.")
+            return
+        except ValueError:
+            logger.exception("Virheellinen arvo PDF:n latauksessa")
+            self._emit_error(
+                "PDF-tiedoston lataus epäonnistui. Tiedosto saattaa olla virheellinen."
+            )
+            return
+        except Exception:
+            logger.exception("Odottamaton virhe PDF:n latauksessa")
+            self._emit_error(
+                "Odottamaton virhe PDF:n latauksessa. Tarkista loki lisätietoja varten."
+            )
+            return
+
+        get_pdf_details = getattr(self.service, "get_pdf_details", None)
+        if get_pdf_details is None or self._is_cancelled:
+            return
+        try:
+            details = get_pdf_details(self.file_path)
+        except Exception:
+            logger.warning("PDF:n metatietojen lukeminen epäonnistui", exc_info=True)
+            return
+        if not self._is_cancelled:
+            self.metadata_loaded.emit(self.request_id, details.get("metadata") or {})
+
+    def _emit_error(self, message: str):
+        if not self._is_cancelled:
+            self.error.emit(self.request_id, message)
+
     def cancel(self):
         """
-        Keskeyttää työn suorittamisen.
+        Peruuttaa latauksen. Jo käynnissä oleva vaihe suoritetaan loppuun,
+        mutta sen tuloksia ei lähetetä.
         """
         self._is_cancelled = True
 
+class SimilarityWorker(QObject):
+    """
+    Laskee sivujen visuaaliset etäisyydet taustasäikeessä.
+
+    Etäisyyksistä muodostetaan ehdotetut sivualueet millä tahansa
+    herkkyydellä ilman uutta laskentaa.
+
+    Args:
+        service: PDF-käsittelypalvelu.
+        request_id: Sen latauspyynnön tunniste, jonka tiedostoa käsitellään.
+        file_path: PDF-tiedoston polku.
+    """
+    distances_ready = pyqtSignal(int, list)
+    error = pyqtSignal(int, str)
+    done = pyqtSignal()
+
+    def __init__(self, service, request_id: int, file_path: str):
+        super().__init__()
+        self.service = service
+        self.request_id = request_id
+        self.file_path = file_path
+        self._cancel_token = CancellationToken()
+
+    @pyqtSlot()
+    def run(self):
+        """
+        Laskee etäisyydet ja lähettää ne, jos laskentaa ei ole peruutettu.
+        """
+        try:
+            self._measure()
+        finally:
+            self.done.emit()
+
+    def _measure(self):
+        try:
+            distances = self.service.measure_page_similarity(
+                self.file_path, cancel_token=self._cancel_token
+            )
+        except SplitCancelledError:
+            return
+        except Exception:
+            logger.exception("Sivujen samankaltaisuuden laskenta epäonnistui")
+            if not self._cancel_token.is_cancelled:
+                self.error.emit(
+                    self.request_id,
+                    "Sivualueiden ehdottaminen epäonnistui. Tarkista loki lisätietoja varten.",
+                )
+            return
+        if not self._cancel_token.is_cancelled:
+            self.distances_ready.emit(self.request_id, distances)
+
+    def cancel(self):
+        """
+        Peruuttaa laskennan viimeistään seuraavan sivuerän jälkeen.
+        """
+        self._cancel_token.cancel()
+
 class MainWindow(QMainWindow):
     """
     Sovelluksen pääikkuna PDF-tiedostojen jakamiseen.
 
     Args:
         pdf_service: PDF-käsittelypalvelu.
+        pdf_service_factory: Funktio, joka luo palvelun, jos sitä ei anneta
+            suoraan. Palvelu luodaan vasta ensimmäisellä käyttökerralla tai
+            heti ikkunan ensimmäisen piirron jälkeen, jotta ikkuna ehtii
+            näkyviin ennen raskaiden kirjastojen lataamista.
     """
-    def __init__(self, pdf_service):
+    # Vastaa palvelun oletusherkkyyttä 0.5. Arvoa ei tuoda palvelusta, jotta
+    # NumPy ja PyMuPDF ladataan vasta ikkunan ensimmäisen piirron jälkeen.
+    DEFAULT_SENSITIVITY_PERCENT = 50
+
+    def __init__(self, pdf_service=None, pdf_service_factory: Optional[Callable[[], Any]] = None):
         super().__init__()
+        if pdf_service is None and pdf_service_factory is None:
+            raise ValueError("PDF-palvelu tai sen luova funktio on annettava.")
         self.pdf_service = pdf_service
+        self._pdf_service_factory = pdf_service_factory
+        self._first_paint_done = False
         self.current_file_path: Optional[str] = None
         self.page_count: int = 0
         self.thread: Optional[QThread] = None
         self.worker: Optional[Worker] = None
+        self.load_worker: Optional[PDFLoadWorker] = None
+        self._load_request_id = 0
+        self._loading_file_path: Optional[str] = None
+        self._load_threads = set()
+        self.similarity_worker: Optional[SimilarityWorker] = None
+        self._similarity_threads = set()
+        self._page_distances: Optional[List[float]] = None
         self.last_save_directory: Optional[str] = None
+        self._profile_next_split = False
         self._init_window()
         self._init_ui()
         self._set_ui_enabled(False)
         self._update_split_button_state()
 
+    def preload_pdf_service(self):
+        """
+        Luo PDF-palvelun etukäteen, jos sitä ei ole vielä luotu.
+        """
+        self._get_pdf_service()
+
+    def _get_pdf_service(self):
+        if self.pdf_service is None:
+            self.pdf_service = self._pdf_service_factory()
+        return self.pdf_service
+
     def _init_window(self):
         self.setWindowTitle("Scanflow - PDF-jakaja")
         self.setMinimumSize(500, 500)
@@ -212,7 +459,7 @@ class MainWindow(QMainWindow):
         self.mode_selector = ModeSelectorGroup()
         self._create_settings_area()
         self._create_output_directory_area()
-        self.progress_bar = QProgressBar()
+        self._create_progress_area()
         self.split_button = QPushButton("Jaa PDF")
 
         self.drop_area.file_dropped.connect(self._load_pdf)
@@ -220,24 +467,44 @@ class MainWindow(QMainWindow):
         self.file_info_section.file_removed.connect(self._remove_file)
         self.mode_selector.mode_changed.connect(self._on_mode_changed)
         self.split_button.clicked.connect(self._start_split_pdf)
+        self.profile_shortcut = QShortcut(QKeySequence("Ctrl+Shift+P"), self)
+        self.profile_shortcut.activated.connect(self._toggle_profile_next_split)
 
         content_layout.addWidget(self.drop_area)
         content_layout.addWidget(self.file_info_section)
         content_layout.addWidget(self.mode_selector)
         content_layout.addWidget(self.settings_stack)
         content_layout.addWidget(self.output_group)
-        content_layout.addWidget(self.progress_bar)
+        content_layout.addWidget(self.progress_container)
         content_layout.addWidget(self.split_button)
         content_layout.addStretch(1)
         self.main_layout.addWidget(content_container)
 
         ButtonStyles.apply_primary_style(self.split_button)
         self.split_button.setEnabled(False)
-        self.progress_bar.setVisible(False)
+        self._set_progress_visible(False)
         self.progress_bar.setValue(0)
         self.progress_bar.setTextVisible(True)
         self.progress_bar.setFormat("Jaetaan... %p%")
 
+    def _create_progress_area(self):
+        self.progress_container = QWidget()
+        progress_layout = QHBoxLayout(self.progress_container)
+        progress_layout.setContentsMargins(0, 0, 0, 0)
+        progress_layout.setSpacing(10)
+
+        self.progress_bar = QProgressBar()
+        self.progress_details_label = QLabel("")
+        self.progress_details_label.setObjectName("StatusLabel")
+
+        progress_layout.addWidget(self.progress_bar, 1)
+        progress_layout.addWidget(self.progress_details_label, 0)
+
+    def _set_progress_visible(self, visible: bool):
+        if visible:
+            self.progress_details_label.setText("")
+        self.progress_container.setVisible(visible)
+
     def _create_settings_area(self):
         self.settings_stack = QStackedWidget()
         self.fixed_settings = FixedRangeSettings()
@@ -264,9 +531,39 @@ class MainWindow(QMainWindow):
             self.range_manager.get_add_button(), alignment=Qt.AlignmentFlag.AlignLeft
         )
         custom_layout.addWidget(button_container)
+        custom_layout.addWidget(self._create_suggestion_area())
         custom_layout.addStretch(1)
         self.settings_stack.addWidget(custom_settings_widget)
         self.range_manager.get_add_button().setVisible(False)
+        self.suggestion_container.setVisible(False)
+
+    def _create_suggestion_area(self) -> QWidget:
+        self.suggestion_container = QWidget()
+        suggestion_layout = QHBoxLayout(self.suggestion_container)
+        suggestion_layout.setContentsMargins(0, 0, 0, 0)
+        suggestion_layout.setSpacing(10)
+
+        self.suggest_button = QPushButton("Ehdota sivualueet")
+        self.suggest_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.suggest_button.setToolTip(
+            "Ehdota asiakirjojen rajat sivujen ulkoasun muutoksista, kuten "
+            "kirjelomakkeen, asettelun tai paperin sävyn vaihtumisesta"
+        )
+        ButtonStyles.apply_add_range_style(self.suggest_button)
+        self.suggest_button.clicked.connect(self._suggest_ranges)
+
+        sensitivity_label = QLabel("Herkkyys")
+        self.sensitivity_slider = QSlider(Qt.Orientation.Horizontal)
+        self.sensitivity_slider.setRange(0, 100)
+        self.sensitivity_slider.setValue(self.DEFAULT_SENSITIVITY_PERCENT)
+        self.sensitivity_slider.setEnabled(False)
+        self.sensitivity_slider.setToolTip("Suurempi herkkyys ehdottaa enemmän sivualueita")
+        self.sensitivity_slider.valueChanged.connect(self._apply_suggested_ranges)
+
+        suggestion_layout.addWidget(self.suggest_button)
+        suggestion_layout.addWidget(sensitivity_label)
+        suggestion_layout.addWidget(self.sensitivity_slider, 1)
+        return self.suggestion_container
 
     def _create_output_directory_area(self):
         self.output_group = QGroupBox("Tallennuskansio")
@@ -319,47 +616,88 @@ class MainWindow(QMainWindow):
             self.thread.wait()
         self.thread = None
         self.worker = None
-        try:
-            self.notification_manager.show_notification("Ladataan...", "info")
-            QApplication.processEvents()
-            pdf_info = self.pdf_service.get_pdf_info(file_path)
-            self.current_file_path = file_path
-            self.page_count = pdf_info["page_count"]
-            self.file_info_section.update_file_info(
-                pdf_info["file_name"], self.page_count
-            )
-            
-            self.drop_area.shrink_area(True)
-            self.drop_area.browse_button.clicked.connect(self._browse_file)
-            
-            self.fixed_settings.update_page_count(self.page_count)
-            self.range_manager.update_page_count(self.page_count)
-            self.range_manager.reset()
-            self.range_manager.get_add_button().setVisible(True)
+        self._cancel_pdf_load()
+        self._cancel_similarity()
 
-            if self.current_file_path and not self.output_dir_line_edit.text():
-                default_output_dir = os.path.dirname(self.current_file_path)
-                self.last_save_directory = default_output_dir
-                self.output_dir_line_edit.setText(default_output_dir)
-                self._update_split_button_state()
+        self._load_request_id += 1
+        self._loading_file_path = file_path
+        self.current_file_path = None
+        self._set_ui_enabled(False)
+        self.notification_manager.show_notification("Ladataan...", "info")
+
+        load_thread = QThread()
+        load_worker = PDFLoadWorker(self._get_pdf_service(), self._load_request_id, file_path)
+        load_worker.moveToThread(load_thread)
+
+        load_thread.started.connect(load_worker.run)
+        load_worker.size_loaded.connect(self._on_file_size_loaded)
+        load_worker.page_count_loaded.connect(self._on_page_count_loaded)
+        load_worker.metadata_loaded.connect(self._on_metadata_loaded)
+        load_worker.error.connect(self._on_load_error)
+        load_worker.done.connect(load_thread.quit)
+        load_worker.done.connect(load_worker.deleteLater)
+        load_thread.finished.connect(load_thread.deleteLater)
+        load_thread.finished.connect(lambda: self._load_threads.discard(load_thread))
+
+        self._load_threads.add(load_thread)
+        self.load_worker = load_worker
+        load_thread.start()
+
+    def _cancel_pdf_load(self):
+        if self.load_worker is not None:
+            self.load_worker.cancel()
+            self.load_worker = None
+        self._load_request_id += 1
+        self._loading_file_path = None
+
+    def _is_current_load(self, request_id: int) -> bool:
+        return request_id == self._load_request_id
+
+    @pyqtSlot(int, str, int)
+    def _on_file_size_loaded(self, request_id: int, file_name: str, size_bytes: int):
+        if not self._is_current_load(request_id):
+            return
+        self.file_info_section.show_loading(file_name, size_bytes)
+        self.fixed_settings.show_loading()
+        self.drop_area.shrink_area(True)
+        self.drop_area.browse_button.clicked.connect(self._browse_file)
 
-            self._set_ui_enabled(True)
-            self.notification_manager.show_notification("Tiedosto ladattu.", "success")
-        except FileNotFoundError:
-            logger.exception("Tiedostoa ei löydy")
-            self._reset_ui_on_error("Tiedostoa ei löydy. Tarkista tiedoston sijainti.")
-        except ValueError:
-            logger.exception("Virheellinen arvo PDF:n latauksessa")
-            self._reset_ui_on_error(
-                "PDF-tiedoston lataus epäonnistui. Tiedosto saattaa olla virheellinen."
-            )
-        except Exception:
-            logger.exception("Odottamaton virhe PDF:n latauksessa")
-            self._reset_ui_on_error(
-                "Odottamaton virhe PDF:n latauksessa. Tarkista loki lisätietoja varten."
-            )
+    @pyqtSlot(int, int)
+    def _on_page_count_loaded(self, request_id: int, page_count: int):
+        if not self._is_current_load(request_id):
+            return
+        self.current_file_path = self._loading_file_path
+        self.page_count = page_count
+        self.file_info_section.update_page_count(self.page_count)
+
+        self.fixed_settings.update_page_count(self.page_count)
+        self.range_manager.update_page_count(self.page_count)
+        self.range_manager.reset()
+        self.range_manager.get_add_button().setVisible(True)
+        self.suggestion_container.setVisible(True)
+
+        if self.current_file_path and not self.output_dir_line_edit.text():
+            default_output_dir = os.path.dirname(self.current_file_path)
+            self.last_save_directory = default_output_dir
+            self.output_dir_line_edit.setText(default_output_dir)
+            self._update_split_button_state()
+
+        self._set_ui_enabled(True)
+        self.notification_manager.show_notification("Tiedosto ladattu.", "success")
+
+    @pyqtSlot(int, dict)
+    def _on_metadata_loaded(self, request_id: int, metadata: dict):
+        if self._is_current_load(request_id):
+            self.file_info_section.update_metadata(metadata)
+
+    @pyqtSlot(int, str)
+    def _on_load_error(self, request_id: int, error_message: str):
+        if self._is_current_load(request_id):
+            self._reset_ui_on_error(error_message)
 
     def _reset_ui_on_error(self, error_message: str):
+        self._cancel_pdf_load()
+        self._cancel_similarity()
         self.current_file_path = None
         self.page_count = 0
         self.file_info_section.clear()
@@ -369,6 +707,7 @@ class MainWindow(QMainWindow):
         self.range_manager.update_page_count(0)
         self.range_manager.reset()
         self.range_manager.get_add_button().setVisible(False)
+        self.suggestion_container.setVisible(False)
         self._set_ui_enabled(False)
 
         if self.thread and self.thread.isRunning():
@@ -391,6 +730,80 @@ class MainWindow(QMainWindow):
             
         self.drop_area.browse_button.clicked.connect(self._browse_file)
 
+    def _suggest_ranges(self):
+        if not self.current_file_path or self.similarity_worker is not None:
+            return
+        if self._page_distances is not None:
+            self._apply_suggested_ranges()
+            return
+        service = self._get_pdf_service()
+        if not hasattr(service, "measure_page_similarity"):
+            self.notification_manager.show_notification(
+                "Sivualueiden ehdottaminen ei ole käytettävissä.", "warning"
+            )
+            return
+
+        self.suggest_button.setEnabled(False)
+        self.notification_manager.show_notification("Etsitään asiakirjojen rajoja...", "info")
+        similarity_thread = QThread()
+        similarity_worker = SimilarityWorker(
+            service, self._load_request_id, self.current_file_path
+        )
+        similarity_worker.moveToThread(similarity_thread)
+
+        similarity_thread.started.connect(similarity_worker.run)
+        similarity_worker.distances_ready.connect(self._on_distances_ready)
+        similarity_worker.error.connect(self._on_similarity_error)
+        similarity_worker.done.connect(similarity_thread.quit)
+        similarity_worker.done.connect(similarity_worker.deleteLater)
+        similarity_thread.finished.connect(similarity_thread.deleteLater)
+        similarity_thread.finished.connect(
+            lambda: self._similarity_threads.discard(similarity_thread)
+        )
+
+        self._similarity_threads.add(similarity_thread)
+        self.similarity_worker = similarity_worker
+        similarity_thread.start()
+
+    def _cancel_similarity(self):
+        if self.similarity_worker is not None:
+            self.similarity_worker.cancel()
+        self._finish_similarity()
+        self._page_distances = None
+        self.sensitivity_slider.setEnabled(False)
+
+    def _finish_similarity(self):
+        self.similarity_worker = None
+        self.suggest_button.setEnabled(True)
+
+    @pyqtSlot(int, list)
+    def _on_distances_ready(self, request_id: int, distances: List[float]):
+        if not self._is_current_load(request_id):
+            return
+        self._finish_similarity()
+        self._page_distances = distances
+        self.sensitivity_slider.setEnabled(True)
+        self._apply_suggested_ranges()
+        self.notification_manager.show_notification(
+            f"Ehdotettu {len(self.range_manager.get_ranges())} sivualuetta. "
+            "Voit muokata alueita ja säätää herkkyyttä ennen jakamista.",
+            "success",
+        )
+
+    @pyqtSlot(int, str)
+    def _on_similarity_error(self, request_id: int, error_message: str):
+        if self._is_current_load(request_id):
+            self._finish_similarity()
+            self.notification_manager.show_notification(error_message, "error")
+
+    def _apply_suggested_ranges(self):
+        if self._page_distances is None:
+            return
+        ranges = self._get_pdf_service().suggest_similarity_ranges(
+            self._page_distances, self.sensitivity_slider.value() / 100
+        )
+        self.range_manager.set_ranges(ranges)
+
     def _on_mode_changed(self, mode_index: int):
         self.settings_stack.setCurrentIndex(mode_index)
 
@@ -422,23 +835,27 @@ class MainWindow(QMainWindow):
 
             self._set_ui_enabled(False)
             self.progress_bar.setValue(0)
-            self.progress_bar.setVisible(True)
+            self._set_progress_visible(True)
 
             self.thread = QThread()
             self.worker = Worker(
-                self.pdf_service,
+                self._get_pdf_service(),
                 mode,
                 self.current_file_path,
                 output_dir,
                 base_filename,
                 settings,
+                profile=self._profile_next_split,
             )
+            self._profile_next_split = False
             self.worker.moveToThread(self.thread)
 
             self.thread.started.connect(self.worker.run)
             self.worker.finished.connect(self._on_split_finished)
             self.worker.error.connect(self._on_split_error)
             self.worker.progress.connect(self._update_progress)
+            self.worker.progress_event.connect(self._update_progress_details)
+            self.worker.profile_saved.connect(self._on_profile_saved)
             self.worker.finished.connect(self.thread.quit)
             self.worker.finished.connect(self.worker.deleteLater)
             self.thread.finished.connect(self.thread.deleteLater)
@@ -457,7 +874,7 @@ class MainWindow(QMainWindow):
                 "Jaon aloitus epäonnistui odottamattoman virheen vuoksi.", "error"
             )
             self._set_ui_enabled(True)
-            self.progress_bar.setVisible(False)
+            self._set_progress_visible(False)
 
     @pyqtSlot(list)
     def _on_split_finished(self, output_files: List[str]):
@@ -472,18 +889,49 @@ class MainWindow(QMainWindow):
                 "Jako valmis, ei luotu tiedostoja.", "info"
             )
         self._set_ui_enabled(True)
-        self.progress_bar.setVisible(False)
+        self._set_progress_visible(False)
+
+    def _toggle_profile_next_split(self):
+        self._profile_next_split = not self._profile_next_split
+        message = (
+            "Seuraava jako profiloidaan."
+            if self._profile_next_split
+            else "Jaon profilointi peruttu."
+        )
+        self.notification_manager.show_notification(message, "info")
+
+    @pyqtSlot(str)
+    def _on_profile_saved(self, pstats_path: str):
+        self.notification_manager.show_notification(
+            f"Profiili tallennettu: {pstats_path}", "info"
+        )
 
     @pyqtSlot(str)
     def _on_split_error(self, error_message: str):
         self.notification_manager.show_notification(error_message, "error")
         self._set_ui_enabled(True)
-        self.progress_bar.setVisible(False)
+        self._set_progress_visible(False)
 
     @pyqtSlot(int)
     def _update_progress(self, value: int):
         self.progress_bar.setValue(value)
 
+    @pyqtSlot(object)
+    def _update_progress_details(self, event: ProgressEvent):
+        details = f"{event.parts_per_second:.1f} osaa/s · {self._format_bytes(event.bytes_per_second)}/s"
+        if event.eta_seconds is not None and not event.is_final:
+            minutes, seconds = divmod(int(round(event.eta_seconds)), 60)
+            details += f" · jäljellä {minutes}:{seconds:02d}"
+        self.progress_details_label.setText(details)
+
+    @staticmethod
+    def _format_bytes(size: float) -> str:
+        for unit in ("t", "kt", "Mt"):
+            if size < 1024:
+                return f"{size:.0f} {unit}" if unit == "t" else f"{size:.1f} {unit}"
+            size /= 1024
+        return f"{size:.1f} Gt"
+
     def _split_cleanup(self):
         self.thread = None
         self.worker = None
@@ -509,8 +957,20 @@ class MainWindow(QMainWindow):
             self.worker.cancel()
             self.thread.quit()
             self.thread.wait()
+        self._cancel_pdf_load()
+        self._cancel_similarity()
+        for background_thread in list(self._load_threads) + list(self._similarity_threads):
+            background_thread.quit()
+            background_thread.wait()
         event.accept()
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._first_paint_done:
+            self._first_paint_done = True
+            if self.pdf_service is None:
+                QTimer.singleShot(0, self.preload_pdf_service)
+
     def showEvent(self, event):
         super().showEvent(event)
         self.notification_manager.position_notification()
@@ -99,6 +99,22 @@ class CustomRangeRow(QWidget):
         end = self.end_spin.value()
         return (start, end) if start <= end else None
 
+    def set_range(self, start: int, end: int):
+        """
+        Asettaa rivin sivualueen sivumäärän rajoissa.
+
+        Args:
+            start: Alueen ensimmäinen sivu (1-pohjainen)
+            end: Alueen viimeinen sivu (1-pohjainen)
+        """
+        max_val = max(1, self.page_count)
+        self.start_spin.setMaximum(max_val)
+        self.end_spin.setMinimum(1)
+        self.end_spin.setValue(min(max(1, end), max_val))
+        self.start_spin.setValue(min(max(1, start), self.end_spin.value()))
+        self._adjust_end_spin_min()
+        self._adjust_start_spin_max()
+
     def update_page_count(self, page_count: int):
         self.page_count = max(0, page_count)
         max_val = max(1, self.page_count)
@@ -214,6 +230,26 @@ class CustomRangeManager:
         """
         return [rng for row in self.range_rows if (rng := row.get_range()) is not None]
 
+    def set_ranges(self, ranges: List[Tuple[int, int]]):
+        """
+        Korvaa nykyiset sivualueet annetuilla, esimerkiksi ehdotetuilla alueilla.
+
+        Rivit jäävät muokattaviksi. Tyhjällä listalla manageri palautetaan
+        alkutilaan.
+
+        Args:
+            ranges: Lista sivualueista (alku, loppu), 1-pohjaisia
+        """
+        self.scroll_widget.setUpdatesEnabled(False)
+        try:
+            self.reset()
+            for index, (start, end) in enumerate(ranges):
+                if index >= len(self.range_rows):
+                    self.add_custom_range()
+                self.range_rows[index].set_range(start, end)
+        finally:
+            self.scroll_widget.setUpdatesEnabled(True)
+
     def update_page_count(self, page_count: int):
         """
         Päivittää PDF:n sivumäärän ja välittää sen riveille.
@@ -2,7 +2,8 @@
 Moduuli ladatun PDF-tiedoston tietojen näyttämiseksi.
 
 Tarjoaa `FileInfoSection`-komponentin, joka näyttää ladatun PDF:n
-nimen ja sivumäärän sekä painikkeen tiedoston poistamiseksi näkymästä.
+nimen, koon, sivumäärän ja metatiedot sekä painikkeen tiedoston
+poistamiseksi näkymästä.
 """
 
 from PyQt6.QtWidgets import (
@@ -22,7 +23,9 @@ class FileInfoSection(QFrame):
     """
     Komponentti ladatun PDF-tiedoston perustietojen näyttämiseen.
 
-    Näyttää tiedoston nimen ja sivumäärän. Sisältää myös painikkeen,
+    Näyttää tiedoston nimen, koon ja sivumäärän sekä mahdolliset
+    metatiedot. Tiedot voidaan päivittää vaiheittain sitä mukaa, kun
+    taustalataus saa ne selville. Sisältää myös painikkeen,
     jolla käyttäjä voi "poistaa" tiedoston sovelluksen näkymästä, mikä
     palauttaa käyttöliittymän tilaan, jossa uusi tiedosto voidaan ladata.
 
@@ -41,6 +44,7 @@ class FileInfoSection(QFrame):
             parent (QWidget, optional): Isäntäwidget. Oletus None.
         """
         super().__init__(parent)
+        self._size_text = ""
         ContainerStyles.apply_file_info_section_style(self)
         self._init_ui()
         self.setVisible(False)
@@ -65,6 +69,12 @@ class FileInfoSection(QFrame):
         self.page_count_label.setObjectName("PageCountLabel")
         text_layout.addWidget(self.page_count_label)
 
+        self.metadata_label = QLabel("")
+        self.metadata_label.setObjectName("PageCountLabel")
+        self.metadata_label.setWordWrap(True)
+        self.metadata_label.setVisible(False)
+        text_layout.addWidget(self.metadata_label)
+
         file_info_layout.addWidget(file_info_text_widget, stretch=1)
 
         remove_file_btn = QPushButton("×")
@@ -91,14 +101,67 @@ class FileInfoSection(QFrame):
             page_count (int): Näytettävän tiedoston sivumäärä.
         """
         self.file_name_label.setText(f"{file_name}")
-        self.page_count_label.setText(f"Sivuja: {page_count}")
+        self._size_text = ""
+        self.update_page_count(page_count)
+        self.setVisible(True)
+
+    def show_loading(self, file_name, size_bytes):
+        """
+        Näyttää tiedoston nimen ja koon, kun sivumäärää vielä luetaan.
+
+        Args:
+            file_name (str): Näytettävän tiedoston nimi.
+            size_bytes (int): Tiedoston koko tavuina.
+        """
+        self.file_name_label.setText(f"{file_name}")
+        self._size_text = self._format_size(size_bytes)
+        self.page_count_label.setText(f"{self._size_text} · Luetaan sivumäärää...")
+        self.metadata_label.setText("")
+        self.metadata_label.setVisible(False)
         self.setVisible(True)
 
+    def update_page_count(self, page_count):
+        """
+        Päivittää näytettävän sivumäärän.
+
+        Args:
+            page_count (int): Tiedoston sivumäärä.
+        """
+        prefix = f"{self._size_text} · " if self._size_text else ""
+        self.page_count_label.setText(f"{prefix}Sivuja: {page_count}")
+
+    def update_metadata(self, metadata):
+        """
+        Näyttää tiedoston otsikon ja tekijän, jos ne on määritelty.
+
+        Args:
+            metadata (dict): PDF-tiedoston metatiedot.
+        """
+        parts = [
+            f"{label}: {metadata[key]}"
+            for key, label in (("title", "Otsikko"), ("author", "Tekijä"))
+            if metadata and metadata.get(key)
+        ]
+        self.metadata_label.setText(" · ".join(parts))
+        self.metadata_label.setVisible(bool(parts))
+
     def clear(self):
         self.file_name_label.setText("Ei tiedostoa valittuna")
         self.page_count_label.setText("")
+        self.metadata_label.setText("")
+        self.metadata_label.setVisible(False)
+        self._size_text = ""
         self.setVisible(False)
 
+    @staticmethod
+    def _format_size(size_bytes):
+        size = float(size_bytes)
+        for unit in ("t", "kt", "Mt"):
+            if size < 1024:
+                return f"{size:.0f} {unit}" if unit == "t" else f"{size:.1f} {unit}"
+            size /= 1024
+        return f"{size:.1f} Gt"
+
     def get_current_filename(self):
         """
         Palauttaa tällä hetkellä näytettävän tiedoston nimen.
@@ -144,6 +144,13 @@ class FixedRangeSettings(QWidget):
         self.pages_spinner.setValue(min(self.pages_spinner.value(), max_pages))
         self._update_info_text()
 
+    def show_loading(self):
+        """
+        Näyttää latausviestin, kun tiedoston sivumäärää vielä luetaan.
+        """
+        self.file_count_info.setText("Luetaan sivumäärää...")
+        self.page_distribution_info.setText("")
+
     def get_pages_per_file(self):
         """
         Palauttaa käyttäjän valitseman sivumäärän per jaettava tiedosto.
@@ -2,6 +2,7 @@
 Painikkeiden tyylit.
 """
 
+from functools import cache
 from PyQt6.QtWidgets import QPushButton
 from PyQt6.QtCore import Qt
 
@@ -15,6 +16,7 @@ class ButtonStyles:
     """
     
     @classmethod
+    @cache
     def get_primary_button_style(cls):
         """
         Palauttaa ensisijaisen toimintapainikkeen tyylimäärittelyn.
@@ -45,6 +47,7 @@ class ButtonStyles:
         """
     
     @classmethod
+    @cache
     def get_browse_button_style(cls):
         """
         Palauttaa tiedoston selaus -painikkeen tyylimäärittelyn.
@@ -68,6 +71,7 @@ class ButtonStyles:
         """
     
     @classmethod
+    @cache
     def get_browse_output_button_style(cls):
         """
         Palauttaa tallennuskansion selaus -painikkeen tyylimäärittelyn.
@@ -91,6 +95,7 @@ class ButtonStyles:
         """
     
     @classmethod
+    @cache
     def get_delete_button_style(cls):
         """
         Palauttaa poistopainikkeen tyylimäärittelyn.
@@ -117,6 +122,7 @@ class ButtonStyles:
         """
     
     @classmethod
+    @cache
     def get_add_range_button_style(cls):
         """
         Palauttaa sivualueiden lisäyspainikkeen tyylimäärittelyn.
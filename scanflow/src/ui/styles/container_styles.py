@@ -5,6 +5,7 @@ Tämä moduuli sisältää tyylimäärittelyt kaikille säiliötyyppisille kompo
 kuten pudotusalueet, ryhmälaatikot ja muut säiliötyyppiset komponentit.
 """
 
+from functools import cache
 from src.ui.styles.base_styles import BaseStyles
 
 class ContainerStyles:
@@ -16,6 +17,7 @@ class ContainerStyles:
     """
     
     @classmethod
+    @cache
     def get_group_box_style(cls):
         """
         Palauttaa ryhmälaatikon tyylimäärittelyn.
@@ -40,6 +42,7 @@ class ContainerStyles:
         """
     
     @classmethod
+    @cache
     def get_group_box_content_style(cls):
         """
         Palauttaa ryhmälaatikon sisällön tyylimäärittelyn.
@@ -53,6 +56,7 @@ class ContainerStyles:
         """
     
     @classmethod
+    @cache
     def get_file_info_section_style(cls):
         """
         Palauttaa tiedostotietojen osion tyylimäärittelyn.
@@ -70,6 +74,7 @@ class ContainerStyles:
         """
     
     @classmethod
+    @cache
     def get_drop_area_normal_style(cls):
         """
         Palauttaa pudotusalueen normaalin tilan tyylimäärittelyn.
@@ -98,6 +103,7 @@ class ContainerStyles:
         """
     
     @classmethod
+    @cache
     def get_drop_area_drag_over_style(cls):
         """
         Palauttaa pudotusalueen raahauksen aikaisen tilan tyylimäärittelyn.
@@ -119,6 +125,7 @@ class ContainerStyles:
         """
     
     @classmethod
+    @cache
     def get_drop_label_style(cls):
         """
         Palauttaa pudotusalueen tekstin tyylimäärittelyn.
@@ -136,6 +143,7 @@ class ContainerStyles:
         """
     
     @classmethod
+    @cache
     def get_or_label_style(cls):
         """
         Palauttaa pudotusalueen "tai"-tekstin tyylimäärittelyn.
@@ -152,6 +160,7 @@ class ContainerStyles:
         """
     
     @classmethod
+    @cache
     def get_shrunk_drop_label_style(cls):
         """
         Palauttaa kutistetun pudotusalueen tekstin tyylimäärittelyn.
@@ -167,6 +176,7 @@ class ContainerStyles:
         """
     
     @classmethod
+    @cache
     def get_shrunk_or_label_style(cls):
         """
         Palauttaa kutistetun pudotusalueen "tai"-tekstin tyylimäärittelyn.
@@ -183,6 +193,7 @@ class ContainerStyles:
         """
     
     @classmethod
+    @cache
     def get_explanation_text_style(cls):
         """
         Palauttaa selitystekstin tyylimäärittelyn.
@@ -197,6 +208,7 @@ class ContainerStyles:
         """
     
     @classmethod
+    @cache
     def get_separator_style(cls):
         """
         Palauttaa erottimen tyylimäärittelyn.
@@ -211,6 +223,7 @@ class ContainerStyles:
         """
     
     @classmethod
+    @cache
     def get_info_text_style(cls):
         """
         Palauttaa informaatiotekstin tyylimäärittelyn.
@@ -6,6 +6,7 @@ erilaisille asetuskomponenteille. Tyylimäärittelyt on toteutettu
 CSS-tyylisäännöstöillä, jotka voidaan soveltaa sopiviin komponentteihin.
 """
 
+from functools import cache
 from src.ui.styles.base_styles import BaseStyles
 from src.ui.styles.button_styles import ButtonStyles
 
@@ -19,6 +20,7 @@ class DialogStyles:
     """
     
     @classmethod
+    @cache
     def get_notification_frame_style(cls, bg_color, border_color):
         """
         Palauttaa ilmoituskehyksen tyylin.
@@ -39,6 +41,7 @@ class DialogStyles:
         """
     
     @classmethod
+    @cache
     def get_notification_label_style(cls, text_color):
         """
         Palauttaa ilmoitustekstin tyylin.
@@ -58,6 +61,7 @@ class DialogStyles:
         """
     
     @classmethod
+    @cache
     def get_close_button_style(cls, close_color):
         """
         Palauttaa ilmoituksen sulkunapin tyylin.
@@ -83,6 +87,7 @@ class DialogStyles:
         """
     
     @classmethod
+    @cache
     def get_range_input_style(cls):
         """
         Palauttaa sivualuekenttien tyylin.
@@ -102,6 +107,7 @@ class DialogStyles:
         """
     
     @classmethod
+    @cache
     def get_scrollarea_style(cls):
         """
         Palauttaa vieritysalueen tyylin.
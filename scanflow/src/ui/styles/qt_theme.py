@@ -6,6 +6,7 @@ PyQt-käyttöliittymäkomponenteille. Tarjoaa `get_stylesheet`-metodin
 sovelluksen tyylisäännöstön hakemiseen.
 """
 
+from functools import cache
 from src.ui.styles.base_styles import BaseStyles
 
 class QtTheme:
@@ -17,6 +18,7 @@ class QtTheme:
     """
     
     @classmethod
+    @cache
     def get_stylesheet(cls):
         """
         Palauttaa sovelluksen globaalin tyylisäännöstön.
@@ -0,0 +1,35 @@
+"""
+Moduuli sovelluksen käyttäjäkohtaisten tiedostopolkujen hallintaan.
+
+Sovellus säilyttää lokit, välimuistit ja muut käyttäjäkohtaiset tiedostot
+kotihakemiston `.scanflow`-kansiossa. Jos kansiota ei voida luoda,
+käytetään järjestelmän väliaikaishakemistoa.
+"""
+
+import os
+import tempfile
+from typing import Optional
+
+
+def get_app_dir(subdir: Optional[str] = None) -> str:
+    """
+    Palauttaa sovelluksen käyttäjäkohtaisen hakemiston ja luo sen tarvittaessa.
+
+    Args:
+        subdir: Valinnainen alihakemisto sovellushakemiston sisällä.
+
+    Returns:
+        Hakemiston polku.
+    """
+    try:
+        app_dir = os.path.join(os.path.expanduser("~"), ".scanflow")
+        if subdir:
+            app_dir = os.path.join(app_dir, subdir)
+        os.makedirs(app_dir, exist_ok=True)
+        return app_dir
+    except (IOError, PermissionError):
+        temp_dir = os.path.join(tempfile.gettempdir(), "scanflow")
+        if subdir:
+            temp_dir = os.path.join(temp_dir, subdir)
+        os.makedirs(temp_dir, exist_ok=True)
+        return temp_dir
@@ -0,0 +1,188 @@
+"""
+Moduuli sovelluksen asynkroniseen ja rakenteiseen lokitukseen.
+
+Lokikutsu ei kirjoita tiedostoon kutsuvassa säikeessä. Se vain lisää
+tietueen jonoon `QueueHandler`-käsittelijällä, ja taustasäikeessä toimiva
+`QueueListener` kirjoittaa tietueet kokorajoitettuun, kierrätettävään
+tiedostoon JSON-riveinä. Näin hidas kotihakemisto tai verkkoprofiili ei
+hidasta jakoa suorittavaa säiettä.
+
+`job_context` liittää jakotyön tunnistetiedot (esim. lähdetiedosto) kaikkiin
+sen aikana kirjattuihin tietueisiin. Konteksti tallennetaan
+`contextvars`-muuttujaan, joten se on säie- ja tehtäväkohtainen.
+"""
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import queue
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, Iterator, Optional
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+
+_log_context: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar(
+    "scanflow_log_context", default={}
+)
+# Käynnissä oleva taustasäie avaimella "listener", tai None.
+_LISTENER_STATE: Dict[str, Optional[QueueListener]] = {"listener": None}
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+
+@contextmanager
+def job_context(**fields: Any) -> Iterator[None]:
+    """
+    Liittää kentät kaikkiin lohkon aikana kirjattuihin lokitietueisiin.
+
+    Sisäkkäiset kontekstit yhdistetään; sisempi arvo korvaa ulomman.
+
+    Args:
+        **fields: Tietueisiin liitettävät kentät, esim. file="a.pdf".
+
+    Yields:
+        None.
+    """
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+def get_job_context() -> Dict[str, Any]:
+    """
+    Palauttaa nykyisen lokikontekstin.
+
+    Returns:
+        Kopio nykyisen säikeen lokikontekstin kentistä.
+    """
+    return dict(_log_context.get())
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    Jonoon kirjoittava käsittelijä, joka säilyttää tietueen rakenteen.
+
+    Toisin kuin `QueueHandler`, käsittelijä ei yhdistä poikkeuksen
+    jäljitystä viestiin, vaan siirtää sen `exc_text`-kenttään. Lisäksi
+    kutsuvan säikeen lokikonteksti liitetään tietueeseen
+    `context`-attribuuttina, koska taustasäikeessä se ei ole saatavilla.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+        record.exc_info = None
+        record.context = _log_context.get()
+        return record
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Muotoilee tietueen yhdeksi JSON-riviksi."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        context = getattr(record, "context", None)
+        if context:
+            entry.update(context)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        elif record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def create_rotating_file_handler(
+    log_file: str,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    backup_count: int = DEFAULT_BACKUP_COUNT,
+) -> RotatingFileHandler:
+    """
+    Luo kokorajoitetun lokitiedoston käsittelijän JSON-muotoilulla.
+
+    Tiedosto avataan heti, jotta kirjoitusvirhe havaitaan jo lokituksen
+    alustuksessa eikä vasta taustasäikeessä.
+
+    Args:
+        log_file: Lokitiedoston polku.
+        max_bytes: Tiedoston enimmäiskoko ennen kierrätystä.
+        backup_count: Säilytettävien vanhojen tiedostojen määrä.
+
+    Returns:
+        Määritelty `RotatingFileHandler`.
+    """
+    handler = RotatingFileHandler(
+        log_file,
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding="utf-8",
+    )
+    handler.setLevel(logging.DEBUG)
+    handler.setFormatter(JsonLineFormatter())
+    return handler
+
+
+def start_queue_logging(
+    handler: logging.Handler, level: int = logging.DEBUG
+) -> QueueListener:
+    """
+    Ohjaa juurilokittajan tietueet jonon kautta annetulle käsittelijälle.
+
+    Juurilokittajan aiemmat käsittelijät poistetaan. Taustasäie pysäytetään
+    ja jono tyhjennetään ohjelman päättyessä, tai aiemmin `stop_queue_logging`-
+    kutsulla.
+
+    Args:
+        handler: Käsittelijä, joka kirjoittaa tietueet taustasäikeessä.
+        level: Juurilokittajan taso.
+
+    Returns:
+        Käynnistetty `QueueListener`.
+    """
+    stop_queue_logging()
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = ContextQueueHandler(log_queue)
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    root_logger.handlers.clear()
+    root_logger.addHandler(queue_handler)
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    _LISTENER_STATE["listener"] = listener
+    return listener
+
+
+def stop_queue_logging() -> None:
+    """
+    Kirjoittaa jonossa olevat tietueet ja pysäyttää taustasäikeen.
+
+    Jonoon kirjoittava käsittelijä poistetaan juurilokittajasta.
+    """
+    listener, _LISTENER_STATE["listener"] = _LISTENER_STATE["listener"], None
+    if listener is None:
+        return
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, ContextQueueHandler):
+            root_logger.removeHandler(handler)
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+atexit.register(stop_queue_logging)
@@ -0,0 +1,57 @@
+"""
+Moduuli tiedostojen kevyeen sisällön tunnistamiseen.
+
+Sormenjälki lasketaan tiedoston koosta sekä alun ja lopun tavuista, joten
+se on nopea myös suurille tiedostoille, mutta tunnistaa tyypilliset
+muutokset, joissa muokkausaika on säilynyt ennallaan. Koko sisällön
+tiiviste on saatavilla `file_sha256`-funktiolla.
+"""
+
+import hashlib
+import os
+
+SAMPLE_BYTES = 64 * 1024
+_READ_CHUNK_BYTES = 1024 * 1024
+
+
+def quick_fingerprint(file_path: str) -> str:
+    """
+    Laskee tiedostolle kevyen sisältösormenjäljen.
+
+    Args:
+        file_path: Tiedoston polku.
+
+    Returns:
+        Heksadesimaalimuotoinen SHA-256-tiiviste.
+
+    Raises:
+        OSError: Jos tiedostoa ei voida lukea.
+    """
+    size = os.path.getsize(file_path)
+    digest = hashlib.sha256(str(size).encode("ascii"))
+    with open(file_path, "rb") as file:
+        digest.update(file.read(SAMPLE_BYTES))
+        if size > SAMPLE_BYTES:
+            file.seek(max(SAMPLE_BYTES, size - SAMPLE_BYTES))
+            digest.update(file.read(SAMPLE_BYTES))
+    return digest.hexdigest()
+
+
+def file_sha256(file_path: str) -> str:
+    """
+    Laskee tiedoston koko sisällön SHA-256-tiivisteen.
+
+    Args:
+        file_path: Tiedoston polku.
+
+    Returns:
+        Heksadesimaalimuotoinen SHA-256-tiiviste.
+
+    Raises:
+        OSError: Jos tiedostoa ei voida lukea.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(_READ_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
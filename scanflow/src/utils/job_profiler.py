@@ -0,0 +1,101 @@
+"""
+Moduuli yksittäisen jakotyön profilointiin cProfile-työkalulla.
+
+`JobProfiler` profiloi context managerin sisällä suoritetun koodin ja
+tallentaa tuloksen `.pstats`-tiedostoksi sekä luettavaksi tekstiyhteenvedoksi
+hakemistoon `~/.scanflow/profiles`. Tiedostot voi liittää
+suorituskykyongelmien raportteihin sellaisenaan; `.pstats`-tiedoston voi
+avata esimerkiksi `python -m pstats`- tai snakeviz-työkalulla.
+
+cProfile profiloi vain sen säikeen, jossa profilointi aloitetaan, eikä
+työprosesseja, joten profiloitava jako kannattaa ajaa sarjassa.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import re
+from datetime import datetime
+from typing import Optional
+
+from .app_paths import get_app_dir
+
+DEFAULT_TOP_N = 40
+DEFAULT_SORT = "cumulative"
+
+
+class JobProfiler:
+    """
+    Profiloi yhden jakotyön ja tallentaa tuloksen.
+
+    Attributes:
+        pstats_path (Optional[str]): Tallennetun `.pstats`-tiedoston polku.
+        summary_path (Optional[str]): Tallennetun tekstiyhteenvedon polku.
+    """
+
+    def __init__(
+        self,
+        label: str = "jako",
+        output_dir: Optional[str] = None,
+        top_n: int = DEFAULT_TOP_N,
+        sort: str = DEFAULT_SORT,
+    ):
+        """
+        Alustaa profiloijan.
+
+        Args:
+            label: Tiedostonimiin lisättävä tunniste, esim. lähdetiedoston nimi.
+            output_dir: Tallennushakemisto. Oletuksena `~/.scanflow/profiles`.
+            top_n: Tekstiyhteenvetoon tulostettavien funktioiden määrä.
+            sort: Yhteenvedon lajitteluperuste (`pstats`-avain).
+
+        Raises:
+            ValueError: Jos top_n ei ole positiivinen.
+        """
+        if top_n < 1:
+            raise ValueError("Yhteenvedon rivimäärän tulee olla vähintään 1.")
+        self.label = re.sub(r"[^\w.-]+", "_", label) or "jako"
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.sort = sort
+        self.pstats_path: Optional[str] = None
+        self.summary_path: Optional[str] = None
+        self._profile = cProfile.Profile()
+
+    def __enter__(self) -> "JobProfiler":
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self._profile.disable()
+        self.save()
+
+    def save(self) -> str:
+        """
+        Tallentaa profiilin ja tekstiyhteenvedon.
+
+        Returns:
+            Tallennetun `.pstats`-tiedoston polku.
+        """
+        output_dir = self.output_dir or get_app_dir("profiles")
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        base_path = os.path.join(output_dir, f"{stamp}-{self.label}")
+        self.pstats_path = f"{base_path}.pstats"
+        self.summary_path = f"{base_path}.txt"
+        self._profile.dump_stats(self.pstats_path)
+        with open(self.summary_path, "w", encoding="utf-8") as file:
+            file.write(self.format_summary())
+        return self.pstats_path
+
+    def format_summary(self) -> str:
+        """
+        Muotoilee profiilin raskaimmat funktiot tekstiksi.
+
+        Returns:
+            `pstats`-muotoinen yhteenveto `top_n` ensimmäisestä funktiosta.
+        """
+        stream = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=stream)
+        stats.sort_stats(self.sort).print_stats(self.top_n)
+        return stream.getvalue()
@@ -0,0 +1,337 @@
+"""
+Moduuli PDF-jaon muistinkäytön profilointiin.
+
+Tarjoaa `MemoryProfiler`-luokan, joka seuraa prosessin muistinkäyttöä
+(RSS) taustasäikeessä ja Pythonin omia varauksia `tracemalloc`-moduulilla,
+sekä `ProfilingRepository`-kääreen, joka kohdistaa mittaukset jaon
+vaiheisiin (`load_pdf`, `extract_pages`, `save_pdf`, `close_pdf`) ja
+yksittäisiin osiin. Raportista näkee vaiheiden huippu- ja pysyvän
+muistinkäytön sekä sen, kasvaako muistinkäyttö osien määrän mukana.
+
+PyMuPDF varaa valtaosan muistista C-kirjastossa, jota `tracemalloc` ei
+näe, joten RSS on ensisijainen mittari. Profilointi koskee vain nykyistä
+prosessia, joten jako kannattaa ajaa sarjassa (workers=1).
+"""
+
+import os
+import statistics
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Collection, Dict, Iterator, List, Optional
+
+DEFAULT_SAMPLE_INTERVAL = 0.005
+_MB = 1024 * 1024
+
+
+def current_rss_bytes() -> Optional[int]:
+    """
+    Palauttaa prosessin nykyisen muistinkäytön (RSS) tavuina.
+
+    Returns:
+        RSS tavuina, tai None, jos alusta ei tarjoa tietoa (`/proc` puuttuu).
+    """
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as file:
+            resident_pages = int(file.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+class StageStats:
+    """
+    Yhden jakovaiheen kootut muistimittaukset.
+
+    Attributes:
+        calls (int): Vaiheen kutsujen määrä.
+        seconds (float): Vaiheeseen kulunut yhteenlaskettu aika.
+        peak_rss_bytes (int): Suurin vaiheen aikana havaittu RSS.
+        peak_python_bytes (int): Suurin Pythonin varausten huippu yhden
+            kutsun aikana.
+        rss_delta_bytes (int): Kutsujen jälkeen prosessiin jääneen RSS-muutoksen summa.
+    """
+
+    __slots__ = ("calls", "seconds", "peak_rss_bytes", "peak_python_bytes", "rss_delta_bytes")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.peak_rss_bytes = 0
+        self.peak_python_bytes = 0
+        self.rss_delta_bytes = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Palauttaa mittaukset sanakirjana megatavuina.
+
+        Returns:
+            Sanakirja avaimilla 'calls', 'seconds', 'peak_rss_mb',
+            'peak_python_mb' ja 'rss_delta_mb'.
+        """
+        return {
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "peak_rss_mb": self.peak_rss_bytes / _MB,
+            "peak_python_mb": self.peak_python_bytes / _MB,
+            "rss_delta_mb": self.rss_delta_bytes / _MB,
+        }
+
+
+class _RssSampler:
+    """
+    Taustasäie, joka ottaa RSS-näytteitä tasaisin välein ja mittaa ajoajan.
+
+    Attributes:
+        interval (float): Näytteiden väli sekunteina.
+        elapsed (float): Edellisen ajon kesto sekunteina.
+    """
+
+    __slots__ = ("interval", "elapsed", "_observe", "_stop_event", "_thread", "_started_at")
+
+    def __init__(self, observe: Callable[[], Any], interval: float):
+        self.interval = interval
+        self.elapsed = 0.0
+        self._observe = observe
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+
+    def start(self) -> None:
+        """Käynnistää näytteistyksen."""
+        self._started_at = time.perf_counter()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Pysäyttää näytteistyksen ja kirjaa ajon keston."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self._started_at
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self._observe()
+
+
+class MemoryProfiler:
+    """
+    Muistinkäytön näytteistäjä ja vaihekohtainen kirjanpito.
+
+    Käytetään context managerina, jonka aikana taustasäie ottaa RSS-näytteitä
+    ja `tracemalloc` seuraa Pythonin varauksia. Vaiheet merkitään
+    `stage`-metodilla ja valmistuneet osat `part_done`-metodilla.
+    """
+
+    def __init__(self, sample_interval: float = DEFAULT_SAMPLE_INTERVAL):
+        """
+        Alustaa profiloijan.
+
+        Args:
+            sample_interval: RSS-näytteiden väli sekunteina.
+
+        Raises:
+            ValueError: Jos sample_interval ei ole positiivinen.
+        """
+        if sample_interval <= 0:
+            raise ValueError("Näytevälin tulee olla positiivinen.")
+        self.stages: Dict[str, StageStats] = {}
+        self.parts: List[Dict[str, Any]] = []
+        self.baseline_rss_bytes = 0
+        self.peak_rss_bytes = 0
+        self._active_stage: Optional[StageStats] = None
+        self._sampler = _RssSampler(self._observe_rss, sample_interval)
+        self._started_tracemalloc = False
+
+    def __enter__(self) -> "MemoryProfiler":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.baseline_rss_bytes = current_rss_bytes() or 0
+        self.peak_rss_bytes = self.baseline_rss_bytes
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self._sampler.stop()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Mittaa lohkon muistinkäytön nimetyn vaiheen alle.
+
+        Args:
+            name: Vaiheen nimi, esim. "extract_pages".
+
+        Yields:
+            None. Lohkon suorituksen ajan vaihe on aktiivinen.
+        """
+        stats = self.stages.setdefault(name, StageStats())
+        rss_before = self._observe_rss()
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        previous_stage, self._active_stage = self._active_stage, stats
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.seconds += time.perf_counter() - started
+            stats.calls += 1
+            self._active_stage = previous_stage
+            if tracemalloc.is_tracing():
+                python_peak = tracemalloc.get_traced_memory()[1]
+                stats.peak_python_bytes = max(stats.peak_python_bytes, python_peak)
+            rss_after = self._observe_rss()
+            stats.peak_rss_bytes = max(stats.peak_rss_bytes, rss_before, rss_after)
+            stats.rss_delta_bytes += rss_after - rss_before
+
+    def part_done(self, page_count: int) -> None:
+        """
+        Kirjaa pysyvän muistinkäytön osan valmistuttua.
+
+        Args:
+            page_count: Valmistuneen osan sivumäärä.
+        """
+        python_bytes = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        self.parts.append({
+            "index": len(self.parts),
+            "pages": page_count,
+            "rss_mb": self._observe_rss() / _MB,
+            "python_mb": python_bytes / _MB,
+        })
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Kokoaa mittaukset raportiksi.
+
+        Pysyvä muistinkäyttö on osien välissä mitatun RSS:n mediaani. Kasvu
+        osaa kohden lasketaan osien jälkeisten RSS-mittausten lineaarisesta
+        sovitteesta; selvästi positiivinen arvo viittaa vuotoon tai
+        kertymään, joka kasvaa osien määrän mukana.
+
+        Returns:
+            Sanakirja, jossa on kokonaisluvut megatavuina, vaiheet ja osat.
+        """
+        part_rss = [part["rss_mb"] for part in self.parts]
+        part_python = [part["python_mb"] for part in self.parts]
+        return {
+            "seconds": self._sampler.elapsed,
+            "baseline_rss_mb": self.baseline_rss_bytes / _MB,
+            "peak_rss_mb": self.peak_rss_bytes / _MB,
+            "steady_rss_mb": statistics.median(part_rss) if part_rss else None,
+            "rss_growth_per_part_kb": _slope_kb(part_rss),
+            "python_growth_per_part_kb": _slope_kb(part_python),
+            "stages": {name: stats.to_dict() for name, stats in self.stages.items()},
+            "parts": list(self.parts),
+        }
+
+    def _observe_rss(self) -> int:
+        rss = current_rss_bytes() or 0
+        self.peak_rss_bytes = max(self.peak_rss_bytes, rss)
+        if self._active_stage is not None:
+            self._active_stage.peak_rss_bytes = max(self._active_stage.peak_rss_bytes, rss)
+        return rss
+
+
+def _slope_kb(values_mb: List[float]) -> Optional[float]:
+    if len(values_mb) < 2:
+        return None
+    slope = statistics.linear_regression(range(len(values_mb)), values_mb).slope
+    return slope * 1024
+
+
+class ProfilingRepository:
+    """
+    PDF-repositorion kääre, joka mittaa jokaisen vaiheen muistinkäytön.
+
+    Kääre välittää kaikki kutsut alkuperäiselle repositoriolle. Kun
+    `extract_pages`-metodin palauttama osadokumentti suljetaan, osa
+    kirjataan profiloijalle valmiiksi.
+    """
+
+    def __init__(self, repository: Any, profiler: MemoryProfiler):
+        """
+        Alustaa kääreen.
+
+        Args:
+            repository: Käärittävä `PDFRepository`-instanssi.
+            profiler: Mittaukset vastaanottava profiloija.
+        """
+        self.repository = repository
+        self.profiler = profiler
+        self._part_pages: Dict[int, int] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.repository, name)
+
+    def load_pdf(self, file_path: str) -> Any:
+        """Lataa lähdedokumentin vaiheena "load_pdf"."""
+        with self.profiler.stage("load_pdf"):
+            return self.repository.load_pdf(file_path)
+
+    def extract_pages(
+        self,
+        source_doc: Any,
+        start_idx: int,
+        end_idx: int,
+        skip_pages: Optional[Collection[int]] = None,
+    ) -> Any:
+        """Poimii osan sivut vaiheena "extract_pages"."""
+        extract_options = {"skip_pages": skip_pages} if skip_pages else {}
+        with self.profiler.stage("extract_pages"):
+            new_doc = self.repository.extract_pages(
+                source_doc, start_idx, end_idx, **extract_options
+            )
+        self._part_pages[id(new_doc)] = new_doc.page_count
+        return new_doc
+
+    def save_pdf(self, pdf_document: Any, output_path: str) -> str:
+        """Tallentaa osan vaiheena "save_pdf"."""
+        with self.profiler.stage("save_pdf"):
+            return self.repository.save_pdf(pdf_document, output_path)
+
+    def close_pdf(self, pdf_document: Any) -> None:
+        """Sulkee dokumentin vaiheena "close_pdf" ja kirjaa valmiin osan."""
+        page_count = self._part_pages.pop(id(pdf_document), None)
+        with self.profiler.stage("close_pdf"):
+            self.repository.close_pdf(pdf_document)
+        if page_count is not None:
+            self.profiler.part_done(page_count)
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+    Muotoilee muistiraportin luettavaksi tekstiksi.
+
+    Args:
+        report: `MemoryProfiler.report`-metodin palauttama raportti.
+
+    Returns:
+        Monirivinen yhteenveto.
+    """
+
+    def megabytes(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value:.1f} Mt"
+
+    growth = report["rss_growth_per_part_kb"]
+    lines = [
+        f"Muisti: lähtötaso {megabytes(report['baseline_rss_mb'])}, "
+        f"huippu {megabytes(report['peak_rss_mb'])}, "
+        f"pysyvä {megabytes(report['steady_rss_mb'])}",
+        f"Kasvu per osa: {'-' if growth is None else f'{growth:.1f} kt'} "
+        f"({len(report['parts'])} osaa)",
+    ]
+    for name, stage in report["stages"].items():
+        lines.append(
+            f"  {name}: {stage['calls']} kutsua, {stage['seconds']:.2f} s, "
+            f"huippu-RSS {stage['peak_rss_mb']:.1f} Mt, "
+            f"Python-huippu {stage['peak_python_mb']:.2f} Mt, "
+            f"jäänyt {stage['rss_delta_mb']:+.1f} Mt"
+        )
+    return "\n".join(lines)
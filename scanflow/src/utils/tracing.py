@@ -0,0 +1,217 @@
+"""
+Moduuli PDF-jaon aikajanan jäljittämiseen Chrome/Perfetto-muodossa.
+
+Jäljitys otetaan käyttöön ajon aikana `enable`-funktiolla ja poistetaan
+`disable`-funktiolla. Koodi merkitsee vaiheet `span`-context managerilla;
+kun jäljitys ei ole käytössä, `span` palauttaa valmiin tyhjän context
+managerin eikä ota aikaleimoja.
+
+Työprosessit kirjoittavat tapahtumansa omiin tiedostoihinsa jäljittimen
+välihakemistoon, ja `Tracer.write` yhdistää ne pääprosessin tapahtumiin
+yhdeksi `trace.json`-tiedostoksi. Tiedoston voi avata osoitteessa
+https://ui.perfetto.dev tai Chromen `chrome://tracing`-näkymässä.
+Aikaleimat otetaan monotonisesta kellosta, joka on Linuxissa yhteinen
+kaikille prosesseille, joten prosessien aikajanat ovat vertailukelpoisia.
+"""
+
+import glob
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, List, Optional
+
+_NULL_SPAN = nullcontext()
+# Prosessin käytössä oleva jäljitin avaimella "tracer", tai None.
+_TRACER_STATE: Dict[str, Optional["Tracer"]] = {"tracer": None}
+
+
+class Tracer:
+    """
+    Kerää Chrome-jäljitysmuodon "complete"-tapahtumia.
+
+    Pääprosessin jäljitin pitää tapahtumat muistissa. Työprosessin
+    jäljitin (`spool_path` annettu) kirjoittaa jokaisen tapahtuman heti
+    JSON-rivinä tiedostoon, jotta tapahtumat säilyvät myös, jos prosessi
+    lopetetaan kesken.
+    """
+
+    def __init__(self, spool_path: Optional[str] = None, process_name: str = "scanflow"):
+        """
+        Alustaa jäljittimen.
+
+        Args:
+            spool_path: Valinnainen tiedosto, johon tapahtumat kirjoitetaan
+                        muistin sijaan. Käytetään työprosesseissa.
+            process_name: Prosessin nimi aikajanalla.
+        """
+        self.events: List[Dict[str, Any]] = []
+        self.spool_dir: Optional[str] = None
+        self._spool_path = spool_path
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._record({
+            "name": "process_name", "ph": "M", "pid": self._pid, "tid": 0,
+            "args": {"name": process_name},
+        })
+
+    @contextmanager
+    def span(self, name: str, category: str = "split", **args: Any) -> Iterator[None]:
+        """
+        Mittaa lohkon keston yhdeksi aikajanan tapahtumaksi.
+
+        Args:
+            name: Tapahtuman nimi, esim. "extract".
+            category: Tapahtuman luokka.
+            **args: Tapahtumaan liitettävät lisätiedot.
+
+        Yields:
+            None.
+        """
+        started = time.monotonic_ns()
+        try:
+            yield
+        finally:
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": started // 1000,
+                "dur": (time.monotonic_ns() - started) // 1000,
+                "pid": self._pid,
+                "tid": threading.get_native_id(),
+            }
+            if args:
+                event["args"] = args
+            self._record(event)
+
+    def worker_spool_dir(self) -> str:
+        """
+        Palauttaa hakemiston, johon työprosessit kirjoittavat tapahtumansa.
+
+        Hakemisto luodaan ensimmäisellä kutsulla ja poistetaan `write`-kutsussa.
+
+        Returns:
+            Välihakemiston polku.
+        """
+        with self._lock:
+            if self.spool_dir is None:
+                self.spool_dir = tempfile.mkdtemp(prefix="scanflow-trace-")
+            return self.spool_dir
+
+    def collect(self) -> List[Dict[str, Any]]:
+        """
+        Palauttaa omat ja työprosessien tapahtumat aikajärjestyksessä.
+
+        Returns:
+            Lista tapahtumia.
+        """
+        with self._lock:
+            events = list(self.events)
+            spool_dir = self.spool_dir
+        if spool_dir is not None:
+            for path in sorted(glob.glob(os.path.join(spool_dir, "*.jsonl"))):
+                with open(path, "r", encoding="utf-8") as file:
+                    events.extend(json.loads(line) for line in file if line.endswith("\n"))
+        events.sort(key=lambda event: (event["ph"] != "M", event.get("ts", 0)))
+        return events
+
+    def write(self, path: str) -> str:
+        """
+        Kirjoittaa jäljityksen Chrome/Perfetto-muotoiseen JSON-tiedostoon.
+
+        Args:
+            path: Kohdetiedoston polku, esim. "trace.json".
+
+        Returns:
+            Kirjoitetun tiedoston polku.
+        """
+        trace = {"traceEvents": self.collect(), "displayTimeUnit": "ms"}
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(trace, file)
+        if self.spool_dir is not None:
+            shutil.rmtree(self.spool_dir, ignore_errors=True)
+            self.spool_dir = None
+        return path
+
+    def _record(self, event: Dict[str, Any]) -> None:
+        if self._spool_path is None:
+            with self._lock:
+                self.events.append(event)
+            return
+        with open(self._spool_path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(event) + "\n")
+
+
+def enable(tracer: Optional[Tracer] = None) -> Tracer:
+    """
+    Ottaa jäljityksen käyttöön nykyisessä prosessissa.
+
+    Args:
+        tracer: Käytettävä jäljitin. Jos None, luodaan uusi.
+
+    Returns:
+        Käyttöön otettu jäljitin.
+    """
+    tracer = tracer or Tracer()
+    _TRACER_STATE["tracer"] = tracer
+    return tracer
+
+
+def disable() -> Optional[Tracer]:
+    """
+    Poistaa jäljityksen käytöstä.
+
+    Returns:
+        Käytössä ollut jäljitin tai None.
+    """
+    tracer, _TRACER_STATE["tracer"] = _TRACER_STATE["tracer"], None
+    return tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    """
+    Palauttaa käytössä olevan jäljittimen.
+
+    Returns:
+        Jäljitin, tai None jos jäljitys ei ole käytössä.
+    """
+    return _TRACER_STATE["tracer"]
+
+
+def span(name: str, **args: Any) -> ContextManager[None]:
+    """
+    Mittaa lohkon, jos jäljitys on käytössä.
+
+    Args:
+        name: Tapahtuman nimi.
+        **args: Tapahtumaan liitettävät lisätiedot.
+
+    Returns:
+        Context manager. Kun jäljitys ei ole käytössä, palautetaan jaettu
+        tyhjä context manager.
+    """
+    tracer = _TRACER_STATE["tracer"]
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, **args)
+
+
+def enable_worker(spool_dir: str) -> Tracer:
+    """
+    Ottaa jäljityksen käyttöön työprosessissa.
+
+    Args:
+        spool_dir: Pääprosessin jäljittimen välihakemisto.
+
+    Returns:
+        Työprosessin jäljitin.
+    """
+    pid = os.getpid()
+    return enable(Tracer(
+        spool_path=os.path.join(spool_dir, f"{pid}.jsonl"),
+        process_name=f"worker {pid}",
+    ))
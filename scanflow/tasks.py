@@ -21,6 +21,18 @@ def coverage(ctx):
 def coverage_report(ctx):
     ctx.run("coverage html", pty=True)
 
+@task
+def bench_startup(ctx, runs=5):
+    ctx.run(f"python3 -m src.benchmarks.startup_benchmark --runs {runs}", pty=True)
+
+@task
+def bench(ctx, scale=1.0, repeat=5, update_baseline=False):
+    flags = " --update-baseline" if update_baseline else ""
+    ctx.run(
+        f"python3 -m src.benchmarks.split_benchmark --scale {scale} --repeat {repeat}{flags}",
+        pty=True,
+    )
+
 @task
 def format(ctx):
     ctx.run("autopep8 --in-place --recursive src", pty=True)